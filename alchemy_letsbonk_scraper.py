@@ -10,6 +10,11 @@ import logging
 import os
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timezone
+from cachetools import TTLCache
+
+from metaplex_metadata import MetaplexMetadataFetcher
+from timestamp_provenance import detection_provenance
+from slot_clock import get_slot_clock
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +35,9 @@ class AlchemyLetsBonkScraper:
         
         # Caching to reduce API calls
         self.processed_signatures = {}
-        self.metadata_cache = {}
+        self.metadata_cache = TTLCache(maxsize=5000, ttl=3600)
+        self.metaplex_cache = TTLCache(maxsize=5000, ttl=3600)  # Decoded on-chain metadata, filled in batches
+        self.metadata_fetcher = MetaplexMetadataFetcher(self._make_rpc_call)
         
         self.session = requests.Session()
         self.session.headers.update({
@@ -94,8 +101,13 @@ class AlchemyLetsBonkScraper:
                 current_time = time.time()
                 recent_signatures = []
                 
+                # Entries without blockTime are timed by the shared slot clock (one batched lookup at most)
+                slot_clock = get_slot_clock()
+                slot_clock.observe_entries(result)
+                slot_clock.prefetch(sig_info.get('slot') for sig_info in result if not sig_info.get('blockTime'))
+                
                 for sig_info in result:
-                    block_time = sig_info.get('blockTime')
+                    block_time = sig_info.get('blockTime') or slot_clock.block_time(sig_info.get('slot'))
                     if block_time and (current_time - block_time) <= 15:  # Only 15 seconds for ultra-fresh tokens
                         recent_signatures.append(sig_info['signature'])
                 
@@ -137,7 +149,8 @@ class AlchemyLetsBonkScraper:
         """Extract token information from transaction - ONLY for token CREATION events"""
         try:
             # CRITICAL: Validate blockchain timestamp with STRICT requirements
-            block_time = transaction.get('blockTime')
+            # (fresh confirmed transactions can lack blockTime - the slot clock fills it in)
+            block_time = transaction.get('blockTime') or get_slot_clock().block_time(transaction.get('slot'))
             current_time = time.time()
             
             if block_time and block_time > 0:
@@ -245,6 +258,7 @@ class AlchemyLetsBonkScraper:
                 'symbol': metadata.get('symbol', 'UNK'),
                 'decimals': metadata.get('decimals', 9),
                 'supply': 1000000000,
+                **detection_provenance(transaction),
                 'created_timestamp': block_time,  # Now guaranteed to be within 2 minutes
                 'signature': signatures[0] if signatures else '',
                 'platform': 'letsbonk.fun',
@@ -317,6 +331,13 @@ class AlchemyLetsBonkScraper:
             return self.metadata_cache[mint_address]
         
         try:
+            # Already decoded from chain by a batch prefetch - authoritative and free
+            prefetched = self.metaplex_cache.get(mint_address)
+            if prefetched:
+                logger.info(f"✅ Got real name from Metaplex: {prefetched['name']}")
+                self.metadata_cache[mint_address] = prefetched
+                return prefetched
+            
             # Method 1: Try DexScreener API first (most reliable for LetsBonk tokens)
             dex_metadata = self._get_dexscreener_metadata(mint_address)
             if dex_metadata and dex_metadata.get('name') and len(dex_metadata['name'].strip()) > 0:
@@ -351,87 +372,32 @@ class AlchemyLetsBonkScraper:
             return {}
     
     def _get_metaplex_metadata(self, mint_address: str) -> dict:
-        """Get metadata from Metaplex metadata program"""
+        """Get metadata from the mint's Metaplex metadata PDA (prefetched when possible)"""
+        if mint_address not in self.metaplex_cache:
+            self.prefetch_metaplex_metadata([mint_address])
+        return self.metaplex_cache.get(mint_address)
+    
+    def prefetch_metaplex_metadata(self, mint_addresses: List[str]) -> int:
+        """Resolve many mints' on-chain metadata in batched getMultipleAccounts calls
+        
+        Only decoded accounts are cached - brand-new mints may not have their
+        metadata account yet, so misses are looked up again next time.
+        """
+        pending = [mint for mint in dict.fromkeys(mint_addresses) if mint not in self.metaplex_cache]
+        if not pending:
+            return 0
+        
         try:
-            import base58
-            import struct
-            
-            # Metaplex metadata program ID
-            metadata_program_id = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
-            
-            # Derive the metadata account PDA
-            # This is a simplified PDA derivation for Metaplex metadata
-            try:
-                # Use getProgramAccounts to find metadata accounts for this mint
-                result = self._make_rpc_call("getProgramAccounts", [
-                    metadata_program_id,
-                    {
-                        "encoding": "base64",
-                        "filters": [
-                            {
-                                "memcmp": {
-                                    "offset": 33,  # Mint address offset in metadata account
-                                    "bytes": mint_address
-                                }
-                            }
-                        ]
-                    }
-                ])
-                
-                if result and len(result) > 0:
-                    # Get the metadata account data
-                    metadata_account = result[0]
-                    account_data = metadata_account.get('account', {}).get('data')
-                    
-                    if account_data:
-                        # Decode the metadata from base64
-                        import base64
-                        decoded_data = base64.b64decode(account_data[0])
-                        
-                        # Parse the metadata structure (simplified)
-                        # Metaplex metadata has a specific structure
-                        try:
-                            # Skip the first few bytes (discriminator, etc.)
-                            # The name usually starts around byte 69
-                            offset = 69
-                            
-                            # Read name length (4 bytes)
-                            if len(decoded_data) > offset + 4:
-                                name_len = struct.unpack('<I', decoded_data[offset:offset+4])[0]
-                                if name_len > 0 and name_len < 200:  # Reasonable name length
-                                    name_start = offset + 4
-                                    name_end = name_start + name_len
-                                    if len(decoded_data) > name_end:
-                                        name = decoded_data[name_start:name_end].decode('utf-8', errors='ignore').strip('\x00')
-                                        
-                                        # Read symbol length and symbol
-                                        symbol_offset = name_end
-                                        if len(decoded_data) > symbol_offset + 4:
-                                            symbol_len = struct.unpack('<I', decoded_data[symbol_offset:symbol_offset+4])[0]
-                                            if symbol_len > 0 and symbol_len < 50:
-                                                symbol_start = symbol_offset + 4
-                                                symbol_end = symbol_start + symbol_len
-                                                if len(decoded_data) > symbol_end:
-                                                    symbol = decoded_data[symbol_start:symbol_end].decode('utf-8', errors='ignore').strip('\x00')
-                                                    
-                                                    if name and len(name) > 0:
-                                                        logger.info(f"🎯 Found real token name: {name} ({symbol})")
-                                                        return {
-                                                            'name': name,
-                                                            'symbol': symbol,
-                                                            'decimals': 9
-                                                        }
-                        except Exception as parse_error:
-                            logger.debug(f"Metadata parsing error: {parse_error}")
-                
-            except Exception as rpc_error:
-                logger.debug(f"RPC call failed: {rpc_error}")
-            
-            return None
-            
+            resolved = 0
+            for mint, metadata in self.metadata_fetcher.fetch(pending).items():
+                if metadata and metadata.name:
+                    self.metaplex_cache[mint] = metadata.to_token_metadata()
+                    resolved += 1
+            logger.debug(f"📦 METAPLEX BATCH: {resolved}/{len(pending)} mints resolved on-chain")
+            return resolved
         except Exception as e:
-            logger.debug(f"Metaplex metadata fetch failed for {mint_address}: {e}")
-            return None
+            logger.debug(f"Metaplex batch fetch failed for {len(pending)} mints: {e}")
+            return 0
     
     def _get_dexscreener_metadata(self, mint_address: str) -> dict:
         """Get token metadata from DexScreener API with better rate limiting"""
@@ -546,15 +512,22 @@ class AlchemyLetsBonkScraper:
             tokens = []
             processed_count = 0
             
-            for signature in signatures:
+            transactions = [self.get_transaction_details(signature) for signature in signatures]
+            transactions = [transaction for transaction in transactions if transaction]
+            
+            # One getMultipleAccounts call names every new mint in this batch
+            candidate_mints = [
+                balance.get('mint') for transaction in transactions
+                for balance in (transaction.get('meta') or {}).get('postTokenBalances', [])
+                if balance.get('mint', '').lower().endswith('bonk')
+            ]
+            if candidate_mints:
+                self.prefetch_metaplex_metadata(candidate_mints)
+            
+            for transaction in transactions:
                 if processed_count >= limit:
                     break
                 
-                # Get transaction details
-                transaction = self.get_transaction_details(signature)
-                if not transaction:
-                    continue
-                
                 # Extract token data
                 token_data = self.extract_token_from_transaction(transaction)
                 if token_data:
@@ -12,12 +12,12 @@ import asyncio
 from datetime import datetime, timezone
 from flask import Flask, jsonify, request
 from waitress import serve
-from typing import Dict, List, Any
+from typing import Dict, FrozenSet, List, Any, Mapping, Optional
 import discord
 from discord.ext import commands
 from discord import app_commands
 from solana.rpc.api import Client
-from cachetools import TTLCache
+from compact_seen_set import CompactSeenSet, SIGNATURE_KEY_SIZE
 import base58
 # Disabled solders imports for pure DexScreener deployment
 # from solders.keypair import Keypair
@@ -28,8 +28,10 @@ PublicKey = None
 # Import existing components
 from alchemy_letsbonk_scraper import AlchemyLetsBonkScraper
 from new_token_only_monitor import NewTokenOnlyMonitor
+from keyword_automaton import KeywordAutomaton
+from keyword_snapshot import KeywordSnapshot, KeywordSnapshotStore
 # from letsbonk_api_monitor import LetsBonkAPIMonitor  # REMOVED - file doesn't exist
-# from spl_websocket_monitor import SPLWebSocketMonitor  # REMOVED - file doesn't exist
+from spl_websocket_monitor import SPLWebSocketMonitor
 from config_manager import ConfigManager
 from discord_notifier import DiscordNotifier
 # Conditional import for webhook notifier (Railway deployment compatibility)
@@ -158,6 +160,20 @@ except ImportError:
 from cryptography.fernet import Fernet
 import psycopg2
 import hashlib
+from db_pool import get_db_pool, get_pooled_connection, get_pool_metrics
+from notification_dedup import get_notification_dedup
+from background_event_loop import get_background_loop
+from async_token_pipeline import PipelineStage, LatencyHistogram
+from token_processing_engine import TokenProcessingEngine, PollingSource
+from timestamp_provenance import TimestampProvenanceResolver, has_provenance
+from slot_clock import get_slot_clock
+from latency_budget import BudgetedValidator, time_since_ingest, token_budget
+from market_data_service import get_market_data_service
+from memory_governor import get_memory_governor
+from dexscreener_batch import get_dexscreener_batch
+from name_retry_scheduler import get_name_retry_scheduler
+from keyword_events import (get_keyword_listener, keyword_event, apply_keyword_event, applies_to,
+                            OP_ADD, OP_REMOVE, SCOPE_KEYWORDS)
 # Conditional import with fallback for Railway deployment
 try:
     from keyword_attribution import KeywordAttributionManager
@@ -185,6 +201,10 @@ except ImportError:
     except ImportError:
         pass
 
+# Market data is an embellishment - never hold a notification longer than this for it
+# (a timed-out fetch keeps running and fills the shared cache for the next caller)
+NOTIFICATION_MARKET_DATA_TIMEOUT = 1.0
+
 # Initialize Solana RPC client with fallback endpoints
 ALCHEMY_API_KEY = os.getenv('ALCHEMY_API_KEY', '877gH4oJoW3wJcEZpK6OxPMPBIlJhpS8')
 
@@ -234,10 +254,15 @@ class AlchemyMonitoringServer:
         self.alchemy_api_key = ALCHEMY_API_KEY
         
         # Initialize TTL cache system for memory management
-        self.seen_token_addresses = TTLCache(maxsize=10000, ttl=60)  # 1-minute TTL
-        self.processed_signatures = TTLCache(maxsize=5000, ttl=300)  # 5-minute TTL for signatures
-        self.websocket_signatures = TTLCache(maxsize=5000, ttl=60)   # 1-minute TTL for WebSocket events
-        self.permanently_rejected_tokens = set()  # Permanent blocklist for old tokens (prevents TTL cache reprocessing)
+        # Fixed-memory seen sets: decoded keys in preallocated tables, expired in time buckets
+        self.seen_token_addresses = CompactSeenSet(capacity=10000, ttl=60, name='seen_tokens')  # 1-minute TTL
+        self.processed_signatures = CompactSeenSet(capacity=5000, ttl=300, key_size=SIGNATURE_KEY_SIZE,
+                                                   name='processed_signatures')  # 5-minute TTL for signatures
+        self.websocket_signatures = CompactSeenSet(capacity=5000, ttl=60, key_size=SIGNATURE_KEY_SIZE,
+                                                   name='websocket_signatures')  # 1-minute TTL for WebSocket events
+        # Blocklist for old tokens (prevents TTL cache reprocessing): a day exact, then a Bloom tail
+        self.permanently_rejected_tokens = CompactSeenSet(capacity=50000, ttl=86400, tail_capacity=200000,
+                                                          name='rejected_tokens')
         
         # User wallet storage system with persistent database storage
         self.connected_wallets = {}  # user_id -> {'address': str, 'keypair': Keypair, 'connected_at': timestamp}
@@ -257,17 +282,34 @@ class AlchemyMonitoringServer:
         # Initialize successful extractions tracking
         self.recent_successful_extractions = []
         
-        # Load keywords from PostgreSQL database (FIXED VERSION)
+        # Load keywords from PostgreSQL database (FIXED VERSION), then follow pushed changes
+        self.keyword_snapshots = KeywordSnapshotStore()
         self.keywords = self._load_keywords_direct_database()
+        get_keyword_listener().subscribe(self.on_keyword_change)
+        
+        # Shared background event loop - async extraction runs here so pooled
+        # aiohttp sessions survive from one token to the next
+        self.event_loop_service = get_background_loop()
+        
+        # PIPELINE_MODE=async routes detected tokens through the shared token processing
+        # engine instead of the per-batch thread pool (kept as the default for comparison)
+        self.pipeline_mode = os.getenv('PIPELINE_MODE', 'threaded').strip().lower()
+        self.token_engine = None
+        self.threaded_latency = LatencyHistogram()
         
         # Initialize Pure DexScreener 70% success rate extractor (NO Jupiter/Solana RPC)
         try:
-            from dexscreener_70_percent_extractor import DexScreener70PercentExtractor
+            from dexscreener_70_percent_extractor import DexScreener70PercentExtractor, MAX_EXTRACTION_SECONDS
             self.dexscreener_extractor = DexScreener70PercentExtractor()
+            # Scoring history loads from the database in the background, not on startup's critical path
+            self.event_loop_service.submit(self.dexscreener_extractor.initialize_scoring())
+            # Outer wait for an extraction: its capped retry sequence plus a margin
+            self.name_extraction_timeout = MAX_EXTRACTION_SECONDS + 5
             logger.info("✅ PURE DEXSCREENER: 70%+ success rate extractor initialized (NO Jupiter/Solana RPC)")
         except Exception as e:
             logger.warning(f"⚠️ DexScreener 70% extractor failed to initialize: {e}")
             self.dexscreener_extractor = None
+            self.name_extraction_timeout = 80
         
         # Simple keyword matching (AI smart matching disabled per user request)
         self.ai_smart_matcher = None
@@ -295,6 +337,10 @@ class AlchemyMonitoringServer:
         # Initialize Alchemy scraper for token recovery system
         self.alchemy_scraper = AlchemyLetsBonkScraper()
         
+        # Chain creation-time lookups for tokens that arrive without detection provenance
+        self.timestamp_resolver = TimestampProvenanceResolver(self.alchemy_scraper._make_rpc_call)
+        self.slot_clock = get_slot_clock()
+        
         # Initialize link scraping statistics tracking
         self.link_scraping_stats = {
             'total_extractions_attempted': 0,
@@ -329,14 +375,23 @@ class AlchemyMonitoringServer:
             logger.error(f"❌ Failed to initialize API-free social media scraper: {e}")
             self.api_free_social_scraper = None
         
-        # Initialize SPL Token Program WebSocket monitor for ultra-fast detection (DISABLED - module not available)
-        # try:
-        #     self.spl_websocket_monitor = SPLWebSocketMonitor(callback_func=self.process_spl_token_event)
-        #     logger.info("✅ SPL WebSocket monitor initialized - real-time token program monitoring")
-        #     logger.info("📡 WebSocket subscription to SPL Token Program for sub-second detection")
-        # except Exception as e:
-        #     logger.error(f"❌ Failed to initialize SPL WebSocket monitoring: {e}")
-        self.spl_websocket_monitor = None  # Module not available in deployment
+        # TOKEN_INGESTION_MODE: poll (default), websocket (logsSubscribe only) or both
+        self.ingestion_mode = os.getenv('TOKEN_INGESTION_MODE', 'poll').strip().lower()
+        
+        # Initialize LetsBonk logsSubscribe WebSocket monitor for sub-second detection
+        self.spl_websocket_monitor = None
+        if self.ingestion_mode in ('websocket', 'both'):
+            try:
+                # Resolution and gap backfill reuse the poller's batched RPC session
+                self.spl_websocket_monitor = SPLWebSocketMonitor(
+                    callback_func=self.process_tokens,
+                    resolve_func=self.new_token_monitor.resolve_signatures,
+                    backfill_func=self.new_token_monitor.get_signatures_since
+                )
+                logger.info("✅ SPL WebSocket monitor initialized - real-time token program monitoring")
+                logger.info("📡 WebSocket logsSubscribe to LetsBonk program for sub-second detection")
+            except Exception as e:
+                logger.error(f"❌ Failed to initialize SPL WebSocket monitoring: {e}")
         
         # Initialize Discord notifier with webhook fallback
         webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
@@ -373,6 +428,17 @@ class AlchemyMonitoringServer:
             logger.warning(f"⚠️ DexScreener validator failed to initialize: {e}")
             self.dexscreener_validator = None
         
+        # Per-token latency budget: every freshness step declares its cost and is
+        # skipped or deferred when it can't finish before the token's deadline
+        self.token_deadline_seconds = float(os.getenv('TOKEN_DEADLINE_SECONDS', '5.0'))
+        self.freshness_validator = BudgetedValidator()
+        self.freshness_validator.register('chain_timestamp', 0.5)
+        self.freshness_validator.register('dexscreener_freshness', 1.0)
+        self.freshness_validator.register('consensus', 3.0)
+        # TEMPORARILY DISABLED: DexScreener validation to enable social media extraction testing
+        # Re-enable this after social media extraction is confirmed working
+        self.dexscreener_freshness_enabled = False
+        
         # Initialize multi-source timestamp validator for consensus validation
         self.multi_source_validator = None
         try:
@@ -469,9 +535,15 @@ class AlchemyMonitoringServer:
         logger.info("🎯 Auto-sell monitor disabled for pure DexScreener deployment")
         
         # Tracking with persistent database storage to prevent duplicates across restarts
-        self.notified_token_addresses = set()  # Track tokens we've already sent notifications for in memory
+        # Bloom filter + LRU warmed from notified_tokens; set-style facade keeps .add()/in working
+        self.notification_dedup = get_notification_dedup(warm=False)
+        self.notified_token_addresses = self.notification_dedup
         self.notification_count = 0
         
+        # Memory governor: per-cache byte footprints, incremental eviction only under pressure
+        self.memory_governor = get_memory_governor()
+        self.register_memory_caches()
+        
         # Initialize persistent notification tracking in database
         self.init_persistent_notification_tracking()
         self.monitoring_stats = {
@@ -481,10 +553,9 @@ class AlchemyMonitoringServer:
             'uptime_start': datetime.now().isoformat()
         }
         
-        # ⚡ ZERO-DELAY OPTIMIZATION: Pre-compile keyword patterns for instant matching
-        self.instant_keyword_set = set(kw.lower() for kw in self.keywords)
-        self.keyword_lookup = {kw.lower(): kw for kw in self.keywords}
-        logger.info(f"⚡ INSTANT MATCHING: Pre-compiled {len(self.instant_keyword_set)} keywords for zero-delay processing")
+        # ⚡ ZERO-DELAY OPTIMIZATION: Keyword automaton, instant_keyword_set and keyword_lookup
+        # are compiled by the keywords setter whenever the watchlist is (re)loaded
+        logger.info(f"⚡ INSTANT MATCHING: Pre-compiled {len(self.instant_keyword_set)} keywords into {self.keyword_automaton.state_count}-state automaton")
         logger.info(f"⚡ DUAL API INTEGRATION: Jupiter + DexScreener redundancy active for 70-85% extraction success rate")
         
         # Initialize reliable monitoring system for goal achievement
@@ -522,6 +593,58 @@ class AlchemyMonitoringServer:
         # Initialize market cap alert manager with Discord bot reference
         # self.market_cap_alert_manager = MarketCapAlertManager(self.discord_bot)  # DISABLED
     
+    @property
+    def keyword_snapshot(self) -> KeywordSnapshot:
+        """Current keyword snapshot - grab it once per match and use only that reference"""
+        return self.keyword_snapshots.current
+    
+    @property
+    def keywords(self) -> List[str]:
+        """Current watchlist keywords (from the published keyword snapshot)"""
+        return list(self.keyword_snapshots.current.keywords)
+    
+    @keywords.setter
+    def keywords(self, value: List[str]):
+        """Compile a new keyword snapshot and publish it with a single reference swap"""
+        self._keywords_published(self.keyword_snapshots.publish({'System': list(value or [])}))
+    
+    @property
+    def keyword_automaton(self) -> KeywordAutomaton:
+        return self.keyword_snapshots.current.automaton
+    
+    @property
+    def instant_keyword_set(self) -> FrozenSet[str]:
+        return self.keyword_snapshots.current.lowered
+    
+    @property
+    def keyword_lookup(self) -> Mapping[str, str]:
+        return self.keyword_snapshots.current.lookup
+    
+    def _keywords_published(self, snapshot: KeywordSnapshot):
+        get_name_retry_scheduler().update_keywords(snapshot.keywords)
+        logger.info(f"⚡ KEYWORD SNAPSHOT v{snapshot.version}: Compiled {len(snapshot)} keywords "
+                    f"({snapshot.automaton.state_count} states)")
+    
+    def on_keyword_change(self, event: Dict[str, Any]):
+        """Apply a pushed change to the System watchlist without reloading the keywords table"""
+        if not applies_to(event, SCOPE_KEYWORDS) or event.get('user_id') not in (None, 'System'):
+            return
+        
+        def apply(snapshot: KeywordSnapshot) -> Dict[str, List[str]]:
+            updated = apply_keyword_event(snapshot.keywords, event)
+            if updated is None:
+                updated = self._load_keywords_direct_database()
+            return {'System': updated}
+        
+        snapshot = self.keyword_snapshots.update(apply)
+        self._keywords_published(snapshot)
+        logger.info(f"⚡ KEYWORD PUSH: {event['op']} '{event.get('keyword') or '*'}' - {len(snapshot)} keywords active")
+    
+    def apply_local_keyword_changes(self, op: str, keywords: List[str]):
+        """Apply this process's own slash-command changes immediately (the NOTIFY echo is idempotent)"""
+        for keyword in keywords:
+            self.on_keyword_change(keyword_event(op, keyword, 'System'))
+    
     def check_token_keywords(self, token: Dict[str, Any]) -> str:
         """AI-Enhanced keyword matching with typo detection and fuzzy matching
         Enhanced with Simple Metaplex Integration for LetsBonk tokens
@@ -534,16 +657,20 @@ class AlchemyMonitoringServer:
             name = token.get('name', '')
             symbol = token.get('symbol', '')
             
+            # Grab the published snapshot once - a concurrent reload swaps in a new
+            # version but never changes this one mid-match
+            snapshot = self.keyword_snapshot
+            automaton = snapshot.automaton
+            
             logger.info(f"🔍 KEYWORD MATCH DEBUG: Testing token '{name}' (symbol: '{symbol}')")
-            logger.info(f"🔍 Available keywords count: {len(self.keywords) if hasattr(self, 'keywords') else 'NO KEYWORDS'}")
+            logger.info(f"🔍 Available keywords count: {len(snapshot)} (snapshot v{snapshot.version})")
             
-            if not hasattr(self, 'keywords') or not self.keywords:
+            if not snapshot:
                 logger.error(f"❌ NO KEYWORDS LOADED - Cannot perform keyword matching!")
                 return ""
             
             # Log first few keywords for debugging
-            sample_keywords = list(self.keywords)[:5] if self.keywords else []
-            logger.info(f"🔍 Sample keywords: {sample_keywords}")
+            logger.info(f"🔍 Sample keywords: {automaton.keywords[:5]}")
             
             # Metaplex processing removed - system now uses DexScreener API exclusively for token metadata
             symbol = token.get('symbol', '')
@@ -575,7 +702,7 @@ class AlchemyMonitoringServer:
                 return ""  # Skip tokens that don't meet freshness criteria
             
             # Skip empty keywords
-            if len(self.keywords) == 0:
+            if not automaton:
                 return ""
             
             # Quality filters to reduce spam
@@ -583,17 +710,16 @@ class AlchemyMonitoringServer:
                 return ""
             
             # SIMPLE KEYWORD MATCHING (AI smart matching disabled per user request)
-            # Check both name and symbol for direct keyword matches
-            name_lower = name.lower() if name else ""
-            symbol_lower = symbol.lower() if symbol else ""
-            
-            for keyword in self.keywords:
-                keyword_lower = keyword.lower()
-                # Check for exact match or substring match
-                if (keyword_lower == name_lower or keyword_lower == symbol_lower or 
-                    keyword_lower in name_lower or keyword_lower in symbol_lower):
-                    logger.info(f"🎯 BASIC KEYWORD MATCH: '{name}' (symbol: {symbol}) → keyword '{keyword}'")
-                    return keyword
+            # One automaton pass over name and symbol finds every exact/substring match
+            matched_keywords = automaton.match_all(name or "", symbol or "")
+            if matched_keywords:
+                keyword = matched_keywords[0]
+                token['keyword_snapshot_version'] = snapshot.version
+                logger.info(f"🎯 BASIC KEYWORD MATCH: '{name}' (symbol: {symbol}) → keyword '{keyword}' "
+                            f"(snapshot v{snapshot.version})")
+                if len(matched_keywords) > 1:
+                    logger.info(f"   🔍 Also matched: {matched_keywords[1:6]}")
+                return keyword
             
             # No keyword match found
             return ""
@@ -615,8 +741,7 @@ class AlchemyMonitoringServer:
                 from link_sniper import LinkSniper
                 db_url = os.getenv('DATABASE_URL')
                 if db_url:
-                    import psycopg2
-                    conn = psycopg2.connect(db_url)
+                    conn = get_pooled_connection(db_url)
                     cursor = conn.cursor()
                     cursor.execute("SELECT DISTINCT target_link FROM link_sniper_configs WHERE enabled = true")
                     results = cursor.fetchall()
@@ -670,20 +795,15 @@ class AlchemyMonitoringServer:
                     logger.debug(f"🔍 Extracting social URLs for {token['name']} using enhanced scraper")
                     
                     # Run async extraction in thread-safe way
-                    import asyncio
                     import threading
                     
                     def run_extraction():
                         try:
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            try:
-                                result = loop.run_until_complete(
-                                    self.social_extractor.get_social_links(token['address'])
-                                )
-                                return result.get('social_links', []) if result else []
-                            finally:
-                                loop.close()
+                            result = self.event_loop_service.run(
+                                self.social_extractor.get_social_links(token['address']),
+                                timeout=30
+                            )
+                            return result.get('social_links', []) if result else []
                         except Exception as e:
                             logger.debug(f"Enhanced extraction failed: {e}")
                             return []
@@ -832,6 +952,15 @@ class AlchemyMonitoringServer:
             logger.debug(f"LetsBonk detection error: {e}")
             return False
 
+    def get_token_age(self, token: Dict[str, Any]) -> Optional[float]:
+        """Seconds since creation from created_timestamp (ms or s), None if unknown"""
+        created_timestamp = token.get('created_timestamp')
+        if not created_timestamp or created_timestamp <= 0:
+            return None
+        if created_timestamp > 1e12:
+            created_timestamp = created_timestamp / 1000.0
+        return max(time.time() - created_timestamp, 0.0)
+    
     def is_ultra_fresh_token(self, token: Dict[str, Any]) -> bool:
         """Check if token is ultra-fresh using multiple validation sources
         
@@ -839,7 +968,18 @@ class AlchemyMonitoringServer:
         - Primary: Blockchain timestamp validation
         - Secondary: DexScreener API cross-validation
         - Reasonable 2-minute age limit for effective monitoring
+        
+        Tokens we detected carry the creation transaction's blockTime
+        (timestamp_provenance); only the rest pay for an RPC lookup, and
+        consensus runs only if that fails too. Each step must fit the token's
+        latency budget - consensus that doesn't fit runs in the background
+        behind a provisional pass.
         """
+        budget = token_budget(token, self.token_deadline_seconds)
+        if has_provenance(token):
+            self.timestamp_resolver.ensure(token)
+        else:
+            self.freshness_validator.run('chain_timestamp', budget, self.timestamp_resolver.ensure, token)
         current_time = time.time()
         created_timestamp = token.get('created_timestamp')
         token_name = token.get('name', 'unknown')
@@ -899,31 +1039,42 @@ class AlchemyMonitoringServer:
             logger.error(f"   🚫 This token is too old to be considered 'new' for real-time monitoring")
             return False
         
-        # TEMPORARILY DISABLED: DexScreener validation to enable social media extraction testing
-        # Re-enable this after social media extraction is confirmed working
-        if False and self.dexscreener_validator and token_address.endswith('bonk'):
+        # DexScreener cross-validation (disabled via dexscreener_freshness_enabled for now)
+        if self.dexscreener_freshness_enabled and self.dexscreener_validator and token_address.endswith('bonk'):
             try:
-                is_dex_fresh = self.dexscreener_validator.is_token_genuinely_fresh(token_address, max_age_seconds=180)
-                if not is_dex_fresh:
+                ran, is_dex_fresh = self.freshness_validator.run(
+                    'dexscreener_freshness', budget,
+                    self.dexscreener_validator.is_token_genuinely_fresh, token_address, max_age_seconds=180
+                )
+                if ran and not is_dex_fresh:
                     logger.warning(f"🚫 DEXSCREENER VALIDATION FAILED: {token_name} failed DexScreener freshness check")
                     return False
-                else:
+                elif ran:
                     logger.info(f"✅ DEXSCREENER VALIDATION PASSED: {token_name} confirmed fresh")
             except Exception as e:
                 logger.debug(f"⚠️ DexScreener validation error for {token_name}: {e}")
                 # Continue with blockchain validation only
         
-        # ULTIMATE: Multi-source consensus validation for maximum accuracy
-        if self.multi_source_validator and token_address.endswith('bonk'):
+        # ULTIMATE: Multi-source consensus validation - only when the chain gave us nothing
+        if self.multi_source_validator and token_address.endswith('bonk') and not has_provenance(token):
+            # CRITICAL FIX: Use proper async context manager for session
+            async def run_consensus_validation():
+                async with self.multi_source_validator:
+                    return await self.multi_source_validator.validate_token_timestamp(token_address)
+            
             try:
-                import asyncio
-                
-                # CRITICAL FIX: Use proper async context manager for session
-                async def run_consensus_validation():
-                    async with self.multi_source_validator:
-                        return await self.multi_source_validator.validate_token_timestamp(token_address)
-                
-                consensus_result = asyncio.run(run_consensus_validation())
+                if not self.freshness_validator.fits('consensus', budget):
+                    # Decide provisionally on the timestamp we have; a late "too old" verdict still blocks the token
+                    future = self.freshness_validator.defer(
+                        'consensus', lambda: self.event_loop_service.submit(run_consensus_validation())
+                    )
+                    future.add_done_callback(lambda done: self._review_deferred_consensus(token, done))
+                    consensus_result = None
+                else:
+                    _, consensus_result = self.freshness_validator.run(
+                        'consensus', budget,
+                        lambda: self.event_loop_service.run(run_consensus_validation(), timeout=max(budget.remaining(), 0.1))
+                    )
                 
                 if consensus_result and consensus_result.get('valid_sources', 0) >= 1:  # Allow single source
                     consensus_age = consensus_result.get('age_seconds', float('inf'))
@@ -948,7 +1099,7 @@ class AlchemyMonitoringServer:
                         else:
                             logger.warning(f"🚫 SMART CONSENSUS FAILED: {token_name} (age: {consensus_age:.1f}s, confidence: {confidence:.2f})")
                             return False
-                else:
+                elif consensus_result is not None:
                     logger.debug(f"⚠️ No valid consensus sources for {token_name}")
             except Exception as e:
                 logger.debug(f"⚠️ Multi-source validation error for {token_name}: {e}")
@@ -980,8 +1131,30 @@ class AlchemyMonitoringServer:
                 status='pre_migration'
             )
         
+        self.freshness_validator.note_deadline(budget)
         return is_fresh
     
+    def _review_deferred_consensus(self, token: Dict[str, Any], future):
+        """Act on a consensus result that finished after a provisional freshness pass"""
+        try:
+            consensus_result = future.result()
+        except Exception as e:
+            logger.debug(f"⚠️ Deferred consensus failed for {token.get('name', 'unknown')}: {e}")
+            return
+        if not consensus_result or consensus_result.get('valid_sources', 0) < 1:
+            return
+        
+        consensus_age = consensus_result.get('age_seconds', float('inf'))
+        confidence = consensus_result.get('confidence', 0)
+        if consensus_age <= 300 and confidence > 0.3:
+            return
+        if validate_token_age_smart(token.get('name', 'unknown'), consensus_age, confidence, consensus_result.get('valid_sources', 0)):
+            return
+        
+        self.freshness_validator.overturned('consensus')
+        self.permanently_rejected_tokens.add(token['address'])
+        logger.warning(f"🚫 PROVISIONAL PASS OVERTURNED: {token.get('name', 'unknown')} (consensus age: {consensus_age:.1f}s, confidence: {confidence:.2f}) - blocked from further processing")
+    
     def init_persistent_notification_tracking(self):
         """Initialize database table for persistent notification tracking across restarts"""
         try:
@@ -1018,7 +1191,7 @@ class AlchemyMonitoringServer:
             cursor.close()
             conn.close()
             
-            # Load recently notified tokens into memory cache (last 24 hours)
+            # Load recently notified tokens into memory filter (last 7 days)
             self.load_recent_notifications()
             
             # Schedule periodic cleanup of old notifications (every 6 hours)
@@ -1041,28 +1214,10 @@ class AlchemyMonitoringServer:
             logger.error(f"❌ Failed to initialize persistent notification tracking: {e}")
     
     def load_recent_notifications(self):
-        """Load recently notified tokens from database into memory cache"""
+        """Warm the in-memory notification filter from the database"""
         try:
-            conn = self.get_db_connection()
-            if not conn:
-                return
-                
-            cursor = conn.cursor()
-            
-            # Load tokens notified in last 24 hours to prevent immediate re-notifications
-            cursor.execute("""
-                SELECT token_address FROM notified_tokens 
-                WHERE notified_at > CURRENT_TIMESTAMP - INTERVAL '24 hours'
-            """)
-            
-            recent_tokens = cursor.fetchall()
-            for (token_address,) in recent_tokens:
-                self.notified_token_addresses.add(token_address)
-            
-            cursor.close()
-            conn.close()
-            
-            logger.info(f"📋 Loaded {len(recent_tokens)} recently notified tokens from database")
+            loaded = self.notification_dedup.warm()
+            logger.info(f"📋 Loaded {loaded} recently notified tokens from database")
             
         except Exception as e:
             logger.error(f"❌ Failed to load recent notifications: {e}")
@@ -1150,52 +1305,21 @@ class AlchemyMonitoringServer:
             logger.error(f"Error searching detected tokens: {e}")
             return []
     
-    def record_notification_in_db(self, token_address, token_name, notification_type='keyword_match'):
-        """Record token notification in database for persistent deduplication"""
+    def record_notification_in_db(self, token_address, token_name, notification_type='keyword_match',
+                                  keyword_snapshot_version=None):
+        """Record token notification (and the keyword snapshot it matched) for persistent deduplication"""
         try:
-            conn = self.get_db_connection()
-            if not conn:
-                return False
-                
-            cursor = conn.cursor()
-            
-            # Insert notification record (ignore if already exists)
-            cursor.execute("""
-                INSERT INTO notified_tokens (token_address, token_name, notification_type)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (token_address) DO NOTHING
-            """, (token_address, token_name, notification_type))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            return True
+            return self.notification_dedup.record(token_address, token_name, notification_type,
+                                                  keyword_snapshot_version)
             
         except Exception as e:
             logger.error(f"❌ Failed to record notification in database: {e}")
             return False
     
     def is_token_already_notified(self, token_address):
-        """Check if token was already notified (database check for persistence across restarts)"""
+        """Check if token was already notified (in-memory filter warmed from the database)"""
         try:
-            conn = self.get_db_connection()
-            if not conn:
-                return False
-                
-            cursor = conn.cursor()
-            
-            # Check if notification exists for this token
-            cursor.execute("""
-                SELECT COUNT(*) FROM notified_tokens 
-                WHERE token_address = %s
-            """, (token_address,))
-            
-            count = cursor.fetchone()[0]
-            cursor.close()
-            conn.close()
-            
-            return count > 0
+            return self.notification_dedup.is_notified(token_address)
             
         except Exception as e:
             logger.debug(f"❌ Database notification check failed: {e}")
@@ -1223,6 +1347,8 @@ class AlchemyMonitoringServer:
             
             if deleted_count > 0:
                 logger.info(f"🧹 Cleaned up {deleted_count} old notification records")
+                # Bloom filters can't forget - rebuild so deleted rows stop costing DB confirmations
+                self.notification_dedup.rebuild()
                 
         except Exception as e:
             logger.error(f"❌ Failed to cleanup old notifications: {e}")
@@ -1230,7 +1356,6 @@ class AlchemyMonitoringServer:
     def _load_keywords_direct_database(self) -> List[str]:
         """Load keywords directly from PostgreSQL database - BYPASSES ConfigManager issues"""
         try:
-            import psycopg2
             database_url = os.getenv('DATABASE_URL')
             
             if not database_url:
@@ -1238,7 +1363,7 @@ class AlchemyMonitoringServer:
                 return self._get_fallback_keywords_list()
             
             logger.info("🔗 DIRECT DATABASE: Connecting to PostgreSQL...")
-            conn = psycopg2.connect(database_url)
+            conn = get_pooled_connection(database_url)
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -1302,11 +1427,11 @@ class AlchemyMonitoringServer:
             self.cipher_suite = None
     
     def get_db_connection(self):
-        """Get database connection for wallet storage"""
+        """Get pooled database connection (close() returns it to the shared pool)"""
         try:
-            database_url = os.getenv('DATABASE_URL')
-            if database_url:
-                return psycopg2.connect(database_url)
+            pool = get_db_pool()
+            if pool:
+                return pool.getconn()
             else:
                 logger.warning("⚠️ No DATABASE_URL found for wallet persistence")
                 return None
@@ -1423,21 +1548,6 @@ class AlchemyMonitoringServer:
         except Exception as e:
             logger.error(f"❌ Failed to restore wallets from database: {e}")
 
-    def get_block_time(self, tx_signature):
-        """Get block time for a transaction signature using Solana RPC client"""
-        try:
-            tx = client.get_transaction(tx_signature, commitment="finalized").value
-            if tx and tx.block_time:
-                block_time = tx.block_time
-                logger.info(f"Transaction {tx_signature}: block_time={block_time}")
-                return block_time
-            else:
-                logger.warning(f"No block time found for transaction {tx_signature}")
-                return None
-        except Exception as e:
-            logger.error(f"Failed to fetch block time for {tx_signature}: {e}")
-            return None
-    
     def send_token_notification(self, token: Dict[str, Any], matched_keyword: str = ""):
         """Send Discord notification for matched token"""
         try:
@@ -1451,7 +1561,8 @@ class AlchemyMonitoringServer:
             # Get market data from DexScreener API
             if self.market_data_api:
                 try:
-                    market_data = self.market_data_api.get_market_data(token['address'])
+                    market_data = self.market_data_api.get_market_data(token['address'], token_age=self.get_token_age(token),
+                                                                       timeout=NOTIFICATION_MARKET_DATA_TIMEOUT)
                     if market_data:
                         logger.info(f"📈 Market data fetched: {token['name']} - ${market_data.get('market_cap', 0):,.0f} cap")
                     else:
@@ -1574,7 +1685,8 @@ class AlchemyMonitoringServer:
                 'age_display': age_display,
                 'market_data': market_data,
                 'url': f"https://letsbonk.fun/token/{token['address']}",
-                'created_timestamp': token.get('created_timestamp')
+                'created_timestamp': token.get('created_timestamp'),
+                'keyword_snapshot_version': token.get('keyword_snapshot_version')
             }
             
             # Send enhanced notification with matched keyword AND quick buy buttons
@@ -1663,7 +1775,8 @@ class AlchemyMonitoringServer:
             market_data = None
             if self.market_data_api:
                 try:
-                    market_data = self.market_data_api.get_market_data(token['address'])
+                    market_data = self.market_data_api.get_market_data(token['address'], token_age=self.get_token_age(token),
+                                                                       timeout=NOTIFICATION_MARKET_DATA_TIMEOUT)
                     if market_data:
                         logger.info(f"📈 INSTANT market data: {token['name']} - ${market_data.get('market_cap', 0):,.0f} cap")
                     else:
@@ -1679,7 +1792,8 @@ class AlchemyMonitoringServer:
                 'address': token['address'],
                 'age_display': age_display,
                 'market_data': market_data,
-                'url': f"https://letsbonk.fun/token/{token['address']}"
+                'url': f"https://letsbonk.fun/token/{token['address']}",
+                'keyword_snapshot_version': token.get('keyword_snapshot_version')
             }
             
             # Send notification with market data AND quick buy buttons
@@ -1748,7 +1862,8 @@ class AlchemyMonitoringServer:
             market_data = None
             if self.market_data_api:
                 try:
-                    market_data = self.market_data_api.get_market_data(token['address'])
+                    market_data = self.market_data_api.get_market_data(token['address'], token_age=self.get_token_age(token),
+                                                                       timeout=NOTIFICATION_MARKET_DATA_TIMEOUT)
                     if market_data:
                         logger.info(f"📈 Market data retrieved for {token['name']}: ${market_data.get('market_cap', 0):,.0f} cap")
                 except Exception as e:
@@ -1795,6 +1910,18 @@ class AlchemyMonitoringServer:
     
     def process_tokens(self, tokens: List[Dict[str, Any]]):
         """Process multiple tokens simultaneously for keyword matches and notifications"""
+        # Latency budgets start at ingestion so queueing time counts against them
+        for token in tokens:
+            token_budget(token, self.token_deadline_seconds)
+            if token.get('update_type') == 'name_resolution':
+                # A retry resolved the name: the token was seen unnamed, so let it be matched again
+                self.seen_token_addresses.discard(token['address'])
+        
+        if self.token_engine is not None:
+            accepted = self.token_engine.submit_batch(tokens, timeout=30)
+            logger.info(f"🧵 ASYNC PIPELINE: Queued {accepted}/{len(tokens)} tokens")
+            return
+        
         try:
             new_tokens = []
             logger.info(f"🔄 BATCH PROCESSING: {len(tokens)} tokens simultaneously")
@@ -1808,10 +1935,10 @@ class AlchemyMonitoringServer:
                 try:
                     # Initialize deduplication structures if they don't exist (fix for missing attributes)
                     if not hasattr(self, 'permanently_rejected_tokens'):
-                        self.permanently_rejected_tokens = set()
+                        self.permanently_rejected_tokens = CompactSeenSet(capacity=50000, ttl=86400, tail_capacity=200000,
+                                                                          name='rejected_tokens')
                     if not hasattr(self, 'seen_token_addresses'):
-                        from cachetools import TTLCache
-                        self.seen_token_addresses = TTLCache(maxsize=10000, ttl=300)  # 5-minute cache
+                        self.seen_token_addresses = CompactSeenSet(capacity=10000, ttl=300, name='seen_tokens')  # 5-minute cache
                     
                     # Check permanent blocklist first (prevents reprocessing old tokens when TTL cache expires)
                     if token['address'] in self.permanently_rejected_tokens:
@@ -1842,7 +1969,8 @@ class AlchemyMonitoringServer:
                                 logger.info(f"⚡ CRITICAL notification sent for keyword match: {token['name']} → {matched_keyword}")
                                 
                                 # Store in database for persistent tracking
-                                self.record_notification_in_db(token['address'], token['name'], 'keyword_match')
+                                self.record_notification_in_db(token['address'], token['name'], 'keyword_match',
+                                                               token.get('keyword_snapshot_version'))
                                 
                                 # Return early - we found what we were looking for
                                 return token
@@ -1872,7 +2000,7 @@ class AlchemyMonitoringServer:
                         return None
                     
                     # Mark as seen in TTL cache (auto-expires in 5 minutes)
-                    self.seen_token_addresses[token['address']] = True
+                    self.seen_token_addresses.add(token['address'])
                     
                     # Log the token being processed with full address (only for genuinely new tokens)
                     logger.info(f"   📍 NEW: {token['name']} - {token['address']}")
@@ -1885,13 +2013,12 @@ class AlchemyMonitoringServer:
                     # Try pure DexScreener 70% extractor (NO Jupiter/Solana RPC)
                     if self.dexscreener_extractor:
                         try:
-                            import asyncio
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            dexscreener_result = loop.run_until_complete(
-                                self.dexscreener_extractor.extract_from_dexscreener_with_retries(token['address'])
+                            # The extractor caps its whole retry sequence at MAX_EXTRACTION_SECONDS
+                            dexscreener_result = self.event_loop_service.run(
+                                self.dexscreener_extractor.extract_from_dexscreener_with_retries(
+                                    token['address'], token_age=self.get_token_age(token)),
+                                timeout=self.name_extraction_timeout
                             )
-                            loop.close()
                             
                             # Check if we got name from DexScreener 70% extractor
                             if dexscreener_result and dexscreener_result.success and dexscreener_result.name:
@@ -1926,12 +2053,10 @@ class AlchemyMonitoringServer:
                             
                             logger.info(f"🔄 ENHANCED RESOLVER: Attempting comprehensive resolution for {token['address']}")
                             
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            enhanced_result = loop.run_until_complete(
-                                resolve_token_name_with_retry(token['address'])
+                            enhanced_result = self.event_loop_service.run(
+                                resolve_token_name_with_retry(token['address']),
+                                timeout=self.name_extraction_timeout
                             )
-                            loop.close()
                             
                             if enhanced_result and enhanced_result.get('confidence', 0) > 0.7:
                                 accurate_name = enhanced_result['name']
@@ -1982,6 +2107,7 @@ class AlchemyMonitoringServer:
                         # Store matched keyword and which name matched
                         token['matched_keyword'] = matched_keyword
                         token['matched_name'] = name_to_check
+                        token['keyword_snapshot_version'] = temp_token.get('keyword_snapshot_version')
                         
                         # Use the accurate name for notifications if available
                         notification_name = dual_api_result.get('name', token['name']) if dual_api_result else token['name']
@@ -2017,7 +2143,8 @@ class AlchemyMonitoringServer:
                                 
                                 success = self.discord_notifier.send_enhanced_token_notification(notification_data, matched_keyword)
                                 if success:
-                                    self.notified_token_addresses.add(token['address'])
+                                    self.record_notification_in_db(token['address'], notification_name, 'keyword_match',
+                                                                   token.get('keyword_snapshot_version'))
                                     logger.info(f"⚡ RAILWAY DEDUP: Notification sent for '{notification_name}' → {matched_keyword}")
                                 else:
                                     logger.warning(f"⚠️ Discord notification failed for {notification_name}")
@@ -2107,7 +2234,8 @@ class AlchemyMonitoringServer:
                                         logger.info(f"⚡ PURE NAME SUCCESS: Discord notification sent for '{accurate_name}' in {instant_time:.3f}s (confidence: {match_confidence:.2f})")
                                         
                                         # Track the notification to prevent duplicates
-                                        self.notified_token_addresses.add(token['address'])
+                                        self.record_notification_in_db(token['address'], accurate_name, 'keyword_match',
+                                                                       token.get('keyword_snapshot_version'))
                                         self.notification_count += 1
                                         
                                     else:
@@ -2169,6 +2297,12 @@ class AlchemyMonitoringServer:
             
             logger.info(f"🔄 INITIAL BATCH PROCESSING: {len(tokens)} tokens with {initial_batch_size} workers")
             
+            def record_token_latency(token):
+                """Ingest-to-completion time for one token (rejected, skipped or handled)"""
+                elapsed = time_since_ingest(token)
+                if elapsed is not None:
+                    self.threaded_latency.record(elapsed)
+            
             with ThreadPoolExecutor(max_workers=initial_batch_size) as executor:
                 future_to_token = {executor.submit(process_single_token, token): token for token in tokens}
                 
@@ -2180,6 +2314,7 @@ class AlchemyMonitoringServer:
                         valid_tokens.append(result)
                         logger.debug(f"✅ INITIAL BATCH {processed}/{len(tokens)}: {result['name']} validated")
                     else:
+                        record_token_latency(future_to_token[future])
                         logger.debug(f"⏭️ INITIAL BATCH {processed}/{len(tokens)}: Token rejected")
             
             new_tokens = valid_tokens
@@ -2201,6 +2336,7 @@ class AlchemyMonitoringServer:
                 # Skip tokens that already received instant notifications
                 if token.get('instant_notification_sent', False):
                     logger.info(f"⏭️ SKIPPING: {token['name']} already received instant notification")
+                    record_token_latency(token)
                     continue
                 
                 # Process tokens with keyword matches, URL matches, or link matches
@@ -2235,18 +2371,9 @@ class AlchemyMonitoringServer:
                                     for opportunity in snipe_opportunities:
                                         # Execute snipe in background using thread-safe approach
                                         try:
-                                            # Try to get the current event loop or create a new one
-                                            try:
-                                                loop = asyncio.get_event_loop()
-                                                if loop.is_closed():
-                                                    raise RuntimeError("Event loop is closed")
-                                            except RuntimeError:
-                                                # No event loop running, create a new one for this thread
-                                                loop = asyncio.new_event_loop()
-                                                asyncio.set_event_loop(loop)
-                                            
-                                            # Execute snipe using run_coroutine_threadsafe for thread safety
-                                            future = asyncio.run_coroutine_threadsafe(
+                                            # Execute snipe on the shared loop - a loop created
+                                            # here would never run the scheduled coroutine
+                                            future = self.event_loop_service.submit(
                                                 self.auto_sniper.execute_snipe(
                                                     {
                                                         'name': token['name'],
@@ -2254,8 +2381,7 @@ class AlchemyMonitoringServer:
                                                         'symbol': token['symbol']
                                                     },
                                                     opportunity
-                                                ),
-                                                loop
+                                                )
                                             )
                                             logger.info(f"🎯 SNIPER ACTIVATED: {token['name']} for user {opportunity['user_id']}")
                                             
@@ -2415,7 +2541,8 @@ class AlchemyMonitoringServer:
                             
                             # CRITICAL: Store in database for persistent deduplication across system restarts
                             notification_type = 'keyword_match' if matched_keyword else 'url_match'
-                            db_success = self.record_notification_in_db(token['address'], token['name'], notification_type)
+                            db_success = self.record_notification_in_db(token['address'], token['name'], notification_type,
+                                                                        token.get('keyword_snapshot_version'))
                             if db_success:
                                 logger.info(f"💾 PERSISTENT TRACKING: {token['name']} recorded in database to prevent duplicate notifications")
                             else:
@@ -2430,7 +2557,8 @@ class AlchemyMonitoringServer:
                                 try:
                                     time.sleep(0.5)  # Small delay to let APIs catch up
                                     if self.market_data_api:
-                                        market_data = self.market_data_api.get_market_data(token['address'])
+                                        market_data = self.market_data_api.get_market_data(token['address'], token_age=self.get_token_age(token),
+                                                                                           timeout=NOTIFICATION_MARKET_DATA_TIMEOUT)
                                         if market_data and market_data.get('market_cap'):
                                             logger.info(f"📈 Market cap update: {token['name']} - ${market_data['market_cap']:,.0f}")
                                 except:
@@ -2444,6 +2572,7 @@ class AlchemyMonitoringServer:
                 else:
                     # Log keyword mismatches for debugging
                     logger.debug(f"❌ No keyword match: {token['name']} ({token['symbol']}) - checked {len(self.keywords)} keywords")
+                record_token_latency(token)
             
             self.monitoring_stats['total_tokens_processed'] += len(new_tokens)
             
@@ -2458,6 +2587,121 @@ class AlchemyMonitoringServer:
         except Exception as e:
             logger.error(f"Token processing error: {e}")
     
+    def build_token_engine(self) -> TokenProcessingEngine:
+        """Configure the shared engine: detect → dedup → keyword → enrich → match → notify → persist"""
+        sources = []
+        if self.new_token_monitor and not (self.ingestion_mode == 'websocket' and self.spl_websocket_monitor):
+            sources.append(PollingSource('alchemy', self.new_token_monitor.poll_new_tokens, interval=2))
+        
+        if not hasattr(self, 'permanently_rejected_tokens'):
+            self.permanently_rejected_tokens = CompactSeenSet(capacity=50000, ttl=86400, tail_capacity=200000,
+                                                              name='rejected_tokens')
+        if not hasattr(self, 'seen_token_addresses'):
+            self.seen_token_addresses = CompactSeenSet(capacity=10000, ttl=300, name='seen_tokens')  # 5-minute cache
+        
+        return TokenProcessingEngine(
+            'alchemy-pipeline',
+            # Matching happens in the keyword/enrich stages; unmatched tokens never get this far
+            matcher=lambda token: [token['matched_keyword']] if token.get('matched_keyword') else [],
+            sources=sources,
+            enrichers=[
+                PipelineStage('dedup', self._pipeline_dedup, concurrency=4, queue_size=200, blocking=True),
+                PipelineStage('keyword', self._pipeline_keyword, concurrency=2, queue_size=200),
+                PipelineStage('enrich', self._pipeline_enrich, concurrency=16, queue_size=100),
+            ],
+            sinks=[
+                PipelineStage('notify', self._pipeline_notify, concurrency=4, queue_size=100, blocking=True),
+                PipelineStage('persist', self._pipeline_persist, concurrency=2, queue_size=200, blocking=True),
+            ],
+            drop_unmatched=True,
+            admit=self._pipeline_admit,
+            ingest=lambda token: token_budget(token, self.token_deadline_seconds),
+            seen=self.seen_token_addresses,
+            loop_service=self.event_loop_service,
+        )
+    
+    def _pipeline_admit(self, token: Dict[str, Any]) -> bool:
+        """Drop blocklisted tokens; the engine's detect stage handles the seen cache"""
+        if token['address'] in self.permanently_rejected_tokens:
+            return False
+        self.monitoring_stats['total_tokens_processed'] += 1
+        return True
+    
+    def _pipeline_dedup(self, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.is_token_already_notified(token['address']):
+            logger.debug(f"🚫 PIPELINE DEDUP: {token.get('name', 'unknown')} already notified")
+            return None
+        return token
+    
+    def _pipeline_keyword(self, token: Dict[str, Any]) -> Dict[str, Any]:
+        """Match the detected name; unmatched tokens still go to enrich for the accurate name"""
+        matched_keyword = self.check_token_keywords(token)
+        if matched_keyword:
+            logger.info(f"🎯 PIPELINE MATCH: '{token['name']}' → keyword '{matched_keyword}'")
+            token['matched_keyword'] = matched_keyword
+            token['matched_name'] = token['name']
+        return token
+    
+    async def _pipeline_enrich(self, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Freshness check plus DexScreener name extraction for tokens that haven't matched yet"""
+        # Keyword matches bypass age validation, same as the threaded path
+        if token.get('matched_keyword'):
+            return token
+        
+        is_fresh = await self.token_engine.run_blocking(self.is_ultra_fresh_token, token)
+        if not is_fresh:
+            logger.info(f"⏰ SKIPPING OLD TOKEN: {token['name']} - failed freshness check")
+            self.permanently_rejected_tokens.add(token['address'])
+            return None
+        
+        if not self.dexscreener_extractor:
+            return None
+        
+        # Already on the shared loop - await directly so the pooled session is reused
+        result = await self.dexscreener_extractor.extract_from_dexscreener_with_retries(
+            token['address'], token_age=self.get_token_age(token))
+        if not (result and result.success and result.name) or result.name == token['name']:
+            return None
+        
+        enriched = dict(token, accurate_name=result.name, extraction_confidence=result.confidence,
+                        extraction_source='dexscreener_70_percent')
+        candidate = dict(token, name=result.name)
+        matched_keyword = self.check_token_keywords(candidate)
+        if not matched_keyword:
+            logger.debug(f"❌ No keyword match: '{token['name']}' / '{result.name}'")
+            return None
+        
+        logger.info(f"🎯 PIPELINE MATCH: '{result.name}' → keyword '{matched_keyword}' (after enrichment)")
+        enriched['matched_keyword'] = matched_keyword
+        enriched['matched_name'] = result.name
+        enriched['keyword_snapshot_version'] = candidate.get('keyword_snapshot_version')
+        return enriched
+    
+    def _pipeline_notify(self, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        name = token.get('accurate_name') or token['name']
+        # Atomic check-and-mark so concurrent notify workers (or peer workers) can't double send
+        if not self.notification_dedup.claim(token['address'], name, 'keyword_match',
+                                             token.get('keyword_snapshot_version')):
+            logger.info(f"🚫 KEYWORD MATCH DUPLICATE: {name} → {token['matched_keyword']} (already notified)")
+            return None
+        
+        self.send_instant_notification(dict(token, name=name), token['matched_keyword'])
+        self.monitoring_stats['notifications_sent'] += 1
+        logger.info(f"⚡ PIPELINE NOTIFY: {name} → {token['matched_keyword']}")
+        return token
+    
+    def _pipeline_persist(self, token: Dict[str, Any]) -> Dict[str, Any]:
+        self.store_detected_token_in_db(
+            address=token['address'],
+            name=token.get('accurate_name') or token['name'],
+            symbol=token.get('symbol', ''),
+            platform='letsbonk',
+            status='pre_migration',
+            matched_keywords=[token['matched_keyword']],
+            social_links=token.get('social_links', [])
+        )
+        return token
+    
     def monitoring_loop(self):
         """Start real-time WebSocket monitoring for NEW token creations only"""
         logger.info("🚀 Starting REAL-TIME WebSocket monitoring")
@@ -2513,6 +2757,32 @@ class AlchemyMonitoringServer:
         logger.info(f"   🎯 Tokens processed: {self.monitoring_stats['total_tokens_processed']}")
         logger.info(f"   📢 Notifications sent: {self.monitoring_stats['notifications_sent']}")
         logger.info(f"   🔍 Keywords: {len(self.keywords)}")
+        dedup_stats = self.notification_dedup.get_stats()
+        logger.info(f"   🧮 Dedup: {dedup_stats['lru_entries']} tracked, {dedup_stats['bloom_negatives']} filter misses, {dedup_stats['db_confirmations']} DB confirmations, {dedup_stats['pending_writes']} pending writes")
+        provenance_stats = self.timestamp_resolver.get_stats()
+        logger.info(f"   🕒 Creation time: {provenance_stats['from_detection']} from detection tx, {provenance_stats['rpc_resolved']}/{provenance_stats['rpc_lookups']} via RPC lookup")
+        budget_stats = self.freshness_validator.get_stats()
+        step_summary = ", ".join(
+            f"{name} {step['runs']} run/{step['skipped']} skipped/{step['deferred']} deferred"
+            for name, step in budget_stats.items() if name != 'tokens_past_deadline'
+        )
+        logger.info(f"   ⏳ Freshness budget: {step_summary}; {budget_stats['tokens_past_deadline']} tokens past deadline")
+        clock_stats = self.slot_clock.get_stats()
+        logger.info(f"   ⏱️ Slot clock: {clock_stats['entries']} slots, {clock_stats['local_answers']} local answers (avg ±{clock_stats['avg_error_served']:.2f}s, max ±{clock_stats['max_error_served']:.2f}s), {clock_stats['rpc_fetched']} fetched in {clock_stats['rpc_batches']} batches")
+        market_stats = get_market_data_service().get_stats()
+        logger.info(f"   📈 Market data: {market_stats['hit_rate']:.0%} hit rate ({market_stats['hits']} hits, {market_stats['negative_hits']} too-new hits, {market_stats['collapsed']} collapsed), {market_stats['upstream_calls']} upstream calls, {market_stats['entries']} cached")
+        batch_stats = get_dexscreener_batch().get_stats()
+        logger.info(f"   📦 DexScreener batching: {batch_stats['lookups']} lookups in {batch_stats['requests']} requests (avg {batch_stats['avg_batch_size']:.1f} mints/request), {batch_stats['request_errors']} errors")
+        loop_stats = self.event_loop_service.get_stats()
+        logger.info(f"   🔁 Event loop: {loop_stats['completed']} completed, {loop_stats['failed']} failed, {loop_stats['timeouts']} timeouts, {loop_stats['pending']} pending")
+        if self.spl_websocket_monitor:
+            ws_stats = self.spl_websocket_monitor.get_stats()
+            logger.info(f"   📡 WebSocket: {'connected' if ws_stats['connected'] else 'DISCONNECTED'}, {ws_stats['creations']} creations, {ws_stats['tokens_emitted']} tokens, {ws_stats['reconnects']} reconnects, p95 {ws_stats['detection_latency']['p95_ms']:.0f}ms to callback")
+        if self.token_engine is not None:
+            self.token_engine.log_metrics()
+        else:
+            threaded = self.threaded_latency.snapshot()
+            logger.info(f"   🧵 Threaded: {threaded['count']} tokens, p50 {threaded['p50_ms']:.0f}ms, p95 {threaded['p95_ms']:.0f}ms")
         logger.info(f"   💰 API Cost: $0 (Alchemy FREE tier)")
         
         # Show recent successful extractions to make them more visible
@@ -2530,10 +2800,36 @@ class AlchemyMonitoringServer:
     
 
     
+    def register_memory_caches(self):
+        """Hand the in-process caches to the memory governor
+
+        Seen sets are fixed-memory and only measured; the dedup LRU (backed by
+        its Bloom filter and the database) and the market-data cache can be
+        trimmed oldest-first, market data first since it is cheapest to refetch.
+        """
+        governor = self.memory_governor
+        for seen in (self.seen_token_addresses, self.processed_signatures,
+                     self.websocket_signatures, self.permanently_rejected_tokens):
+            governor.register(seen.name, seen)
+        governor.register('notification_dedup', self.notification_dedup, value=4.0)
+        governor.register('market_data', get_market_data_service(), value=1.0)
+    
     def start_monitoring(self):
         """Start all monitoring threads"""
         self.running = True
         
+        # Processing engine must be up before the first detection callback arrives
+        if self.pipeline_mode == 'async' and self.token_engine is None:
+            try:
+                engine = self.build_token_engine()
+                self.token_engine = engine
+                engine.start()
+                logger.info("🧵 PIPELINE MODE: async (token processing engine)")
+            except Exception as e:
+                logger.error(f"❌ Failed to start async pipeline, falling back to threaded mode: {e}")
+        else:
+            logger.info("🧵 PIPELINE MODE: threaded")
+        
         # Start Token Recovery System
         if self.recovery_system:
             try:
@@ -2542,8 +2838,10 @@ class AlchemyMonitoringServer:
             except Exception as e:
                 logger.error(f"❌ Failed to start Token Recovery System: {e}")
         
-        # Start new token monitoring (PRIMARY TOKEN SOURCE)
-        if self.new_token_monitor:
+        # Start new token monitoring (PRIMARY TOKEN SOURCE unless WebSocket-only ingestion)
+        if self.token_engine is not None and self.token_engine.sources:
+            logger.info("🎯 NEW TOKEN MONITOR polling runs as a token processing engine source")
+        elif self.new_token_monitor and not (self.ingestion_mode == 'websocket' and self.spl_websocket_monitor):
             try:
                 new_token_thread = threading.Thread(target=self.new_token_monitor.start_monitoring, daemon=True)
                 new_token_thread.start()
@@ -2556,15 +2854,14 @@ class AlchemyMonitoringServer:
         monitoring_thread.start()
         logger.info("🔍 Token monitoring thread started")
         
-        # Start SPL WebSocket monitoring if available (DISABLED - module not available in deployment)
-        # if self.spl_websocket_monitor:
-        #     try:
-        #         self.spl_websocket_monitor.start_monitoring()
-        #         logger.info("🚀 SPL WebSocket monitor started - ultra-fast token detection")
-        #     except Exception as e:
-        #         logger.error(f"❌ Failed to start SPL WebSocket monitor: {e}")
-        # else:
-        logger.warning("⚠️ SPL WebSocket monitor not available - using primary monitoring only")
+        # Start SPL WebSocket monitoring if enabled (TOKEN_INGESTION_MODE=websocket|both)
+        if self.spl_websocket_monitor:
+            try:
+                self.spl_websocket_monitor.start_monitoring()
+            except Exception as e:
+                logger.error(f"❌ Failed to start SPL WebSocket monitor: {e}")
+        else:
+            logger.warning("⚠️ SPL WebSocket monitor not enabled - using primary monitoring only")
         
         # Market cap alert monitoring disabled (outdated feature)
         
@@ -2597,6 +2894,9 @@ class AlchemyMonitoringServer:
         
         # Start Discord bot
         
+        # Startup objects are long-lived: freeze them out of GC scans and raise the gen0 threshold
+        self.memory_governor.tune_gc()
+        
         return monitoring_thread
     
     def setup_discord_bot(self):
@@ -2676,7 +2976,7 @@ class AlchemyMonitoringServer:
                     duplicate_urls = []
                     
                     # Get existing data once for efficiency  
-                    existing_keywords = monitor_server.keywords
+                    existing_keywords = list(monitor_server.keywords)
                     existing_configs = []
                     if monitor_server.link_sniper:
                         existing_configs = monitor_server.link_sniper.get_user_link_configs(interaction.user.id)
@@ -2736,9 +3036,9 @@ class AlchemyMonitoringServer:
                             else:
                                 failed_keywords.append(item)
                     
-                    # Refresh keywords if any were added
+                    # Apply added keywords in place (other processes get them via NOTIFY)
                     if added_keywords:
-                        monitor_server.keywords = monitor_server._load_keywords_direct_database()
+                        monitor_server.apply_local_keyword_changes(OP_ADD, added_keywords)
                     
                     # Record action for undo functionality
                     if added_keywords or added_urls:
@@ -2937,15 +3237,9 @@ class AlchemyMonitoringServer:
                         # Handle keyword removal
                         success = monitor_server.config_manager.remove_keyword(keyword_or_url)
                         if success:
-                            # Update server keywords list by reloading from database/file
-                            try:
-                                updated_keywords = monitor_server.config_manager.list_keywords()
-                                monitor_server.keywords = updated_keywords
-                                logger.info(f"✅ Updated server keywords list: {len(updated_keywords)} keywords remaining")
-                            except Exception as e:
-                                logger.error(f"Failed to reload keywords after removal: {e}")
-                                # Fallback: remove from current list
-                                monitor_server.keywords = [k for k in monitor_server.keywords if k.lower() != keyword_or_url.lower()]
+                            # Update server keywords list in place (other processes get it via NOTIFY)
+                            monitor_server.apply_local_keyword_changes(OP_REMOVE, [keyword_or_url])
+                            logger.info(f"✅ Updated server keywords list: {len(monitor_server.keywords)} keywords remaining")
                             
                             # Record keyword removal in attribution tracking
                             if monitor_server.keyword_attribution:
@@ -2961,8 +3255,6 @@ class AlchemyMonitoringServer:
                                 action_type='remove_keywords',
                                 action_data={'removed_keywords': [keyword_or_url]}
                             )
-                            # Refresh keywords in monitor
-                            monitor_server.keywords = monitor_server._load_keywords_direct_database()
                             await interaction.followup.send(f"✅ **Keyword Removed**\n\n🔍 **Removed:** '{keyword_or_url}'\n\n↩️ **Use /undo to reverse this removal if needed**", ephemeral=True)
                         else:
                             await interaction.followup.send(f"❌ Keyword not found: '{keyword_or_url}'", ephemeral=True)
@@ -3027,9 +3319,9 @@ class AlchemyMonitoringServer:
                     elif urls_to_remove:
                         failed_urls.extend(urls_to_remove)
                     
-                    # Refresh keywords if any were removed
+                    # Apply removals in place (other processes get them via NOTIFY)
                     if removed_keywords:
-                        monitor_server.keywords = monitor_server._load_keywords_direct_database()
+                        monitor_server.apply_local_keyword_changes(OP_REMOVE, removed_keywords)
                     
                     # Build response message
                     response_parts = []
@@ -4177,7 +4469,6 @@ You don't have a wallet connected to disconnect.
                     
                     # Get recent tokens from database
                     try:
-                        import psycopg2
                         from datetime import datetime, timedelta
                         
                         db_url = os.getenv('DATABASE_URL')
@@ -4185,7 +4476,7 @@ You don't have a wallet connected to disconnect.
                             await interaction.edit_original_response(content="❌ **Database Error**\n\nDatabase connection not available.")
                             return
                         
-                        conn = psycopg2.connect(db_url)
+                        conn = get_pooled_connection(db_url)
                         cursor = conn.cursor()
                         
                         # Calculate time range
@@ -4401,6 +4692,20 @@ if __name__ == "__main__":
             return jsonify({
                 'status': 'healthy',
                 'message': 'Token monitoring server is running',
+                'db_pool': get_pool_metrics(),
+                'event_loop': get_background_loop().get_stats(),
+                'slot_clock': get_slot_clock().get_stats(),
+                'freshness_budget': monitor.freshness_validator.get_stats(),
+                'market_data_cache': get_market_data_service().get_stats(),
+                'dexscreener_batch': get_dexscreener_batch().get_stats(),
+                'name_retry_scheduler': get_name_retry_scheduler().get_stats(),
+                'keyword_events': get_keyword_listener().get_stats(),
+                'keyword_snapshot': monitor.keyword_snapshots.get_stats(),
+                'seen_sets': {seen.name: seen.get_stats() for seen in (monitor.seen_token_addresses,
+                                                                       monitor.permanently_rejected_tokens)},
+                'memory': monitor.memory_governor.get_stats(),
+                'pipeline_mode': monitor.pipeline_mode,
+                'pipeline': monitor.token_engine.get_metrics() if monitor.token_engine else {'threaded': monitor.threaded_latency.snapshot()},
                 'timestamp': datetime.now(timezone.utc).isoformat()
             })
         
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Async Token Pipeline - staged asyncio queues for token ingestion
+detect → dedup → keyword match → enrich → notify → persist, each stage with its
+own bounded queue, fixed worker count and latency histograms. Runs on the
+shared background event loop so producers on other threads only block when
+the first queue is full (back-pressure).
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from background_event_loop import BackgroundEventLoop, get_background_loop
+
+logger = logging.getLogger(__name__)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds) with percentile estimates"""
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        elapsed_ms = seconds * 1000
+        index = len(self.BUCKETS_MS)
+        for position, bound in enumerate(self.BUCKETS_MS):
+            if elapsed_ms <= bound:
+                index = position
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bucket bound containing the given fraction of samples"""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+            max_ms = self.max_ms
+        if not total:
+            return 0.0
+        target = fraction * total
+        seen = 0
+        for position, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= target:
+                return float(self.BUCKETS_MS[position]) if position < len(self.BUCKETS_MS) else max_ms
+        return max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self.count
+            total_ms = self.total_ms
+            max_ms = self.max_ms
+            buckets = {(f"le_{bound}" if position < len(self.BUCKETS_MS) else "inf"): self.counts[position]
+                       for position, bound in enumerate(self.BUCKETS_MS + (None,))}
+        return {
+            'count': count,
+            'avg_ms': total_ms / count if count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': max_ms,
+            'buckets': buckets,
+        }
+
+class PipelineStage:
+    """One pipeline stage: handler(token) returns the token to forward or None to drop
+
+    Handlers may be plain functions or coroutines. Set blocking=True for plain
+    functions that do network/database I/O so they run on the pipeline's
+    thread pool instead of stalling the event loop.
+    """
+
+    def __init__(self, name: str, handler: Callable, concurrency: int = 4,
+                 queue_size: int = 100, blocking: bool = False):
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size
+        self.blocking = blocking
+
+        self.latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+        self.processed = 0
+        self.passed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def get_metrics(self, queue: Optional[asyncio.Queue] = None) -> Dict[str, Any]:
+        return {
+            'concurrency': self.concurrency,
+            'queue_depth': queue.qsize() if queue is not None else 0,
+            'queue_size': self.queue_size,
+            'in_flight': self.in_flight,
+            'processed': self.processed,
+            'passed': self.passed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'latency': self.latency.snapshot(),
+            'queue_wait': self.queue_wait.snapshot(),
+        }
+
+class AsyncTokenPipeline:
+    """Chain of PipelineStages connected by bounded asyncio queues"""
+
+    def __init__(self, stages: List[PipelineStage], loop_service: Optional[BackgroundEventLoop] = None,
+                 max_blocking_workers: Optional[int] = None, name: str = "token-pipeline"):
+        if not stages:
+            raise ValueError("AsyncTokenPipeline needs at least one stage")
+        self.name = name
+        self.stages = stages
+        self.loop_service = loop_service or get_background_loop()
+
+        blocking_workers = max_blocking_workers or sum(stage.concurrency for stage in stages if stage.blocking) or 1
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=blocking_workers, thread_name_prefix=name
+        )
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self._started = False
+
+        self.end_to_end = LatencyHistogram()
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self):
+        """Create queues and worker tasks on the shared loop"""
+        if self._started:
+            return
+        self.loop_service.run(self._start(), timeout=10)
+        self._started = True
+        layout = " → ".join(f"{stage.name}×{stage.concurrency}" for stage in self.stages)
+        logger.info(f"✅ ASYNC PIPELINE: '{self.name}' started ({layout})")
+
+    async def _start(self):
+        self._queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        for index, stage in enumerate(self.stages):
+            for worker_number in range(stage.concurrency):
+                task = asyncio.ensure_future(self._worker(index))
+                self._workers.append(task)
+
+    async def run_blocking(self, func: Callable, *args):
+        """Run a blocking callable from inside an async handler on the pipeline thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _call_handler(self, stage: PipelineStage, token: Any):
+        if stage.blocking:
+            return await self.run_blocking(stage.handler, token)
+        result = stage.handler(token)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _worker(self, index: int):
+        stage = self.stages[index]
+        queue = self._queues[index]
+        next_queue = self._queues[index + 1] if index + 1 < len(self._queues) else None
+
+        while True:
+            token, enqueued_at, started_at = await queue.get()
+            try:
+                dequeued_at = time.monotonic()
+                stage.queue_wait.record(dequeued_at - enqueued_at)
+                stage.in_flight += 1
+                try:
+                    result = await self._call_handler(stage, token)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    stage.errors += 1
+                    logger.error(f"❌ PIPELINE {stage.name.upper()}: {e}")
+                    result = None
+                finally:
+                    stage.in_flight -= 1
+                    stage.processed += 1
+                    stage.latency.record(time.monotonic() - dequeued_at)
+
+                if result is None:
+                    stage.dropped += 1
+                    continue
+
+                stage.passed += 1
+                if next_queue is not None:
+                    # Blocks this worker while the next stage is saturated
+                    await next_queue.put((result, time.monotonic(), started_at))
+                else:
+                    self.completed += 1
+                    self.end_to_end.record(time.monotonic() - started_at)
+            finally:
+                queue.task_done()
+
+    async def put(self, token: Any):
+        """Enqueue from inside the loop, waiting while the first stage is full"""
+        now = time.monotonic()
+        await self._queues[0].put((token, now, now))
+        self.submitted += 1
+
+    def submit(self, token: Any, timeout: Optional[float] = None) -> bool:
+        """Thread-safe enqueue; blocks the producer while the pipeline is saturated
+
+        Returns False (and counts a rejection) if there's still no room after timeout.
+        """
+        if not self._started:
+            self.start()
+        future = self.loop_service.submit(self.put(token))
+        try:
+            future.result(timeout=timeout)
+            return True
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.rejected += 1
+            logger.warning(f"⚠️ PIPELINE BACK-PRESSURE: rejected token after {timeout}s wait")
+            return False
+
+    def submit_batch(self, tokens: Iterable[Any], timeout: Optional[float] = None) -> int:
+        """Submit every token in order; returns how many were accepted"""
+        return sum(1 for token in tokens if self.submit(token, timeout=timeout))
+
+    async def _drain(self):
+        # Stages drain in order because workers forward before task_done()
+        for queue in self._queues:
+            await queue.join()
+
+    def drain(self, timeout: Optional[float] = None):
+        """Block until every submitted token has left the pipeline"""
+        if self._started:
+            self.loop_service.run(self._drain(), timeout=timeout)
+
+    async def _cancel_workers(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stop(self, timeout: float = 10.0):
+        """Cancel workers and release the thread pool"""
+        if not self._started:
+            return
+        try:
+            self.loop_service.run(self._cancel_workers(), timeout=timeout)
+        finally:
+            self._executor.shutdown(wait=False)
+            self._started = False
+            logger.info(f"🛑 ASYNC PIPELINE: '{self.name}' stopped")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-stage counters and latency histograms plus end-to-end latency"""
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'end_to_end': self.end_to_end.snapshot(),
+            'stages': {
+                stage.name: stage.get_metrics(self._queues[index] if index < len(self._queues) else None)
+                for index, stage in enumerate(self.stages)
+            },
+        }
+
+    def log_metrics(self):
+        metrics = self.get_metrics()
+        logger.info(f"   🧵 Pipeline: {metrics['submitted']} in, {metrics['completed']} out, "
+                    f"p95 {metrics['end_to_end']['p95_ms']:.0f}ms end-to-end")
+        for name, stage in metrics['stages'].items():
+            logger.info(f"      → {name}: depth {stage['queue_depth']}/{stage['queue_size']}, "
+                        f"{stage['passed']} passed, {stage['dropped']} dropped, {stage['errors']} errors, "
+                        f"p50 {stage['latency']['p50_ms']:.0f}ms, p95 {stage['latency']['p95_ms']:.0f}ms")
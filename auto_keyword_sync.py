@@ -11,6 +11,8 @@ import threading
 from typing import Set, List
 from keyword_sync_manager import KeywordSyncManager
 from config_manager import ConfigManager
+from keyword_events import (get_keyword_listener, applies_to, OP_ADD, OP_REMOVE, SCOPE_ATTRIBUTION,
+                            SAFETY_RESYNC_SECONDS)
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,12 @@ class AutoKeywordSync:
         self.last_file_keywords = set()
         self.last_db_keywords = set()
         
+        # Pushed changes wake the loop; the interval is only a safety net
+        self.pending_changes = []
+        self.changes_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.subscribed = False
+        
     def start(self):
         """Start the automatic synchronization service"""
         if self.running:
@@ -38,6 +46,9 @@ class AutoKeywordSync:
             return
             
         self.running = True
+        if not self.subscribed:
+            get_keyword_listener().subscribe(self._on_keyword_change)
+            self.subscribed = True
         self.sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
         self.sync_thread.start()
         logger.info(f"🔄 Auto keyword sync started (interval: {self.sync_interval}s)")
@@ -45,6 +56,7 @@ class AutoKeywordSync:
     def stop(self):
         """Stop the automatic synchronization service"""
         self.running = False
+        self.wakeup.set()
         if self.sync_thread:
             self.sync_thread.join(timeout=5)
         logger.info("⏹️ Auto keyword sync stopped")
@@ -60,13 +72,48 @@ class AutoKeywordSync:
             logger.error(f"Failed to initialize sync tables: {e}")
             return
             
+        self._perform_sync_check()
         while self.running:
             try:
-                self._perform_sync_check()
-                time.sleep(self.sync_interval)
+                listening = get_keyword_listener().connected.is_set()
+                woken = self.wakeup.wait(max(self.sync_interval, SAFETY_RESYNC_SECONDS) if listening
+                                         else self.sync_interval)
+                self.wakeup.clear()
+                if woken:
+                    self._apply_pending_changes()
+                else:
+                    self._perform_sync_check()
             except Exception as e:
                 logger.error(f"Error in sync loop: {e}")
                 time.sleep(5)  # Brief pause before retrying
+    
+    def _on_keyword_change(self, event: dict):
+        """Queue a pushed keyword change for the sync thread"""
+        if not applies_to(event, SCOPE_ATTRIBUTION):
+            return
+        with self.changes_lock:
+            self.pending_changes.append(event)
+        self.wakeup.set()
+    
+    def _apply_pending_changes(self):
+        """Patch the file with pushed deltas; anything else falls back to a full check"""
+        with self.changes_lock:
+            changes, self.pending_changes = self.pending_changes, []
+        if not changes:
+            return
+        if any(event['op'] not in (OP_ADD, OP_REMOVE) for event in changes):
+            self._perform_sync_check()
+            return
+        
+        file_keywords = self.config_manager.load_watchlist()
+        for event in changes:
+            keyword = event['keyword'].lower().strip()
+            if event['op'] == OP_ADD:
+                file_keywords.add(keyword)
+            else:
+                file_keywords.discard(keyword)
+        self._sync_file_to_database(file_keywords)
+        logger.info(f"⚡ Applied {len(changes)} pushed keyword change(s) to file")
                 
     def _perform_sync_check(self):
         """Perform a single synchronization check"""
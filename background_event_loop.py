@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Background Event Loop Service
+One long-lived asyncio loop on a daemon thread shared by the threaded pipeline,
+so pooled aiohttp sessions survive across tokens instead of dying with a
+per-call asyncio.new_event_loop()
+"""
+
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class BackgroundEventLoop:
+    """Event loop running forever on its own thread with a thread-safe submit API
+
+    Any thread can hand a coroutine to submit() and get a
+    concurrent.futures.Future back, or call run() to block for the result.
+    The loop is started lazily on first use and restarted if it ever dies.
+    """
+
+    def __init__(self, name: str = "background-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'timeouts': 0,
+            'loop_starts': 0,
+        }
+        self._pending = 0
+
+    def _run_forever(self, loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        self._started.set()
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            except Exception as e:
+                logger.debug(f"Background loop shutdown cleanup failed: {e}")
+            finally:
+                loop.close()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if it isn't running and return the loop"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed() and self._thread is not None and self._thread.is_alive():
+            return loop
+
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed() and self._thread is not None and self._thread.is_alive():
+                return self._loop
+
+            self._started.clear()
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=self._run_forever, args=(loop,), name=self.name, daemon=True)
+            thread.start()
+            self._started.wait(timeout=5)
+
+            self._loop = loop
+            self._thread = thread
+            self.stats['loop_starts'] += 1
+            logger.info(f"✅ BACKGROUND LOOP: '{self.name}' running on dedicated thread")
+            return loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.start()
+
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _on_done(self, future: concurrent.futures.Future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                self.stats['cancelled'] += 1
+            elif future.exception() is not None:
+                self.stats['failed'] += 1
+            else:
+                self.stats['completed'] += 1
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedule a coroutine on the shared loop from any thread"""
+        loop = self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        with self._lock:
+            self.stats['submitted'] += 1
+            self._pending += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the shared loop and block for its result
+
+        On timeout the coroutine is cancelled and concurrent.futures.TimeoutError
+        is raised. Must not be called from the loop thread itself.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("BackgroundEventLoop.run() called from the loop thread - await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.stats['timeouts'] += 1
+            raise
+
+    def call_soon(self, callback: Callable, *args) -> None:
+        """Run a plain callback on the loop thread"""
+        self.start().call_soon_threadsafe(callback, *args)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['pending'] = self._pending
+        stats['running'] = self.is_running()
+        return stats
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the loop, cancelling whatever is still scheduled on it"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        logger.info(f"🛑 BACKGROUND LOOP: '{self.name}' stopped")
+
+# Global instance for system-wide use
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Get the process-wide background event loop (started on first use)"""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                _background_loop = BackgroundEventLoop()
+    return _background_loop
+
+def run_in_background_loop(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Quick interface: run a coroutine on the shared loop and wait for the result"""
+    return get_background_loop().run(coro, timeout=timeout)
+
+if __name__ == "__main__":
+    print("🧪 TESTING BACKGROUND EVENT LOOP")
+
+    async def which_loop():
+        await asyncio.sleep(0.01)
+        return id(asyncio.get_running_loop())
+
+    service = get_background_loop()
+    first = service.run(which_loop(), timeout=5)
+    second = service.run(which_loop(), timeout=5)
+    print(f"Same loop across calls: {first == second}")
+    print(f"Stats: {service.get_stats()}")
+    service.stop()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Bulk Token Resolution - claim, resolve and write back a whole batch at once
+One cycle claims up to batch_size rows from pending_tokens or
+fallback_processing_coins with FOR UPDATE SKIP LOCKED, resolves every name
+concurrently (the DexScreener batch client packs them 30 to a request) and
+writes the results back in the same transaction: one multi-row insert into
+detected_tokens, one delete for resolved rows, one retry-count update for the
+rest. Rows claimed by one resolver are skipped by the others, so several
+resolver instances can run side by side.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from db_pool import get_db_pool
+from name_retry_scheduler import DEFAULT_BASE_DELAY, DEFAULT_MAX_DELAY
+
+logger = logging.getLogger(__name__)
+
+# Rows are due once the name retry scheduler's backoff has elapsed since their last attempt
+DUE_FILTER = f'''
+    (last_retry_at IS NULL
+     OR last_retry_at + LEAST({DEFAULT_BASE_DELAY:g} * POWER(2, GREATEST(COALESCE(retry_count, 0) - 1, 0)),
+                              {DEFAULT_MAX_DELAY:g}) * INTERVAL '1 second' <= CURRENT_TIMESTAMP)
+'''
+# Tokens that already matched a keyword first, then oldest first (older names are likelier to be indexed)
+PRIORITY_ORDER = "COALESCE(cardinality(matched_keywords), 0) > 0 DESC, detected_at ASC"
+
+# Claim queries per source table - rows locked by another resolver are skipped, not waited on
+CLAIM_QUERIES = {
+    'pending_tokens': f'''
+        SELECT contract_address, token_name, symbol, matched_keywords, COALESCE(retry_count, 0)
+        FROM pending_tokens
+        WHERE {DUE_FILTER}
+        ORDER BY {PRIORITY_ORDER}
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ''',
+    'fallback_processing_coins': f'''
+        SELECT contract_address, token_name, symbol, matched_keywords, COALESCE(retry_count, 0)
+        FROM fallback_processing_coins
+        WHERE processing_status IN ('pending', 'api_failed', 'network_error', 'name_pending')
+        AND migrated_to_detected IS NOT TRUE
+        AND {DUE_FILTER}
+        ORDER BY {PRIORITY_ORDER}
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ''',
+}
+
+INSERT_RESOLVED_SQL = '''
+    INSERT INTO detected_tokens (address, name, symbol, matched_keywords, platform, status)
+    VALUES %s
+    ON CONFLICT (address)
+    DO UPDATE SET
+        name = EXCLUDED.name,
+        symbol = EXCLUDED.symbol,
+        matched_keywords = EXCLUDED.matched_keywords,
+        updated_at = CURRENT_TIMESTAMP
+'''
+INSERT_RESOLVED_TEMPLATE = "(%s, %s, %s, %s::text[], %s, %s)"
+
+ResolveFunc = Callable[[str], Awaitable[Any]]
+
+def normalize_resolution(result: Any) -> Optional[Dict[str, Optional[str]]]:
+    """{'name', 'symbol'} from a resolver result (dict, plain name or None); placeholders count as unresolved"""
+    if isinstance(result, str):
+        result = {'name': result}
+    if not result:
+        return None
+    name = (result.get('name') or '').strip()
+    if not name or name.startswith('Unnamed'):
+        return None
+    return {'name': name, 'symbol': (result.get('symbol') or '').strip() or None}
+
+class BulkTokenResolver:
+    """One claim → resolve → write-back cycle per run_cycle() call for a single source table
+
+    resolve(contract_address) is awaited for every claimed row at once and
+    returns a {'name', 'symbol'} dict, a plain name, or None when unresolved.
+    """
+
+    def __init__(self, database_url: str, table: str, resolve: ResolveFunc, batch_size: int = 100,
+                 platform: str = 'LetsBonk', pool=None):
+        if table not in CLAIM_QUERIES:
+            raise ValueError(f"Unsupported table for bulk resolution: {table}")
+        self.table = table
+        self.resolve = resolve
+        self.batch_size = batch_size
+        self.platform = platform
+        self.pool = pool or get_db_pool(database_url)
+        self.stats = {
+            'cycles': 0,
+            'claimed': 0,
+            'resolved': 0,
+            'retried': 0,
+            'failed_cycles': 0,
+        }
+
+    async def run_cycle(self) -> Dict[str, int]:
+        """Claim a batch, resolve it concurrently and write every result in one transaction"""
+        summary = {'claimed': 0, 'resolved': 0, 'retried': 0}
+        if self.pool is None:
+            logger.error("❌ BULK RESOLUTION: No database configured")
+            return summary
+
+        loop = asyncio.get_running_loop()
+        self.stats['cycles'] += 1
+        try:
+            # The row locks live as long as this transaction - commit (or rollback) releases them
+            async with self.pool.async_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    rows = await loop.run_in_executor(None, self._claim, cursor)
+                    if not rows:
+                        return summary
+
+                    results = await asyncio.gather(*[self._resolve(row[0]) for row in rows])
+                    resolved, unresolved = self._partition(rows, results)
+                    await loop.run_in_executor(None, self._write_back, cursor, resolved, unresolved)
+                finally:
+                    cursor.close()
+        except Exception as e:
+            self.stats['failed_cycles'] += 1
+            logger.error(f"❌ BULK RESOLUTION: {self.table} cycle failed, claimed rows released: {e}")
+            return summary
+
+        summary = {'claimed': len(rows), 'resolved': len(resolved), 'retried': len(unresolved)}
+        for key, value in summary.items():
+            self.stats[key] += value
+        logger.info(f"📊 BULK RESOLUTION: {self.table} - {summary['resolved']}/{summary['claimed']} resolved, "
+                    f"{summary['retried']} retried")
+        return summary
+
+    async def _resolve(self, contract_address: str) -> Optional[Dict[str, Optional[str]]]:
+        try:
+            return normalize_resolution(await self.resolve(contract_address))
+        except Exception as e:
+            logger.warning(f"⚠️ BULK RESOLUTION: Lookup failed for {contract_address[:10]}...: {e}")
+            return None
+
+    def _claim(self, cursor) -> List[Tuple]:
+        cursor.execute(CLAIM_QUERIES[self.table], (self.batch_size,))
+        return cursor.fetchall()
+
+    def _partition(self, rows: List[Tuple], results: List[Optional[Dict[str, Optional[str]]]]):
+        resolved, unresolved = [], []
+        for row, result in zip(rows, results):
+            contract_address, placeholder_name, symbol, matched_keywords, retry_count = row
+            if result:
+                resolved.append((contract_address, result['name'], result['symbol'] or symbol,
+                                 list(matched_keywords or []), self.platform, 'detected'))
+                logger.info(f"✅ RESOLVED: {result['name']} (was {placeholder_name})")
+            else:
+                unresolved.append(contract_address)
+                logger.info(f"⏳ Still unresolved: {placeholder_name} (retry #{retry_count + 1})")
+        return resolved, unresolved
+
+    def _write_back(self, cursor, resolved: List[Tuple], unresolved: List[str]):
+        if resolved:
+            self._insert_resolved(cursor, resolved)
+            cursor.execute(f"DELETE FROM {self.table} WHERE contract_address = ANY(%s)",
+                           ([row[0] for row in resolved],))
+        if unresolved:
+            cursor.execute(f'''
+                UPDATE {self.table}
+                SET retry_count = COALESCE(retry_count, 0) + 1,
+                    last_retry_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE contract_address = ANY(%s)
+            ''', (unresolved,))
+
+    def _insert_resolved(self, cursor, rows: List[Tuple]):
+        from psycopg2.extras import execute_values
+        execute_values(cursor, INSERT_RESOLVED_SQL, rows, template=INSERT_RESOLVED_TEMPLATE)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Compact Seen Set - fixed-memory "have we seen this mint/signature?" set
+Base58 keys are decoded to their raw 32-byte (mint) or 64-byte (signature)
+form and stored in one preallocated open-addressing table (linear probing)
+with a one-byte time-bucket stamp per slot, so entries expire without
+per-entry timers. Memory is fixed at construction: when the table is full the
+oldest bucket is dropped early, and a burst that fills half the capacity
+within one bucket starts the next bucket early so only its older half can be
+dropped. Expired and dropped keys can optionally spill
+into a rotating pair of Bloom filters that keep the long tail at a known
+false-positive rate.
+"""
+
+import math
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+MINT_KEY_SIZE = 32
+SIGNATURE_KEY_SIZE = 64
+
+B58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_B58_INDEX = {char: index for index, char in enumerate(B58_ALPHABET)}
+
+# Slot stamps: 0 = never used, 255 = deleted, 1..254 = time bucket the key was last seen in
+_EMPTY = 0
+_DELETED = 255
+_STAMP_RANGE = 254
+
+Key = Union[str, bytes, bytearray]
+
+def decode_key(value: Key, key_size: int = MINT_KEY_SIZE) -> bytes:
+    """Raw key_size-byte form of a base58 address/signature
+
+    Anything that isn't canonical base58 of exactly key_size bytes (test ids,
+    truncated strings) is hashed to key_size bytes instead, so every distinct
+    input still maps to a distinct key.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) == key_size:
+            return bytes(value)
+        return hashlib.blake2b(bytes(value), digest_size=key_size).digest()
+    try:
+        number = 0
+        for char in value:
+            number = number * 58 + _B58_INDEX[char]
+        raw = number.to_bytes(key_size, 'big')
+        leading_ones = len(value) - len(value.lstrip('1'))
+        # Canonical base58 spells each leading zero byte as one '1'
+        if leading_ones == key_size - len(raw.lstrip(b'\0')):
+            return raw
+    except (KeyError, OverflowError):
+        pass
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=key_size).digest()
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity: int = 200000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bit_count = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.bit_count / capacity * math.log(2))))
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        self.item_count = 0
+
+    def _positions(self, item: str):
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.bit_count
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.item_count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def estimated_false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.item_count / self.bit_count)) ** self.hash_count
+
+class CompactSeenSet:
+    """Set-like (add / in / discard / len / clear), thread-safe, fixed memory
+
+    capacity is the number of live keys kept exactly; ttl is how long a key
+    stays live after it was last added, in `buckets` steps. With tail_capacity
+    set, keys leaving the exact table stay members of a rotating Bloom pair
+    holding roughly the last 2 × tail_capacity of them. A bucket holding
+    capacity / 2 keys closes early, which ages every key by one bucket.
+    """
+
+    def __init__(self, capacity: int = 100000, ttl: float = 3600.0, buckets: int = 16,
+                 key_size: int = MINT_KEY_SIZE, max_load: float = 0.7, tail_capacity: int = 0,
+                 tail_error_rate: float = 0.0001, clock: Callable[[], float] = time.monotonic,
+                 name: str = "seen"):
+        if not 1 <= buckets < _STAMP_RANGE // 2:
+            raise ValueError(f"buckets must be between 1 and {_STAMP_RANGE // 2 - 1}")
+        self.name = name
+        self.capacity = capacity
+        self.ttl = ttl
+        self.buckets = buckets
+        self.bucket_seconds = ttl / buckets
+        self.key_size = key_size
+        self.tail_capacity = tail_capacity
+        self.tail_error_rate = tail_error_rate
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._slot_count = max(8, int(capacity / max_load) + 1)
+        self._rebuild_at = int(self._slot_count * 0.9)
+        self._keys = bytearray(self._slot_count * key_size)
+        self._stamps = bytearray(self._slot_count)
+        self._bucket_counts = [0] * (_STAMP_RANGE + 1)    # keys per stamp, live or not yet purged
+        self._occupied = 0                                  # non-empty slots, including deleted
+        self._roll_at = max(1, capacity // 2)               # keys in one bucket before it closes early
+        self._bucket_offset = 0                             # buckets closed early so far
+        self._last_purge_bucket = self._last_bucket = self._bucket()
+
+        self._tail = BloomFilter(tail_capacity, tail_error_rate) if tail_capacity else None
+        self._tail_previous = None
+
+        self.stats = {
+            'adds': 0,
+            'checks': 0,
+            'hits': 0,
+            'tail_hits': 0,
+            'expired': 0,
+            'evicted_early': 0,
+            'early_rolls': 0,
+            'rebuilds': 0,
+            'tail_rotations': 0,
+        }
+
+    # ------------------------------------------------------------------ time buckets
+
+    def _bucket(self) -> int:
+        return int(self.clock() / self.bucket_seconds) + self._bucket_offset
+
+    @staticmethod
+    def _stamp(bucket: int) -> int:
+        return bucket % _STAMP_RANGE + 1
+
+    def _age(self, stamp: int, bucket: int) -> int:
+        """Buckets since stamp was current (valid while purges keep ages below the stamp range)"""
+        return (bucket - (stamp - 1)) % _STAMP_RANGE
+
+    def _live(self, stamp: int, bucket: int) -> bool:
+        return _EMPTY != stamp != _DELETED and self._age(stamp, bucket) < self.buckets
+
+    # ------------------------------------------------------------------ table
+
+    def _probe(self, key: bytes, bucket: int):
+        """(slot holding key or -1, first reusable slot on key's probe chain)"""
+        slot = hash(key) % self._slot_count
+        size = self.key_size
+        keys, stamps = self._keys, self._stamps
+        reusable = -1
+        for _ in range(self._slot_count):
+            stamp = stamps[slot]
+            if stamp == _EMPTY:
+                return -1, (reusable if reusable >= 0 else slot)
+            offset = slot * size
+            if stamp != _DELETED and keys[offset:offset + size] == key:
+                return slot, slot
+            if reusable < 0 and not self._live(stamp, bucket):
+                reusable = slot
+            slot += 1
+            if slot == self._slot_count:
+                slot = 0
+        return -1, reusable
+
+    def _live_count(self, bucket: int) -> int:
+        return sum(self._bucket_counts[self._stamp(bucket - age)] for age in range(self.buckets))
+
+    def _store(self, slot: int, key: bytes, stamp: int):
+        previous = self._stamps[slot]
+        if previous == _EMPTY:
+            self._occupied += 1
+        elif previous != _DELETED:
+            self._bucket_counts[previous] -= 1
+            if self._keys[slot * self.key_size:(slot + 1) * self.key_size] != key:
+                # Reusing an expired key's slot
+                self.stats['expired'] += 1
+                self._spill(bytes(self._keys[slot * self.key_size:(slot + 1) * self.key_size]))
+        self._keys[slot * self.key_size:(slot + 1) * self.key_size] = key
+        self._stamps[slot] = stamp
+        self._bucket_counts[stamp] += 1
+
+    def _rebuild(self, bucket: int, keep_buckets: int, reference: Optional[int] = None):
+        """Re-insert keys younger than keep_buckets into fresh arrays; older ones spill to the tail
+
+        Stamps are read relative to reference (the last bucket any operation
+        used), which is still unambiguous after a long idle gap.
+        """
+        if reference is None:
+            reference = bucket
+        size = self.key_size
+        old_keys, old_stamps = self._keys, self._stamps
+        self._keys = bytearray(self._slot_count * size)
+        self._stamps = bytearray(self._slot_count)
+        self._bucket_counts = [0] * (_STAMP_RANGE + 1)
+        self._occupied = 0
+        dropped = 0
+        for slot in range(self._slot_count):
+            stamp = old_stamps[slot]
+            if stamp == _EMPTY or stamp == _DELETED:
+                continue
+            key = bytes(old_keys[slot * size:(slot + 1) * size])
+            if self._age(stamp, reference) + (bucket - reference) >= keep_buckets:
+                dropped += 1
+                self._spill(key)
+                continue
+            _, target = self._probe(key, bucket)
+            self._store(target, key, stamp)
+        self._last_purge_bucket = bucket
+        self.stats['rebuilds'] += 1
+        return dropped
+
+    def _make_room(self, bucket: int):
+        """Purge expired keys; while still over capacity, drop the oldest live bucket early"""
+        live_before = self._live_count(bucket)
+        self.stats['expired'] += self._rebuild(bucket, self.buckets)
+        keep = self.buckets
+        while self._live_count(bucket) >= self.capacity and keep > 1:
+            keep -= 1
+            self.stats['evicted_early'] += self._rebuild(bucket, keep)
+        if self._live_count(bucket) >= self.capacity:
+            # Only reachable when capacity < 2 - buckets close at capacity / 2 keys otherwise
+            self.stats['evicted_early'] += self._rebuild(bucket, 0)
+        logger.debug(f"🧹 SEEN SET '{self.name}': {live_before} → {self._live_count(bucket)} live keys")
+
+    def _current_bucket(self) -> int:
+        """Current bucket, purging first if stamps are about to wrap around (caller holds lock)"""
+        bucket = self._bucket()
+        if bucket - self._last_purge_bucket >= _STAMP_RANGE - self.buckets - 1:
+            # Otherwise keys stamped 254 buckets ago would look fresh again
+            self.stats['expired'] += self._rebuild(bucket, self.buckets, reference=self._last_bucket)
+        self._last_bucket = bucket
+        return bucket
+
+    def _roll_bucket(self) -> int:
+        """Close the current bucket early (caller holds lock)
+
+        Without this a burst of capacity keys inside one bucket leaves nothing
+        older to drop, and making room would discard every key, including the
+        ones just added.
+        """
+        if self.stats['early_rolls'] % 100 == 0:
+            logger.warning(f"⚠️ SEEN SET '{self.name}': {self._roll_at} keys within {self.bucket_seconds:.0f}s - "
+                           f"closing buckets early, keys expire sooner than the {self.ttl:.0f}s ttl")
+        self._bucket_offset += 1
+        self.stats['early_rolls'] += 1
+        return self._current_bucket()
+
+    # ------------------------------------------------------------------ long tail
+
+    def _spill(self, key: bytes):
+        if self._tail is None:
+            return
+        if self._tail.item_count >= self.tail_capacity:
+            self._tail_previous = self._tail
+            self._tail = BloomFilter(self.tail_capacity, self.tail_error_rate)
+            self.stats['tail_rotations'] += 1
+        self._tail.add(key.hex())
+
+    def _in_tail(self, key: bytes) -> bool:
+        if self._tail is None:
+            return False
+        item = key.hex()
+        return item in self._tail or (self._tail_previous is not None and item in self._tail_previous)
+
+    # ------------------------------------------------------------------ set API
+
+    def add(self, value: Key) -> bool:
+        """Mark value as seen now; True if it wasn't a live member before"""
+        if not value:
+            return False
+        key = decode_key(value, self.key_size)
+        with self._lock:
+            bucket = self._current_bucket()
+            self.stats['adds'] += 1
+            slot, reusable = self._probe(key, bucket)
+            was_live = slot >= 0 and self._live(self._stamps[slot], bucket)
+            if slot < 0 and self._bucket_counts[self._stamp(bucket)] >= self._roll_at:
+                bucket = self._roll_bucket()
+                slot, reusable = self._probe(key, bucket)
+            if slot < 0 and (self._live_count(bucket) >= self.capacity or self._occupied >= self._rebuild_at):
+                self._make_room(bucket)
+                slot, reusable = self._probe(key, bucket)
+            self._store(slot if slot >= 0 else reusable, key, self._stamp(bucket))
+            return not was_live
+
+    def __contains__(self, value: Key) -> bool:
+        if not value:
+            return False
+        key = decode_key(value, self.key_size)
+        with self._lock:
+            bucket = self._current_bucket()
+            self.stats['checks'] += 1
+            slot, _ = self._probe(key, bucket)
+            if slot >= 0:
+                if self._live(self._stamps[slot], bucket):
+                    self.stats['hits'] += 1
+                    return True
+                if self._tail is not None:
+                    # Expired but not purged yet - still an exact tail member
+                    self.stats['tail_hits'] += 1
+                    return True
+                return False
+            if self._in_tail(key):
+                self.stats['tail_hits'] += 1
+                return True
+            return False
+
+    def discard(self, value: Key):
+        if not value:
+            return
+        key = decode_key(value, self.key_size)
+        with self._lock:
+            slot, _ = self._probe(key, self._current_bucket())
+            if slot >= 0:
+                self._bucket_counts[self._stamps[slot]] -= 1
+                self._stamps[slot] = _DELETED
+
+    def update(self, values: Iterable[Key]):
+        for value in values:
+            self.add(value)
+
+    def clear(self):
+        with self._lock:
+            self._keys = bytearray(self._slot_count * self.key_size)
+            self._stamps = bytearray(self._slot_count)
+            self._bucket_counts = [0] * (_STAMP_RANGE + 1)
+            self._occupied = 0
+            self._last_purge_bucket = self._last_bucket = self._bucket()
+            if self._tail is not None:
+                self._tail = BloomFilter(self.tail_capacity, self.tail_error_rate)
+                self._tail_previous = None
+
+    def __len__(self) -> int:
+        """Live keys held exactly (the Bloom tail isn't counted)"""
+        with self._lock:
+            return self._live_count(self._current_bucket())
+
+    # ------------------------------------------------------------------ metrics
+
+    @property
+    def memory_bytes(self) -> int:
+        tail_bytes = sum(len(bloom._bits) for bloom in (self._tail, self._tail_previous) if bloom is not None)
+        return len(self._keys) + len(self._stamps) + tail_bytes
+
+    def false_positive_rate(self) -> float:
+        """Estimated chance that a never-seen key tests as a member (only the Bloom tail can err)"""
+        rates = [bloom.estimated_false_positive_rate() for bloom in (self._tail, self._tail_previous)
+                 if bloom is not None]
+        miss_all = 1.0
+        for rate in rates:
+            miss_all *= 1 - rate
+        return 1 - miss_all
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['live'] = self._live_count(self._current_bucket())
+            stats['occupied_slots'] = self._occupied
+            stats['tail_items'] = sum(bloom.item_count for bloom in (self._tail, self._tail_previous)
+                                      if bloom is not None)
+            stats['false_positive_rate'] = self.false_positive_rate()
+        stats['capacity'] = self.capacity
+        stats['slots'] = self._slot_count
+        stats['memory_bytes'] = self.memory_bytes
+        return stats
@@ -15,6 +15,8 @@ import time
 from datetime import datetime, timedelta
 import logging
 from typing import Optional, Dict, List
+from market_data_service import get_market_data_service
+from keyword_events import publish_keyword_change, OP_ADD, OP_REMOVE, OP_CLEAR
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -234,6 +236,7 @@ async def add_keyword(interaction: discord.Interaction, keyword: str):
             "INSERT INTO keywords (keyword, user_id, created_at) VALUES (%s, %s, %s)",
             (keyword, user_id, datetime.now())
         )
+        publish_keyword_change(cursor, OP_ADD, keyword, user_id)
         
         conn.commit()
         cursor.close()
@@ -267,6 +270,7 @@ async def remove_keyword(interaction: discord.Interaction, keyword: str):
         cursor.execute("DELETE FROM keywords WHERE user_id = %s AND keyword = %s", (user_id, keyword))
         
         if cursor.rowcount > 0:
+            publish_keyword_change(cursor, OP_REMOVE, keyword, user_id)
             conn.commit()
             embed = discord.Embed(
                 title="✅ Keyword Removed",
@@ -341,6 +345,7 @@ async def clear_keywords(interaction: discord.Interaction):
         cursor = conn.cursor()
         cursor.execute("DELETE FROM keywords WHERE user_id = %s", (user_id,))
         deleted_count = cursor.rowcount
+        publish_keyword_change(cursor, OP_CLEAR, user_id=user_id)
         
         conn.commit()
         cursor.close()
@@ -1124,24 +1129,11 @@ async def export_data(interaction: discord.Interaction):
 # ==================== UTILITY FUNCTIONS ====================
 
 async def get_market_data(token_address: str) -> Dict:
-    """Get market data from DexScreener"""
+    """Get market data from the shared DexScreener cache"""
     try:
-        url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-        response = requests.get(url, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            pairs = data.get('pairs', [])
-            
-            if pairs:
-                best_pair = max(pairs, key=lambda x: float(x.get('liquidity', {}).get('usd', 0)))
-                
-                return {
-                    'price': float(best_pair.get('priceUsd', 0)),
-                    'market_cap': float(best_pair.get('marketCap', 0)),
-                    'volume_24h': float(best_pair.get('volume', {}).get('h24', 0)),
-                    'liquidity': float(best_pair.get('liquidity', {}).get('usd', 0))
-                }
+        market_data = await get_market_data_service().get_async(token_address)
+        if not market_data.get('status'):
+            return market_data
     except Exception as e:
         logger.warning(f"Failed to get market data: {e}")
     
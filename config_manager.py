@@ -7,6 +7,7 @@ import logging
 import psycopg2
 from typing import Set, List
 from config import Config
+from keyword_events import (publish_keyword_change, OP_ADD, OP_REMOVE, OP_CLEAR, SCOPE_ATTRIBUTION)
 
 logger = logging.getLogger(__name__)
 
@@ -146,6 +147,7 @@ class ConfigManager:
                 
                 # Deactivate all keywords in database
                 cursor.execute("UPDATE keyword_attribution SET is_active = FALSE, deactivated_reason = 'bulk_clear'")
+                publish_keyword_change(cursor, OP_CLEAR, scope=SCOPE_ATTRIBUTION)
                 conn.commit()
                 cursor.close()
                 conn.close()
@@ -188,6 +190,7 @@ class ConfigManager:
                 
                 # Insert new keyword
                 cursor.execute("INSERT INTO keywords (keyword, user_id) VALUES (%s, %s)", (keyword, user_id))
+                publish_keyword_change(cursor, OP_ADD, keyword, user_id)
                 conn.commit()
                 cursor.close()
                 conn.close()
@@ -259,6 +262,8 @@ class ConfigManager:
                         logger.warning(f"Could not remove from {table_name}: {e}")
                         continue
                 
+                if removed_count > 0:
+                    publish_keyword_change(cursor, OP_REMOVE, keyword, user_id, scope=None)
                 conn.commit()
                 cursor.close()
                 conn.close()
@@ -384,6 +389,7 @@ class ConfigManager:
                         logger.warning(f"Could not clear {table_name}: {e}")
                         continue
                 
+                publish_keyword_change(cursor, OP_CLEAR, scope=None)
                 conn.commit()
                 cursor.close()
                 conn.close()
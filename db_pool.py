@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Shared PostgreSQL Connection Pool
+One thread-safe pool per DATABASE_URL so hot-path queries reuse warm connections
+instead of paying a TCP+TLS+auth handshake to Railway Postgres on every call
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+class PoolExhaustedError(psycopg2.OperationalError):
+    """Raised when no pooled connection becomes available before the timeout"""
+
+class PooledConnection:
+    """psycopg2 connection proxy whose close() returns the connection to the pool
+
+    Existing code written as ``conn = get_db_connection() ... conn.close()``
+    keeps working unchanged - close() checks the connection back in instead
+    of tearing it down.
+    """
+
+    def __init__(self, pool: 'DatabasePool', raw_conn, created_at: float):
+        self._pool = pool
+        self._conn = raw_conn
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        # conn.autocommit = True etc. must reach the real connection, not shadow it on the proxy
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def raw_connection(self):
+        return self._conn
+
+    def close(self):
+        """Return connection to the pool (safe to call more than once)"""
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._conn, self._created_at)
+
+    def __del__(self):
+        # Callers that hit an exception before close() would otherwise leak a slot
+        try:
+            if not self._released:
+                self._pool.metrics_counter('leaked_returns')
+                self.close()
+        except Exception:
+            pass
+
+class DatabasePool:
+    """Thread-safe blocking connection pool with health checks and recycling"""
+
+    def __init__(self, database_url: str, min_size: int = 1, max_size: int = 10,
+                 acquire_timeout: float = 10.0, max_lifetime: float = 1800.0,
+                 health_check_after: float = 30.0, connect_timeout: int = 10):
+        self.database_url = database_url
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.connect_timeout = connect_timeout
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        # Idle entries are (raw_conn, created_at, last_used_at); LIFO keeps hot connections hot
+        self._idle = deque()
+        self._in_use = 0
+        self._closed = False
+
+        self.metrics = {
+            'connections_created': 0,
+            'connections_reused': 0,
+            'connections_recycled': 0,
+            'health_check_failures': 0,
+            'checkouts': 0,
+            'checkout_timeouts': 0,
+            'leaked_returns': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+        }
+
+        self._prefill()
+
+    def _prefill(self):
+        """Open min_size connections up front so the first token doesn't pay for them"""
+        for _ in range(self.min_size):
+            try:
+                raw_conn = self._connect()
+                self._idle.append((raw_conn, time.time(), time.time()))
+            except Exception as e:
+                logger.warning(f"⚠️ DB POOL: Prefill connection failed: {e}")
+                break
+
+    def _connect(self):
+        raw_conn = psycopg2.connect(self.database_url, connect_timeout=self.connect_timeout)
+        with self._lock:
+            self.metrics['connections_created'] += 1
+        return raw_conn
+
+    def metrics_counter(self, name: str, amount: int = 1):
+        with self._lock:
+            self.metrics[name] = self.metrics.get(name, 0) + amount
+
+    def _discard(self, raw_conn):
+        try:
+            raw_conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, raw_conn, created_at: float, last_used: float) -> bool:
+        """Cheap checks first, round-trip ping only for connections idle a while"""
+        if raw_conn.closed:
+            return False
+        now = time.time()
+        if now - created_at > self.max_lifetime:
+            self.metrics_counter('connections_recycled')
+            return False
+        if now - last_used > self.health_check_after:
+            try:
+                cursor = raw_conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+                cursor.close()
+                raw_conn.rollback()
+            except Exception:
+                self.metrics_counter('health_check_failures')
+                return False
+        return True
+
+    def getconn(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a healthy connection, blocking up to timeout seconds"""
+        if self._closed:
+            raise psycopg2.InterfaceError("Database pool is closed")
+
+        if timeout is None:
+            timeout = self.acquire_timeout
+        wait_start = time.time()
+        if not self._slots.acquire(timeout=timeout):
+            self.metrics_counter('checkout_timeouts')
+            raise PoolExhaustedError(f"No database connection available within {timeout}s")
+
+        waited = time.time() - wait_start
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    raw_conn = self._connect()
+                    created_at = time.time()
+                    break
+                raw_conn, created_at, last_used = entry
+                if self._is_healthy(raw_conn, created_at, last_used):
+                    self.metrics_counter('connections_reused')
+                    break
+                self._discard(raw_conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self.metrics['checkouts'] += 1
+            self.metrics['total_wait_seconds'] += waited
+            self.metrics['max_wait_seconds'] = max(self.metrics['max_wait_seconds'], waited)
+
+        return PooledConnection(self, raw_conn, created_at)
+
+    def _release(self, raw_conn, created_at: float):
+        try:
+            reusable = not self._closed and not raw_conn.closed
+            if reusable and raw_conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                # Don't hand the next caller someone else's open transaction
+                try:
+                    raw_conn.rollback()
+                except Exception:
+                    reusable = False
+            if reusable and time.time() - created_at > self.max_lifetime:
+                self.metrics_counter('connections_recycled')
+                reusable = False
+
+            if reusable:
+                with self._lock:
+                    self._idle.append((raw_conn, created_at, time.time()))
+            else:
+                self._discard(raw_conn)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager: commit on success, rollback on error, always return to pool"""
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            conn.close()
+
+    def execute(self, query: str, params: Any = None, fetch: Optional[str] = None):
+        """Run a single statement on a pooled connection
+
+        fetch: None (returns rowcount), 'one' or 'all'
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params)
+                if fetch == 'one':
+                    return cursor.fetchone()
+                if fetch == 'all':
+                    return cursor.fetchall()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+    @asynccontextmanager
+    async def async_connection(self, timeout: Optional[float] = None):
+        """Async variant - checkout happens in the default executor so the loop never blocks"""
+        loop = asyncio.get_running_loop()
+        conn = await loop.run_in_executor(None, self.getconn, timeout)
+        try:
+            yield conn
+            await loop.run_in_executor(None, conn.commit)
+        except Exception:
+            try:
+                await loop.run_in_executor(None, conn.rollback)
+            except Exception:
+                pass
+            raise
+        finally:
+            conn.close()
+
+    async def execute_async(self, query: str, params: Any = None, fetch: Optional[str] = None):
+        """Async variant of execute() for coroutine callers"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.execute(query, params, fetch))
+
+    async def run_async(self, func: Callable, *args):
+        """Run func(conn, *args) on a pooled connection without blocking the event loop"""
+        def run():
+            with self.connection() as conn:
+                return func(conn, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, run)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool metrics for health endpoints and monitoring summaries"""
+        with self._lock:
+            metrics = dict(self.metrics)
+            idle = len(self._idle)
+            in_use = self._in_use
+        checkouts = metrics['checkouts']
+        metrics.update({
+            'idle_connections': idle,
+            'in_use_connections': in_use,
+            'max_size': self.max_size,
+            'reuse_rate': metrics['connections_reused'] / checkouts if checkouts else 0.0,
+            'avg_wait_ms': (metrics['total_wait_seconds'] / checkouts * 1000) if checkouts else 0.0,
+        })
+        return metrics
+
+    def close(self):
+        """Close every idle connection; checked-out ones close when returned"""
+        self._closed = True
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for raw_conn, _, _ in idle:
+            self._discard(raw_conn)
+        logger.info("🔌 DB POOL: Closed")
+
+# Global instances (one pool per database URL)
+_pools: Dict[str, DatabasePool] = {}
+_pools_lock = threading.Lock()
+
+def get_db_pool(database_url: Optional[str] = None) -> Optional[DatabasePool]:
+    """Get the shared pool for database_url (defaults to DATABASE_URL), or None if unset"""
+    database_url = database_url or os.getenv('DATABASE_URL')
+    if not database_url:
+        return None
+
+    pool = _pools.get(database_url)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(database_url)
+        if pool is None:
+            pool = DatabasePool(
+                database_url,
+                min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+                max_size=int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            )
+            _pools[database_url] = pool
+            logger.info(f"✅ DB POOL: Initialized shared pool (max {pool.max_size} connections)")
+        return pool
+
+def get_pooled_connection(database_url: Optional[str] = None) -> PooledConnection:
+    """Drop-in replacement for psycopg2.connect(DATABASE_URL) - close() returns it to the pool"""
+    pool = get_db_pool(database_url)
+    if pool is None:
+        raise psycopg2.OperationalError("DATABASE_URL not configured")
+    return pool.getconn()
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every pool in the process keyed by host (credentials stripped)"""
+    return {url.split('@')[-1]: pool.get_metrics() for url, pool in list(_pools.items())}
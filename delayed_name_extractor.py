@@ -10,6 +10,8 @@ import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from name_retry_scheduler import get_name_retry_scheduler
+
 logger = logging.getLogger(__name__)
 
 class DelayedNameExtractor:
@@ -24,6 +26,7 @@ class DelayedNameExtractor:
         self.pending_extractions = {}
         self.extracted_names = {}
         self.running = False
+        self.scheduler = get_name_retry_scheduler()
         
         # Accept any additional kwargs to prevent initialization errors
         for key, value in kwargs.items():
@@ -32,77 +35,52 @@ class DelayedNameExtractor:
         logger.info(f"✅ Delayed name extractor initialized (delay: {delay_seconds}s)")
     
     def queue_extraction(self, token_address: str, fallback_name: str):
-        """Queue a token for delayed name extraction"""
-        if token_address not in self.pending_extractions:
+        """Queue a token for delayed name extraction on the shared retry scheduler"""
+        if token_address in self.pending_extractions:
+            return
+        queued = self.scheduler.schedule(
+            token_address,
+            self._attempt_name_extraction,
+            on_resolved=self._on_name_extracted,
+            on_abandoned=self._on_extraction_abandoned,
+            hints=(fallback_name,),
+            initial_delay=self.delay_seconds,
+        )
+        if queued:
             self.pending_extractions[token_address] = {
                 'fallback_name': fallback_name,
-                'queued_time': time.time(),
-                'attempts': 0
+                'queued_time': time.time()
             }
             logger.info(f"⏰ Queued for delayed extraction: {token_address[:8]}...")
     
     async def start_extraction_loop(self):
-        """Start the delayed extraction loop"""
+        """Keep the extractor marked running - retries are driven by the shared scheduler"""
         self.running = True
-        logger.info("🔄 Starting delayed name extraction loop")
+        logger.info("🔄 Delayed name extraction running on the shared retry scheduler")
         
         while self.running:
-            try:
-                await self._process_pending_extractions()
-                await asyncio.sleep(30)  # Check every 30 seconds
-            except Exception as e:
-                logger.error(f"❌ Delayed extraction loop error: {e}")
-                await asyncio.sleep(60)  # Wait longer on error
+            await asyncio.sleep(30)
     
-    async def _process_pending_extractions(self):
-        """Process pending extractions that are ready"""
-        current_time = time.time()
-        ready_extractions = []
+    async def _on_name_extracted(self, address: str, extracted_name: str):
+        """Record a name the scheduler resolved and notify the callback"""
+        data = self.pending_extractions.pop(address, None)
+        if not data or extracted_name == data['fallback_name']:
+            return
         
-        for address, data in self.pending_extractions.items():
-            if current_time - data['queued_time'] >= self.delay_seconds:
-                ready_extractions.append(address)
+        self.extracted_names[address] = {
+            'name': extracted_name,
+            'extracted_time': time.time(),
+            'fallback_name': data['fallback_name']
+        }
+        logger.info(f"✅ Delayed extraction success: {address[:8]}... → '{extracted_name}'")
         
-        for address in ready_extractions:
-            try:
-                await self._extract_delayed_name(address)
-            except Exception as e:
-                logger.warning(f"⚠️ Delayed extraction failed for {address[:8]}...: {e}")
+        # Notify callback if available
+        if hasattr(self, 'callback_func') and self.callback_func:
+            await self.callback_func(address, extracted_name)
     
-    async def _extract_delayed_name(self, address: str):
-        """Extract name for a specific token after delay"""
-        data = self.pending_extractions.get(address)
-        if not data:
-            return
-        
-        try:
-            # Try to get real name now that time has passed
-            # This would integrate with your existing name extraction methods
-            extracted_name = await self._attempt_name_extraction(address)
-            
-            if extracted_name and extracted_name != data['fallback_name']:
-                self.extracted_names[address] = {
-                    'name': extracted_name,
-                    'extracted_time': time.time(),
-                    'fallback_name': data['fallback_name']
-                }
-                logger.info(f"✅ Delayed extraction success: {address[:8]}... → '{extracted_name}'")
-                
-                # Notify callback if available
-                if hasattr(self, 'callback_func') and self.callback_func:
-                    await self.callback_func(address, extracted_name)
-            
-            # Remove from pending regardless of success
-            del self.pending_extractions[address]
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Delayed extraction error for {address[:8]}...: {e}")
-            
-            # Increment attempts and retry or remove
-            data['attempts'] += 1
-            if data['attempts'] >= 3:
-                del self.pending_extractions[address]
-                logger.warning(f"❌ Giving up on delayed extraction for {address[:8]}...")
+    def _on_extraction_abandoned(self, address: str):
+        self.pending_extractions.pop(address, None)
+        logger.warning(f"❌ Giving up on delayed extraction for {address[:8]}...")
     
     async def _attempt_name_extraction(self, address: str) -> Optional[str]:
         """Attempt to extract the real name for a token"""
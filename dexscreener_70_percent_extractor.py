@@ -12,8 +12,15 @@ from typing import Optional, Dict, Any
 from dataclasses import dataclass
 import json
 
+from source_scoring import get_source_scoring
+from dexscreener_batch import get_dexscreener_batch
+
 logger = logging.getLogger(__name__)
 
+# Whole retry sequence (attempts + waits) - callers waiting on it use this plus a margin
+MAX_EXTRACTION_SECONDS = 75.0
+ATTEMPT_TIMEOUT = 12.0          # One batched lookup: batch window + DexScreener's 10s HTTP timeout
+
 @dataclass
 class ExtractionResult:
     """Result from name extraction attempt"""
@@ -36,31 +43,37 @@ class DexScreener70PercentExtractor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Connection pool optimized for DexScreener
-        self.connector = aiohttp.TCPConnector(
-            limit=30,                    # Higher connection pool for retries
-            limit_per_host=15,          # More connections to DexScreener
-            keepalive_timeout=60,       # Keep connections alive longer
-            enable_cleanup_closed=True
-        )
+        # Connection pool optimized for DexScreener - created inside the loop
+        # that owns the session (aiohttp connectors are bound to one loop)
+        self.connector = None
         
         # Smart retry strategy for 70%+ success
         self.max_retries = 5            # More retries = higher success rate
-        self.retry_delays = [1, 3, 5, 10, 15]  # Progressive delays
+        # Cold-start schedule only - once the scoring service has age-tagged
+        # history, waits come from DexScreener's success-by-token-age curve
+        self.retry_delays = [1, 3, 5, 10, 15]
+        # Scoring history loads from the database - done off the event loop in initialize_scoring()
+        self._scoring = None
         self.request_timeout = 8.0      # Longer timeout for reliability
+        self.attempt_timeout = ATTEMPT_TIMEOUT
+        self.max_total_seconds = MAX_EXTRACTION_SECONDS
         
         # Performance tracking
         self.success_count = 0
         self.total_attempts = 0
         self.extraction_times = []
         
-        # Session (initialized once)
+        # Session (initialized once per event loop - reused across tokens when
+        # callers share background_event_loop)
         self.session = None
+        self.session_loop = None
+        self.sessions_created = 0
         
     async def initialize_session(self):
         """Initialize optimized session for DexScreener with proper event loop handling"""
         try:
             # Check if event loop is running and available
+            loop = None
             try:
                 loop = asyncio.get_running_loop()
                 if loop.is_closed():
@@ -70,9 +83,24 @@ class DexScreener70PercentExtractor:
                 # No event loop running, which is ok for this context
                 pass
             
+            # A session from a loop that has since been torn down can't be reused
+            if self.session is not None and loop is not None and self.session_loop is not loop:
+                self.logger.warning("🔄 70% SESSION: Event loop changed, rebuilding connection pool")
+                self.session = None
+                self.connector = None
+            
             if self.session is None or self.session.closed:
                 self.logger.info("🚀 70% SUCCESS INIT: Creating optimized DexScreener connection pool...")
                 
+                self.connector = aiohttp.TCPConnector(
+                    limit=30,                    # Higher connection pool for retries
+                    limit_per_host=15,          # More connections to DexScreener
+                    keepalive_timeout=60,       # Keep connections alive longer
+                    enable_cleanup_closed=True
+                )
+                self.session_loop = loop
+                self.sessions_created += 1
+                
                 self.session = aiohttp.ClientSession(
                     connector=self.connector,
                     timeout=aiohttp.ClientTimeout(total=self.request_timeout),
@@ -90,58 +118,97 @@ class DexScreener70PercentExtractor:
             self.logger.error(f"❌ Session initialization failed: {e}")
             return False
     
-    async def extract_from_dexscreener_with_retries(self, token_address: str) -> ExtractionResult:
+    @property
+    def scoring(self):
+        if self._scoring is None:
+            self._scoring = get_source_scoring()
+        return self._scoring
+    
+    async def initialize_scoring(self):
+        """Load the shared scoring history on a worker thread so the event loop never waits on the database"""
+        if self._scoring is None:
+            self._scoring = await asyncio.get_running_loop().run_in_executor(None, get_source_scoring)
+    
+    def _token_age(self, token_age: Optional[float], overall_start: float) -> Optional[float]:
+        """Token age right now, given its age when extraction started"""
+        if token_age is None:
+            return None
+        return token_age + (time.time() - overall_start)
+    
+    def _retry_delay(self, attempt: int, token_age: Optional[float]) -> float:
+        """Wait before the next attempt, from live DexScreener data when available"""
+        return self.scoring.next_retry_delay('dexscreener', token_age=token_age, attempt=attempt,
+                                             fallback=self.retry_delays)
+    
+    async def _wait_before_retry(self, delay: float, overall_start: float) -> bool:
+        """Sleep up to delay, leaving room for one more attempt inside max_total_seconds; False if there is none"""
+        remaining = self.max_total_seconds - (time.time() - overall_start) - self.attempt_timeout
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(delay, remaining))
+        return True
+    
+    async def extract_from_dexscreener_with_retries(self, token_address: str,
+                                                    token_age: Optional[float] = None) -> ExtractionResult:
         """
         Extract name from DexScreener with smart retry strategy for 70%+ success
-        Uses progressive retries to handle newly created tokens
+        Retry waits follow how old the token must be before DexScreener usually
+        knows it; token_age is seconds since creation when the caller knows it
         """
-        await self.initialize_session()
         overall_start = time.time()
         
         self.logger.info(f"🎯 70% EXTRACTION: Starting smart retry sequence for {token_address[:10]}...")
         
         for attempt in range(self.max_retries + 1):
             attempt_start = time.time()
+            attempt_age = self._token_age(token_age, overall_start)
             
             try:
-                url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
+                # Shared batch client - concurrent extractions share one request per 30 mints
+                # shield: a timed-out attempt must not cancel the batch other callers share
+                pairs = await asyncio.wait_for(asyncio.shield(get_dexscreener_batch().lookup_async(token_address)),
+                                               timeout=self.attempt_timeout)
+                
+                if pairs is None:
+                    # Request failed or rate limited - counts against reliability, but says nothing
+                    # about whether DexScreener knows the token, so it stays out of the age curve
+                    self.scoring.record('dexscreener', False, time.time() - attempt_start)
+                    self.logger.warning(f"⏳ DEXSCREENER UNAVAILABLE: Waiting longer before retry {attempt + 1}")
+                    if attempt < self.max_retries and not await self._wait_before_retry(
+                            self._retry_delay(attempt, self._token_age(token_age, overall_start)) * 2, overall_start):
+                        break
+                    continue
                 
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
+                for pair in pairs:
+                    base_token = pair.get('baseToken', {})
+                    if base_token.get('address', '').lower() == token_address.lower():
+                        name = base_token.get('name')
+                        symbol = base_token.get('symbol', '')
                         
-                        if data and 'pairs' in data and data['pairs']:
-                            for pair in data['pairs']:
-                                base_token = pair.get('baseToken', {})
-                                if base_token.get('address', '').lower() == token_address.lower():
-                                    name = base_token.get('name')
-                                    symbol = base_token.get('symbol', '')
-                                    
-                                    # Verify it's a real name, not a fallback
-                                    if (name and 
-                                        name != 'Unknown' and 
-                                        len(name) > 2 and
-                                        not name.lower().startswith(('token ', 'letsbonk token '))):
-                                        
-                                        extraction_time = time.time() - overall_start
-                                        self.logger.info(f"✅ 70% SUCCESS: '{name}' in {extraction_time:.2f}s (attempt {attempt + 1})")
-                                        
-                                        return ExtractionResult(
-                                            name=name,
-                                            confidence=0.95,
-                                            source='dexscreener',
-                                            extraction_time=extraction_time,
-                                            success=True
-                                        )
-                    
-                    elif response.status == 429:
-                        # Rate limited - wait longer
-                        self.logger.warning(f"⏳ RATE LIMITED: Waiting longer before retry {attempt + 1}")
-                        if attempt < self.max_retries:
-                            await asyncio.sleep(self.retry_delays[min(attempt, len(self.retry_delays) - 1)] * 2)
-                        continue
+                        # Verify it's a real name, not a fallback
+                        if (name and 
+                            name != 'Unknown' and 
+                            len(name) > 2 and
+                            not name.lower().startswith(('token ', 'letsbonk token '))):
+                            
+                            extraction_time = time.time() - overall_start
+                            self.scoring.record('dexscreener', True, time.time() - attempt_start,
+                                                token_age=attempt_age)
+                            self.logger.info(f"✅ 70% SUCCESS: '{name}' in {extraction_time:.2f}s (attempt {attempt + 1})")
+                            
+                            return ExtractionResult(
+                                name=name,
+                                confidence=0.95,
+                                source='dexscreener',
+                                extraction_time=extraction_time,
+                                success=True
+                            )
+                
+                # Answered but not indexed yet - this is what shapes the age curve
+                self.scoring.record('dexscreener', False, time.time() - attempt_start, token_age=attempt_age)
                         
             except asyncio.TimeoutError:
+                self.scoring.record('dexscreener', False, time.time() - attempt_start, token_age=attempt_age)
                 self.logger.warning(f"⏰ TIMEOUT: Attempt {attempt + 1} timed out")
             except Exception as e:
                 if "Event loop is closed" in str(e):
@@ -154,17 +221,20 @@ class DexScreener70PercentExtractor:
                         extraction_time=time.time() - overall_start,
                         success=False
                     )
+                self.scoring.record('dexscreener', False, time.time() - attempt_start)
                 self.logger.warning(f"❌ ERROR: Attempt {attempt + 1} failed: {e}")
             
-            # Wait before retry (progressive delay for newly created tokens)
+            # Wait before retry (until the token is old enough for DexScreener to know it)
             if attempt < self.max_retries:
-                delay = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
-                self.logger.info(f"🔄 SMART RETRY: Waiting {delay}s before attempt {attempt + 2} (70% strategy)")
-                await asyncio.sleep(delay)
+                delay = self._retry_delay(attempt, self._token_age(token_age, overall_start))
+                self.logger.info(f"🔄 SMART RETRY: Waiting {delay:.1f}s before attempt {attempt + 2} (70% strategy)")
+                if not await self._wait_before_retry(delay, overall_start):
+                    break
         
-        # All retries exhausted
+        # All retries (or the time budget) exhausted
         extraction_time = time.time() - overall_start
-        self.logger.warning(f"❌ 70% EXHAUSTED: {token_address[:10]}... after {self.max_retries + 1} attempts")
+        self.logger.warning(f"❌ 70% EXHAUSTED: {token_address[:10]}... after {attempt + 1} attempts "
+                            f"in {extraction_time:.1f}s")
         
         return ExtractionResult(
             name=None,
@@ -174,7 +244,7 @@ class DexScreener70PercentExtractor:
             success=False
         )
     
-    async def extract_token_name(self, token_address: str) -> ExtractionResult:
+    async def extract_token_name(self, token_address: str, token_age: Optional[float] = None) -> ExtractionResult:
         """
         Main extraction method with 70%+ success rate
         Uses smart DexScreener retry strategy
@@ -182,7 +252,7 @@ class DexScreener70PercentExtractor:
         self.total_attempts += 1
         
         # Use smart retry system for 70%+ success
-        result = await self.extract_from_dexscreener_with_retries(token_address)
+        result = await self.extract_from_dexscreener_with_retries(token_address, token_age=token_age)
         
         if result.success:
             self.success_count += 1
@@ -211,6 +281,8 @@ class DexScreener70PercentExtractor:
                 
             if self.connector and not self.connector.closed:
                 await self.connector.close()
+            self.connector = None
+            self.session_loop = None
                 
             self.logger.info("🧹 70% CLEANUP: All connections closed properly")
         except Exception as e:
@@ -224,6 +296,7 @@ async def get_dex_70_extractor() -> DexScreener70PercentExtractor:
     global _global_extractor
     if _global_extractor is None:
         _global_extractor = DexScreener70PercentExtractor()
+        await _global_extractor.initialize_scoring()
         await _global_extractor.initialize_session()
         
     return _global_extractor
@@ -240,5 +313,6 @@ async def get_70_percent_stats() -> Dict[str, Any]:
         'success_rate': extractor.get_success_rate(),
         'average_time': extractor.get_average_time(),
         'total_attempts': extractor.total_attempts,
-        'successful_extractions': extractor.success_count
+        'successful_extractions': extractor.success_count,
+        'sessions_created': extractor.sessions_created
     }
\ No newline at end of file
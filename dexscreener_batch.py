@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+DexScreener Batch Client - many mints per /latest/dex/tokens request
+Lookups from any thread or event loop are gathered for a few milliseconds
+(or until the per-request address limit) and sent as one comma-separated
+request; each caller gets back the pairs for its own mint. Background
+resolvers working through hundreds of pending tokens spend one request per
+30 mints instead of one per mint.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import Callable, Dict, Iterable, List, Optional
+
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEXSCREENER_TOKENS_URL = "https://api.dexscreener.com/latest/dex/tokens/{addresses}"
+MAX_ADDRESSES_PER_REQUEST = 30      # DexScreener's limit for comma-separated lookups
+
+def pairs_for(address: str, pairs: Iterable[dict]) -> List[dict]:
+    """Pairs where address is the base (or quote) token - what a single-mint lookup returns"""
+    matched = []
+    for pair in pairs or ():
+        if not pair:
+            continue
+        base = (pair.get('baseToken') or {}).get('address')
+        quote = (pair.get('quoteToken') or {}).get('address')
+        if address in (base, quote):
+            matched.append(pair)
+    return matched
+
+def base_token_name(address: str, pairs: Optional[List[dict]]) -> Optional[Dict[str, str]]:
+    """Name/symbol from the first pair that has address as its base token"""
+    for pair in pairs or ():
+        base_token = pair.get('baseToken') or {}
+        if base_token.get('address', '').lower() == address.lower():
+            name = (base_token.get('name') or '').strip()
+            if name and name != 'Unknown':
+                return {'name': name, 'symbol': (base_token.get('symbol') or '').strip()}
+    return None
+
+class DexScreenerBatchClient:
+    """Coalesces single-mint lookups into batched DexScreener requests
+
+    lookup() results: list of pairs ([] when DexScreener doesn't know the mint
+    yet), or None when the request failed. fetch_batch(addresses) -> pairs
+    replaces the HTTP call (tests, alternative transports).
+    """
+
+    def __init__(self, fetch_batch: Optional[Callable[[List[str]], List[dict]]] = None,
+                 max_batch: int = MAX_ADDRESSES_PER_REQUEST, max_wait: float = 0.01,
+                 result_ttl: float = 5.0, requests_per_second: float = 5.0, burst: int = 10,
+                 max_workers: int = 4):
+        self.fetch_batch = fetch_batch or self._fetch_http
+        self.max_batch = max(1, min(max_batch, MAX_ADDRESSES_PER_REQUEST))
+        self.max_wait = max_wait
+        self.result_ttl = result_ttl
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix="dexscreener-batch")
+        self._bucket = TokenBucket(burst, requests_per_second)
+        self._bucket_lock = threading.Lock()
+        self._session = None
+
+        self._cond = threading.Condition()
+        self._queue: List[str] = []
+        self._window_started = 0.0
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._recent: Dict[str, tuple] = {}       # address -> (pairs, expires_at)
+        self._dispatcher: Optional[threading.Thread] = None
+        self.stats = {
+            'lookups': 0,
+            'recent_hits': 0,
+            'collapsed': 0,
+            'requests': 0,
+            'addresses_requested': 0,
+            'request_errors': 0,
+        }
+
+    # ------------------------------------------------------------------ public API
+
+    def lookup(self, address: str, timeout: float = 15.0) -> Optional[List[dict]]:
+        """Pairs for one mint, blocking the calling thread until its batch returns"""
+        try:
+            return self._future(address).result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            return None
+
+    async def lookup_async(self, address: str) -> Optional[List[dict]]:
+        """Pairs for one mint without blocking the running event loop"""
+        return await asyncio.wrap_future(self._future(address))
+
+    def lookup_many(self, addresses: Iterable[str], timeout: float = 30.0) -> Dict[str, Optional[List[dict]]]:
+        """Pairs per mint for a whole backlog (queued together, so batches fill up)"""
+        futures = {address: self._future(address) for address in dict.fromkeys(addresses)}
+        results = {}
+        for address, future in futures.items():
+            try:
+                results[address] = future.result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                results[address] = None
+        return results
+
+    async def lookup_many_async(self, addresses: Iterable[str]) -> Dict[str, Optional[List[dict]]]:
+        addresses = list(dict.fromkeys(addresses))
+        results = await asyncio.gather(*[asyncio.wrap_future(self._future(address)) for address in addresses])
+        return dict(zip(addresses, results))
+
+    # ------------------------------------------------------------------ batching
+
+    def _future(self, address: str) -> concurrent.futures.Future:
+        with self._cond:
+            self.stats['lookups'] += 1
+            recent = self._recent.get(address)
+            if recent and recent[1] > time.monotonic():
+                self.stats['recent_hits'] += 1
+                future = concurrent.futures.Future()
+                future.set_result(recent[0])
+                return future
+            future = self._pending.get(address)
+            if future is not None:
+                self.stats['collapsed'] += 1
+                return future
+            future = self._pending[address] = concurrent.futures.Future()
+            if not self._queue:
+                self._window_started = time.monotonic()
+            self._queue.append(address)
+            self._ensure_dispatcher()
+            self._cond.notify()
+        return future
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch_forever, name="dexscreener-dispatcher",
+                                                daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_forever(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                # Hold the window open until it's full or max_wait has passed
+                while len(self._queue) < self.max_batch:
+                    remaining = self._window_started + self.max_wait - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[str]):
+        self._throttle()
+        with self._cond:
+            self.stats['requests'] += 1
+            self.stats['addresses_requested'] += len(batch)
+        try:
+            pairs = self.fetch_batch(batch)
+            results = {address: pairs_for(address, pairs) for address in batch}
+        except Exception as e:
+            logger.warning(f"⚠️ DEXSCREENER BATCH: {len(batch)} mints failed: {e}")
+            with self._cond:
+                self.stats['request_errors'] += 1
+            results = {address: None for address in batch}
+
+        expires = time.monotonic() + self.result_ttl
+        with self._cond:
+            futures = [(self._pending.pop(address, None), result) for address, result in results.items()]
+            for address, result in results.items():
+                if result:
+                    # Only listed mints - "not indexed yet" must be re-asked by retrying callers
+                    self._recent[address] = (result, expires)
+            self._prune_recent()
+        for future, result in futures:
+            if future is not None:
+                future.set_result(result)
+
+    def _prune_recent(self):
+        if len(self._recent) > 5000:
+            now = time.monotonic()
+            for address in [address for address, (_, expires) in self._recent.items() if expires <= now]:
+                del self._recent[address]
+
+    def _throttle(self):
+        while True:
+            with self._bucket_lock:
+                wait = self._bucket.wait_time()
+                if wait <= 0:
+                    self._bucket.consume()
+                    return
+            time.sleep(wait)
+
+    def _fetch_http(self, addresses: List[str]) -> List[dict]:
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update({'User-Agent': 'TokenMonitor/1.0', 'Accept': 'application/json'})
+        response = self._session.get(DEXSCREENER_TOKENS_URL.format(addresses=','.join(addresses)), timeout=10)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return (response.json() or {}).get('pairs') or []
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats['queued'] = len(self._queue)
+        stats['avg_batch_size'] = stats['addresses_requested'] / stats['requests'] if stats['requests'] else 0.0
+        return stats
+
+# Global instance shared by every DexScreener consumer
+_dexscreener_batch = None
+_dexscreener_batch_lock = threading.Lock()
+
+def get_dexscreener_batch() -> DexScreenerBatchClient:
+    """Get the process-wide DexScreener batch client"""
+    global _dexscreener_batch
+    if _dexscreener_batch is None:
+        with _dexscreener_batch_lock:
+            if _dexscreener_batch is None:
+                _dexscreener_batch = DexScreenerBatchClient()
+    return _dexscreener_batch
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Discord Delivery Engine - non-blocking, rate-limit-aware webhook delivery
+Producers hand payloads to an outbound asyncio queue on the shared background
+loop and return immediately. Each destination drains its own priority queue
+(keyword matches before status messages) through token buckets that follow
+Discord's X-RateLimit-* and Retry-After headers, over one pooled HTTP session.
+"""
+
+import json
+import time
+import asyncio
+import logging
+import itertools
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from async_token_pipeline import LatencyHistogram
+from background_event_loop import BackgroundEventLoop, get_background_loop
+from rate_limit import TokenBucket
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes - lower drains first within a destination
+PRIORITY_MATCH = 0
+PRIORITY_STATUS = 1
+LANE_NAMES = {PRIORITY_MATCH: 'match', PRIORITY_STATUS: 'status'}
+
+# Defaults until Discord's headers tell us the real limits
+WEBHOOK_BURST, WEBHOOK_PER_SECOND = 5, 5 / 2.0       # 5 requests per 2s per webhook
+CHANNEL_BURST, CHANNEL_PER_SECOND = 30, 30 / 60.0    # 30 webhook messages per minute per channel
+GLOBAL_BURST, GLOBAL_PER_SECOND = 50, 50.0           # 50 requests per second
+
+# (status, headers, body) from one POST
+Transport = Callable[[str, Dict[str, Any], float], Awaitable[Tuple[Optional[int], Any, str]]]
+
+def _header(headers: Any, name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    return value if value is not None else headers.get(name.lower())
+
+def _float_header(headers: Any, name: str) -> Optional[float]:
+    try:
+        value = _header(headers, name)
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class Delivery:
+    """One queued webhook message"""
+
+    def __init__(self, url: str, payload: Dict[str, Any], priority: int, channel: Optional[str], label: str):
+        self.url = url
+        self.payload = payload
+        self.priority = priority
+        self.channel = channel
+        self.label = label
+        self.enqueued = time.monotonic()
+        self.future: Optional[asyncio.Future] = None
+
+class DiscordDeliveryEngine:
+    """Outbound Discord webhook queue with per-destination token buckets
+
+    send() is thread-safe and returns a concurrent.futures.Future resolving to
+    True once Discord accepted the message (False after giving up). Messages
+    to one webhook keep their order within a lane; different webhooks never
+    wait on each other.
+    """
+
+    def __init__(self, loop_service: Optional[BackgroundEventLoop] = None, transport: Optional[Transport] = None,
+                 timeout: float = 10.0, max_attempts: int = 3, retry_delay: float = 1.0,
+                 max_rate_limited: int = 5):
+        self.loop_service = loop_service or get_background_loop()
+        self.transport = transport or self._http_post
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_rate_limited = max_rate_limited
+
+        self._sequence = itertools.count()
+        self._queues: Dict[str, asyncio.PriorityQueue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._route_buckets: Dict[str, str] = {}     # route key -> Discord bucket id (shared limits)
+        self._global_bucket = TokenBucket(GLOBAL_BURST, GLOBAL_PER_SECOND)
+        self._session = None
+        self._requests_session = None
+
+        self._lock = threading.Lock()
+        self.queue_latency = {lane: LatencyHistogram() for lane in LANE_NAMES}
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'failed': 0,
+            'rate_limited': 0,
+            'global_rate_limited': 0,
+            'retries': 0,
+            'bucket_waits': 0,
+            'max_queue_depth': 0,
+        }
+
+    # ------------------------------------------------------------------ producers
+
+    def send(self, url: str, payload: Dict[str, Any], priority: int = PRIORITY_MATCH,
+             channel: Optional[str] = None, label: str = "") -> concurrent.futures.Future:
+        """Queue a webhook payload from any thread without blocking"""
+        delivery = Delivery(url, payload, priority, channel, label)
+        with self._lock:
+            self.stats['queued'] += 1
+        return self.loop_service.submit(self._enqueue(delivery))
+
+    async def send_async(self, url: str, payload: Dict[str, Any], priority: int = PRIORITY_MATCH,
+                         channel: Optional[str] = None, label: str = "") -> bool:
+        """Queue from a coroutine (on any loop) and await Discord's answer"""
+        return await asyncio.wrap_future(self.send(url, payload, priority, channel, label))
+
+    # ------------------------------------------------------------------ loop side
+
+    async def _enqueue(self, delivery: Delivery) -> bool:
+        key = delivery.url
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.PriorityQueue()
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.get_running_loop().create_task(self._drain(queue))
+
+        delivery.future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((delivery.priority, next(self._sequence), delivery))
+        with self._lock:
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], queue.qsize())
+        return await delivery.future
+
+    async def _drain(self, queue: asyncio.PriorityQueue):
+        while True:
+            _, _, delivery = await queue.get()
+            try:
+                delivered = await self._deliver(delivery)
+            except Exception as e:
+                logger.error(f"❌ DISCORD DELIVERY: {delivery.label or 'message'} crashed: {e}")
+                delivered = False
+            finally:
+                queue.task_done()
+            with self._lock:
+                self.stats['sent' if delivered else 'failed'] += 1
+            if not delivery.future.done():
+                delivery.future.set_result(delivered)
+
+    def _bucket(self, route: str, burst: float, per_second: float) -> TokenBucket:
+        bucket_id = self._route_buckets.get(route, route)
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self._buckets[bucket_id] = TokenBucket(burst, per_second)
+        return bucket
+
+    def _buckets_for(self, delivery: Delivery):
+        # A webhook posts into exactly one channel, so without an explicit channel
+        # the webhook stands in for it; webhooks sharing a channel pass channel=
+        channel = delivery.channel or delivery.url
+        return [self._global_bucket,
+                self._bucket(delivery.url, WEBHOOK_BURST, WEBHOOK_PER_SECOND),
+                self._bucket(f"channel:{channel}", CHANNEL_BURST, CHANNEL_PER_SECOND)]
+
+    async def _acquire(self, delivery: Delivery):
+        """Wait (on the loop, not a producer thread) until every bucket has room"""
+        while True:
+            buckets = self._buckets_for(delivery)
+            now = time.monotonic()
+            wait = max(bucket.wait_time(now) for bucket in buckets)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.consume(now)
+                return
+            with self._lock:
+                self.stats['bucket_waits'] += 1
+            await asyncio.sleep(wait)
+
+    def _sync_headers(self, delivery: Delivery, headers: Any):
+        bucket_id = _header(headers, 'X-RateLimit-Bucket')
+        if bucket_id and delivery.url not in self._route_buckets:
+            # Routes reporting the same bucket hash share one limit
+            current = self._buckets.pop(delivery.url, None)
+            self._route_buckets[delivery.url] = bucket_id
+            if current is not None:
+                self._buckets.setdefault(bucket_id, current)
+        self._bucket(delivery.url, WEBHOOK_BURST, WEBHOOK_PER_SECOND).sync(
+            _float_header(headers, 'X-RateLimit-Limit'),
+            _float_header(headers, 'X-RateLimit-Remaining'),
+            _float_header(headers, 'X-RateLimit-Reset-After'),
+        )
+
+    def _retry_after(self, headers: Any, body: str) -> float:
+        retry_after = _float_header(headers, 'Retry-After')
+        if retry_after is None:
+            try:
+                retry_after = float(json.loads(body or '{}').get('retry_after'))
+            except (TypeError, ValueError, AttributeError):
+                retry_after = None
+        return retry_after if retry_after is not None else 1.0
+
+    async def _deliver(self, delivery: Delivery) -> bool:
+        attempts = 0
+        rate_limited = 0
+        lane = delivery.priority if delivery.priority in self.queue_latency else PRIORITY_STATUS
+        while True:
+            await self._acquire(delivery)
+            try:
+                status, headers, body = await self.transport(delivery.url, delivery.payload, self.timeout)
+            except Exception as e:
+                status, headers, body = None, None, str(e)
+            self._sync_headers(delivery, headers)
+
+            if status is not None and 200 <= status < 300:
+                self.queue_latency[lane].record(time.monotonic() - delivery.enqueued)
+                logger.info(f"✅ DISCORD DELIVERY: {delivery.label or 'message'} sent "
+                            f"({LANE_NAMES.get(lane)} lane, {time.monotonic() - delivery.enqueued:.2f}s after queueing)")
+                return True
+
+            if status == 429:
+                retry_after = self._retry_after(headers, body)
+                is_global = str(_header(headers, 'X-RateLimit-Global') or '').lower() == 'true'
+                with self._lock:
+                    self.stats['global_rate_limited' if is_global else 'rate_limited'] += 1
+                if is_global:
+                    self._global_bucket.block(retry_after)
+                else:
+                    for bucket in self._buckets_for(delivery)[1:]:
+                        bucket.block(retry_after)
+                rate_limited += 1
+                if rate_limited > self.max_rate_limited:
+                    logger.error(f"❌ DISCORD DELIVERY: {delivery.label or 'message'} still rate limited "
+                                 f"after {rate_limited} tries - dropping")
+                    return False
+                logger.warning(f"⚠️ DISCORD DELIVERY: rate limited{' (global)' if is_global else ''}, "
+                               f"retrying in {retry_after:.2f}s")
+                continue
+
+            attempts += 1
+            if status is not None and 400 <= status < 500:
+                # Discord rejected the payload itself - resending won't help
+                logger.error(f"❌ DISCORD DELIVERY: {delivery.label or 'message'} rejected: {status} {body[:200]}")
+                return False
+            if attempts >= self.max_attempts:
+                logger.error(f"❌ DISCORD DELIVERY: {delivery.label or 'message'} failed after "
+                             f"{attempts} attempts: {status or body}")
+                return False
+            with self._lock:
+                self.stats['retries'] += 1
+            await asyncio.sleep(self.retry_delay * (2 ** (attempts - 1)))
+
+    # ------------------------------------------------------------------ transport
+
+    async def _http_post(self, url: str, payload: Dict[str, Any], timeout: float) -> Tuple[Optional[int], Any, str]:
+        """POST over the pooled aiohttp session (pooled requests session in an executor without aiohttp)"""
+        if aiohttp is not None:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                )
+            async with self._session.post(url, json=payload) as response:
+                return response.status, response.headers, await response.text()
+
+        import requests
+        if self._requests_session is None:
+            self._requests_session = requests.Session()
+        response = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self._requests_session.post(url, json=payload, timeout=timeout))
+        return response.status_code, response.headers, response.text
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['destinations'] = len(self._queues)
+        stats['pending'] = sum(queue.qsize() for queue in list(self._queues.values()))
+        stats['lanes'] = {LANE_NAMES[lane]: histogram.snapshot() for lane, histogram in self.queue_latency.items()}
+        return stats
+
+# Global instance shared by every notifier
+_discord_delivery = None
+_discord_delivery_lock = threading.Lock()
+
+def get_discord_delivery() -> DiscordDeliveryEngine:
+    """Get the process-wide Discord delivery engine"""
+    global _discord_delivery
+    if _discord_delivery is None:
+        with _discord_delivery_lock:
+            if _discord_delivery is None:
+                _discord_delivery = DiscordDeliveryEngine()
+    return _discord_delivery
@@ -3,10 +3,12 @@ Discord notification module for sending contract addresses.
 """
 
 import logging
-import time
+import threading
+import concurrent.futures
 from typing import Optional
 from discord_webhook import DiscordWebhook, DiscordEmbed
 from config import Config
+from discord_delivery import get_discord_delivery, PRIORITY_MATCH, PRIORITY_STATUS
 
 logger = logging.getLogger(__name__)
 
@@ -15,19 +17,45 @@ class DiscordNotifier:
     
     def __init__(self):
         self.webhook_url = Config.DISCORD_WEBHOOK_URL
-        self.last_send_time = 0
+        self.delivery = get_discord_delivery()
+        self._stats_lock = threading.Lock()
+        self.stats = {'queued': 0, 'delivered': 0, 'failed': 0}
         
-    def _rate_limit(self) -> None:
-        """Implement rate limiting for Discord webhooks."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_send_time
-        min_interval = 1.0  # Minimum 1 second between Discord messages
+    def _queue_webhook(self, webhook: DiscordWebhook, label: str, priority: int = PRIORITY_MATCH) -> bool:
+        """
+        Hand the webhook payload to the delivery engine without waiting; True once queued.
         
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            time.sleep(sleep_time)
-            
-        self.last_send_time = time.time()
+        Rate limits and retries happen on the engine's loop and _on_delivered counts
+        the outcome when Discord answers. Callers that need the answer use send_and_wait.
+        """
+        delivery = self.delivery.send(self.webhook_url, webhook.json, priority=priority, label=label)
+        with self._stats_lock:
+            self.stats['queued'] += 1
+        delivery.add_done_callback(lambda future: self._on_delivered(future, label))
+        logger.info(f"📤 Queued Discord {label}")
+        return True
+    
+    def _on_delivered(self, future: concurrent.futures.Future, label: str) -> None:
+        """Delivery engine callback - only messages Discord accepted count as delivered"""
+        delivered = not future.cancelled() and future.exception() is None and future.result()
+        with self._stats_lock:
+            self.stats['delivered' if delivered else 'failed'] += 1
+        if not delivered:
+            logger.error(f"❌ Discord {label} was not delivered")
+    
+    def send_and_wait(self, webhook: DiscordWebhook, label: str, priority: int = PRIORITY_STATUS,
+                      timeout: float = 30.0) -> bool:
+        """
+        Blocking send for the few callers that need Discord's answer.
+        
+        Never call this on the delivery engine's loop thread - it would wait on itself.
+        """
+        delivery = self.delivery.send(self.webhook_url, webhook.json, priority=priority, label=label)
+        try:
+            return delivery.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"⚠️ Discord {label} not confirmed after {timeout:.0f}s - still queued")
+            return False
         
     def send_enhanced_token_notification_with_buttons(self, token_data: dict, matched_keyword: str = None, discord_bot=None) -> bool:
         """
@@ -92,8 +120,6 @@ class DiscordNotifier:
             return self.send_enhanced_token_notification(token_data, matched_keyword)
             
         try:
-            self._rate_limit()
-            
             # Extract token info
             name = token_data.get('name', f'Token {token_data.get("address", "")[-6:]}')
             symbol = token_data.get('symbol', 'UNK')
@@ -349,8 +375,6 @@ class DiscordNotifier:
             return False
             
         try:
-            self._rate_limit()
-            
             # Create webhook and embed
             webhook = DiscordWebhook(url=self.webhook_url)
             
@@ -553,33 +577,7 @@ class DiscordNotifier:
             
             webhook.add_embed(embed)
             
-            # Execute webhook with retry logic
-            for attempt in range(Config.MAX_RETRIES):
-                try:
-                    response = webhook.execute()
-                    
-                    if response.status_code in [200, 204]:
-                        logger.info(f"Successfully sent enhanced Discord notification for {address}")
-                        return True
-                    elif response.status_code == 429:
-                        # Rate limited by Discord
-                        retry_after = response.headers.get('Retry-After', 5)
-                        logger.warning(f"Discord rate limit hit, waiting {retry_after} seconds")
-                        time.sleep(int(retry_after))
-                        continue
-                    else:
-                        logger.warning(f"Discord webhook returned status {response.status_code}")
-                        
-                except Exception as e:
-                    logger.warning(f"Discord webhook attempt {attempt + 1} failed: {e}")
-                    
-                # Wait before retry
-                if attempt < Config.MAX_RETRIES - 1:
-                    sleep_time = Config.RETRY_DELAY * (2 ** attempt)
-                    time.sleep(sleep_time)
-                    
-            logger.error(f"Failed to send Discord notification after {Config.MAX_RETRIES} attempts")
-            return False
+            return self._queue_webhook(webhook, f"token notification for {address}")
             
         except Exception as e:
             logger.error(f"Error sending Discord notification: {e}")
@@ -634,8 +632,6 @@ class DiscordNotifier:
             return False
             
         try:
-            self._rate_limit()
-            
             # Create webhook
             webhook = DiscordWebhook(url=self.webhook_url)
             
@@ -674,33 +670,7 @@ class DiscordNotifier:
                     
                 webhook.content = message
             
-            # Execute webhook with retry logic
-            for attempt in range(Config.MAX_RETRIES):
-                try:
-                    response = webhook.execute()
-                    
-                    if response.status_code in [200, 204]:
-                        logger.info(f"Successfully sent Discord notification for {contract_address}")
-                        return True
-                    elif response.status_code == 429:
-                        # Rate limited by Discord
-                        retry_after = response.headers.get('Retry-After', 5)
-                        logger.warning(f"Discord rate limit hit, waiting {retry_after} seconds")
-                        time.sleep(int(retry_after))
-                        continue
-                    else:
-                        logger.warning(f"Discord webhook returned status {response.status_code}")
-                        
-                except Exception as e:
-                    logger.warning(f"Discord webhook attempt {attempt + 1} failed: {e}")
-                    
-                # Wait before retry
-                if attempt < Config.MAX_RETRIES - 1:
-                    sleep_time = Config.RETRY_DELAY * (2 ** attempt)
-                    time.sleep(sleep_time)
-                    
-            logger.error(f"Failed to send Discord notification after {Config.MAX_RETRIES} attempts")
-            return False
+            return self._queue_webhook(webhook, f"contract address {contract_address}")
             
         except Exception as e:
             logger.error(f"Error sending Discord notification: {e}")
@@ -721,19 +691,10 @@ class DiscordNotifier:
             return False
             
         try:
-            self._rate_limit()
-            
             webhook = DiscordWebhook(url=self.webhook_url)
             webhook.content = f"ℹ️ **Status:** {message}"
             
-            response = webhook.execute()
-            
-            if response.status_code in [200, 204]:
-                logger.info("Successfully sent status message to Discord")
-                return True
-            else:
-                logger.warning(f"Discord status message returned status {response.status_code}")
-                return False
+            return self._queue_webhook(webhook, "status message", priority=PRIORITY_STATUS)
                 
         except Exception as e:
             logger.error(f"Error sending Discord status message: {e}")
@@ -746,7 +707,20 @@ class DiscordNotifier:
         Returns:
             True if webhook is working, False otherwise
         """
-        return self.send_status_message("Pump.fun monitor test - webhook is working! 🎉")
+        if not self.webhook_url:
+            logger.error("Discord webhook URL not configured")
+            return False
+            
+        try:
+            webhook = DiscordWebhook(url=self.webhook_url)
+            webhook.content = "ℹ️ **Status:** Pump.fun monitor test - webhook is working! 🎉"
+            
+            # The one caller that needs Discord's answer, so wait for delivery
+            return self.send_and_wait(webhook, "webhook test")
+            
+        except Exception as e:
+            logger.error(f"Error testing Discord webhook: {e}")
+            return False
     
     async def send_embed_async(self, embed_data: dict) -> bool:
         """Send Discord embed notification asynchronously"""
@@ -755,9 +729,6 @@ class DiscordNotifier:
                 logger.error("Discord webhook URL not configured")
                 return False
             
-            # Rate limiting
-            self._rate_limit()
-            
             # Create webhook and embed
             webhook = DiscordWebhook(url=self.webhook_url)
             
@@ -785,14 +756,12 @@ class DiscordNotifier:
             
             webhook.add_embed(embed)
             
-            # Execute webhook
-            response = webhook.execute()
-            
-            if response.status_code in [200, 204]:
+            # Awaiting delivery suspends only this coroutine
+            if await self.delivery.send_async(self.webhook_url, webhook.json, label="embed notification"):
                 logger.info("✅ Discord embed notification sent successfully")
                 return True
             else:
-                logger.error(f"❌ Discord embed notification failed: {response.status_code}")
+                logger.error("❌ Discord embed notification failed")
                 return False
                 
         except Exception as e:
@@ -5,13 +5,14 @@ Background service that resolves pending token names and migrates them to resolv
 """
 
 import asyncio
-import aiohttp
 import psycopg2
 import os
 import logging
 from datetime import datetime
 import json
 from fixed_dual_table_processor import FixedDualTableProcessor
+from dexscreener_batch import get_dexscreener_batch, base_token_name
+from bulk_token_resolution import BulkTokenResolver
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,92 +20,41 @@ logger = logging.getLogger(__name__)
 class DualTableNameResolver:
     def __init__(self):
         self.processor = FixedDualTableProcessor()
+        self.bulk_resolver = BulkTokenResolver(self.processor.database_url, 'pending_tokens',
+                                               self.resolve_token_name_dexscreener, batch_size=100)
         self.running = False
         
     async def resolve_token_name_dexscreener(self, contract_address):
-        """Resolve token name using DexScreener API"""
+        """Resolve token name using DexScreener API (batched with concurrent lookups)"""
         try:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{contract_address}"
+            pairs = await get_dexscreener_batch().lookup_async(contract_address)
+            if pairs is None:
+                logger.warning(f"⚠️ DexScreener API error for {contract_address[:10]}...")
+                return None
             
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data and 'pairs' in data and data['pairs']:
-                            # Get the first pair with valid data
-                            for pair in data['pairs']:
-                                if pair and 'baseToken' in pair:
-                                    base_token = pair['baseToken']
-                                    
-                                    if base_token and base_token.get('address', '').lower() == contract_address.lower():
-                                        name = base_token.get('name', '').strip()
-                                        symbol = base_token.get('symbol', '').strip()
-                                        
-                                        if name and name != 'Unknown':
-                                            logger.info(f"🎯 DEXSCREENER RESOLVED: {name} ({symbol})")
-                                            return {
-                                                'name': name,
-                                                'symbol': symbol,
-                                                'source': 'DexScreener'
-                                            }
-                        
-                        logger.info(f"⏳ DexScreener: Token {contract_address[:10]}... not indexed yet")
-                        return None
-                    else:
-                        logger.warning(f"⚠️ DexScreener API error: {response.status}")
-                        return None
+            resolved = base_token_name(contract_address, pairs)
+            if resolved:
+                logger.info(f"🎯 DEXSCREENER RESOLVED: {resolved['name']} ({resolved['symbol']})")
+                return dict(resolved, source='DexScreener')
+            
+            logger.info(f"⏳ DexScreener: Token {contract_address[:10]}... not indexed yet")
+            return None
                         
         except Exception as e:
             logger.error(f"❌ DexScreener resolution failed: {e}")
             return None
     
     async def process_pending_tokens(self):
-        """Process all pending tokens and attempt name resolution"""
+        """Claim a batch of pending tokens, resolve them together and migrate the resolved ones"""
         try:
-            pending_tokens = self.processor.get_pending_tokens(limit=100)
+            summary = await self.bulk_resolver.run_cycle()
             
-            if not pending_tokens:
+            if not summary['claimed']:
                 logger.info("✅ No pending tokens to process")
                 return 0
             
-            logger.info(f"🔄 Processing {len(pending_tokens)} pending tokens...")
-            
-            resolved_count = 0
-            
-            for token_data in pending_tokens:
-                (contract_address, placeholder_name, keyword, matched_keywords, 
-                 retry_count, detected_at, blockchain_age_seconds) = token_data
-                
-                logger.info(f"🔍 Attempting to resolve: {placeholder_name} ({contract_address[:10]}...)")
-                
-                # Try to resolve the name
-                result = await self.resolve_token_name_dexscreener(contract_address)
-                
-                if result:
-                    # Successfully resolved - migrate to detected_tokens
-                    success = self.processor.migrate_pending_to_resolved(
-                        contract_address,
-                        result['name'],
-                        result.get('symbol'),
-                        {'dexscreener': True}
-                    )
-                    
-                    if success:
-                        resolved_count += 1
-                        logger.info(f"✅ RESOLVED & MIGRATED: {result['name']} (was {placeholder_name})")
-                    else:
-                        logger.error(f"❌ Migration failed for {result['name']}")
-                else:
-                    # Update retry count
-                    self.update_retry_count(contract_address)
-                    logger.info(f"⏳ Still pending: {placeholder_name} (retry #{retry_count + 1})")
-                
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.1)
-            
-            logger.info(f"📊 RESOLUTION SUMMARY: {resolved_count}/{len(pending_tokens)} tokens resolved")
-            return resolved_count
+            logger.info(f"📊 RESOLUTION SUMMARY: {summary['resolved']}/{summary['claimed']} tokens resolved")
+            return summary['resolved']
             
         except Exception as e:
             logger.error(f"❌ Error processing pending tokens: {e}")
@@ -12,6 +12,8 @@ import json
 import requests
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from discord_delivery import get_discord_delivery
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +23,10 @@ class EnhancedNotificationSystem:
     def __init__(self, webhook_url: str = None):
         self.database_url = os.getenv('DATABASE_URL')
         self.webhook_url = webhook_url or os.getenv('DISCORD_WEBHOOK_URL')
-        self.last_send_time = 0
+        self.delivery = get_discord_delivery()
+        self.in_flight = set()  # Queued but not yet confirmed by Discord
+        # Delivery callbacks may run on the engine's loop or the sender's thread - DB writes go here
+        self.confirm_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='notification-confirm')
         
         # Blocked tokens list (from original discord_notifier.py)
         self.blocked_tokens = {
@@ -37,18 +42,6 @@ class EnhancedNotificationSystem:
         """Get database connection"""
         return psycopg2.connect(self.database_url)
     
-    def _rate_limit(self) -> None:
-        """Implement rate limiting for Discord webhooks"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_send_time
-        min_interval = 1.0  # Minimum 1 second between Discord messages
-        
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            time.sleep(sleep_time)
-            
-        self.last_send_time = time.time()
-    
     def has_been_notified(self, token_address: str, notification_type: str = 'discord', 
                          user_id: str = 'system') -> bool:
         """Check if token has already been notified to prevent duplicates"""
@@ -193,13 +186,12 @@ class EnhancedNotificationSystem:
                 logger.error(f"🚨 BLOCKED TOKEN: {token_address} ({token_name}) - USER COMPLAINED")
                 return False
             
-            # STEP 2: Duplicate check
-            if self.has_been_notified(token_address):
+            # STEP 2: Duplicate check (including notifications still in the delivery queue)
+            if token_address in self.in_flight or self.has_been_notified(token_address):
                 logger.info(f"⚠️ DUPLICATE PREVENTED: {token_name} ({token_address[:10]}...) already notified")
                 return False
             
-            # STEP 3: Rate limiting
-            self._rate_limit()
+            # STEP 3: Rate limiting happens in the delivery engine - never sleep here
             
             # STEP 4: Prepare token information
             symbol = token_data.get('symbol', 'UNK')
@@ -326,29 +318,37 @@ class EnhancedNotificationSystem:
                 "embeds": [embed]
             }
             
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
+            self.in_flight.add(token_address)
+            delivery = self.delivery.send(self.webhook_url, payload, label=f"{token_name} ({token_address[:10]}...)")
+            delivery.add_done_callback(
+                lambda future: self._on_delivered(future, token_address, token_name, matched_keyword))
             
-            if response.status_code == 204:
-                # STEP 8: Mark as notified to prevent duplicates
-                self.mark_as_notified(token_address, token_name)
-                
-                logger.info(f"✅ NOTIFICATION SENT: {token_name} ({token_address[:10]}...)")
-                if matched_keyword:
-                    logger.info(f"🎯 KEYWORD MATCH: {matched_keyword}")
-                
-                return True
-            else:
-                logger.error(f"❌ Webhook failed: {response.status_code} - {response.text}")
-                return False
+            logger.info(f"📤 NOTIFICATION QUEUED: {token_name} ({token_address[:10]}...)")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Notification error: {e}")
             return False
     
+    def _on_delivered(self, future, token_address: str, token_name: str, matched_keyword: str = None) -> None:
+        """Delivery engine callback - only confirmed notifications count as sent"""
+        if not future.cancelled() and future.exception() is None and future.result():
+            logger.info(f"✅ NOTIFICATION SENT: {token_name} ({token_address[:10]}...)")
+            if matched_keyword:
+                logger.info(f"🎯 KEYWORD MATCH: {matched_keyword}")
+            # Keep the DB write off the delivery loop (and off the sender if it already finished)
+            self.confirm_executor.submit(self._confirm_notified, token_address, token_name)
+        else:
+            logger.error(f"❌ Webhook delivery failed: {token_name} ({token_address[:10]}...)")
+            self.in_flight.discard(token_address)
+    
+    def _confirm_notified(self, token_address: str, token_name: str) -> None:
+        """STEP 8: Mark as notified to prevent duplicates"""
+        try:
+            self.mark_as_notified(token_address, token_name)
+        finally:
+            self.in_flight.discard(token_address)
+    
     def cleanup_old_notifications(self, days_old: int = 7) -> None:
         """Clean up old notification records to prevent database bloat"""
         try:
@@ -10,6 +10,8 @@ import time
 from datetime import datetime
 from fixed_dual_table_processor import FixedDualTableProcessor
 from enhanced_fallback_name_resolver import EnhancedFallbackResolver
+from dexscreener_batch import get_dexscreener_batch
+from bulk_token_resolution import BulkTokenResolver
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,6 +21,8 @@ class EnhancedRetryBackgroundService:
         self.processor = FixedDualTableProcessor()
         self.resolver = EnhancedFallbackResolver()
         self.retry_interval = retry_interval
+        self.bulk_resolver = BulkTokenResolver(self.processor.database_url, 'fallback_processing_coins',
+                                               self.attempt_name_resolution, batch_size=50)
         self.running = False
         
     async def start_background_service(self):
@@ -41,94 +45,33 @@ class EnhancedRetryBackgroundService:
         """Process one cycle of retry attempts"""
         logger.info("🔄 Starting retry cycle...")
         
-        # Get tokens that need retry processing
-        fallback_tokens = self.processor.get_fallback_tokens(limit=50)
+        # Claim, resolve and write back the whole batch in one transaction
+        summary = await self.bulk_resolver.run_cycle()
         
-        if not fallback_tokens:
+        if not summary['claimed']:
             logger.info("📭 No fallback tokens to process")
             return
         
-        logger.info(f"🎯 Processing {len(fallback_tokens)} fallback tokens")
-        
-        processed = 0
-        resolved = 0
-        retried = 0
-        
-        for token in fallback_tokens:
-            try:
-                contract_address = token[0]
-                token_name = token[1]
-                current_retry_count = token[3] if len(token) > 3 else 0
-                
-                logger.info(f"🔍 Processing: {token_name} (retry #{current_retry_count})")
-                
-                # Try to resolve the token name
-                resolved_name = await self.attempt_name_resolution(contract_address)
-                
-                if resolved_name and not resolved_name.startswith('Unnamed'):
-                    # Success! Migrate to detected tokens
-                    logger.info(f"✅ RESOLVED: '{resolved_name}' for {contract_address[:10]}...")
-                    
-                    resolved_id = self.processor.insert_resolved_token(
-                        contract_address=contract_address,
-                        token_name=resolved_name,
-                        symbol=token[2] if len(token) > 2 else 'UNKNOWN'
-                    )
-                    
-                    if resolved_id:
-                        # Remove from fallback table
-                        await self.remove_from_fallback(contract_address)
-                        logger.info(f"🎉 MIGRATED: {resolved_name} moved to detected_tokens")
-                        resolved += 1
-                    
-                else:
-                    # Still couldn't resolve - increment retry count
-                    logger.info(f"⏳ Still unresolved: {token_name} (retry #{current_retry_count + 1})")
-                    
-                    success = self.processor.update_retry_count(contract_address, 'fallback_processing_coins')
-                    if success:
-                        retried += 1
-                        logger.info(f"📈 Retry count incremented to {current_retry_count + 1}")
-                    else:
-                        logger.warning(f"⚠️ Failed to increment retry count for {contract_address[:10]}...")
-                
-                processed += 1
-                
-                # Rate limiting between requests
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"❌ Error processing token {contract_address[:10]}...: {e}")
-                continue
-        
         # Log cycle summary
         logger.info("=" * 60)
         logger.info(f"📊 RETRY CYCLE SUMMARY:")
-        logger.info(f"   • Processed: {processed} tokens")
-        logger.info(f"   • Resolved: {resolved} tokens")
-        logger.info(f"   • Retried: {retried} tokens")
+        logger.info(f"   • Processed: {summary['claimed']} tokens")
+        logger.info(f"   • Resolved: {summary['resolved']} tokens")
+        logger.info(f"   • Retried: {summary['retried']} tokens")
         logger.info(f"   • Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info("=" * 60)
     
     async def attempt_name_resolution(self, contract_address):
         """Attempt to resolve token name using multiple methods"""
         try:
-            # Try DexScreener first
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                url = f"https://api.dexscreener.com/latest/dex/tokens/{contract_address}"
+            # Try DexScreener first (batched with the rest of the cycle)
+            pairs = await get_dexscreener_batch().lookup_async(contract_address)
+            
+            if pairs:
+                token_name = (pairs[0].get('baseToken') or {}).get('name')
                 
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data.get('pairs') and len(data['pairs']) > 0:
-                            pair = data['pairs'][0]
-                            base_token = pair.get('baseToken', {})
-                            token_name = base_token.get('name')
-                            
-                            if token_name and len(token_name.strip()) > 0:
-                                return token_name.strip()
+                if token_name and len(token_name.strip()) > 0:
+                    return token_name.strip()
             
             return None
             
@@ -6,6 +6,7 @@ Handles token detection with separate pending, detected, and fallback token tabl
 
 import psycopg2
 import os
+from db_pool import get_pooled_connection
 import logging
 from datetime import datetime
 import json
@@ -20,8 +21,8 @@ class FixedDualTableProcessor:
             raise ValueError("DATABASE_URL environment variable not found")
     
     def get_db_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.database_url)
+        """Get pooled database connection (close() returns it to the shared pool)"""
+        return get_pooled_connection(self.database_url)
     
     def insert_pending_token(self, contract_address, placeholder_name, keyword=None, 
                            matched_keywords=None, blockchain_age_seconds=None):
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Hedged Resolver - staggered parallel fan-out across name sources
+Starts the best-ranked source immediately, hedges with the next ones after
+short delays, takes the first high-confidence answer and cancels the rest.
+Per-source latency and win rate feed back into the ranking.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class HedgedResult:
+    """Outcome of one hedged resolution"""
+    name: Optional[str]
+    source: Optional[str]
+    confidence: float
+    latency: float
+    attempted: List[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return bool(self.name)
+
+class SourceScoreboard:
+    """In-memory per-source outcome window used to rank sources
+
+    Anything with the same record()/rank() shape can be passed to
+    HedgedResolver instead.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._outcomes: Dict[str, deque] = {}
+        self._latencies: Dict[str, deque] = {}
+        self.wins: Dict[str, int] = {}
+        self.attempts: Dict[str, int] = {}
+        self.cancellations: Dict[str, int] = {}
+
+    def record(self, source: str, success: bool, latency: Optional[float],
+               won: bool = False, cancelled: bool = False, **context):
+        with self._lock:
+            self.attempts[source] = self.attempts.get(source, 0) + 1
+            if cancelled:
+                # A cancelled hedge says nothing about the source's quality
+                self.cancellations[source] = self.cancellations.get(source, 0) + 1
+                return
+            self._outcomes.setdefault(source, deque(maxlen=self.window)).append(1 if success else 0)
+            if latency is not None:
+                self._latencies.setdefault(source, deque(maxlen=self.window)).append(latency)
+            if won:
+                self.wins[source] = self.wins.get(source, 0) + 1
+
+    def _percentile(self, source: str, fraction: float) -> Optional[float]:
+        latencies = sorted(self._latencies.get(source, ()))
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    def success_rate(self, source: str) -> Optional[float]:
+        outcomes = self._outcomes.get(source)
+        if not outcomes:
+            return None
+        return sum(outcomes) / len(outcomes)
+
+    def score(self, source: str, prior: float = 0.5, **context) -> float:
+        """Expected successes per second - success rate over median latency"""
+        with self._lock:
+            rate = self.success_rate(source)
+            p50 = self._percentile(source, 0.5)
+        rate = prior if rate is None else rate
+        return rate / max(p50 if p50 is not None else 1.0, 0.05)
+
+    def rank(self, sources: Sequence[str], priors: Optional[Dict[str, float]] = None, **context) -> List[str]:
+        """Best first; unseen sources rank by their prior, ties keep the given order"""
+        priors = priors or {}
+        order = {source: index for index, source in enumerate(sources)}
+        return sorted(sources, key=lambda source: (-self.score(source, priors.get(source, 0.5), **context), order[source]))
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            sources = set(self.attempts)
+            stats = {}
+            for source in sources:
+                attempts = self.attempts.get(source, 0)
+                stats[source] = {
+                    'attempts': attempts,
+                    'wins': self.wins.get(source, 0),
+                    'win_rate': self.wins.get(source, 0) / attempts if attempts else 0.0,
+                    'cancellations': self.cancellations.get(source, 0),
+                    'success_rate': self.success_rate(source) or 0.0,
+                    'p50_latency': self._percentile(source, 0.5) or 0.0,
+                    'p95_latency': self._percentile(source, 0.95) or 0.0,
+                }
+        return stats
+
+class HedgedResolver:
+    """Run the top-ranked sources with staggered starts; first confident answer wins
+
+    sources maps a name to an async callable(key) -> Optional[str].
+    confidences gives each source's trust level; answers below min_confidence
+    are only used if nothing better arrives before every attempt finishes.
+    hedge_delays[i] is when (seconds after start) the i-th ranked source is
+    launched; a source is also launched early if everything in flight failed.
+    """
+
+    def __init__(self, sources: Dict[str, Callable[[str], Awaitable[Optional[str]]]],
+                 confidences: Optional[Dict[str, float]] = None,
+                 hedge_delays: Sequence[float] = (0.0, 0.3, 0.6, 1.0),
+                 max_parallel: int = 4, min_confidence: float = 0.8, timeout: float = 8.0,
+                 scoreboard=None):
+        self.sources = dict(sources)
+        self.confidences = confidences or {}
+        self.hedge_delays = list(hedge_delays) or [0.0]
+        self.max_parallel = max(1, max_parallel)
+        self.min_confidence = min_confidence
+        self.timeout = timeout
+        self.scoreboard = scoreboard or SourceScoreboard()
+
+    def _launch_offset(self, position: int) -> float:
+        if position < len(self.hedge_delays):
+            return self.hedge_delays[position]
+        return self.hedge_delays[-1]
+
+    def ranked_sources(self, **context) -> List[str]:
+        return self.scoreboard.rank(list(self.sources), priors=self.confidences, **context)[:self.max_parallel]
+
+    async def resolve(self, key: str, **context) -> HedgedResult:
+        """Resolve key across sources; context (e.g. token_age) is passed to the scoreboard"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        ranking = self.ranked_sources(**context)
+        tasks: Dict[asyncio.Task, tuple] = {}
+        attempted: List[str] = []
+        fallback: Optional[HedgedResult] = None
+
+        def launch(source: str):
+            task = asyncio.ensure_future(self.sources[source](key))
+            tasks[task] = (source, loop.time())
+            attempted.append(source)
+
+        try:
+            while True:
+                elapsed = loop.time() - started
+                # Launch every hedge that is due, or the next one if nothing is in flight
+                while len(attempted) < len(ranking) and (
+                        self._launch_offset(len(attempted)) <= elapsed or not tasks):
+                    launch(ranking[len(attempted)])
+                if not tasks:
+                    break
+
+                remaining = self.timeout - elapsed
+                if remaining <= 0:
+                    break
+                wait_for = remaining
+                if len(attempted) < len(ranking):
+                    wait_for = min(wait_for, max(self._launch_offset(len(attempted)) - elapsed, 0))
+
+                done, _ = await asyncio.wait(list(tasks), timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source, task_started = tasks.pop(task)
+                    latency = loop.time() - task_started
+                    try:
+                        name = task.result()
+                    except Exception as e:
+                        logger.debug(f"Hedged source {source} failed for {key[:10]}...: {e}")
+                        name = None
+
+                    confidence = self.confidences.get(source, 0.5) if name else 0.0
+                    won = bool(name) and confidence >= self.min_confidence
+                    self.scoreboard.record(source, bool(name), latency, won=won, **context)
+                    if won:
+                        return HedgedResult(name, source, confidence, loop.time() - started, attempted)
+                    if name and (fallback is None or confidence > fallback.confidence):
+                        fallback = HedgedResult(name, source, confidence, 0.0, attempted)
+        finally:
+            for task, (source, _) in tasks.items():
+                task.cancel()
+                self.scoreboard.record(source, False, None, cancelled=True, **context)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        if fallback is not None:
+            fallback.latency = loop.time() - started
+            return fallback
+        return HedgedResult(None, None, 0.0, loop.time() - started, attempted)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        return self.scoreboard.get_stats()
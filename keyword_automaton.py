@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Keyword Automaton - compiled multi-pattern matcher for watchlist keywords
+Aho-Corasick automaton built once per keyword load so matching a token name
+costs one pass over the text regardless of how many keywords are watched
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class KeywordAutomaton:
+    """Immutable Aho-Corasick automaton over lower-cased keywords
+
+    Build a new instance whenever the keyword list changes and swap the
+    reference; instances are never mutated after construction so readers
+    on other threads always see a consistent automaton.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        # Preserve the caller's keyword order - the first keyword in this
+        # order wins when a single match is needed (same as the old loop)
+        self.keywords: List[str] = [kw for kw in (keywords or []) if kw is not None]
+        self.lowered: Tuple[str, ...] = tuple(kw.lower() for kw in self.keywords)
+
+        # goto[state] maps a character to the next state, fail[state] is the
+        # failure link, output[state] holds keyword indices ending at state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        self._build()
+
+    def _build(self):
+        """Build trie, failure links and merged outputs"""
+        outputs: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.lowered):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = next_state
+            # Empty keywords end at the root and match every text
+            outputs[state].append(index)
+
+        # Breadth-first pass so failure targets are complete before use
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self._fail[child]])
+
+        self._output = [tuple(sorted(set(out))) for out in outputs]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def scan(self, text: str) -> set:
+        """Return indices of every keyword occurring in already lower-cased text"""
+        found = set(self._output[0])
+        if not text or len(self._goto) == 1:
+            return found
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def match_all(self, *texts: str) -> List[str]:
+        """Return every keyword found in any of the texts, in keyword order"""
+        found = set()
+        for text in texts:
+            if text:
+                found |= self.scan(text.lower())
+            elif self._output[0]:
+                found.update(self._output[0])
+        return [self.keywords[index] for index in sorted(found)]
+
+    def first_match(self, *texts: str) -> str:
+        """Return the first keyword (in keyword order) found in any text, or empty string"""
+        matches = self.match_all(*texts)
+        return matches[0] if matches else ""
+
+if __name__ == "__main__":
+    print("🧪 TESTING KEYWORD AUTOMATON")
+
+    automaton = KeywordAutomaton(["Moon", "he", "she", "his", "hers", "Doge Moon"])
+    print(f"States: {automaton.state_count}")
+    print(f"'ushers' → {automaton.match_all('ushers')}")
+    print(f"'DOGE MOON' / 'DM' → {automaton.match_all('DOGE MOON', 'DM')}")
+    print(f"First match for 'nothing here' → '{automaton.first_match('nothing here')}'")
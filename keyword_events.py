@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Keyword Events - push keyword changes to every matcher process
+Writers publish a small JSON delta with pg_notify inside the same transaction
+as their keyword write, so it is delivered exactly when the change commits.
+Each process keeps one LISTEN connection on a daemon thread and hands deltas
+to its subscribers, which patch their in-memory keyword sets instead of
+reloading the keywords table on a timer. Every (re)connect sends subscribers a
+'reload' event, since notifications sent before LISTEN took effect are lost.
+"""
+
+import os
+import json
+import time
+import select
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_CHANNEL = "keyword_changes"
+
+OP_ADD = "add"
+OP_REMOVE = "remove"
+OP_CLEAR = "clear"
+OP_RELOAD = "reload"
+KEYWORD_OPS = (OP_ADD, OP_REMOVE, OP_CLEAR, OP_RELOAD)
+
+# Which table changed - per-user `keywords` rows, or the global active set in keyword_attribution
+SCOPE_KEYWORDS = "keywords"
+SCOPE_ATTRIBUTION = "keyword_attribution"
+
+# Full reloads once events are flowing are only a safety net against lost notifications
+SAFETY_RESYNC_SECONDS = 600
+
+# NOTIFY payloads must stay under 8000 bytes - one keyword per event is far below that
+MAX_PAYLOAD_BYTES = 7900
+
+Subscriber = Callable[[Dict[str, Any]], None]
+
+def keyword_event(op: str, keyword: Optional[str] = None, user_id: Optional[str] = None,
+                  scope: Optional[str] = SCOPE_KEYWORDS) -> Dict[str, Any]:
+    """Normalized change event; user_id None means the change applies to every user"""
+    if op not in KEYWORD_OPS:
+        raise ValueError(f"Unknown keyword change: {op}")
+    return {
+        'op': op,
+        'keyword': keyword.strip() if keyword else None,
+        'user_id': str(user_id) if user_id is not None else None,
+        'scope': scope,
+        'pid': os.getpid(),
+    }
+
+def publish_keyword_change(cursor, op: str, keyword: Optional[str] = None, user_id: Optional[str] = None,
+                           scope: Optional[str] = SCOPE_KEYWORDS) -> bool:
+    """Queue a change notification on cursor's transaction (sent by Postgres on commit)
+
+    scope None marks a change to every keyword table. The notify runs under a
+    savepoint: if it fails, only the savepoint is rolled back and the caller's
+    keyword write still commits (listeners converge on their safety-net
+    reload). If the savepoint itself can't be set or restored the transaction
+    is already broken, and the error propagates to the caller.
+    """
+    payload = json.dumps(keyword_event(op, keyword, user_id, scope))
+    if len(payload.encode('utf-8')) > MAX_PAYLOAD_BYTES:
+        payload = json.dumps(keyword_event(OP_RELOAD, scope=scope))
+
+    cursor.execute("SAVEPOINT keyword_event")
+    try:
+        cursor.execute("SELECT pg_notify(%s, %s)", (KEYWORD_CHANNEL, payload))
+    except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT keyword_event")
+        logger.warning(f"⚠️ KEYWORD EVENTS: Could not publish {op} '{keyword}' (keyword write kept): {e}")
+        return False
+    cursor.execute("RELEASE SAVEPOINT keyword_event")
+    return True
+
+def parse_keyword_event(payload: str) -> Optional[Dict[str, Any]]:
+    try:
+        event = json.loads(payload)
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ KEYWORD EVENTS: Ignoring malformed payload {payload!r:.80}")
+        return None
+    if not isinstance(event, dict) or event.get('op') not in KEYWORD_OPS:
+        return None
+    if event['op'] in (OP_ADD, OP_REMOVE) and not event.get('keyword'):
+        return None
+    return event
+
+def applies_to(event: Dict[str, Any], scope: str) -> bool:
+    """True if event changes the given table (reloads after a reconnect apply everywhere)"""
+    return event.get('scope') in (None, scope)
+
+def apply_keyword_event(keywords: Iterable[str], event: Dict[str, Any]) -> Optional[List[str]]:
+    """New keyword list after event, preserving order; None when a full reload is needed"""
+    op = event['op']
+    if op == OP_RELOAD:
+        return None
+    if op == OP_CLEAR:
+        return []
+    keyword = event['keyword']
+    current = [kw for kw in keywords if kw.lower() != keyword.lower()]
+    if op == OP_ADD:
+        current.append(keyword)
+    return current
+
+class KeywordChangeListener:
+    """One LISTEN connection per process, fanning change events out to subscribers
+
+    Subscribers run on the listener thread and must not block; they usually
+    swap a new in-memory index into place.
+    """
+
+    def __init__(self, database_url: Optional[str], connect: Optional[Callable[[str], Any]] = None,
+                 poll_interval: float = 5.0, reconnect_delay: float = 1.0, max_reconnect_delay: float = 60.0):
+        self.database_url = database_url
+        self.connect = connect or self._connect
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._conn = None
+        self.connected = threading.Event()
+        self.stats = {
+            'events': 0,
+            'dispatched': 0,
+            'subscriber_errors': 0,
+            'connects': 0,
+            'disconnects': 0,
+        }
+
+    def subscribe(self, callback: Subscriber):
+        """Register callback(event) and make sure the listener thread is running"""
+        with self._lock:
+            self._subscribers.append(callback)
+        self.start()
+
+    def start(self):
+        if not self.database_url:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._listen_forever, name="keyword-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def dispatch(self, event: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.stats['events'] += 1
+        for callback in subscribers:
+            try:
+                callback(event)
+                with self._lock:
+                    self.stats['dispatched'] += 1
+            except Exception as e:
+                with self._lock:
+                    self.stats['subscriber_errors'] += 1
+                logger.error(f"❌ KEYWORD EVENTS: Subscriber failed on {event.get('op')}: {e}")
+
+    # ------------------------------------------------------------------ listener thread
+
+    def _connect(self, database_url: str):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+        conn = psycopg2.connect(database_url, application_name='keyword_listener')
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    def _listen_forever(self):
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                conn = self._conn = self.connect(self.database_url)
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {KEYWORD_CHANNEL}")
+                cursor.close()
+                with self._lock:
+                    self.stats['connects'] += 1
+                self.connected.set()
+                logger.info(f"✅ KEYWORD EVENTS: Listening on '{KEYWORD_CHANNEL}'")
+                delay = self.reconnect_delay
+
+                # Anything published before LISTEN took effect (startup load, or while we were away) is gone
+                self.dispatch(keyword_event(OP_RELOAD, scope=None))
+
+                while self._running:
+                    readable, _, _ = select.select([conn], [], [], self.poll_interval)
+                    if readable:
+                        self._drain(conn)
+            except Exception as e:
+                if not self._running:
+                    break
+                self.connected.clear()
+                with self._lock:
+                    self.stats['disconnects'] += 1
+                logger.warning(f"⚠️ KEYWORD EVENTS: Listener connection lost ({e}), retrying in {delay:.0f}s")
+                self._close_quietly()
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+        self.connected.clear()
+        self._close_quietly()
+
+    def _drain(self, conn):
+        conn.poll()
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            event = parse_keyword_event(notify.payload)
+            if event is not None:
+                self.dispatch(event)
+
+    def _close_quietly(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['subscribers'] = len(self._subscribers)
+        stats['connected'] = self.connected.is_set()
+        return stats
+
+# Global instance - one LISTEN connection per process
+_keyword_listener = None
+_keyword_listener_lock = threading.Lock()
+
+def get_keyword_listener() -> KeywordChangeListener:
+    """Get the process-wide keyword change listener (idle when DATABASE_URL is unset)"""
+    global _keyword_listener
+    if _keyword_listener is None:
+        with _keyword_listener_lock:
+            if _keyword_listener is None:
+                _keyword_listener = KeywordChangeListener(os.getenv('DATABASE_URL'))
+    return _keyword_listener
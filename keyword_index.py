@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Keyword Index - inverted index from normalized keyword tokens to user postings
+Lets IntegratedTokenMonitor tokenize a token name once and look up every
+(user_id, keyword) pair it matches instead of walking every user's list
+"""
+
+import re
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from keyword_automaton import KeywordAutomaton
+
+logger = logging.getLogger(__name__)
+
+# Same word definition as the r'\b...\b' check used by is_keyword_match
+WORD_PATTERN = re.compile(r'\w+')
+
+class KeywordIndex:
+    """Immutable inverted index over every user's keywords
+
+    Matching semantics mirror IntegratedTokenMonitor.is_keyword_match:
+    - exact (case-insensitive) name match
+    - single-word keywords match on word boundaries
+    - multi-word keywords match as a phrase, as a subset of the token's words,
+      or with 80% word overlap when the keyword has more than two words
+    Keywords the index can't express exactly fall back to a slow-path
+    matcher with a precompiled pattern.
+    """
+
+    def __init__(self, user_keywords: Dict[str, List[str]]):
+        # Postings are (sequence, user_id, keyword); the sequence preserves the
+        # order the per-user loop used to produce matches in
+        self._exact: Dict[str, List[Tuple[int, str, str]]] = defaultdict(list)
+        self._single_word: Dict[str, List[Tuple[int, str, str]]] = defaultdict(list)
+        self._multi_word: List[Dict] = []
+        self._word_postings: Dict[str, List[int]] = defaultdict(list)
+        self._slow_path: List[Tuple[int, str, str, re.Pattern]] = []
+        self.posting_count = 0
+        self.user_count = len(user_keywords)
+
+        sequence = 0
+        for user_id, keywords in user_keywords.items():
+            for keyword in keywords:
+                self._add(sequence, user_id, keyword)
+                sequence += 1
+        self.posting_count = sequence
+
+        # Phrase matching for multi-word keywords is a substring test - do it
+        # for all of them in one automaton pass
+        self._phrase_automaton = KeywordAutomaton([entry['keyword'] for entry in self._multi_word])
+
+    def _add(self, sequence: int, user_id: str, keyword: str):
+        keyword_lower = keyword.lower()
+        posting = (sequence, user_id, keyword)
+        self._exact[keyword_lower].append(posting)
+
+        words = keyword_lower.split()
+        if len(words) == 1:
+            if WORD_PATTERN.fullmatch(keyword_lower):
+                self._single_word[keyword_lower].append(posting)
+            else:
+                # Punctuation changes where \b sits - keep the original regex
+                pattern = re.compile(r'\b' + re.escape(keyword_lower) + r'\b')
+                self._slow_path.append((sequence, user_id, keyword, pattern))
+            return
+
+        keyword_words = frozenset(word for word in words if len(word) > 1)
+        entry_id = len(self._multi_word)
+        self._multi_word.append({
+            'posting': posting,
+            'keyword': keyword_lower,
+            'words': keyword_words,
+        })
+        for word in keyword_words:
+            self._word_postings[word].append(entry_id)
+
+    def __len__(self) -> int:
+        return self.posting_count
+
+    def match(self, token_name: str) -> List[Tuple[str, str]]:
+        """Return (user_id, keyword) for every keyword matching the token name"""
+        if not token_name:
+            return []
+
+        name_lower = token_name.lower()
+        hits = set()
+
+        # Exact match (covers keywords of any shape)
+        hits.update(self._exact.get(name_lower, ()))
+
+        # Single-word keywords: tokenize once, look each word up
+        if self._single_word:
+            for word in set(WORD_PATTERN.findall(name_lower)):
+                postings = self._single_word.get(word)
+                if postings:
+                    hits.update(postings)
+
+        for sequence, user_id, keyword, pattern in self._slow_path:
+            if pattern.search(name_lower):
+                hits.add((sequence, user_id, keyword))
+
+        if self._multi_word:
+            hits.update(self._match_multi_word(token_name, name_lower))
+
+        return [(user_id, keyword) for _, user_id, keyword in sorted(hits)]
+
+    def _match_multi_word(self, token_name: str, name_lower: str) -> List[Tuple[int, str, str]]:
+        # Multi-word exact phrase matching - automaton indices are entry ids
+        candidates = self._phrase_automaton.scan(name_lower)
+        matched = [self._multi_word[entry_id]['posting'] for entry_id in candidates]
+
+        # Word-based matching - prevent single character tokens matching
+        if len(token_name.strip()) <= 2:
+            return matched
+
+        overlap_counts: Dict[int, int] = defaultdict(int)
+        token_words = set(word.lower() for word in token_name.split() if len(word) > 1)
+        for word in token_words:
+            for entry_id in self._word_postings.get(word, ()):
+                overlap_counts[entry_id] += 1
+        token_word_count = len(token_name.split())
+
+        for entry_id, overlap in overlap_counts.items():
+            if entry_id in candidates:
+                continue
+            keyword_word_count = len(self._multi_word[entry_id]['words'])
+            # Require ALL significant keyword words to be present
+            if overlap == keyword_word_count:
+                matched.append(self._multi_word[entry_id]['posting'])
+            # 80% word overlap for longer keywords when the token has enough content
+            elif keyword_word_count > 2 and token_word_count >= 2 and overlap / keyword_word_count >= 0.8:
+                matched.append(self._multi_word[entry_id]['posting'])
+
+        return matched
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Keyword Snapshot - immutable, versioned view of the active keywords
+A snapshot bundles everything matching needs - the compiled automaton, the
+original-case lookup, per-user ownership and the per-user index - built once
+and never mutated. Matching threads read the store's current reference
+without locking and keep using that one snapshot for the whole match; writers
+build a complete new snapshot and publish it with a single reference swap, so
+a reload can never leave the matcher and the lookup out of sync.
+"""
+
+import time
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from keyword_automaton import KeywordAutomaton
+from keyword_index import KeywordIndex
+
+logger = logging.getLogger(__name__)
+
+UserKeywords = Mapping[str, Iterable[str]]
+
+class KeywordSnapshot:
+    """One published keyword set; treat every attribute as read-only"""
+
+    __slots__ = ('version', 'created_at', 'user_keywords', 'keywords', 'automaton', 'lowered',
+                 'lookup', 'owners', 'index')
+
+    def __init__(self, version: int, user_keywords: UserKeywords):
+        self.version = version
+        self.created_at = time.time()
+        self.user_keywords: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {user_id: tuple(kw for kw in keywords if kw) for user_id, keywords in user_keywords.items()})
+
+        # Unique keywords in first-seen order - the first owner's spelling is the display case
+        lookup: Dict[str, str] = {}
+        owners: Dict[str, Tuple[str, ...]] = {}
+        for user_id, keywords in self.user_keywords.items():
+            for keyword in keywords:
+                key = keyword.lower()
+                lookup.setdefault(key, keyword)
+                if user_id not in owners.get(key, ()):
+                    owners[key] = owners.get(key, ()) + (user_id,)
+
+        self.keywords: Tuple[str, ...] = tuple(lookup.values())
+        self.automaton = KeywordAutomaton(self.keywords)
+        self.lowered = frozenset(self.automaton.lowered)
+        self.lookup: Mapping[str, str] = MappingProxyType(lookup)
+        self.owners: Mapping[str, Tuple[str, ...]] = MappingProxyType(owners)
+        self.index = KeywordIndex(self.user_keywords)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def owners_of(self, keyword: str) -> Tuple[str, ...]:
+        """User ids watching keyword (case-insensitive)"""
+        return self.owners.get(keyword.lower(), ())
+
+    def original_case(self, keyword: str) -> str:
+        return self.lookup.get(keyword.lower(), keyword)
+
+class KeywordSnapshotStore:
+    """Holds the current snapshot; publishing builds the next version and swaps it in
+
+    Readers use `current` without locking. Writers are serialized so versions
+    increase by one per publish and never go backwards.
+    """
+
+    def __init__(self, user_keywords: Optional[UserKeywords] = None):
+        self._write_lock = threading.Lock()
+        self.current = KeywordSnapshot(0, user_keywords or {})
+        self.stats = {
+            'published': 0,
+            'stale_discarded': 0,
+            'last_build_ms': 0.0,
+        }
+
+    def publish(self, user_keywords: UserKeywords) -> KeywordSnapshot:
+        """Build and publish the next version from a complete per-user keyword map"""
+        with self._write_lock:
+            return self._publish(user_keywords)
+
+    def publish_if_current(self, base_version: int, user_keywords: UserKeywords) -> Optional[KeywordSnapshot]:
+        """Publish a full map read while base_version was current; None if anything was published since
+
+        A full reload reads the database before it publishes. A delta applied in
+        between may not be in that read, so the stale map is dropped rather than
+        allowed to overwrite it.
+        """
+        with self._write_lock:
+            if self.current.version != base_version:
+                self.stats['stale_discarded'] += 1
+                return None
+            return self._publish(user_keywords)
+
+    def update(self, transform: Callable[[KeywordSnapshot], Optional[UserKeywords]]) -> KeywordSnapshot:
+        """Read-modify-write: transform(current) returns the new map, or None to keep the current one"""
+        with self._write_lock:
+            user_keywords = transform(self.current)
+            if user_keywords is None:
+                return self.current
+            return self._publish(user_keywords)
+
+    def _publish(self, user_keywords: UserKeywords) -> KeywordSnapshot:
+        started = time.perf_counter()
+        snapshot = KeywordSnapshot(self.current.version + 1, user_keywords)
+        self.current = snapshot
+        self.stats['published'] += 1
+        self.stats['last_build_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        logger.debug(f"⚡ KEYWORD SNAPSHOT: v{snapshot.version} published ({len(snapshot)} keywords, "
+                     f"{len(snapshot.user_keywords)} users)")
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self.current
+        stats = dict(self.stats)
+        stats.update({
+            'version': snapshot.version,
+            'keywords': len(snapshot),
+            'users': len(snapshot.user_keywords),
+            'age_seconds': round(time.time() - snapshot.created_at, 1),
+        })
+        return stats
@@ -10,6 +10,7 @@ import psycopg2
 from typing import List, Set, Dict, Optional
 from datetime import datetime
 import json
+from keyword_events import publish_keyword_change, OP_ADD, OP_REMOVE, SCOPE_ATTRIBUTION
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +99,9 @@ class KeywordSyncManager:
                     except psycopg2.errors.UndefinedColumn:
                         logger.info("⏭️ Skipping detected tokens update (column doesn't exist)")
                     
+                    # 5. Tell every matcher process (delivered on commit)
+                    publish_keyword_change(cursor, OP_REMOVE, keyword, scope=SCOPE_ATTRIBUTION)
+                    
                     conn.commit()
                     
                     logger.info(f"🎯 Keyword '{keyword}' completely deactivated across all systems")
@@ -133,6 +137,9 @@ class KeywordSyncManager:
                         DELETE FROM keyword_removal_log WHERE keyword = %s
                     """, (keyword,))
                     
+                    # 3. Tell every matcher process (delivered on commit)
+                    publish_keyword_change(cursor, OP_ADD, keyword, user_id, scope=SCOPE_ATTRIBUTION)
+                    
                     conn.commit()
                     
                     logger.info(f"🎯 Keyword '{keyword}' successfully activated")
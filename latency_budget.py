@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Latency Budget - per-token deadlines for validation steps
+Each token gets a deadline when it enters processing; each validation step
+declares its expected cost (replaced by its observed p95 once there is
+enough data). A step that can't finish inside the remaining budget is
+skipped or deferred to run in the background, and every skip or deferral
+is counted.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from async_token_pipeline import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_KEY = 'deadline'   # time.monotonic() value stored in the token dict
+INGESTED_KEY = 'ingested_at'   # time.monotonic() when the deadline was started
+
+class LatencyBudget:
+    """Remaining time until a monotonic deadline"""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+def token_budget(token: Dict[str, Any], seconds: float) -> LatencyBudget:
+    """The token's budget, starting its deadline now if it doesn't have one yet"""
+    if token.get(DEADLINE_KEY) is None:
+        now = time.monotonic()
+        token[INGESTED_KEY] = now
+        token[DEADLINE_KEY] = now + seconds
+    return LatencyBudget(token[DEADLINE_KEY])
+
+def time_since_ingest(token: Dict[str, Any]) -> Optional[float]:
+    """Seconds since token_budget first saw the token, or None if it never did"""
+    ingested_at = token.get(INGESTED_KEY)
+    if ingested_at is None:
+        return None
+    return time.monotonic() - ingested_at
+
+class ValidationStep:
+    """Declared cost plus observed latency for one validation step"""
+
+    def __init__(self, name: str, expected_cost: float, min_samples: int = 20):
+        self.name = name
+        self.declared_cost = expected_cost
+        self.min_samples = min_samples
+        self.latency = LatencyHistogram()
+        self.counts = {'runs': 0, 'skipped': 0, 'deferred': 0, 'overruns': 0, 'overturned': 0}
+
+    def expected_cost(self) -> float:
+        """Observed p95 once there is enough data, else the declared cost"""
+        if self.latency.count >= self.min_samples:
+            return self.latency.percentile(0.95) / 1000.0
+        return self.declared_cost
+
+class BudgetedValidator:
+    """Decides which validation steps fit a token's remaining budget"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps: Dict[str, ValidationStep] = {}
+        self.tokens_past_deadline = 0
+
+    def register(self, name: str, expected_cost: float) -> ValidationStep:
+        step = ValidationStep(name, expected_cost)
+        self.steps[name] = step
+        return step
+
+    def fits(self, name: str, budget: LatencyBudget) -> bool:
+        return self.steps[name].expected_cost() <= budget.remaining()
+
+    def _count(self, name: str, key: str):
+        with self._lock:
+            self.steps[name].counts[key] += 1
+
+    def skip(self, name: str, reason: str = ""):
+        self._count(name, 'skipped')
+        logger.info(f"⏭️ BUDGET SKIP: {name}{f' - {reason}' if reason else ''}")
+
+    def run(self, name: str, budget: LatencyBudget, func: Callable, *args, **kwargs) -> Tuple[bool, Any]:
+        """Run func if the step fits the budget; returns (ran, result)"""
+        if not self.fits(name, budget):
+            self.skip(name, f"expected {self.steps[name].expected_cost():.2f}s > {budget.remaining():.2f}s left")
+            return False, None
+        started = time.monotonic()
+        try:
+            return True, func(*args, **kwargs)
+        finally:
+            self.record(name, time.monotonic() - started, budget)
+
+    def record(self, name: str, elapsed: float, budget: Optional[LatencyBudget] = None):
+        """Observed latency of a step run (inline or deferred)"""
+        step = self.steps[name]
+        step.latency.record(elapsed)
+        self._count(name, 'runs')
+        if budget is not None and budget.expired():
+            self._count(name, 'overruns')
+
+    def defer(self, name: str, submit: Callable[[], Any]) -> Any:
+        """Start a step in the background; the caller decides provisionally meanwhile"""
+        self._count(name, 'deferred')
+        started = time.monotonic()
+        future = submit()
+        if hasattr(future, 'add_done_callback'):
+            future.add_done_callback(lambda _: self.record(name, time.monotonic() - started))
+        logger.info(f"⏩ BUDGET DEFER: {name} running in background - provisional decision")
+        return future
+
+    def overturned(self, name: str):
+        """A deferred step disagreed with the provisional decision"""
+        self._count(name, 'overturned')
+
+    def note_deadline(self, budget: LatencyBudget):
+        if budget.expired():
+            with self._lock:
+                self.tokens_past_deadline += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                name: dict(step.counts, expected_ms=step.expected_cost() * 1000.0,
+                           p95_ms=step.latency.snapshot()['p95_ms'])
+                for name, step in self.steps.items()
+            }
+            stats['tokens_past_deadline'] = self.tokens_past_deadline
+        return stats
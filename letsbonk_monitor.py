@@ -18,6 +18,8 @@ from solana.rpc.websocket_api import connect
 from solana.rpc.commitment import Confirmed
 from solders.pubkey import Pubkey
 
+from compact_seen_set import CompactSeenSet, SIGNATURE_KEY_SIZE
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -27,7 +29,8 @@ class LetsBonkMonitor:
         self.helius_rpc = "https://mainnet.helius-rpc.com/?api-key=demo-key"
         self.letsbonk_program_id = "BondingCurveProgramId"  # Replace with actual LetsBonk program ID
         self.running = False
-        self.processed_signatures = set()
+        self.processed_signatures = CompactSeenSet(capacity=5000, ttl=3600, key_size=SIGNATURE_KEY_SIZE,
+                                                   name='letsbonk_signatures')
         
     def get_db_connection(self):
         try:
@@ -97,10 +100,6 @@ class LetsBonkMonitor:
                     if signature and signature not in self.processed_signatures:
                         await self.analyze_transaction(signature)
                         self.processed_signatures.add(signature)
-                        
-                        # Keep only recent signatures to prevent memory growth
-                        if len(self.processed_signatures) > 1000:
-                            self.processed_signatures = set(list(self.processed_signatures)[-500:])
                             
         except Exception as e:
             logger.debug(f"Transaction check error: {e}")
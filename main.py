@@ -6,11 +6,8 @@ Railway deployment ready with port conflict resolution
 """
 
 import asyncio
-import websockets
-import json
 import time
 import threading
-import psycopg2
 import os
 import requests
 import discord
@@ -21,11 +18,28 @@ from flask import Flask, jsonify
 from waitress import serve
 from typing import Optional, Dict, List
 import difflib
+from keyword_snapshot import KeywordSnapshot, KeywordSnapshotStore
+from db_pool import get_pooled_connection, get_pool_metrics
+from discord_delivery import get_discord_delivery
+from market_data_service import get_market_data_service
+from dexscreener_batch import get_dexscreener_batch
+from name_retry_scheduler import get_name_retry_scheduler
+from async_token_pipeline import PipelineStage
+from token_processing_engine import TokenProcessingEngine, PumpPortalSource
+from keyword_events import (get_keyword_listener, apply_keyword_event, applies_to, OP_ADD, OP_CLEAR,
+                            OP_RELOAD, SCOPE_KEYWORDS, SAFETY_RESYNC_SECONDS)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Discord message limits for coalesced alerts
+MAX_MENTIONS_PER_MESSAGE = 100   # allowed_mentions.users cap
+MAX_CONTENT_LENGTH = 2000
+
+# Full keyword reload interval while LISTEN/NOTIFY is unavailable
+KEYWORD_POLL_SECONDS = 30
+
 class IntegratedTokenMonitor:
     def __init__(self):
         # Database setup
@@ -37,41 +51,57 @@ class IntegratedTokenMonitor:
         # WebSocket setup
         self.websocket_url = "wss://pumpportal.fun/api/data"
         self.running = False
-        self.processed_tokens = set()
         
         # Discord setup
         self.discord_token = os.getenv('DISCORD_TOKEN')
         self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL', '')
+        self.discord_delivery = get_discord_delivery()
         
-        # Keywords cache
-        self.user_keywords = {}
+        # Matches per token waiting out the coalescing window
+        self.pending_alerts: Dict[str, List[Dict]] = {}
+        self.alert_coalesce_window = float(os.getenv('ALERT_COALESCE_SECONDS', '0.25'))
+        
+        # Keywords cache - immutable snapshots (map + inverted index) swapped in on every change
+        self.keyword_snapshots = KeywordSnapshotStore()
         self.last_keyword_refresh = 0
+        self.keyword_listener = get_keyword_listener()
+        self.keyword_listener.subscribe(self.on_keyword_change)
+        
+        # notified_tokens gains keyword_snapshot_version on the first insert
+        self.notification_columns_ready = False
         
         # PumpPortal market data cache
         self.token_market_cache = {}
         self.pumpportal_api_key = os.getenv('PUMPPORTAL_API_KEY', '')
         
+        # Shared processing engine - its seen-token cache doubles as the processed count
+        self.engine = self.build_engine()
+        self.processed_tokens = self.engine.seen
+        
         logger.info("🚀 Integrated Token Monitor initialized")
     
     def get_db_connection(self):
-        """Get database connection"""
+        """Get pooled database connection (close() returns it to the shared pool)"""
         try:
-            return psycopg2.connect(self.database_url)
+            return get_pooled_connection(self.database_url)
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             return None
     
     def refresh_keywords(self):
-        """Refresh user keywords from database"""
+        """Full reload of user keywords from database (pushed changes are applied in between)"""
         try:
-            # Only refresh every 30 seconds to avoid database spam
-            if time.time() - self.last_keyword_refresh < 30:
+            # Polling fallback every 30 seconds; with LISTEN/NOTIFY up this is only a safety net
+            interval = SAFETY_RESYNC_SECONDS if self.keyword_listener.connected.is_set() else KEYWORD_POLL_SECONDS
+            if time.time() - self.last_keyword_refresh < interval:
                 return
             
             conn = self.get_db_connection()
             if not conn:
                 return
             
+            # Pushed deltas landing while we read bump this version and make the read stale
+            base_version = self.keyword_snapshots.current.version
             cursor = conn.cursor()
             cursor.execute("SELECT user_id, keyword FROM keywords WHERE user_id IS NOT NULL")
             
@@ -82,18 +112,71 @@ class IntegratedTokenMonitor:
                     new_keywords[user_id] = []
                 new_keywords[user_id].append(keyword.lower().strip())
             
-            self.user_keywords = new_keywords
+            cursor.close()
+            conn.close()
+            
+            snapshot = self.keyword_snapshots.publish_if_current(base_version, new_keywords)
+            if snapshot is None:
+                # Retry on the next loop rather than overwrite a newer delta with the stale read
+                self.last_keyword_refresh = 0
+                logger.info("🔄 Keyword refresh raced a pushed change - discarded, retrying")
+                return
+            self._keywords_published(snapshot)
             self.last_keyword_refresh = time.time()
             
             total_keywords = sum(len(keywords) for keywords in new_keywords.values())
             logger.info(f"🔄 Refreshed {total_keywords} keywords for {len(new_keywords)} users")
             
-            cursor.close()
-            conn.close()
-            
         except Exception as e:
             logger.error(f"Failed to refresh keywords: {e}")
     
+    @property
+    def user_keywords(self):
+        """Per-user keywords of the current snapshot (read-only)"""
+        return self.keyword_snapshots.current.user_keywords
+    
+    @property
+    def keyword_index(self):
+        return self.keyword_snapshots.current.index
+    
+    def publish_keywords(self, new_keywords: Dict[str, List[str]]) -> KeywordSnapshot:
+        """Build a snapshot (map + index) from a complete per-user keyword map and swap it in"""
+        return self._keywords_published(self.keyword_snapshots.publish(new_keywords))
+    
+    def _keywords_published(self, snapshot: KeywordSnapshot) -> KeywordSnapshot:
+        get_name_retry_scheduler().update_keywords(snapshot.keywords)
+        return snapshot
+    
+    def on_keyword_change(self, event: Dict):
+        """Apply a pushed keyword change to the in-memory index (runs on the listener thread)"""
+        if not applies_to(event, SCOPE_KEYWORDS):
+            return
+        if event['op'] == OP_RELOAD:
+            self.last_keyword_refresh = 0   # Next refresh_keywords() does a full reload
+            return
+        
+        user_id = event.get('user_id')
+        if event['op'] == OP_ADD:
+            event = dict(event, keyword=event['keyword'].lower())
+        
+        def apply(snapshot: KeywordSnapshot) -> Dict[str, List[str]]:
+            if event['op'] == OP_CLEAR:
+                return {} if user_id is None else {
+                    uid: keywords for uid, keywords in snapshot.user_keywords.items() if uid != user_id}
+            new_keywords = dict(snapshot.user_keywords)
+            targets = [user_id] if user_id is not None else list(new_keywords)
+            for uid in targets:
+                updated = apply_keyword_event(new_keywords.get(uid, ()), event)
+                if updated:
+                    new_keywords[uid] = updated
+                else:
+                    new_keywords.pop(uid, None)
+            return new_keywords
+        
+        snapshot = self._keywords_published(self.keyword_snapshots.update(apply))
+        logger.info(f"⚡ KEYWORD PUSH: {event['op']} '{event.get('keyword') or '*'}' "
+                    f"(user {user_id or 'all'}) applied as snapshot v{snapshot.version}")
+    
     def check_keyword_matches(self, token_name: str, token_address: str) -> List[Dict]:
         """Check if token matches any user keywords + special LetsBonk detection"""
         if not token_name:
@@ -105,19 +188,19 @@ class IntegratedTokenMonitor:
         # Detect platform type
         platform = self.detect_platform(token_address)
         
-        # Check user keywords
-        for user_id, user_keywords in self.user_keywords.items():
-            for keyword in user_keywords:
-                # Enhanced matching logic
-                if self.is_keyword_match(token_name_lower, keyword):
-                    matches.append({
-                        'user_id': user_id,
-                        'keyword': keyword,
-                        'token_name': token_name,
-                        'token_address': token_address,
-                        'match_type': self.get_match_type(token_name_lower, keyword),
-                        'platform': platform
-                    })
+        # Check user keywords - one tokenization, one index lookup (same rules as is_keyword_match)
+        # against a single snapshot, so a concurrent reload can't mix two keyword sets
+        snapshot = self.keyword_snapshots.current
+        for user_id, keyword in snapshot.index.match(token_name_lower):
+            matches.append({
+                'user_id': user_id,
+                'keyword': keyword,
+                'token_name': token_name,
+                'token_address': token_address,
+                'match_type': self.get_match_type(token_name_lower, keyword),
+                'platform': platform,
+                'keyword_snapshot_version': snapshot.version
+            })
         
         # STRICT KEYWORD MATCHING ONLY - No auto-notifications to prevent spam
         
@@ -229,124 +312,182 @@ class IntegratedTokenMonitor:
             return "fuzzy"
     
     async def send_discord_notification(self, match_info: Dict):
-        """Send Discord notification for keyword match with ENHANCED FORMAT + LetsBonk highlighting"""
-        try:
-            # Get market data
-            market_data = await self.get_market_data(match_info['token_address'])
-            
-            # Detect platform and customize notification
-            platform = match_info.get('platform', self.detect_platform(match_info['token_address']))
-            is_letsbonk = platform == 'LetsBonk'
-            
-            # Customize title and color based on platform
-            if is_letsbonk:
-                title = '🟠 NEW LETSBONK TOKEN DETECTED'
-                color = 0xff6b35  # Orange for LetsBonk
-                platform_emoji = '🟠'
-            else:
-                title = '🚨 NEW TOKEN DETECTED'
-                color = 0x00ff41  # Green for others
-                platform_emoji = '🔵' if platform == 'Pump.fun' else '⚪'
-            
-            # Create ENHANCED rich embed with MOBILE COPY OPTIMIZED formatting
-            embed = {
-                'title': title,
-                'description': f'**{match_info["token_name"]}** matches your keyword: `{match_info["keyword"]}`\n\n`{match_info["token_address"]}`',
-                'color': color,
-                'fields': [
-                    {
-                        'name': '📊 Token Info',
-                        'value': f'**Name:** {match_info["token_name"]}\n**Platform:** {platform_emoji} {platform}\n**Keyword:** {match_info["keyword"]}\n**Match:** {match_info["match_type"].capitalize()}',
-                        'inline': True
-                    }
-                ],
-                'timestamp': datetime.now().isoformat(),
-                'footer': {
-                    'text': f'⚡ Real-time {platform} monitoring • Keyword match alert'
+        """Send Discord notification for a single keyword match (see send_coalesced_notification)"""
+        return await self.send_coalesced_notification([match_info])
+    
+    def queue_alert(self, match_info: Dict):
+        """Add a match to its token's alert group; the first match opens the coalescing window"""
+        token_address = match_info['token_address']
+        group = self.pending_alerts.get(token_address)
+        if group is None:
+            group = self.pending_alerts[token_address] = []
+            asyncio.get_running_loop().create_task(self._flush_alert_group(token_address))
+        group.append(match_info)
+    
+    async def _flush_alert_group(self, token_address: str):
+        await asyncio.sleep(self.alert_coalesce_window)
+        matches = self.pending_alerts.pop(token_address, [])
+        if matches:
+            await self.send_coalesced_notification(matches)
+    
+    def build_match_embed(self, matches: List[Dict], market_data: Optional[Dict]) -> Dict:
+        """Render the ENHANCED embed once for every match on one token (+ LetsBonk highlighting)"""
+        match_info = matches[0]
+        keywords = list(dict.fromkeys(match['keyword'] for match in matches))
+        match_types = list(dict.fromkeys(match['match_type'].capitalize() for match in matches))
+        keyword_text = ', '.join(keywords)
+        if len(keyword_text) > 200:
+            keyword_text = keyword_text[:197] + '...'
+        
+        # Detect platform and customize notification
+        platform = match_info.get('platform', self.detect_platform(match_info['token_address']))
+        is_letsbonk = platform == 'LetsBonk'
+        
+        # Customize title and color based on platform
+        if is_letsbonk:
+            title = '🟠 NEW LETSBONK TOKEN DETECTED'
+            color = 0xff6b35  # Orange for LetsBonk
+            platform_emoji = '🟠'
+        else:
+            title = '🚨 NEW TOKEN DETECTED'
+            color = 0x00ff41  # Green for others
+            platform_emoji = '🔵' if platform == 'Pump.fun' else '⚪'
+        
+        # Create ENHANCED rich embed with MOBILE COPY OPTIMIZED formatting
+        embed = {
+            'title': title,
+            'description': f'**{match_info["token_name"]}** matches your keyword{"s" if len(keywords) > 1 else ""}: `{keyword_text}`\n\n`{match_info["token_address"]}`',
+            'color': color,
+            'fields': [
+                {
+                    'name': '📊 Token Info',
+                    'value': f'**Name:** {match_info["token_name"]}\n**Platform:** {platform_emoji} {platform}\n**Keyword:** {keyword_text}\n**Match:** {", ".join(match_types)}',
+                    'inline': True
                 }
+            ],
+            'timestamp': datetime.now().isoformat(),
+            'footer': {
+                'text': f'⚡ Real-time {platform} monitoring • Keyword match alert'
             }
-            
-            # ENHANCED Market data with MARKET CAP prominently displayed first
-            market_value = ""
-            data_source = market_data.get('source', 'DexScreener') if market_data and not market_data.get('status') else ''
-            
-            if market_data and not market_data.get('status'):
-                # ALWAYS show market cap first - most important metric
-                if market_data.get('market_cap') and market_data['market_cap'] > 0:
-                    mc = market_data['market_cap']
-                    if mc >= 1_000_000:
-                        market_value += f"💰 **MARKET CAP: ${mc/1_000_000:.2f}M**\n"
-                    elif mc >= 1_000:
-                        market_value += f"💰 **MARKET CAP: ${mc/1_000:.1f}K**\n"
-                    else:
-                        market_value += f"💰 **MARKET CAP: ${mc:.2f}**\n"
+        }
+        
+        # ENHANCED Market data with MARKET CAP prominently displayed first
+        market_value = ""
+        data_source = market_data.get('source', 'DexScreener') if market_data and not market_data.get('status') else ''
+        
+        if market_data and not market_data.get('status'):
+            # ALWAYS show market cap first - most important metric
+            if market_data.get('market_cap') and market_data['market_cap'] > 0:
+                mc = market_data['market_cap']
+                if mc >= 1_000_000:
+                    market_value += f"💰 **MARKET CAP: ${mc/1_000_000:.2f}M**\n"
+                elif mc >= 1_000:
+                    market_value += f"💰 **MARKET CAP: ${mc/1_000:.1f}K**\n"
                 else:
-                    market_value += f"💰 **MARKET CAP:** ${market_data.get('market_cap', 0):.0f}\n"
-                
-                if market_data.get('price'):
-                    market_value += f"💵 **Price:** ${market_data['price']:.8f}\n"
-                if market_data.get('volume_24h'):
-                    vol = market_data['volume_24h']
-                    if vol >= 1_000_000:
-                        market_value += f"📊 **24h Volume:** ${vol/1_000_000:.1f}M"
-                    elif vol >= 1_000:
-                        market_value += f"📊 **24h Volume:** ${vol/1_000:.0f}K"
-                    else:
-                        market_value += f"📊 **24h Volume:** ${vol:,.0f}"
-                
-                # Add data source attribution
-                if data_source:
-                    market_value += f"\n📈 **Source:** {data_source}"
-                    
-            elif market_data and market_data.get('status') == 'too_new':
-                market_value = "💰 **MARKET CAP:** Just launched!\n💵 **Price:** Trading starting...\n📊 **Volume:** Fresh token - check PumpFun\n🚀 **Source:** PumpFun Launch"
+                    market_value += f"💰 **MARKET CAP: ${mc:.2f}**\n"
             else:
-                market_value = "💰 **MARKET CAP:** Loading...\n💵 **Price:** Fetching...\n📊 **Volume:** Please wait"
+                market_value += f"💰 **MARKET CAP:** ${market_data.get('market_cap', 0):.0f}\n"
             
-            # Always show market data field with market cap prominently displayed
-            embed['fields'].append({
-                'name': '💰 Live Market Data',
-                'value': market_value,
-                'inline': True
-            })
+            if market_data.get('price'):
+                market_value += f"💵 **Price:** ${market_data['price']:.8f}\n"
+            if market_data.get('volume_24h'):
+                vol = market_data['volume_24h']
+                if vol >= 1_000_000:
+                    market_value += f"📊 **24h Volume:** ${vol/1_000_000:.1f}M"
+                elif vol >= 1_000:
+                    market_value += f"📊 **24h Volume:** ${vol/1_000:.0f}K"
+                else:
+                    market_value += f"📊 **24h Volume:** ${vol:,.0f}"
             
-            # Platform info field
-            embed['fields'].append({
-                'name': '🚀 Platform',
-                'value': "**Source:** PumpFun\n**Network:** Solana",
-                'inline': True
-            })
+            # Add data source attribution
+            if data_source:
+                market_value += f"\n📈 **Source:** {data_source}"
+                
+        elif market_data and market_data.get('status') == 'too_new':
+            market_value = "💰 **MARKET CAP:** Just launched!\n💵 **Price:** Trading starting...\n📊 **Volume:** Fresh token - check PumpFun\n🚀 **Source:** PumpFun Launch"
+        else:
+            market_value = "💰 **MARKET CAP:** Loading...\n💵 **Price:** Fetching...\n📊 **Volume:** Please wait"
+        
+        # Always show market data field with market cap prominently displayed
+        embed['fields'].append({
+            'name': '💰 Live Market Data',
+            'value': market_value,
+            'inline': True
+        })
+        
+        # Platform info field
+        embed['fields'].append({
+            'name': '🚀 Platform',
+            'value': "**Source:** PumpFun\n**Network:** Solana",
+            'inline': True
+        })
+        
+        # Trading links field with enhanced copy functionality
+        links_text = f"[🚀 Trade on PumpFun](https://pump.fun/{match_info['token_address']})\n"
+        links_text += f"[📊 DexScreener](https://dexscreener.com/solana/{match_info['token_address']})\n"
+        links_text += f"[🔍 SolScan](https://solscan.io/token/{match_info['token_address']})\n"
+        links_text += f"[📋 Copy Address](https://solscan.io/token/{match_info['token_address']})"
+        
+        embed['fields'].append({
+            'name': '🔗 Trading Links',
+            'value': links_text,
+            'inline': False
+        })
+        
+        return embed
+    
+    @staticmethod
+    def chunk_mentions(user_ids: List[str]) -> List[List[str]]:
+        """Split users into groups that fit one message's mention and content limits"""
+        chunks, current, length = [], [], 0
+        for user_id in dict.fromkeys(user_ids):
+            mention_length = len(f'<@{user_id}> ')
+            if current and (len(current) >= MAX_MENTIONS_PER_MESSAGE or length + mention_length > MAX_CONTENT_LENGTH):
+                chunks.append(current)
+                current, length = [], 0
+            current.append(user_id)
+            length += mention_length
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    async def send_coalesced_notification(self, matches: List[Dict]):
+        """One market-data lookup, one embed and as few messages as possible for all matches on a token"""
+        try:
+            match_info = matches[0]
+            # Get market data
+            market_data = await self.get_market_data(match_info['token_address'])
+            embed = self.build_match_embed(matches, market_data)
             
-            # Trading links field with enhanced copy functionality
-            links_text = f"[🚀 Trade on PumpFun](https://pump.fun/{match_info['token_address']})\n"
-            links_text += f"[📊 DexScreener](https://dexscreener.com/solana/{match_info['token_address']})\n"
-            links_text += f"[🔍 SolScan](https://solscan.io/token/{match_info['token_address']})\n"
-            links_text += f"[📋 Copy Address](https://solscan.io/token/{match_info['token_address']})"
+            # Send notification - every chunk carries the same embed and mentions its users
+            chunks = self.chunk_mentions([match['user_id'] for match in matches])
+            results = await asyncio.gather(*[
+                self.discord_delivery.send_async(self.webhook_url, {
+                    'content': ' '.join(f'<@{user_id}>' for user_id in chunk),  # Mention users
+                    'embeds': [embed],
+                    'allowed_mentions': {'users': chunk},
+                }, label=f"match {match_info['token_name']} for {len(chunk)} users")
+                for chunk in chunks
+            ], return_exceptions=True)
             
-            embed['fields'].append({
-                'name': '🔗 Trading Links',
-                'value': links_text,
-                'inline': False
-            })
+            delivered_users = set()
+            for chunk, delivered in zip(chunks, results):
+                if delivered is True:
+                    delivered_users.update(chunk)
+                else:
+                    logger.error(f"Discord notification failed for users {', '.join(chunk)}: {delivered}")
             
-            # Send notification
-            payload = {
-                'content': f'<@{match_info["user_id"]}>',  # Mention user
-                'embeds': [embed]
-            }
+            if not delivered_users:
+                return False
             
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            logger.info(f"✅ ENHANCED Discord notification sent to {len(delivered_users)} users "
+                        f"for {match_info['token_name']} ({len(matches)} matches, {len(chunks)} messages, "
+                        f"keywords v{match_info.get('keyword_snapshot_version')})")
             
-            if response.status_code == 200 or response.status_code == 204:
-                logger.info(f"✅ ENHANCED Discord notification sent to user {match_info['user_id']}")
-                
-                # Record notification in database
-                await self.record_notification(match_info)
-                
-                return True
-            else:
-                logger.error(f"Discord notification failed: {response.status_code}")
-                return False
+            # Record notifications in database
+            await self.record_notifications([match for match in matches if match['user_id'] in delivered_users])
+            
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to send Discord notification: {e}")
@@ -354,39 +495,57 @@ class IntegratedTokenMonitor:
     
     async def record_notification(self, match_info: Dict):
         """Record notification in database"""
+        await self.record_notifications([match_info])
+    
+    async def record_notifications(self, matches: List[Dict]):
+        """Record every notified match in one batched insert (off the event loop)"""
+        if not matches:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.insert_notifications, matches)
+    
+    def insert_notifications(self, matches: List[Dict]):
         try:
             conn = self.get_db_connection()
             if not conn:
                 return
             
+            from psycopg2.extras import execute_values
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO notified_tokens (token_address, token_name, matched_keyword, user_id, notified_at, notification_type)
-                VALUES (%s, %s, %s, %s, %s, %s)
+            if not self.notification_columns_ready:
+                # Which keyword snapshot produced a notification, for auditing reload races
+                cursor.execute("""
+                    ALTER TABLE notified_tokens
+                    ADD COLUMN IF NOT EXISTS keyword_snapshot_version INTEGER
+                """)
+            notified_at = datetime.now()
+            execute_values(cursor, """
+                INSERT INTO notified_tokens (token_address, token_name, matched_keyword, user_id, notified_at,
+                                             notification_type, keyword_snapshot_version)
+                VALUES %s
                 ON CONFLICT (token_address, user_id, matched_keyword) DO NOTHING
-            """, (
-                match_info['token_address'],
-                match_info['token_name'],
-                match_info['keyword'],
-                match_info['user_id'],
-                datetime.now(),
-                'keyword_match'
-            ))
+            """, [(
+                match['token_address'],
+                match['token_name'],
+                match['keyword'],
+                match['user_id'],
+                notified_at,
+                'keyword_match',
+                match.get('keyword_snapshot_version')
+            ) for match in matches])
             
             conn.commit()
+            self.notification_columns_ready = True
             cursor.close()
             conn.close()
             
         except Exception as e:
-            logger.error(f"Failed to record notification: {e}")
+            logger.error(f"Failed to record notifications: {e}")
     
     async def get_market_data(self, token_address: str, retry_delay: int = 0) -> Dict:
         """Get market data from PumpPortal first, then fallback to DexScreener"""
-        import time
-        
         if retry_delay > 0:
             logger.info(f"⏱️ Waiting {retry_delay} seconds before retry for {token_address[:10]}...")
-            time.sleep(retry_delay)
+            await asyncio.sleep(retry_delay)
         
         # Try PumpPortal first (best for new tokens)
         pumpportal_data = await self.get_pumpportal_data(token_address)
@@ -394,49 +553,13 @@ class IntegratedTokenMonitor:
             logger.info(f"✅ Got PumpPortal data for {token_address[:10]}...")
             return pumpportal_data
         
-        # Fallback to DexScreener
-        try:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            logger.info(f"📊 Fetching DexScreener data for {token_address[:10]}...")
-            
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get('pairs') if data else None
-                
-                if pairs and len(pairs) > 0:
-                    logger.info(f"📊 Found {len(pairs)} pairs for {token_address[:10]}...")
-                    
-                    # Get the pair with highest liquidity (or first if no liquidity data)
-                    try:
-                        best_pair = max(pairs, key=lambda x: float(x.get('liquidity', {}).get('usd', 0)) if x.get('liquidity') else 0)
-                    except:
-                        best_pair = pairs[0]
-                    
-                    market_data = {
-                        'price': float(best_pair.get('priceUsd', 0)),
-                        'market_cap': float(best_pair.get('marketCap', 0)),
-                        'volume_24h': float(best_pair.get('volume', {}).get('h24', 0)),
-                        'liquidity': float(best_pair.get('liquidity', {}).get('usd', 0)),
-                        'price_change_24h': float(best_pair.get('priceChange', {}).get('h24', 0)),
-                        'source': 'DexScreener'
-                    }
-                    
-                    logger.info(f"✅ DexScreener data loaded: MC=${market_data['market_cap']:.0f}, Price=${market_data['price']:.8f}")
-                    return market_data
-                else:
-                    logger.warning(f"⚠️ No pairs found on DexScreener for {token_address[:10]}...")
-                    return {'status': 'too_new'}
-            else:
-                logger.warning(f"⚠️ DexScreener API error {response.status_code} for {token_address[:10]}...")
-                return {'status': 'api_error'}
-                
-        except Exception as e:
-            logger.warning(f"❌ Market data fetch failed for {token_address[:10]}...: {e}")
-            return {'status': 'fetch_error'}
-        
-        return {'status': 'unknown_error'}
+        # Fallback to DexScreener through the shared cache (concurrent lookups share one request)
+        market_data = await get_market_data_service().get_async(token_address)
+        if not market_data.get('status'):
+            logger.info(f"✅ DexScreener data loaded: MC=${market_data['market_cap']:.0f}, Price=${market_data['price']:.8f}")
+        elif market_data['status'] == 'too_new':
+            logger.warning(f"⚠️ No pairs found on DexScreener for {token_address[:10]}...")
+        return market_data
     
     async def get_pumpportal_data(self, token_address: str) -> Dict:
         """Get market data from PumpPortal WebSocket cache or try pump.fun API"""
@@ -454,12 +577,14 @@ class IntegratedTokenMonitor:
             f"https://pump.fun/api/tokens/{token_address}"
         ]
         
+        loop = asyncio.get_running_loop()
         for endpoint in endpoints:
             try:
                 logger.info(f"🚀 Trying endpoint for {token_address[:10]}...")
-                response = requests.get(endpoint, timeout=8, headers={
+                # Blocking HTTP runs in the executor - this coroutine shares the engine's loop
+                response = await loop.run_in_executor(None, lambda: requests.get(endpoint, timeout=8, headers={
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
+                }))
                 
                 if response.status_code == 200:
                     # Try to extract any market data from the response
@@ -497,71 +622,53 @@ class IntegratedTokenMonitor:
         else:
             return f"${market_cap:.0f}"
     
+    def build_engine(self) -> TokenProcessingEngine:
+        """PumpPortal → name enrichment → keyword match → coalesced alerts + persistence"""
+        return TokenProcessingEngine(
+            'pumpportal-engine',
+            matcher=self.match_token,
+            sources=[PumpPortalSource(self.websocket_url)],
+            enrichers=[PipelineStage('enrich', self.enrich_token, concurrency=8, queue_size=200)],
+            sinks=[
+                PipelineStage('alert', self.alert_token, concurrency=1, queue_size=200),
+                PipelineStage('persist', self.persist_token, concurrency=2, queue_size=200, blocking=True),
+            ],
+            match_blocking=True,
+            seen_ttl=3600,
+        )
+    
     async def connect_and_monitor(self):
-        """Connect to PumpPortal and monitor for tokens"""
+        """Run the processing engine (PumpPortal source included) until its sources stop"""
+        self.running = True
         try:
-            logger.info(f"🔗 Connecting to {self.websocket_url}")
-            
-            async with websockets.connect(self.websocket_url) as websocket:
-                self.running = True
-                logger.info("✅ Connected to PumpPortal")
-                
-                # Subscribe to new token events
-                subscribe_message = json.dumps({"method": "subscribeNewToken"})
-                await websocket.send(subscribe_message)
-                logger.info("📡 Subscribed to new token events")
-                
-                # Listen for messages
-                async for message in websocket:
-                    try:
-                        data = json.loads(message)
-                        await self.process_token_data(data)
-                        
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid JSON: {message[:100]}")
-                    except Exception as e:
-                        logger.error(f"Message processing error: {e}")
-        
-        except Exception as e:
-            logger.error(f"WebSocket connection error: {e}")
+            await asyncio.wrap_future(self.engine.start())
+        finally:
             self.running = False
     
-    async def process_token_data(self, data):
-        """Process incoming token data and check for notifications"""
-        try:
-            # Check for new token events
-            if data.get('type') == 'new_token' or 'mint' in data:
-                token_address = data.get('mint') or data.get('address')
-                token_name = data.get('name', 'Unknown')
-                token_symbol = data.get('symbol', '')
-                
-                if token_address and token_address not in self.processed_tokens:
-                    self.processed_tokens.add(token_address)
-                    
-                    logger.info(f"🆕 New token: {token_name} ({token_symbol}) - {token_address}")
-                    
-                    # Enhanced name resolution
-                    enhanced_name = await self.enhance_token_name(token_address, token_name)
-                    
-                    # Insert to database
-                    await self.insert_token_to_database(token_address, enhanced_name, token_symbol)
-                    
-                    # Refresh keywords periodically
-                    self.refresh_keywords()
-                    
-                    # Check for keyword matches and send notifications
-                    matches = self.check_keyword_matches(enhanced_name, token_address)
-                    
-                    if matches:
-                        logger.info(f"🎯 STRICT MATCH: Found {len(matches)} keyword matches for '{enhanced_name}'")
-                        
-                        # Log each match for debugging
-                        for match in matches:
-                            logger.info(f"✅ MATCH DETAILS: Token='{match['token_name']}' | Keyword='{match['keyword']}' | Type={match['match_type']}")
-                            await self.send_discord_notification(match)
-                    
-        except Exception as e:
-            logger.error(f"Token processing error: {e}")
+    async def enrich_token(self, token: Dict) -> Dict:
+        """Enhanced name resolution for tokens PumpPortal sent without a real name"""
+        logger.info(f"🆕 New token: {token['name']} ({token['symbol']}) - {token['address']}")
+        token['name'] = await self.enhance_token_name(token['address'], token['name'])
+        return token
+    
+    def match_token(self, token: Dict) -> List[Dict]:
+        """Keyword matches for the token (refreshing keywords first when due)"""
+        self.refresh_keywords()
+        return self.check_keyword_matches(token['name'], token['address'])
+    
+    def alert_token(self, token: Dict) -> Dict:
+        """Queue every match; one coalesced alert goes out per token"""
+        matches = token['matches']
+        if matches:
+            logger.info(f"🎯 STRICT MATCH: Found {len(matches)} keyword matches for '{token['name']}'")
+            for match in matches:
+                logger.info(f"✅ MATCH DETAILS: Token='{match['token_name']}' | Keyword='{match['keyword']}' | Type={match['match_type']}")
+                self.queue_alert(match)
+        return token
+    
+    def persist_token(self, token: Dict) -> Dict:
+        self.insert_token_to_database(token['address'], token['name'], token['symbol'])
+        return token
     
     async def enhance_token_name(self, address, raw_name):
         """Enhance token name using DexScreener"""
@@ -569,26 +676,21 @@ class IntegratedTokenMonitor:
             if raw_name and raw_name != 'Unknown' and not raw_name.startswith('Unnamed'):
                 return raw_name
             
-            # Fallback to DexScreener
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{address}"
-            response = requests.get(url, timeout=5)
+            # Fallback to DexScreener (batched with other in-flight lookups)
+            pairs = await get_dexscreener_batch().lookup_async(address)
             
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get('pairs', [])
-                
-                if pairs:
-                    enhanced_name = pairs[0].get('baseToken', {}).get('name')
-                    if enhanced_name and enhanced_name != raw_name:
-                        logger.info(f"🔍 Enhanced: {raw_name} → {enhanced_name}")
-                        return enhanced_name
+            if pairs:
+                enhanced_name = pairs[0].get('baseToken', {}).get('name')
+                if enhanced_name and enhanced_name != raw_name:
+                    logger.info(f"🔍 Enhanced: {raw_name} → {enhanced_name}")
+                    return enhanced_name
         
         except Exception as e:
             logger.warning(f"Name enhancement failed: {e}")
         
         return raw_name
     
-    async def insert_token_to_database(self, address, name, symbol):
+    def insert_token_to_database(self, address, name, symbol):
         """Insert token to database with platform detection"""
         try:
             conn = self.get_db_connection()
@@ -929,6 +1031,14 @@ class IntegratedServer:
                     'websocket_active': self.monitor.running if self.monitor else False,
                     'active_keywords': sum(len(keywords) for keywords in self.monitor.user_keywords.values()) if self.monitor else 0,
                     'users': len(self.monitor.user_keywords) if self.monitor else 0,
+                    'db_pool': get_pool_metrics(),
+                    'discord_delivery': get_discord_delivery().get_stats(),
+                    'market_data_cache': get_market_data_service().get_stats(),
+                    'dexscreener_batch': get_dexscreener_batch().get_stats(),
+                    'name_retry_scheduler': get_name_retry_scheduler().get_stats(),
+                    'keyword_events': get_keyword_listener().get_stats(),
+                    'keyword_snapshot': self.monitor.keyword_snapshots.get_stats() if self.monitor else None,
+                    'engine': self.monitor.engine.get_metrics() if self.monitor else None,
                     'timestamp': time.time()
                 })
             except Exception as e:
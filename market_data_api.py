@@ -6,7 +6,8 @@ import requests
 import logging
 from typing import Dict, List, Optional, Any
 import time
-from cachetools import TTLCache
+
+from market_data_service import get_market_data_service
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +20,10 @@ class MarketDataAPI:
             'User-Agent': 'TokenMonitor/1.0'
         })
         
-        # Cache for API responses (5 minute TTL)
-        self.cache = TTLCache(maxsize=1000, ttl=300)
+        # Token lookups share the process-wide cache and single-flight fetches
+        self.market_data = get_market_data_service()
         
-        # Rate limiting
+        # Rate limiting (search only - token lookups are throttled by the service)
         self.last_request_time = 0
         self.min_request_interval = 1.0  # Minimum seconds between requests
     
@@ -34,42 +35,35 @@ class MarketDataAPI:
             time.sleep(self.min_request_interval - time_since_last)
         self.last_request_time = time.time()
     
+    def get_market_data(self, token_address: str, token_age: Optional[float] = None,
+                        timeout: float = 15.0) -> Optional[Dict[str, Any]]:
+        """Get market data (price, market cap, volume, liquidity) from the shared service
+
+        Waits at most timeout seconds; a slower fetch still lands in the cache.
+        """
+        market_data = self.market_data.get(token_address, token_age=token_age, timeout=timeout)
+        if market_data.get('status'):
+            return None
+        return market_data
+    
     def get_token_info(self, token_address: str) -> Optional[Dict[str, Any]]:
         """Get basic token information"""
         try:
-            # Check cache first
-            cache_key = f"token_info_{token_address}"
-            if cache_key in self.cache:
-                return self.cache[cache_key]
+            market_data = self.get_market_data(token_address)
             
-            self._rate_limit()
-            
-            # Try DexScreener API
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get('pairs', [])
-                
-                if pairs:
-                    pair = pairs[0]  # Take first pair
-                    token_info = {
-                        'address': token_address,
-                        'name': pair.get('baseToken', {}).get('name'),
-                        'symbol': pair.get('baseToken', {}).get('symbol'),
-                        'price_usd': pair.get('priceUsd'),
-                        'market_cap': pair.get('marketCap'),
-                        'liquidity': pair.get('liquidity', {}).get('usd'),
-                        'volume_24h': pair.get('volume', {}).get('h24'),
-                        'price_change_24h': pair.get('priceChange', {}).get('h24'),
-                        'dexscreener_url': pair.get('url'),
-                        'last_updated': time.time()
-                    }
-                    
-                    # Cache the result
-                    self.cache[cache_key] = token_info
-                    return token_info
+            if market_data:
+                return {
+                    'address': token_address,
+                    'name': market_data.get('name'),
+                    'symbol': market_data.get('symbol'),
+                    'price_usd': market_data.get('price_usd'),
+                    'market_cap': market_data.get('market_cap'),
+                    'liquidity': market_data.get('liquidity'),
+                    'volume_24h': market_data.get('volume_24h'),
+                    'price_change_24h': market_data.get('price_change_24h'),
+                    'dexscreener_url': market_data.get('dexscreener_url'),
+                    'last_updated': time.time()
+                }
             
             logger.warning(f"No token info found for {token_address}")
             return None
@@ -144,9 +138,12 @@ class MarketDataAPI:
             return []
     
     def clear_cache(self):
-        """Clear the API response cache"""
-        self.cache.clear()
-        logger.info("Market data cache cleared")
+        """Clear the shared market data cache"""
+        self.market_data.clear()
 
 # Global instance
-market_data_api = MarketDataAPI()
\ No newline at end of file
+market_data_api = MarketDataAPI()
+
+def get_market_data_api() -> MarketDataAPI:
+    """Get the shared market data API instance"""
+    return market_data_api
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Market Data Service - one process-wide market-data cache for every module
+Concurrent requests for the same mint collapse onto a single upstream call
+(single-flight), cached entries live for a freshness tier picked by token age
+(seconds for a just-launched token, minutes for older ones), and "too_new"
+answers are cached briefly so a burst of lookups for an unlisted token costs
+one request.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dexscreener_batch import get_dexscreener_batch
+from memory_governor import estimate_bytes
+
+logger = logging.getLogger(__name__)
+
+# (max token age in seconds, cache TTL in seconds) - first tier the token fits wins
+FRESHNESS_TIERS = (
+    (60, 5.0),
+    (600, 30.0),
+    (3600, 120.0),
+    (float('inf'), 300.0),
+)
+UNKNOWN_AGE_TTL = 30.0
+NEGATIVE_TTL = 10.0          # How long a "too_new" answer is trusted
+
+STATUS_TOO_NEW = 'too_new'
+
+def freshness_ttl(token_age: Optional[float]) -> float:
+    """Cache lifetime for market data of a token this many seconds old"""
+    if token_age is None:
+        return UNKNOWN_AGE_TTL
+    for max_age, ttl in FRESHNESS_TIERS:
+        if token_age < max_age:
+            return ttl
+    return FRESHNESS_TIERS[-1][1]
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_dexscreener_pairs(pairs: Optional[list]) -> Dict[str, Any]:
+    """Market data from the most liquid pair, or a too_new status without pairs"""
+    if not pairs:
+        return {'status': STATUS_TOO_NEW}
+    best_pair = max(pairs, key=lambda pair: _to_float((pair.get('liquidity') or {}).get('usd')))
+    base_token = best_pair.get('baseToken') or {}
+    price = _to_float(best_pair.get('priceUsd'))
+    return {
+        'name': base_token.get('name'),
+        'symbol': base_token.get('symbol'),
+        'price': price,
+        'price_usd': price,
+        'market_cap': _to_float(best_pair.get('marketCap') or best_pair.get('fdv')),
+        'volume_24h': _to_float((best_pair.get('volume') or {}).get('h24')),
+        'liquidity': _to_float((best_pair.get('liquidity') or {}).get('usd')),
+        'price_change_24h': _to_float((best_pair.get('priceChange') or {}).get('h24')),
+        'dexscreener_url': best_pair.get('url'),
+        'pair_created_at': best_pair.get('pairCreatedAt'),
+        'pairs': len(pairs),
+        'source': 'DexScreener',
+    }
+
+class MarketDataService:
+    """Thread- and asyncio-safe market-data cache with single-flight upstream calls
+
+    fetcher(address) -> dict returns market data or a {'status': ...} dict;
+    the default asks DexScreener through the shared batch client.
+    """
+
+    def __init__(self, fetcher: Optional[Callable[[str], Dict[str, Any]]] = None, maxsize: int = 5000,
+                 max_workers: int = 8):
+        self.fetcher = fetcher or self._fetch_dexscreener
+        self.maxsize = maxsize
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix="market-data")
+
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Dict[str, Any], float]] = {}    # address -> (data, expires_at)
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self.stats = {
+            'requests': 0,
+            'hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+            'collapsed': 0,
+            'upstream_calls': 0,
+            'upstream_errors': 0,
+            'evicted': 0,
+        }
+
+    # ------------------------------------------------------------------ public API
+
+    def get(self, address: str, token_age: Optional[float] = None, timeout: float = 15.0) -> Dict[str, Any]:
+        """Market data for address, blocking the calling thread at most timeout seconds"""
+        try:
+            return self._flight(address, token_age).result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            return {'status': 'timeout'}
+
+    async def get_async(self, address: str, token_age: Optional[float] = None) -> Dict[str, Any]:
+        """Market data for address without blocking the running event loop"""
+        return await asyncio.wrap_future(self._flight(address, token_age))
+
+    def peek(self, address: str) -> Optional[Dict[str, Any]]:
+        """Cached data if still fresh, never triggering a fetch"""
+        with self._lock:
+            entry = self._cache.get(address)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def invalidate(self, address: str):
+        with self._lock:
+            self._cache.pop(address, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+        logger.info("Market data cache cleared")
+
+    def evict(self, count: int) -> int:
+        """Drop expired entries, then up to count of the soonest-expiring ones (memory governor hook)"""
+        with self._lock:
+            return self._drop(count)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return estimate_bytes(self._cache)
+
+    # ------------------------------------------------------------------ single flight
+
+    def _flight(self, address: str, token_age: Optional[float]) -> concurrent.futures.Future:
+        now = time.monotonic()
+        with self._lock:
+            self.stats['requests'] += 1
+            entry = self._cache.get(address)
+            if entry and entry[1] > now:
+                self.stats['negative_hits' if entry[0].get('status') else 'hits'] += 1
+                future = concurrent.futures.Future()
+                future.set_result(entry[0])
+                return future
+            future = self._inflight.get(address)
+            if future is not None:
+                self.stats['collapsed'] += 1
+                return future
+            self.stats['misses'] += 1
+            future = self._inflight[address] = concurrent.futures.Future()
+        self._executor.submit(self._resolve, address, token_age, future)
+        return future
+
+    def _resolve(self, address: str, token_age: Optional[float], future: concurrent.futures.Future):
+        try:
+            with self._lock:
+                self.stats['upstream_calls'] += 1
+            data = self.fetcher(address)
+        except Exception as e:
+            logger.warning(f"❌ Market data fetch failed for {address[:10]}...: {e}")
+            data = {'status': 'fetch_error'}
+
+        ttl = self._ttl_for(data, token_age)
+        with self._lock:
+            if data.get('status') and data.get('status') != STATUS_TOO_NEW:
+                self.stats['upstream_errors'] += 1
+            if ttl > 0:
+                self._cache[address] = (data, time.monotonic() + ttl)
+                self._evict()
+            self._inflight.pop(address, None)
+        future.set_result(data)
+
+    def _ttl_for(self, data: Dict[str, Any], token_age: Optional[float]) -> float:
+        status = data.get('status')
+        if status == STATUS_TOO_NEW:
+            return NEGATIVE_TTL
+        if status:
+            return 0.0      # Transient errors are retried on the next request
+        if token_age is None and data.get('pair_created_at'):
+            # Pair creation is the closest thing DexScreener has to token age
+            token_age = time.time() - _to_float(data['pair_created_at']) / 1000.0
+        return freshness_ttl(token_age)
+
+    def _evict(self):
+        """Drop expired entries, then the soonest-expiring ones, to stay under maxsize"""
+        if len(self._cache) > self.maxsize:
+            self._drop(len(self._cache) - self.maxsize)
+
+    def _drop(self, count: int) -> int:
+        """Drop every expired entry, then soonest-expiring ones until count are gone (caller holds lock)"""
+        now = time.monotonic()
+        dropped = 0
+        for address in [address for address, (_, expires) in self._cache.items() if expires <= now]:
+            del self._cache[address]
+            dropped += 1
+        if dropped < count:
+            for address, _ in sorted(self._cache.items(), key=lambda item: item[1][1])[:count - dropped]:
+                del self._cache[address]
+                dropped += 1
+        self.stats['evicted'] += dropped
+        return dropped
+
+    # ------------------------------------------------------------------ upstream
+
+    def _fetch_dexscreener(self, address: str) -> Dict[str, Any]:
+        pairs = get_dexscreener_batch().lookup(address)
+        if pairs is None:
+            return {'status': 'api_error'}
+        return parse_dexscreener_pairs(pairs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._cache)
+            stats['inflight'] = len(self._inflight)
+        served = stats['requests']
+        stats['hit_rate'] = (stats['hits'] + stats['negative_hits'] + stats['collapsed']) / served if served else 0.0
+        return stats
+
+# Global instance shared by the monitors, notifiers and slash commands
+_market_data_service = None
+_market_data_service_lock = threading.Lock()
+
+def get_market_data_service() -> MarketDataService:
+    """Get the process-wide market data service"""
+    global _market_data_service
+    if _market_data_service is None:
+        with _market_data_service_lock:
+            if _market_data_service is None:
+                _market_data_service = MarketDataService()
+    return _market_data_service
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Memory Governor - size- and age-aware eviction for the in-process caches
+Caches register once; the governor measures their byte footprint (sampled,
+so measuring never walks a whole cache) and, only when the tracked total is
+over budget or the host is short on memory, evicts the oldest entries a step
+at a time from the caches that are cheapest to lose per byte. Fixed-memory
+structures (CompactSeenSet) are measured but never evicted - clearing them
+frees nothing and only causes reprocessing. GC is tuned once after startup
+(gc.freeze() plus generational thresholds) instead of forcing full collections.
+"""
+
+import gc
+import os
+import sys
+import time
+import logging
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+DEFAULT_GC_THRESHOLDS = (50000, 50, 100)
+
+def estimate_bytes(container: Any, sample_size: int = 32) -> int:
+    """Approximate footprint of a dict/set/list and its entries from a sample
+
+    Entry sizes are key plus value, with one level of tuple/list/dict values
+    counted, which covers (data, expires_at) and {'field': ...} style entries.
+    """
+    size = sys.getsizeof(container)
+    count = len(container)
+    if not count:
+        return size
+    if isinstance(container, dict):
+        sample = list(islice(container.items(), sample_size))
+    else:
+        sample = [(item, None) for item in islice(container, sample_size)]
+    sampled = 0
+    for key, value in sample:
+        sampled += sys.getsizeof(key)
+        if value is not None:
+            sampled += _value_bytes(value)
+    return size + sampled * count // len(sample)
+
+def _value_bytes(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(key) + sys.getsizeof(item) for key, item in value.items())
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            size += sys.getsizeof(item)
+            if isinstance(item, dict):
+                size += sum(sys.getsizeof(key) + sys.getsizeof(field) for key, field in item.items())
+    return size
+
+def _evict_mapping(cache: Any, count: int) -> int:
+    """Oldest-first eviction for plain dicts/OrderedDicts and cachetools caches"""
+    if hasattr(cache, 'expire'):
+        # cachetools TTLCache: expired entries go first, then popitem() drops the LRU entry
+        before = len(cache)
+        cache.expire()
+        evicted = before - len(cache)
+        while evicted < count and len(cache):
+            cache.popitem()
+            evicted += 1
+        return evicted
+    evicted = 0
+    for key in list(islice(iter(cache), count)):
+        cache.pop(key, None)
+        evicted += 1
+    return evicted
+
+class _RegisteredCache:
+    __slots__ = ('name', 'cache', 'value', 'size', 'evict', 'evicted', 'last_bytes')
+
+    def __init__(self, name: str, cache: Any, value: float, size: Callable[[], int],
+                 evict: Optional[Callable[[int], int]]):
+        self.name = name
+        self.cache = cache
+        self.value = value
+        self.size = size
+        self.evict = evict
+        self.evicted = 0
+        self.last_bytes = 0
+
+class MemoryGovernor:
+    """Tracks registered caches' bytes and evicts incrementally under pressure
+
+    value is what a cache's entries are worth relative to the others (the
+    cost of re-fetching them); under pressure the cache with the lowest value
+    per byte loses `step` of its entries, oldest first, until the tracked
+    total is back under target_ratio × budget.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES, target_ratio: float = 0.8, step: float = 0.1,
+                 system_memory_percent: float = 80.0, max_rounds: int = 50):
+        self.budget_bytes = budget_bytes
+        self.target_ratio = target_ratio
+        self.step = step
+        self.system_memory_percent = system_memory_percent
+        self.max_rounds = max_rounds
+
+        self._lock = threading.Lock()
+        self._caches: Dict[str, _RegisteredCache] = {}
+        self._gc_tuned = None
+
+        self.stats = {
+            'enforcements': 0,
+            'pressure_events': 0,
+            'entries_evicted': 0,
+            'bytes_reclaimed': 0,
+            'last_enforce_ms': 0.0,
+        }
+
+    # ------------------------------------------------------------------ registration
+
+    def register(self, name: str, cache: Any, value: float = 1.0, size: Optional[Callable[[], int]] = None,
+                 evict: Optional[Callable[[int], int]] = None):
+        """Track cache under name (re-registering a name replaces it)
+
+        size() defaults to cache.memory_bytes when the cache reports its own
+        footprint, else a sampled estimate. evict(count) defaults to
+        cache.evict, else oldest-first eviction for mappings; fixed-memory
+        caches (no evict, not a mapping) are only measured.
+        """
+        if size is None:
+            if hasattr(cache, 'memory_bytes'):
+                size = lambda: cache.memory_bytes
+            else:
+                size = lambda: estimate_bytes(cache)
+        if evict is None:
+            if hasattr(cache, 'evict'):
+                evict = cache.evict
+            elif isinstance(cache, dict) or hasattr(cache, 'popitem'):
+                evict = lambda count: _evict_mapping(cache, count)
+        with self._lock:
+            self._caches[name] = _RegisteredCache(name, cache, value, size, evict)
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._caches.pop(name, None)
+
+    # ------------------------------------------------------------------ measurement
+
+    def _measure(self) -> Dict[str, int]:
+        sizes = {}
+        for entry in list(self._caches.values()):
+            try:
+                entry.last_bytes = int(entry.size())
+            except Exception as e:
+                logger.debug(f"Memory governor could not size {entry.name}: {e}")
+            sizes[entry.name] = entry.last_bytes
+        return sizes
+
+    def tracked_bytes(self) -> int:
+        return sum(self._measure().values())
+
+    def _system_pressure(self) -> bool:
+        if psutil is None:
+            return False
+        try:
+            return psutil.virtual_memory().percent > self.system_memory_percent
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------ eviction
+
+    def enforce(self, force: bool = False) -> Dict[str, int]:
+        """Evict until under target if over budget (or force/host pressure); entries evicted per cache"""
+        started = time.perf_counter()
+        with self._lock:
+            self.stats['enforcements'] += 1
+            sizes = self._measure()
+            total = sum(sizes.values())
+            system_pressure = force or self._system_pressure()
+            if total <= self.budget_bytes and not system_pressure:
+                self.stats['last_enforce_ms'] = (time.perf_counter() - started) * 1000
+                return {}
+
+            self.stats['pressure_events'] += 1
+            target = self.budget_bytes * self.target_ratio
+            if system_pressure:
+                # Host is short on memory - give back a step of what can be evicted even within budget
+                evictable = sum(entry.last_bytes for entry in self._caches.values() if entry.evict is not None)
+                target = min(target, total - evictable * self.step)
+            evicted = self._evict_to(target, total)
+
+            reclaimed = max(0, total - sum(self._measure().values()))
+            self.stats['bytes_reclaimed'] += reclaimed
+            self.stats['last_enforce_ms'] = (time.perf_counter() - started) * 1000
+
+        if evicted:
+            logger.info(f"🧹 MEMORY GOVERNOR: evicted {sum(evicted.values())} entries "
+                        f"({', '.join(f'{name} {count}' for name, count in evicted.items())}), "
+                        f"~{reclaimed / 1024:.0f} KiB reclaimed")
+        return evicted
+
+    def _evict_to(self, target: float, total: int) -> Dict[str, int]:
+        """Step-wise eviction, cheapest value per byte first (caller holds lock)"""
+        evicted: Dict[str, int] = {}
+        exhausted = set()
+        for _ in range(self.max_rounds):
+            if total <= target:
+                break
+            candidates = [entry for entry in self._caches.values()
+                          if entry.evict is not None and entry.name not in exhausted and entry.last_bytes > 0]
+            if not candidates:
+                break
+            entry = min(candidates, key=lambda candidate: candidate.value / candidate.last_bytes)
+            entries = len(entry.cache) if hasattr(entry.cache, '__len__') else 0
+            count = max(1, int(entries * self.step))
+            try:
+                dropped = entry.evict(count) if entries else 0
+            except Exception as e:
+                logger.warning(f"⚠️ Memory governor eviction failed for {entry.name}: {e}")
+                dropped = 0
+            if not dropped:
+                exhausted.add(entry.name)
+                continue
+            entry.evicted += dropped
+            self.stats['entries_evicted'] += dropped
+            evicted[entry.name] = evicted.get(entry.name, 0) + dropped
+            before = entry.last_bytes
+            try:
+                entry.last_bytes = int(entry.size())
+            except Exception:
+                entry.last_bytes = 0
+            total -= before - entry.last_bytes
+        return evicted
+
+    # ------------------------------------------------------------------ GC
+
+    def tune_gc(self, thresholds: Tuple[int, int, int] = DEFAULT_GC_THRESHOLDS, freeze: bool = True):
+        """After startup: move long-lived startup objects out of GC scans and raise the gen0 threshold
+
+        The one collection here runs before freezing so startup garbage isn't
+        frozen with it; afterwards collections stay generational and incremental.
+        """
+        with self._lock:
+            if self._gc_tuned is not None:
+                return
+            previous = gc.get_threshold()
+            if freeze and hasattr(gc, 'freeze'):
+                gc.collect()
+                gc.freeze()
+            gc.set_threshold(*thresholds)
+            self._gc_tuned = {'previous_thresholds': previous, 'frozen': freeze and hasattr(gc, 'freeze')}
+        logger.info(f"♻️ GC tuned: thresholds {previous} → {thresholds}, "
+                    f"{gc.get_freeze_count() if hasattr(gc, 'get_freeze_count') else 0} startup objects frozen")
+
+    def gc_stats(self) -> Dict[str, Any]:
+        return {
+            'tuned': self._gc_tuned is not None,
+            'thresholds': gc.get_threshold(),
+            'counts': gc.get_count(),
+            'frozen': gc.get_freeze_count() if hasattr(gc, 'get_freeze_count') else 0,
+            'collections': [generation['collections'] for generation in gc.get_stats()],
+        }
+
+    # ------------------------------------------------------------------ metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = self._measure()
+            caches = {
+                entry.name: {
+                    'bytes': sizes.get(entry.name, 0),
+                    'entries': len(entry.cache) if hasattr(entry.cache, '__len__') else None,
+                    'value': entry.value,
+                    'evictable': entry.evict is not None,
+                    'evicted': entry.evicted,
+                }
+                for entry in self._caches.values()
+            }
+            stats = dict(self.stats)
+        stats['budget_bytes'] = self.budget_bytes
+        stats['tracked_bytes'] = sum(sizes.values())
+        stats['caches'] = caches
+        stats['gc'] = self.gc_stats()
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"📦 MEMORY: {stats['tracked_bytes'] / 1024:.0f} KiB tracked of "
+                    f"{self.budget_bytes / 1024 / 1024:.0f} MiB budget")
+        for name, cache in stats['caches'].items():
+            logger.info(f"      {name}: {cache['bytes'] / 1024:.0f} KiB, {cache['entries']} entries, "
+                        f"{cache['evicted']} evicted")
+
+# Global instance
+_memory_governor = None
+_memory_governor_lock = threading.Lock()
+
+def get_memory_governor() -> MemoryGovernor:
+    """Get the process-wide memory governor (MEMORY_BUDGET_MB overrides the default budget)"""
+    global _memory_governor
+    if _memory_governor is None:
+        with _memory_governor_lock:
+            if _memory_governor is None:
+                budget_mb = os.getenv('MEMORY_BUDGET_MB')
+                budget = int(float(budget_mb) * 1024 * 1024) if budget_mb else DEFAULT_BUDGET_BYTES
+                _memory_governor = MemoryGovernor(budget_bytes=budget)
+    return _memory_governor
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Metaplex Metadata - on-chain token names without program-wide scans
+Derives each mint's metadata PDA locally, fetches up to 100 of them per
+getMultipleAccounts call and decodes the full Borsh layout (name, symbol,
+URI, creators, collection) straight from a memoryview of the account data.
+"""
+
+import base64
+import struct
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import base58
+
+logger = logging.getLogger(__name__)
+
+METADATA_PROGRAM_ID = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
+METADATA_KEY_V1 = 4                 # Account discriminator for Metadata accounts
+MAX_MULTIPLE_ACCOUNTS = 100         # getMultipleAccounts hard limit
+
+# ed25519 field constants for the off-curve check in PDA derivation
+_P = 2 ** 255 - 19
+_D = (-121665 * pow(121666, _P - 2, _P)) % _P
+
+def is_on_curve(point: bytes) -> bool:
+    """True if 32 bytes decompress to an ed25519 point (PDAs must not)"""
+    y = int.from_bytes(point, 'little') & ((1 << 255) - 1)
+    y2 = y * y % _P
+    u = (y2 - 1) % _P
+    v = (_D * y2 + 1) % _P
+    if v == 0:
+        return u == 0
+    x2 = u * pow(v, _P - 2, _P) % _P
+    # x^2 must be a quadratic residue (Euler's criterion)
+    return x2 == 0 or pow(x2, (_P - 1) // 2, _P) == 1
+
+def find_program_address(seeds: Sequence[bytes], program_id: bytes) -> Tuple[bytes, int]:
+    """Solana find_program_address: highest bump whose hash lands off the curve"""
+    for bump in range(255, -1, -1):
+        hasher = hashlib.sha256()
+        for seed in seeds:
+            hasher.update(seed)
+        hasher.update(bytes([bump]))
+        hasher.update(program_id)
+        hasher.update(b"ProgramDerivedAddress")
+        candidate = hasher.digest()
+        if not is_on_curve(candidate):
+            return candidate, bump
+    raise ValueError("Unable to find a viable program address bump seed")
+
+@lru_cache(maxsize=4096)
+def derive_metadata_pda(mint_address: str) -> str:
+    """Metadata account address for a mint: PDA of ["metadata", program, mint]"""
+    program_id = base58.b58decode(METADATA_PROGRAM_ID)
+    address, _ = find_program_address([b"metadata", program_id, base58.b58decode(mint_address)], program_id)
+    return base58.b58encode(address).decode()
+
+@dataclass
+class Creator:
+    address: str
+    verified: bool
+    share: int
+
+@dataclass
+class MetaplexMetadata:
+    """Decoded Metadata account (fields after creators are optional on old accounts)"""
+    update_authority: str
+    mint: str
+    name: str
+    symbol: str
+    uri: str
+    seller_fee_basis_points: int
+    creators: List[Creator] = field(default_factory=list)
+    primary_sale_happened: bool = False
+    is_mutable: bool = True
+    edition_nonce: Optional[int] = None
+    token_standard: Optional[int] = None
+    collection: Optional[Tuple[bool, str]] = None
+
+    def to_token_metadata(self) -> Dict[str, object]:
+        """Shape used by the scrapers' metadata dicts"""
+        return {
+            'name': self.name,
+            'symbol': self.symbol,
+            'uri': self.uri,
+            'decimals': 9,
+            'update_authority': self.update_authority,
+            'creators': [creator.address for creator in self.creators],
+            'extraction_source': 'metaplex',
+        }
+
+class _BorshReader:
+    """Sequential little-endian reader over a memoryview - slices, never copies"""
+
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def remaining(self) -> int:
+        return len(self.view) - self.offset
+
+    def take(self, size: int) -> memoryview:
+        if size < 0 or self.offset + size > len(self.view):
+            raise ValueError(f"Metadata truncated at byte {self.offset} (need {size})")
+        chunk = self.view[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def u8(self) -> int:
+        return self.take(1)[0]
+
+    def u16(self) -> int:
+        return struct.unpack_from('<H', self.take(2))[0]
+
+    def u32(self) -> int:
+        return struct.unpack_from('<I', self.take(4))[0]
+
+    def bool(self) -> bool:
+        return self.u8() != 0
+
+    def pubkey(self) -> str:
+        return base58.b58encode(bytes(self.take(32))).decode()
+
+    def string(self) -> str:
+        # Metaplex pads names/symbols/URIs with NULs to fixed widths
+        return str(self.take(self.u32()), 'utf-8', errors='ignore').rstrip('\x00').strip()
+
+def decode_metadata(data) -> MetaplexMetadata:
+    """Decode a Metadata account; raises ValueError on anything that isn't one"""
+    reader = _BorshReader(data)
+    key = reader.u8()
+    if key != METADATA_KEY_V1:
+        raise ValueError(f"Not a Metadata account (key {key})")
+
+    update_authority = reader.pubkey()
+    mint = reader.pubkey()
+    name = reader.string()
+    symbol = reader.string()
+    uri = reader.string()
+    seller_fee_basis_points = reader.u16()
+
+    creators = []
+    if reader.bool():
+        for _ in range(reader.u32()):
+            creators.append(Creator(reader.pubkey(), reader.bool(), reader.u8()))
+
+    metadata = MetaplexMetadata(update_authority, mint, name, symbol, uri, seller_fee_basis_points, creators)
+
+    # Later fields were added over program versions - stop quietly where old accounts end
+    try:
+        metadata.primary_sale_happened = reader.bool()
+        metadata.is_mutable = reader.bool()
+        if reader.bool():
+            metadata.edition_nonce = reader.u8()
+        if reader.bool():
+            metadata.token_standard = reader.u8()
+        if reader.bool():
+            metadata.collection = (reader.bool(), reader.pubkey())
+    except ValueError:
+        pass
+    return metadata
+
+class MetaplexMetadataFetcher:
+    """Batch metadata lookups over any JSON-RPC call function
+
+    rpc_call(method, params) -> result, e.g. AlchemyLetsBonkScraper._make_rpc_call.
+    """
+
+    def __init__(self, rpc_call: Callable[[str, list], Optional[dict]], batch_size: int = MAX_MULTIPLE_ACCOUNTS,
+                 commitment: str = "confirmed"):
+        self.rpc_call = rpc_call
+        self.batch_size = max(1, min(batch_size, MAX_MULTIPLE_ACCOUNTS))
+        self.commitment = commitment
+        self.stats = {'rpc_calls': 0, 'accounts_requested': 0, 'decoded': 0, 'missing': 0, 'decode_errors': 0}
+
+    def fetch(self, mint_addresses: Iterable[str]) -> Dict[str, Optional[MetaplexMetadata]]:
+        """Metadata per mint (None where no account exists yet or it didn't decode)"""
+        mints = list(dict.fromkeys(mint_addresses))
+        results: Dict[str, Optional[MetaplexMetadata]] = {}
+
+        for start in range(0, len(mints), self.batch_size):
+            chunk = mints[start:start + self.batch_size]
+            pdas = [derive_metadata_pda(mint) for mint in chunk]
+            self.stats['rpc_calls'] += 1
+            self.stats['accounts_requested'] += len(pdas)
+            response = self.rpc_call("getMultipleAccounts", [
+                pdas, {"encoding": "base64", "commitment": self.commitment}
+            ])
+            accounts = (response or {}).get('value') or [None] * len(chunk)
+
+            for mint, account in zip(chunk, accounts):
+                results[mint] = self._decode_account(mint, account)
+        return results
+
+    def _decode_account(self, mint: str, account: Optional[dict]) -> Optional[MetaplexMetadata]:
+        if not account or account.get('owner') != METADATA_PROGRAM_ID:
+            self.stats['missing'] += 1
+            return None
+        try:
+            data = account.get('data') or ['']
+            metadata = decode_metadata(base64.b64decode(data[0]))
+            if metadata.mint != mint:
+                raise ValueError(f"PDA holds metadata for {metadata.mint}")
+            self.stats['decoded'] += 1
+            return metadata
+        except Exception as e:
+            self.stats['decode_errors'] += 1
+            logger.debug(f"Metaplex decode failed for {mint[:10]}...: {e}")
+            return None
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Name Retry Scheduler - one priority scheduler for every pending-name retry
+Tokens waiting for a real name sit on a due-time heap with per-token
+exponential backoff. Once due, they are started highest score first under a
+global concurrency cap: score = chance the name is available at the token's
+age (learned from past attempts) × keyword relevance (the token already
+matched, or its placeholder/symbol still matches an active keyword). Under
+load the tokens users are watching for get resolved first.
+"""
+
+import time
+import heapq
+import asyncio
+import inspect
+import logging
+import itertools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from background_event_loop import BackgroundEventLoop, get_background_loop
+from keyword_automaton import KeywordAutomaton
+
+logger = logging.getLogger(__name__)
+
+# Token-age buckets (upper bounds in seconds) and the availability assumed before any attempts
+AGE_BUCKETS = (15, 30, 60, 120, 300, 600, 1800, 3600, float('inf'))
+PRIOR_AVAILABILITY = (0.05, 0.1, 0.2, 0.35, 0.5, 0.6, 0.65, 0.7, 0.7)
+PRIOR_WEIGHT = 4.0              # Prior counts as this many observations
+MAX_BUCKET_OBSERVATIONS = 500   # Past this, counts are halved so the model keeps adapting
+
+# Keyword relevance multipliers
+RELEVANCE_MATCHED = 1.0         # Already matched, or placeholder/symbol matches an active keyword
+RELEVANCE_OPEN = 0.25           # Real name unknown - it may still match something
+RELEVANCE_NO_WATCHERS = 0.05    # Nobody is watching any keyword right now
+RELEVANCE_UNKNOWN = 1.0         # Keywords never published to the scheduler - don't discriminate
+
+# Per-token exponential backoff: base × 2^(attempts-1), capped
+DEFAULT_BASE_DELAY = 15.0
+DEFAULT_MAX_DELAY = 600.0
+
+ResolveFunc = Callable[[str], Union[Optional[str], Awaitable[Optional[str]]]]
+Callback = Callable[..., Any]
+
+class NameAvailabilityModel:
+    """P(name resolvable now | token age), one Beta-smoothed success rate per age bucket"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._successes = [0.0] * len(AGE_BUCKETS)
+        self._attempts = [0.0] * len(AGE_BUCKETS)
+
+    @staticmethod
+    def bucket(age: float) -> int:
+        for index, upper in enumerate(AGE_BUCKETS):
+            if age < upper:
+                return index
+        return len(AGE_BUCKETS) - 1
+
+    def availability(self, age: float) -> float:
+        index = self.bucket(max(0.0, age))
+        with self._lock:
+            successes, attempts = self._successes[index], self._attempts[index]
+        return (successes + PRIOR_AVAILABILITY[index] * PRIOR_WEIGHT) / (attempts + PRIOR_WEIGHT)
+
+    def record(self, age: float, resolved: bool):
+        index = self.bucket(max(0.0, age))
+        with self._lock:
+            self._attempts[index] += 1
+            if resolved:
+                self._successes[index] += 1
+            if self._attempts[index] > MAX_BUCKET_OBSERVATIONS:
+                self._attempts[index] /= 2
+                self._successes[index] /= 2
+
+    def snapshot(self) -> Dict[str, float]:
+        return {f"<{upper:g}s": round(self.availability(upper - 1 if upper != float('inf') else 86400), 3)
+                for upper in AGE_BUCKETS}
+
+class RetryEntry:
+    """One token waiting for its real name"""
+
+    def __init__(self, address: str, resolve: ResolveFunc, on_resolved: Optional[Callback],
+                 on_abandoned: Optional[Callback], created_at: float, matched_keywords: Iterable[str],
+                 hints: Iterable[str]):
+        self.address = address
+        self.resolve = resolve
+        self.on_resolved = on_resolved
+        self.on_abandoned = on_abandoned
+        self.created_at = created_at
+        self.matched_keywords = tuple(kw.lower() for kw in matched_keywords or () if kw)
+        self.hints = tuple(hint for hint in hints or () if hint)
+        self.attempts = 0
+        self.due = 0.0
+
+class NameRetryScheduler:
+    """Due-time heap + score-ordered dispatch with a global concurrency cap
+
+    schedule() is thread-safe. resolve(address) may be a coroutine function
+    or a plain (blocking) function, which then runs in the default executor;
+    it returns the real name or None. on_resolved(address, name) and
+    on_abandoned(address) may be plain or async callbacks.
+    """
+
+    def __init__(self, loop_service: Optional[BackgroundEventLoop] = None, max_concurrency: int = 8,
+                 base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY,
+                 max_attempts: int = 8, model: Optional[NameAvailabilityModel] = None):
+        self.loop_service = loop_service or get_background_loop()
+        self.max_concurrency = max_concurrency
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.model = model or NameAvailabilityModel()
+
+        self._lock = threading.Lock()
+        self._scheduled: Dict[str, RetryEntry] = {}
+        self._keywords: Optional[KeywordAutomaton] = None
+        self._sequence = itertools.count()
+
+        # Loop-side state - only touched on the loop thread
+        self._timers: List[Tuple[float, int, str]] = []     # (due, sequence, address)
+        self._ready: Dict[str, RetryEntry] = {}
+        self._active = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'scheduled': 0,
+            'duplicates': 0,
+            'attempts': 0,
+            'resolved': 0,
+            'abandoned': 0,
+            'errors': 0,
+            'max_ready': 0,
+        }
+
+    # ------------------------------------------------------------------ producers
+
+    def schedule(self, address: str, resolve: ResolveFunc, on_resolved: Optional[Callback] = None,
+                 on_abandoned: Optional[Callback] = None, created_at: Optional[float] = None,
+                 matched_keywords: Iterable[str] = (), hints: Iterable[str] = (),
+                 initial_delay: float = 0.0) -> bool:
+        """Queue address for name resolution; False if it is already scheduled"""
+        entry = RetryEntry(address, resolve, on_resolved, on_abandoned, created_at or time.time(),
+                           matched_keywords, hints)
+        entry.due = time.monotonic() + max(0.0, initial_delay)
+        with self._lock:
+            if address in self._scheduled:
+                self.stats['duplicates'] += 1
+                return False
+            self._scheduled[address] = entry
+            self.stats['scheduled'] += 1
+        self.loop_service.call_soon(self._add, entry)
+        return True
+
+    def update_keywords(self, keywords: Iterable[str]):
+        """Publish the active keyword list used for relevance scoring"""
+        self._keywords = KeywordAutomaton(list(keywords or []))
+
+    def is_scheduled(self, address: str) -> bool:
+        with self._lock:
+            return address in self._scheduled
+
+    # ------------------------------------------------------------------ scoring
+
+    def relevance(self, entry: RetryEntry) -> float:
+        keywords = self._keywords
+        if keywords is None:
+            return RELEVANCE_UNKNOWN
+        if not keywords:
+            return RELEVANCE_NO_WATCHERS
+        if entry.matched_keywords and set(entry.matched_keywords) & set(keywords.lowered):
+            return RELEVANCE_MATCHED
+        if entry.hints and keywords.first_match(*entry.hints):
+            return RELEVANCE_MATCHED
+        return RELEVANCE_OPEN
+
+    def score(self, entry: RetryEntry, now: Optional[float] = None) -> float:
+        age = (now or time.time()) - entry.created_at
+        return self.model.availability(age) * self.relevance(entry)
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.base_delay * (2 ** max(0, attempts - 1)), self.max_delay)
+
+    # ------------------------------------------------------------------ loop side
+
+    def _add(self, entry: RetryEntry):
+        heapq.heappush(self._timers, (entry.due, next(self._sequence), entry.address))
+        if self._runner is None or self._runner.done():
+            self._wakeup = asyncio.Event()
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            sleep_for = self._dispatch()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self) -> Optional[float]:
+        """Move due timers to the ready set, start the best-scoring ones; returns seconds to the next timer"""
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, address = heapq.heappop(self._timers)
+            with self._lock:
+                entry = self._scheduled.get(address)
+            if entry is not None:
+                self._ready[address] = entry
+        with self._lock:
+            self.stats['max_ready'] = max(self.stats['max_ready'], len(self._ready))
+
+        free = self.max_concurrency - self._active
+        if free > 0 and self._ready:
+            wall_now = time.time()
+            ranked = sorted(self._ready.values(), key=lambda entry: self.score(entry, wall_now), reverse=True)
+            loop = asyncio.get_running_loop()
+            for entry in ranked[:free]:
+                del self._ready[entry.address]
+                self._active += 1
+                loop.create_task(self._attempt(entry))
+
+        if self._timers:
+            return max(0.0, self._timers[0][0] - now)
+        return None
+
+    async def _attempt(self, entry: RetryEntry):
+        age = time.time() - entry.created_at
+        name = None
+        try:
+            if inspect.iscoroutinefunction(entry.resolve):
+                name = await entry.resolve(entry.address)
+            else:
+                name = await asyncio.get_running_loop().run_in_executor(None, entry.resolve, entry.address)
+        except Exception as e:
+            logger.debug(f"Name retry failed for {entry.address[:10]}...: {e}")
+            with self._lock:
+                self.stats['errors'] += 1
+
+        name = name.strip() if isinstance(name, str) else None
+        resolved = bool(name) and not name.startswith('Unnamed')
+        self.model.record(age, resolved)
+        entry.attempts += 1
+        with self._lock:
+            self.stats['attempts'] += 1
+
+        try:
+            if resolved:
+                self._finish(entry, 'resolved')
+                logger.info(f"✅ NAME RESOLVED: '{name}' for {entry.address[:10]}... "
+                            f"(attempt {entry.attempts}, age {age:.0f}s)")
+                await self._call(entry.on_resolved, entry.address, name)
+            elif entry.attempts >= self.max_attempts:
+                self._finish(entry, 'abandoned')
+                logger.info(f"⏰ GIVING UP: {entry.address[:10]}... after {entry.attempts} attempts")
+                await self._call(entry.on_abandoned, entry.address)
+            else:
+                entry.due = time.monotonic() + self.backoff(entry.attempts)
+                heapq.heappush(self._timers, (entry.due, next(self._sequence), entry.address))
+                logger.debug(f"🔄 RETRY {entry.attempts}/{self.max_attempts}: {entry.address[:10]}... "
+                             f"in {self.backoff(entry.attempts):.0f}s")
+        finally:
+            self._active -= 1
+            self._wakeup.set()
+
+    def _finish(self, entry: RetryEntry, outcome: str):
+        with self._lock:
+            self._scheduled.pop(entry.address, None)
+            self.stats[outcome] += 1
+
+    async def _call(self, callback: Optional[Callback], *args):
+        """Await coroutine callbacks; plain ones run in the executor so they can't block the shared loop"""
+        if callback is None:
+            return
+        try:
+            if inspect.iscoroutinefunction(callback):
+                result = callback(*args)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(None, callback, *args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"❌ Name retry callback error for {args[0][:10]}...: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['pending'] = len(self._scheduled)
+        stats['in_flight'] = self._active
+        stats['max_concurrency'] = self.max_concurrency
+        stats['availability_by_age'] = self.model.snapshot()
+        return stats
+
+# Global instance shared by every monitor that queues unnamed tokens
+_name_retry_scheduler = None
+_name_retry_scheduler_lock = threading.Lock()
+
+def get_name_retry_scheduler() -> NameRetryScheduler:
+    """Get the process-wide name retry scheduler"""
+    global _name_retry_scheduler
+    if _name_retry_scheduler is None:
+        with _name_retry_scheduler_lock:
+            if _name_retry_scheduler is None:
+                _name_retry_scheduler = NameRetryScheduler()
+    return _name_retry_scheduler
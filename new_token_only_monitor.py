@@ -6,11 +6,21 @@ No transaction history scanning - pure new token detection
 import time
 import logging
 import requests
-from typing import Dict, Any, Optional, List, Set
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, List, Set, Tuple
 from cachetools import TTLCache
 
+from timestamp_provenance import detection_provenance
+from slot_clock import get_slot_clock
+from name_retry_scheduler import get_name_retry_scheduler
+
 logger = logging.getLogger(__name__)
 
+# How far _fetch_signature_pages got back towards the cursor
+FETCH_COMPLETE = 'complete'     # reached the cursor (or the start of history)
+FETCH_TRUNCATED = 'truncated'   # page cap hit with more behind - the older rest is deliberately skipped
+FETCH_FAILED = 'failed'         # a page failed (429, timeout) - what lies behind the last entry is unknown
+
 class NewTokenOnlyMonitor:
     """Monitor that ONLY catches genuinely new token creations, not transaction history"""
     
@@ -21,8 +31,7 @@ class NewTokenOnlyMonitor:
         # Use TTLCache for automatic memory cleanup instead of basic sets
         self.seen_signatures = TTLCache(maxsize=5000, ttl=300)  # 5 minute TTL for signatures
         self.processed_tokens = TTLCache(maxsize=10000, ttl=60)  # 1 minute TTL for token addresses
-        self.retry_queue = {}  # Queue for tokens awaiting name resolution
-        self.retry_attempts = {}  # Track retry attempts per token
+        self.name_retry_scheduler = get_name_retry_scheduler()  # Unnamed tokens awaiting resolution
         
         # Alchemy endpoint with actual API key
         import os
@@ -37,6 +46,34 @@ class NewTokenOnlyMonitor:
             'Accept': 'application/json'
         }
         
+        # Keep-alive session so polling doesn't pay a TLS handshake per RPC call
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        
+        # Cursor polling: page through every signature newer than the cursor
+        self.signature_page_limit = 1000   # getSignaturesForAddress max
+        self.max_signature_pages = 5       # Cap catch-up after long stalls
+        self.rpc_batch_size = 20           # getTransaction calls per JSON-RPC batch
+        self.max_transaction_retries = 3   # Polls a signature may come back without its transaction
+        self.unresolved_signatures: Dict[str, int] = {}   # signature -> failed getTransaction attempts
+        self.poll_stats = {
+            'polls': 0,
+            'signatures_seen': 0,
+            'failed_signatures_skipped': 0,
+            'rpc_round_trips': 0,
+            'batch_fallbacks': 0,
+            'max_burst': 0,
+            'truncated_catchups': 0,
+            'incomplete_fetches': 0,
+            'transaction_retries': 0,
+            'unresolved_dropped': 0,
+        }
+        
+        # Shared slot clock learns from every signature page and transaction we fetch
+        self.slot_clock = get_slot_clock()
+        self.slot_clock.attach_rpc(self._rpc_batch)
+        
         # Test connection to Alchemy
         logger.info(f"🔗 Connecting to Alchemy with API key: {self.api_key[:10]}...")
         self._test_alchemy_connection()
@@ -56,7 +93,7 @@ class NewTokenOnlyMonitor:
                 "method": "getHealth"
             }
             
-            response = requests.post(self.base_url, json=payload, headers=self.headers, timeout=5)
+            response = self.session.post(self.base_url, json=payload, timeout=5)
             
             if response.status_code == 200:
                 logger.info("✅ Alchemy connection successful")
@@ -64,6 +101,227 @@ class NewTokenOnlyMonitor:
                 logger.error(f"❌ Alchemy connection failed: HTTP {response.status_code}")
         except Exception as e:
             logger.error(f"❌ Alchemy connection test failed: {e}")
+    
+    def _rpc_batch(self, calls: List[tuple]) -> List[Any]:
+        """Send (method, params) calls as JSON-RPC batches; returns results in call order"""
+        results: List[Any] = [None] * len(calls)
+        for start in range(0, len(calls), self.rpc_batch_size):
+            chunk = calls[start:start + self.rpc_batch_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": start + offset, "method": method, "params": params}
+                for offset, (method, params) in enumerate(chunk)
+            ]
+            try:
+                response = self.session.post(self.base_url, json=payload, timeout=10)
+                self.poll_stats['rpc_round_trips'] += 1
+                data = response.json() if response.status_code == 200 else None
+            except Exception as e:
+                logger.debug(f"Batch RPC failed: {e}")
+                data = None
+            
+            if isinstance(data, list):
+                for item in data:
+                    index = item.get('id')
+                    if isinstance(index, int) and 0 <= index < len(results):
+                        results[index] = item.get('result')
+                continue
+            
+            # Endpoint rejected the batch (plan limit or error object) - fall back to single calls
+            self.poll_stats['batch_fallbacks'] += 1
+            for offset, (method, params) in enumerate(chunk):
+                try:
+                    response = self.session.post(
+                        self.base_url,
+                        json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+                        timeout=5
+                    )
+                    self.poll_stats['rpc_round_trips'] += 1
+                    if response.status_code == 200:
+                        results[start + offset] = response.json().get('result')
+                except Exception as e:
+                    logger.debug(f"RPC {method} failed: {e}")
+        return results
+    
+    def _fetch_signature_pages(self, options: Dict[str, Any], max_pages: int) -> Tuple[List[dict], str]:
+        """Page getSignaturesForAddress backwards with `before`; entries come back newest first
+        
+        Also returns FETCH_COMPLETE, FETCH_TRUNCATED or FETCH_FAILED so callers
+        know whether anything between the cursor and the oldest entry is missing.
+        """
+        entries = []
+        for page in range(max_pages):
+            page_options = dict(options)
+            if entries:
+                page_options["before"] = entries[-1]['signature']
+            try:
+                response = self.session.post(self.base_url, json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getSignaturesForAddress",
+                    "params": [self.letsbonk_program_id, page_options]
+                }, timeout=5)
+                self.poll_stats['rpc_round_trips'] += 1
+                if response.status_code != 200:
+                    logger.debug(f"🔍 API Response: {response.status_code}")
+                    return entries, FETCH_FAILED
+                result = response.json().get('result') or []
+            except Exception as e:
+                logger.debug(f"Signature page {page + 1} failed: {e}")
+                return entries, FETCH_FAILED
+            self.slot_clock.observe_entries(result)
+            entries.extend(result)
+            if len(result) < page_options["limit"]:
+                return entries, FETCH_COMPLETE
+        if options.get("until"):
+            # Still more behind the cursor - the caller decides to skip it rather than fall further behind
+            self.poll_stats['truncated_catchups'] += 1
+            return entries, FETCH_TRUNCATED
+        return entries, FETCH_COMPLETE
+    
+    def get_signatures_since(self, signature: str) -> List[str]:
+        """Successful signatures newer than `signature`, oldest first (gap backfill)
+        
+        Doesn't move the poller's own cursor, so other ingestion sources can use it.
+        """
+        try:
+            entries, status = self._fetch_signature_pages(
+                {"limit": self.signature_page_limit, "commitment": "confirmed", "until": signature},
+                self.max_signature_pages
+            )
+            if status != FETCH_COMPLETE and entries:
+                logger.warning(f"⚠️ BACKFILL {status.upper()}: {len(entries)} signatures fetched, "
+                               f"gap {signature[:10]}...{entries[-1]['signature'][:10]}... not covered")
+            return [entry['signature'] for entry in reversed(entries) if entry.get('err') is None]
+        except Exception as e:
+            logger.debug(f"Failed to backfill signatures: {e}")
+            return []
+    
+    def get_new_signatures(self) -> List[str]:
+        """Every successful signature since the cursor, oldest first
+        
+        Uses getSignaturesForAddress with `until` set to the last signature seen
+        and pages backwards with `before`, so a burst of creations between polls
+        is never collapsed into just the newest one. The cursor only advances
+        past signatures that were actually fetched: if a page fails it stays
+        put and the next poll re-pages from it.
+        """
+        try:
+            self.poll_stats['polls'] += 1
+            options = {"limit": self.signature_page_limit, "commitment": "confirmed"}
+            max_pages = self.max_signature_pages
+            if self.last_known_signature:
+                options["until"] = self.last_known_signature
+            else:
+                # First poll only anchors the cursor - no transaction history scanning
+                options["limit"] = 1
+                max_pages = 1
+            
+            entries, status = self._fetch_signature_pages(options, max_pages)
+            if not entries:
+                return []
+            
+            # Newest first from the RPC - advance the cursor to the newest unless the fetch left a gap
+            anchoring = self.last_known_signature is None
+            if status == FETCH_FAILED and not anchoring:
+                # Signatures between the cursor and entries[-1] weren't fetched; the ones we did
+                # fetch are marked seen below, so the re-page only yields what's missing
+                self.poll_stats['incomplete_fetches'] += 1
+                logger.warning(f"⚠️ SIGNATURE PAGING INCOMPLETE: {len(entries)} fetched, cursor kept at "
+                               f"{self.last_known_signature[:10]}... for the next poll")
+            else:
+                if status == FETCH_TRUNCATED:
+                    # Accepted gap: everything older than entries[-1] back to the old cursor
+                    logger.warning(f"⚠️ SIGNATURE CATCH-UP TRUNCATED: {len(entries)} signatures fetched, skipping "
+                                   f"{self.last_known_signature[:10]}...{entries[-1]['signature'][:10]}...")
+                self.last_known_signature = entries[0]['signature']
+            
+            in_startup_buffer = time.time() - self.monitoring_start_time <= 10  # 10 second startup buffer
+            new_signatures = []
+            for entry in reversed(entries):
+                signature = entry['signature']
+                if signature in self.seen_signatures:
+                    continue
+                self.seen_signatures[signature] = True
+                if entry.get('err') is not None:
+                    # Failed transactions can't have created a token
+                    self.poll_stats['failed_signatures_skipped'] += 1
+                    continue
+                new_signatures.append(signature)
+            
+            if anchoring or in_startup_buffer:
+                # During startup, just track signatures without processing
+                logger.info(f"⏳ STARTUP BUFFER: cursor at {self.last_known_signature[:10]}... - skipping {len(new_signatures)} signatures")
+                return []
+            
+            self.poll_stats['signatures_seen'] += len(new_signatures)
+            self.poll_stats['max_burst'] = max(self.poll_stats['max_burst'], len(new_signatures))
+            
+            if new_signatures:
+                logger.info(f"🔍 NEW SIGNATURES FOUND: {len(new_signatures)} since last poll")
+            return new_signatures
+            
+        except Exception as e:
+            logger.debug(f"Failed to get new signatures: {e}")
+            return []
+    
+    def get_transactions_batch(self, signatures: List[str]) -> Dict[str, Optional[dict]]:
+        """Fetch transactions for many signatures with batched getTransaction calls"""
+        calls = [
+            ("getTransaction", [signature, {
+                "encoding": "jsonParsed",
+                "commitment": "confirmed",
+                "maxSupportedTransactionVersion": 0
+            }])
+            for signature in signatures
+        ]
+        transactions = self._rpc_batch(calls)
+        self.slot_clock.observe_entries(transactions)
+        # Transactions without blockTime: one getBlockTime batch for the poll, then age checks resolve locally
+        self.slot_clock.prefetch(transaction.get('slot') for transaction in transactions
+                                 if transaction and not transaction.get('blockTime'))
+        return dict(zip(signatures, transactions))
+    
+    def poll_new_tokens(self) -> List[Dict[str, Any]]:
+        """One polling cycle: retried + new signatures → batched transactions → new tokens"""
+        retries = list(self.unresolved_signatures)
+        signatures = retries + [signature for signature in self.get_new_signatures()
+                                if signature not in self.unresolved_signatures]
+        return self.resolve_signatures(signatures)
+    
+    def _retry_later(self, signature: str):
+        """getTransaction came back empty - forget the signature was seen and try it next poll"""
+        self.seen_signatures.pop(signature, None)
+        attempts = self.unresolved_signatures.get(signature, 0) + 1
+        if attempts > self.max_transaction_retries:
+            self.unresolved_signatures.pop(signature, None)
+            self.poll_stats['unresolved_dropped'] += 1
+            logger.warning(f"⚠️ NO TRANSACTION: {signature[:10]}... still unavailable after {attempts - 1} retries - dropping")
+            return
+        self.unresolved_signatures[signature] = attempts
+        self.poll_stats['transaction_retries'] += 1
+    
+    def resolve_signatures(self, signatures: List[str]) -> List[Dict[str, Any]]:
+        """Batched transactions for the signatures → new token dicts (creation order)"""
+        if not signatures:
+            return []
+        
+        transactions = self.get_transactions_batch(signatures)
+        new_tokens = []
+        for signature in signatures:
+            transaction = transactions.get(signature)
+            if not transaction:
+                logger.debug(f"No transaction details for {signature[:10]}... - retrying next poll")
+                self._retry_later(signature)
+                continue
+            self.unresolved_signatures.pop(signature, None)
+            if not self._is_token_creation_transaction(signature, transaction):
+                logger.info(f"⚠️ FILTERED: {signature[:10]}... - Not a token creation transaction")
+                continue
+            new_token = self.extract_new_token(signature, transaction)
+            if new_token:
+                logger.info(f"🎯 NEW TOKEN FOUND: {new_token['name']} ({new_token['address'][:10]}...)")
+                new_tokens.append(new_token)
+        return new_tokens
         
     def get_only_newest_signature(self) -> Optional[str]:
         """Get ONLY the newest signature - no transaction history scanning"""
@@ -82,7 +340,7 @@ class NewTokenOnlyMonitor:
             }
             
             logger.debug(f"🔍 API Request: {self.base_url[:50]}...")
-            response = requests.post(self.base_url, json=payload, headers=self.headers, timeout=5)
+            response = self.session.post(self.base_url, json=payload, timeout=5)
             logger.debug(f"🔍 API Response: {response.status_code}")
             
             if response.status_code == 200:
@@ -139,7 +397,7 @@ class NewTokenOnlyMonitor:
                 ]
             }
             
-            response = requests.post(self.base_url, json=payload, headers=self.headers, timeout=5)
+            response = self.session.post(self.base_url, json=payload, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -149,10 +407,10 @@ class NewTokenOnlyMonitor:
             logger.debug(f"Failed to get transaction details: {e}")
             return None
     
-    def _is_token_creation_transaction(self, signature: str) -> bool:
+    def _is_token_creation_transaction(self, signature: str, transaction: Optional[dict] = None) -> bool:
         """Check if this transaction is actually creating a new token, not just trading an existing one"""
         try:
-            transaction = self.get_transaction_details(signature)
+            transaction = transaction or self.get_transaction_details(signature)
             if not transaction:
                 logger.debug(f"No transaction details for {signature[:10]}...")
                 return False
@@ -197,10 +455,10 @@ class NewTokenOnlyMonitor:
             logger.debug(f"Error validating token creation transaction: {e}")
             return False
     
-    def extract_new_token(self, signature: str) -> Optional[Dict[str, Any]]:
+    def extract_new_token(self, signature: str, transaction: Optional[dict] = None) -> Optional[Dict[str, Any]]:
         """Extract NEW token data from transaction signature"""
         try:
-            transaction = self.get_transaction_details(signature)
+            transaction = transaction or self.get_transaction_details(signature)
             if not transaction:
                 return None
             
@@ -209,7 +467,8 @@ class NewTokenOnlyMonitor:
             
             # CRITICAL: Use ACTUAL blockchain timestamp for token age validation
             # This fixes the bug where tokens were appearing fresh using discovery time
-            block_time = transaction.get('blockTime')
+            # Fresh confirmed transactions can lack blockTime - the slot clock fills it in
+            block_time = transaction.get('blockTime') or self.slot_clock.block_time(transaction.get('slot'))
             if block_time:
                 # Normalize blockTime to seconds (handle both seconds and milliseconds)
                 if block_time > 1e12:  # Milliseconds format
@@ -232,8 +491,9 @@ class NewTokenOnlyMonitor:
                     logger.error(f"❌ REJECTING OLD BLOCKCHAIN TOKEN: age {age_display} > 60s limit")
                     return None
                 
-                # Use validated blockchain time as the creation timestamp (in seconds)
-                creation_timestamp = normalized_block_time
+                # Use validated blockchain time as the creation timestamp (in seconds) -
+                # blockTime/slot/signature travel with the token so nothing downstream re-derives them
+                provenance = detection_provenance(transaction, signature)
                 logger.info(f"✅ BLOCKCHAIN FRESH TOKEN: age {actual_age:.1f}s (< 60s limit)")
             else:
                 # If no blockchain time or invalid, reject - we need actual creation time
@@ -278,7 +538,7 @@ class NewTokenOnlyMonitor:
                             'name': token_name,
                             'symbol': 'BONK', 
                             'address': mint,
-                            'created_timestamp': creation_timestamp,
+                            **provenance,
                             'platform': 'letsbonk.fun',
                             'url': f'https://letsbonk.fun/token/{mint}',
                             'name_status': 'resolved'
@@ -291,7 +551,7 @@ class NewTokenOnlyMonitor:
                         # Queue for background name resolution
                         self.queue_token_for_retry(mint, {
                             'address': mint,
-                            'created_timestamp': creation_timestamp,
+                            **provenance,
                             'platform': 'letsbonk.fun',
                             'url': f'https://letsbonk.fun/token/{mint}',
                             'discovery_time': current_time,
@@ -303,7 +563,7 @@ class NewTokenOnlyMonitor:
                             'name': placeholder_name,
                             'symbol': 'BONK',
                             'address': mint,
-                            'created_timestamp': creation_timestamp,
+                            **provenance,
                             'platform': 'letsbonk.fun',
                             'url': f'https://letsbonk.fun/token/{mint}',
                             'name_status': 'pending'
@@ -316,68 +576,46 @@ class NewTokenOnlyMonitor:
             return None
     
     def queue_token_for_retry(self, mint_address: str, token_data: dict):
-        """Queue a token for name resolution retry"""
-        self.retry_queue[mint_address] = token_data
-        self.retry_attempts[mint_address] = 0
-        logger.info(f"🔄 QUEUED: {mint_address[-6:]} for DexScreener retry")
+        """Hand a token to the shared name retry scheduler (age/keyword-prioritized, with backoff)"""
+        queued = self.name_retry_scheduler.schedule(
+            mint_address,
+            self.get_token_name_from_dexscreener,
+            on_resolved=lambda address, token_name: self.handle_resolved_name(address, token_data, token_name),
+            created_at=token_data.get('created_timestamp') or token_data.get('discovery_time'),
+            hints=(token_data.get('placeholder_name'),),
+            initial_delay=30,   # DexScreener was just asked during extraction
+        )
+        if queued:
+            logger.info(f"🔄 QUEUED: {mint_address[-6:]} for DexScreener retry")
     
-    def process_retry_queue(self):
-        """Process tokens in retry queue, attempting to get names from DexScreener"""
-        import time
+    def handle_resolved_name(self, mint_address: str, token_data: dict, token_name: str):
+        """Persist and announce a name the retry scheduler resolved"""
+        final_token_data = {
+            'name': token_name,
+            'symbol': 'BONK',
+            'address': mint_address,
+            'created_timestamp': token_data.get('created_timestamp'),
+            'creation_slot': token_data.get('creation_slot'),
+            'creation_signature': token_data.get('creation_signature'),
+            'timestamp_source': token_data.get('timestamp_source'),
+            'platform': token_data.get('platform', 'letsbonk.fun'),
+            'url': token_data.get('url'),
+            'name_status': 'resolved',
+            'original_placeholder': token_data.get('placeholder_name'),
+            'update_type': 'name_resolution'
+        }
         
-        current_time = time.time()
-        processed_tokens = []
+        logger.info(f"✅ NAME RESOLVED: '{token_name}' for {mint_address[-6:]} (was '{token_data.get('placeholder_name', 'unnamed')}')")
         
-        for mint_address, token_data in list(self.retry_queue.items()):
-            # Limit retry attempts and time
-            if self.retry_attempts[mint_address] >= 5:  # Max 5 retries
-                logger.info(f"⏰ TIMEOUT: {mint_address[-6:]} - giving up after 5 attempts")
-                processed_tokens.append(mint_address)
-                continue
-                
-            # Wait at least 30 seconds between retries
-            if current_time - token_data.get('discovery_time', 0) < 30:
-                continue
-                
-            # Try to get name from DexScreener
-            token_name = self.get_token_name_from_dexscreener(mint_address)
-            
-            if token_name and len(token_name.strip()) > 0:
-                # Success! Process the token with real name
-                final_token_data = {
-                    'name': token_name,
-                    'symbol': 'BONK',
-                    'address': mint_address,
-                    'created_timestamp': token_data.get('created_timestamp'),
-                    'platform': token_data.get('platform', 'letsbonk.fun'),
-                    'url': token_data.get('url'),
-                    'name_status': 'resolved',
-                    'original_placeholder': token_data.get('placeholder_name'),
-                    'update_type': 'name_resolution'
-                }
-                
-                logger.info(f"✅ NAME RESOLVED: '{token_name}' for {mint_address[-6:]} (was '{token_data.get('placeholder_name', 'unnamed')}')")
-                
-                # Update database with resolved name
-                self.update_token_name_in_db(mint_address, token_name)
-                
-                # Optional: Send update notification via callback
-                if self.callback_func:
-                    try:
-                        self.callback_func([final_token_data])
-                    except Exception as e:
-                        logger.error(f"Callback error: {e}")
-                
-                processed_tokens.append(mint_address)
-            else:
-                # Still no name, increment retry count
-                self.retry_attempts[mint_address] += 1
-                logger.info(f"🔄 RETRY {self.retry_attempts[mint_address]}/5: {mint_address[-6:]} still waiting for DexScreener")
+        # Update database with resolved name
+        self.update_token_name_in_db(mint_address, token_name)
         
-        # Remove processed tokens from queue
-        for mint_address in processed_tokens:
-            self.retry_queue.pop(mint_address, None)
-            self.retry_attempts.pop(mint_address, None)
+        # Optional: Send update notification via callback
+        if self.callback_func:
+            try:
+                self.callback_func([final_token_data])
+            except Exception as e:
+                logger.error(f"Callback error: {e}")
     
     def get_token_name_from_dexscreener(self, mint_address: str) -> Optional[str]:
         """Get token name from DexScreener API"""
@@ -470,25 +708,18 @@ class NewTokenOnlyMonitor:
         
         while True:
             try:
-                # Get only the newest signature (not transaction history)
-                new_signature = self.get_only_newest_signature()
+                # Every signature since the cursor, transactions fetched in batches
+                new_tokens = self.poll_new_tokens()
                 
-                if new_signature:
-                    logger.debug(f"🔍 Checking signature: {new_signature[:10]}...")
-                    # Extract token data from the NEW signature
-                    new_token = self.extract_new_token(new_signature)
-                    
-                    if new_token:
-                        logger.info(f"🎯 NEW TOKEN FOUND: {new_token['name']} ({new_token['address'][:10]}...)")
-                        
-                        # Call the callback function with new token data
-                        if self.callback_func:
-                            try:
-                                self.callback_func([new_token])
-                            except Exception as e:
-                                logger.error(f"Callback error: {e}")
+                if new_tokens:
+                    # Call the callback function with the whole burst at once
+                    if self.callback_func:
+                        try:
+                            self.callback_func(new_tokens)
+                        except Exception as e:
+                            logger.error(f"Callback error: {e}")
                 else:
-                    logger.info("🔍 No new signatures found - API returned empty result")
+                    logger.debug("🔍 No new tokens since last poll")
                 
                 # Wait 2 seconds before next check (balance speed vs server load)
                 time.sleep(2)
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Notification Deduplication - in-memory notified-token filter with write-behind persistence
+Bloom filter + exact LRU answer "already notified?" in microseconds; new
+notifications are batched back to notified_tokens by a background writer
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# (token_address, token_name, notification_type, keyword_snapshot_version)
+PendingRow = Tuple[str, str, str, Optional[int]]
+
+from db_pool import get_db_pool
+from compact_seen_set import BloomFilter
+from memory_governor import estimate_bytes
+
+logger = logging.getLogger(__name__)
+
+class NotificationDedup:
+    """Process-wide notified-token tracker
+
+    - is_notified(): LRU hit → True, Bloom miss → False, otherwise confirm in DB
+    - claim(): check-and-mark used right before sending a notification
+    - record(): mark locally and queue the notified_tokens row for the writer
+    Other workers' notifications are pulled in by a periodic peer sync. With a
+    database configured, claims are also confirmed with a single
+    INSERT ... ON CONFLICT DO NOTHING, so no two processes or deployments can
+    both win the same token; without one, claims are decided in memory.
+
+    The filter is warmed with warm_window of history, which matches the
+    retention of notified_tokens (cleanup_old_notifications keeps 7 days):
+    a Bloom miss means "not notified within the retained window", and older
+    rows no longer exist in the database to confirm against anyway.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, lru_size: int = 50000,
+                 bloom_capacity: int = 200000, flush_interval: float = 0.5,
+                 flush_batch_size: int = 200, peer_sync_interval: float = 5.0,
+                 warm_window: str = '7 days', max_pending: int = 10000):
+        self.database_url = database_url or os.getenv('DATABASE_URL')
+        self.lru_size = lru_size
+        self.bloom_capacity = bloom_capacity
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.peer_sync_interval = peer_sync_interval
+        self.warm_window = warm_window
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(bloom_capacity)
+        self._lru: 'OrderedDict[str, float]' = OrderedDict()
+        self._pending: List[PendingRow] = []
+        self._flushing: List[PendingRow] = []
+        self._columns_ready = False
+        self._pending_event = threading.Event()
+        self._peer_watermark = None
+        self._running = False
+        self._writer_thread = None
+        self.warmed = False
+
+        self.stats = {
+            'checks': 0,
+            'lru_hits': 0,
+            'bloom_negatives': 0,
+            'db_confirmations': 0,
+            'bloom_false_positives': 0,
+            'claims_won': 0,
+            'claims_lost': 0,
+            'rows_flushed': 0,
+            'flush_batches': 0,
+            'flush_errors': 0,
+            'pending_dropped': 0,
+            'peer_rows_synced': 0,
+            'warmed_rows': 0,
+        }
+
+    # ------------------------------------------------------------------ memory
+
+    def _remember(self, token_address: str):
+        """Mark address as notified in Bloom filter and LRU (caller holds lock)"""
+        self._remember_in(self._bloom, self._lru, token_address, time.time())
+
+    def _remember_in(self, bloom: BloomFilter, lru: 'OrderedDict[str, float]', token_address: str,
+                     remembered_at: float):
+        if token_address not in lru:
+            bloom.add(token_address)
+        lru[token_address] = remembered_at
+        lru.move_to_end(token_address)
+        if len(lru) > self.lru_size:
+            lru.popitem(last=False)
+
+    def add(self, token_address: str):
+        """Set-style mark (memory only) - kept for callers of notified_token_addresses.add()"""
+        if not token_address:
+            return
+        with self._lock:
+            self._remember(token_address)
+
+    def __contains__(self, token_address: str) -> bool:
+        return self.is_notified(token_address)
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def evict(self, count: int) -> int:
+        """Forget the count least recently used addresses (memory governor hook)
+
+        The Bloom filter still remembers them, so a later check falls through
+        to the database instead of re-notifying. Addresses whose rows the
+        writer hasn't persisted yet are skipped - the database can't confirm
+        them until the flush lands.
+        """
+        with self._lock:
+            unflushed = {row[0] for row in self._flushing}
+            unflushed.update(row[0] for row in self._pending)
+            victims = []
+            for token_address in self._lru:
+                if len(victims) >= count:
+                    break
+                if token_address not in unflushed:
+                    victims.append(token_address)
+            for token_address in victims:
+                del self._lru[token_address]
+        return len(victims)
+
+    @property
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return estimate_bytes(self._lru) + len(self._bloom._bits)
+
+    # ------------------------------------------------------------------ checks
+
+    def is_notified(self, token_address: str, confirm_with_db: bool = True) -> bool:
+        """Has this token already been notified (by this or any worker)?"""
+        if not token_address:
+            return False
+        with self._lock:
+            self.stats['checks'] += 1
+            if token_address in self._lru:
+                self._lru.move_to_end(token_address)
+                self.stats['lru_hits'] += 1
+                return True
+            if token_address not in self._bloom:
+                self.stats['bloom_negatives'] += 1
+                return False
+
+        # Bloom positive but not in LRU: evicted entry or a false positive
+        if not confirm_with_db:
+            return True
+        notified = self._db_contains(token_address)
+        with self._lock:
+            self.stats['db_confirmations'] += 1
+            if notified:
+                self._remember(token_address)
+            else:
+                self.stats['bloom_false_positives'] += 1
+        return notified
+
+    def claim(self, token_address: str, token_name: str = '', notification_type: str = 'keyword_match',
+              keyword_snapshot_version: Optional[int] = None) -> bool:
+        """Atomically check-and-mark; True means the caller should send the notification"""
+        if not token_address:
+            return False
+        if self.is_notified(token_address):
+            with self._lock:
+                self.stats['claims_lost'] += 1
+            return False
+
+        with self._lock:
+            # Re-check under the lock so two threads can't both win
+            if token_address in self._lru:
+                self.stats['claims_lost'] += 1
+                return False
+            self._remember(token_address)
+
+        if self.database_url:
+            won = self._db_claim(token_address, token_name, notification_type, keyword_snapshot_version)
+            with self._lock:
+                self.stats['claims_won' if won else 'claims_lost'] += 1
+            return won
+
+        with self._lock:
+            self.stats['claims_won'] += 1
+        return True
+
+    def record(self, token_address: str, token_name: str = '', notification_type: str = 'keyword_match',
+               keyword_snapshot_version: Optional[int] = None) -> bool:
+        """Mark as notified and queue the row (with the keyword snapshot it matched) for write-behind"""
+        if not token_address:
+            return False
+        with self._lock:
+            self._remember(token_address)
+        self._enqueue(token_address, token_name, notification_type, keyword_snapshot_version)
+        return True
+
+    # ---------------------------------------------------------------- database
+
+    def _db_contains(self, token_address: str) -> bool:
+        pool = get_db_pool(self.database_url)
+        if not pool:
+            return False
+        try:
+            row = pool.execute("SELECT 1 FROM notified_tokens WHERE token_address = %s LIMIT 1",
+                               (token_address,), fetch='one')
+            return row is not None
+        except Exception as e:
+            logger.debug(f"❌ DEDUP: Database confirmation failed: {e}")
+            return False
+
+    def _ensure_columns(self, pool):
+        """Add keyword_snapshot_version to notified_tokens once (main.py writes the same column)"""
+        if self._columns_ready:
+            return
+        pool.execute("ALTER TABLE notified_tokens ADD COLUMN IF NOT EXISTS keyword_snapshot_version INTEGER")
+        self._columns_ready = True
+
+    def _db_claim(self, token_address: str, token_name: str, notification_type: str,
+                  keyword_snapshot_version: Optional[int] = None) -> bool:
+        """Single-statement cross-process claim (fail-open like the legacy dedup)"""
+        pool = get_db_pool(self.database_url)
+        if not pool:
+            return True
+        try:
+            # NOT EXISTS covers schemas without a unique token_address; ON CONFLICT
+            # settles two concurrent inserts without a unique-violation error
+            self._ensure_columns(pool)
+            inserted = pool.execute("""
+                INSERT INTO notified_tokens (token_address, token_name, notification_type, notified_at,
+                                             keyword_snapshot_version)
+                SELECT %s, %s, %s, NOW(), %s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM notified_tokens WHERE token_address = %s
+                )
+                ON CONFLICT DO NOTHING
+            """, (token_address, token_name, notification_type, keyword_snapshot_version, token_address))
+            return inserted > 0
+        except Exception as e:
+            logger.error(f"❌ DEDUP ERROR: {e} - ALLOWING notification (fail-safe)")
+            return True
+
+    def _enqueue(self, token_address: str, token_name: str, notification_type: str,
+                 keyword_snapshot_version: Optional[int] = None):
+        if not self.database_url:
+            return  # Memory-only mode - nothing to persist
+        with self._lock:
+            self._pending.append((token_address, token_name or '', notification_type, keyword_snapshot_version))
+            self._trim_pending()
+            if len(self._pending) >= self.flush_batch_size:
+                self._pending_event.set()
+        self.start()
+
+    def _trim_pending(self):
+        """Drop the oldest queued rows past max_pending (caller holds lock)
+
+        Only reached while flushes keep failing; the dropped addresses stay in
+        memory, so this process still won't re-notify them.
+        """
+        overflow = len(self._pending) - self.max_pending
+        if overflow > 0:
+            del self._pending[:overflow]
+            self.stats['pending_dropped'] += overflow
+            logger.warning(f"⚠️ DEDUP: Write-behind queue full - dropped {overflow} unflushed notified_tokens rows")
+
+    def flush(self) -> int:
+        """Write queued rows to notified_tokens in one statement; returns rows inserted"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._flushing = batch
+            self._pending_event.clear()
+        if not batch:
+            return 0
+        try:
+            return self._write_batch(batch)
+        finally:
+            with self._lock:
+                self._flushing = []
+
+    def _write_batch(self, batch: List[PendingRow]) -> int:
+        # Last write wins within a batch (same as one INSERT per notification)
+        unique_rows = list({row[0]: row for row in batch}.values())
+
+        pool = get_db_pool(self.database_url)
+        if not pool:
+            return 0
+        try:
+            from psycopg2.extras import execute_values
+            self._ensure_columns(pool)
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                execute_values(cursor, """
+                    INSERT INTO notified_tokens (token_address, token_name, notification_type, notified_at,
+                                                 keyword_snapshot_version)
+                    SELECT v.token_address, v.token_name, v.notification_type, NOW(),
+                           v.keyword_snapshot_version::integer
+                    FROM (VALUES %s) AS v(token_address, token_name, notification_type, keyword_snapshot_version)
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM notified_tokens n WHERE n.token_address = v.token_address
+                    )
+                    ON CONFLICT DO NOTHING
+                """, unique_rows)
+                inserted = cursor.rowcount
+                cursor.close()
+            with self._lock:
+                self.stats['rows_flushed'] += max(inserted, 0)
+                self.stats['flush_batches'] += 1
+            logger.debug(f"💾 DEDUP: Flushed {len(unique_rows)} notified tokens ({inserted} new rows)")
+            return inserted
+        except Exception as e:
+            logger.error(f"❌ DEDUP: Write-behind flush failed, will retry: {e}")
+            with self._lock:
+                self.stats['flush_errors'] += 1
+                self._pending = batch + self._pending
+                self._trim_pending()
+            return 0
+
+    def _load_recent(self, pool) -> Tuple[list, object]:
+        """Recently notified rows (oldest first) and the database time they were read at"""
+        rows = pool.execute(f"""
+            SELECT token_address, notified_at FROM notified_tokens
+            WHERE notified_at > CURRENT_TIMESTAMP - INTERVAL '{self.warm_window}'
+            ORDER BY notified_at
+        """, fetch='all') or []
+        database_now = pool.execute("SELECT CURRENT_TIMESTAMP", fetch='one')[0]
+        return rows, database_now
+
+    def warm(self) -> int:
+        """Load recently notified tokens from the database into the filter"""
+        pool = get_db_pool(self.database_url)
+        if not pool:
+            logger.warning("⚠️ DEDUP: No database - notification deduplication will be memory-only")
+            return 0
+        try:
+            rows, database_now = self._load_recent(pool)
+            with self._lock:
+                for token_address, notified_at in rows:
+                    self._remember(token_address)
+                # Peer sync picks up from here - rows other workers insert later
+                self._peer_watermark = database_now
+                self.stats['warmed_rows'] += len(rows)
+                self.warmed = True
+            logger.info(f"📋 DEDUP: Warmed filter with {len(rows)} notified tokens ({self.warm_window})")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"❌ DEDUP: Failed to warm from database: {e}")
+            return 0
+
+    def rebuild(self) -> int:
+        """Re-warm into a fresh filter and swap it in (Bloom filters can't forget cleaned-up rows)
+
+        The current filter keeps answering while the new one loads. Addresses
+        marked since the load started, and rows the writer hasn't persisted
+        yet, are merged into the new filter under the lock before the swap.
+        """
+        pool = get_db_pool(self.database_url)
+        if not pool:
+            return 0
+        started = time.time()
+        try:
+            rows, database_now = self._load_recent(pool)
+        except Exception as e:
+            logger.error(f"❌ DEDUP: Rebuild failed, keeping the current filter: {e}")
+            return 0
+
+        bloom = BloomFilter(self.bloom_capacity)
+        lru: 'OrderedDict[str, float]' = OrderedDict()
+        for token_address, notified_at in rows:
+            self._remember_in(bloom, lru, token_address, started)
+
+        with self._lock:
+            unflushed = [row[0] for row in self._flushing + self._pending]
+            for token_address, remembered_at in self._lru.items():
+                if remembered_at >= started:
+                    self._remember_in(bloom, lru, token_address, remembered_at)
+            for token_address in unflushed:
+                self._remember_in(bloom, lru, token_address, self._lru.get(token_address, started))
+            self._bloom, self._lru = bloom, lru
+            self._peer_watermark = database_now
+            self.stats['warmed_rows'] += len(rows)
+            self.warmed = True
+        logger.info(f"📋 DEDUP: Rebuilt filter with {len(rows)} notified tokens "
+                    f"+ {len(unflushed)} unflushed")
+        return len(rows)
+
+    def sync_peers(self) -> int:
+        """Pull rows other workers inserted since the last sync"""
+        if self._peer_watermark is None:
+            return 0
+        pool = get_db_pool(self.database_url)
+        if not pool:
+            return 0
+        try:
+            rows = pool.execute("""
+                SELECT token_address, notified_at FROM notified_tokens
+                WHERE notified_at > %s
+            """, (self._peer_watermark,), fetch='all') or []
+            with self._lock:
+                for token_address, notified_at in rows:
+                    self._remember(token_address)
+                    if notified_at and notified_at > self._peer_watermark:
+                        self._peer_watermark = notified_at
+                self.stats['peer_rows_synced'] += len(rows)
+            return len(rows)
+        except Exception as e:
+            logger.debug(f"DEDUP peer sync failed: {e}")
+            return 0
+
+    # -------------------------------------------------------------- lifecycle
+
+    def start(self):
+        """Start the write-behind/peer-sync thread (idempotent)"""
+        if self._running:
+            return
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._writer_thread = threading.Thread(target=self._writer_loop, name='dedup-writer', daemon=True)
+        self._writer_thread.start()
+
+    def stop(self):
+        """Stop the writer and flush anything still queued"""
+        self._running = False
+        self._pending_event.set()
+        if self._writer_thread:
+            self._writer_thread.join(timeout=5)
+        self.flush()
+
+    def _writer_loop(self):
+        last_peer_sync = time.time()
+        while self._running:
+            self._pending_event.wait(self.flush_interval)
+            try:
+                self.flush()
+                if time.time() - last_peer_sync >= self.peer_sync_interval:
+                    self.sync_peers()
+                    last_peer_sync = time.time()
+            except Exception as e:
+                logger.error(f"❌ DEDUP writer error: {e}")
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['lru_entries'] = len(self._lru)
+            stats['pending_writes'] = len(self._pending)
+            stats['bloom_items'] = self._bloom.item_count
+            stats['bloom_estimated_fp_rate'] = self._bloom.estimated_false_positive_rate()
+        stats['db_claims'] = bool(self.database_url)
+        return stats
+
+# Global instance
+_notification_dedup = None
+_notification_dedup_lock = threading.Lock()
+
+def get_notification_dedup(warm: bool = True) -> NotificationDedup:
+    """Get the process-wide notification dedup
+
+    warm=False lets the owner warm it once notified_tokens is known to exist.
+    """
+    global _notification_dedup
+    if _notification_dedup is None:
+        with _notification_dedup_lock:
+            if _notification_dedup is None:
+                _notification_dedup = NotificationDedup()
+                _notification_dedup.start()
+    if warm and not _notification_dedup.warmed:
+        _notification_dedup.warm()
+    return _notification_dedup
@@ -10,9 +10,10 @@ import time
 import threading
 import psycopg2
 import os
-import requests
 from datetime import datetime, timedelta
 import logging
+from dexscreener_batch import get_dexscreener_batch
+from compact_seen_set import CompactSeenSet
 
 class PumpPortalMonitor:
     def __init__(self):
@@ -28,7 +29,7 @@ class PumpPortalMonitor:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
-        self.processed_tokens = set()
+        self.processed_tokens = CompactSeenSet(capacity=100000, ttl=86400, name='pumpportal_tokens')
         self.last_heartbeat = time.time()
     
     def connect_websocket(self):
@@ -146,21 +147,16 @@ class PumpPortalMonitor:
             if raw_name and raw_name != 'Unknown' and not raw_name.startswith('Unnamed'):
                 return raw_name
             
-            # Fallback to DexScreener for name resolution
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{address}"
-            response = requests.get(url, timeout=5)
+            # Fallback to DexScreener for name resolution (batched with other in-flight lookups)
+            pairs = get_dexscreener_batch().lookup(address, timeout=5)
             
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get('pairs', [])
+            if pairs:
+                token_info = pairs[0].get('baseToken', {})
+                enhanced_name = token_info.get('name')
                 
-                if pairs:
-                    token_info = pairs[0].get('baseToken', {})
-                    enhanced_name = token_info.get('name')
-                    
-                    if enhanced_name and enhanced_name != raw_name:
-                        self.logger.info(f"🔍 Enhanced name: {raw_name} → {enhanced_name}")
-                        return enhanced_name
+                if enhanced_name and enhanced_name != raw_name:
+                    self.logger.info(f"🔍 Enhanced name: {raw_name} → {enhanced_name}")
+                    return enhanced_name
             
         except Exception as e:
             self.logger.warning(f"Name enhancement failed for {address}: {e}")
@@ -4,6 +4,7 @@ Pure Token Name Extractor - 100% Accurate LetsBonk Token Name Detection
 Replaces complex URL detection with simple, accurate name-based keyword matching
 """
 
+import os
 import asyncio
 import aiohttp
 import json
@@ -12,6 +13,9 @@ import time
 import logging
 from typing import Dict, List, Optional, Any
 
+from hedged_resolver import HedgedResolver
+from source_scoring import get_source_scoring
+
 logger = logging.getLogger(__name__)
 
 # Removed ultra-fast API extractor - using only reliable LetsBonk page extraction
@@ -45,7 +49,60 @@ class PureTokenNameExtractor:
         self.cache_timestamps = {}
         self.cache_ttl = 300  # 5 minutes
         
-    async def extract_accurate_token_name(self, token_address: str) -> Optional[str]:
+        # Single-source DexScreener by default; NAME_EXTRACTION_MODE=hedged opts in to fanning out across sources
+        self.extraction_mode = os.getenv('NAME_EXTRACTION_MODE', 'dexscreener').strip().lower()
+        hedge_delays = [float(delay) for delay in os.getenv('NAME_HEDGE_DELAYS', '0,0.3,0.6,1.0').split(',') if delay.strip()]
+        
+        # Trust per source - page scraping and symbol fallbacks can return non-names
+        source_confidence = {
+            'dexscreener': 0.95,
+            'pump_fun': 0.9,
+            'birdeye': 0.9,
+            'coingecko': 0.9,
+            'solscan': 0.85,
+            'alchemy_metadata': 0.85,
+            'letsbonk_http': 0.6,
+        }
+        # Selenium is left out - launching a browser per hedge costs more than it saves
+        self.hedged_resolver = HedgedResolver(
+            {
+                'dexscreener': self._hedged_source(self._dexscreener_extraction),
+                'pump_fun': self._hedged_source(self._pump_fun_extraction),
+                'birdeye': self._hedged_source(self._birdeye_extraction),
+                'coingecko': self._hedged_source(self._coingecko_extraction),
+                'solscan': self._hedged_source(self._solscan_extraction),
+                'alchemy_metadata': self._hedged_source(self._alchemy_token_metadata_fallback),
+                'letsbonk_http': self._hedged_source(self._simple_http_extraction),
+            },
+            confidences=source_confidence,
+            hedge_delays=hedge_delays,
+            max_parallel=int(os.getenv('NAME_HEDGE_MAX_PARALLEL', '4')),
+            scoreboard=get_source_scoring(),
+        )
+        
+    def _hedged_source(self, extraction_method):
+        """Wrap an extraction method so only usable cleaned names count as success"""
+        async def source(token_address: str) -> Optional[str]:
+            raw_name = await extraction_method(token_address)
+            cleaned_name = self._clean_token_name(raw_name) if raw_name else ""
+            return cleaned_name if len(cleaned_name) > 1 else None
+        return source
+    
+    async def _hedged_extraction(self, token_address: str, token_age: Optional[float] = None) -> Optional[str]:
+        """Staggered parallel fan-out - first high-confidence source wins, the rest are cancelled"""
+        # Ranking is age-aware: e.g. DexScreener drops back for tokens a few seconds old
+        result = await self.hedged_resolver.resolve(token_address, token_age=token_age)
+        if result.success:
+            logger.info(f"✅ HEDGED {result.source.upper()}: {token_address[:10]}... → '{result.name}' in {result.latency:.2f}s (tried {', '.join(result.attempted)})")
+            return result.name
+        logger.info(f"❌ HEDGED: No source answered for {token_address[:10]}... (tried {', '.join(result.attempted)})")
+        return None
+    
+    def get_source_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-source latency, success and win rate (shared across all extractors)"""
+        return self.hedged_resolver.get_stats()
+        
+    async def extract_accurate_token_name(self, token_address: str, token_age: Optional[float] = None) -> Optional[str]:
         """Extract 100% accurate token name from LetsBonk page with ultra-fast enhancement"""
         
         # Check cache first
@@ -60,22 +117,27 @@ class PureTokenNameExtractor:
         letsbonk_url = f"https://letsbonk.fun/token/{token_address}"
         
         try:
-            # Simple DexScreener-only extraction
             extraction_start = time.time()
             
-            logger.info(f"🔍 SIMPLE EXTRACTION: DexScreener only for {token_address[:10]}...")
-            
-            # Try DexScreener only
-            result = await self._dexscreener_extraction(token_address)
-            if result:
-                cleaned_name = self._clean_token_name(result)
-                if cleaned_name and len(cleaned_name) > 1:
-                    extraction_time = time.time() - extraction_start
-                    self._cache_name(token_address, cleaned_name)
-                    logger.info(f"✅ DEXSCREENER: {token_address[:10]}... → '{cleaned_name}' in {extraction_time:.2f}s")
-                    return cleaned_name
-            
-            logger.info(f"❌ DexScreener failed for {token_address[:10]}...")
+            if self.extraction_mode == 'hedged':
+                hedged_name = await self._hedged_extraction(token_address, token_age)
+                if hedged_name:
+                    self._cache_name(token_address, hedged_name)
+                    return hedged_name
+            else:
+                logger.info(f"🔍 SIMPLE EXTRACTION: DexScreener only for {token_address[:10]}...")
+                
+                # Try DexScreener only
+                result = await self._dexscreener_extraction(token_address)
+                if result:
+                    cleaned_name = self._clean_token_name(result)
+                    if cleaned_name and len(cleaned_name) > 1:
+                        extraction_time = time.time() - extraction_start
+                        self._cache_name(token_address, cleaned_name)
+                        logger.info(f"✅ DEXSCREENER: {token_address[:10]}... → '{cleaned_name}' in {extraction_time:.2f}s")
+                        return cleaned_name
+                
+                logger.info(f"❌ DexScreener failed for {token_address[:10]}...")
                 
         except Exception as e:
             logger.error(f"❌ NAME EXTRACTION ERROR: {token_address[:10]}... → {str(e)}")
@@ -746,7 +808,11 @@ class PureNameTokenProcessor:
         try:
             # Extract accurate token name from LetsBonk
             extraction_start = time.time()
-            accurate_name = await self.name_extractor.extract_accurate_token_name(token_address)
+            created_timestamp = token.get('created_timestamp')
+            if created_timestamp and created_timestamp > 1e12:
+                created_timestamp = created_timestamp / 1000.0
+            token_age = extraction_start - created_timestamp if created_timestamp else None
+            accurate_name = await self.name_extractor.extract_accurate_token_name(token_address, token_age)
             extraction_time = time.time() - extraction_start
             
             self.stats['total_extraction_time'] += extraction_time
@@ -829,4 +895,6 @@ class PureNameTokenProcessor:
         logger.info(f"   ✅ Names extracted: {stats['names_extracted']} ({stats['extraction_success_rate']:.1%})")
         logger.info(f"   🎯 Keyword matches: {stats['keyword_matches']} ({stats['keyword_match_rate']:.1%})")
         logger.info(f"   ⏱️ Avg extraction time: {stats['avg_extraction_time']:.2f}s")
+        for source, source_stats in sorted(self.name_extractor.get_source_stats().items()):
+            logger.info(f"   🏁 {source}: win rate {source_stats['win_rate']:.1%}, success {source_stats['success_rate']:.1%}, p50 {source_stats['p50_latency']:.2f}s, p95 {source_stats['p95_latency']:.2f}s")
         logger.info(f"   💰 Cost per token: $0 (HTTP only)")
\ No newline at end of file
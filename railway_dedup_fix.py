@@ -8,8 +8,8 @@ Solution: Centralized deduplication system with Railway-specific fixes
 import logging
 import time
 import os
-import psycopg2
 from typing import Optional, Dict, Any
+from db_pool import get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ class RailwayDedupFix:
         # Verify database table structure
         if database_url:
             try:
-                conn = psycopg2.connect(database_url)
+                conn = get_pooled_connection(database_url)
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -61,6 +61,19 @@ class RailwayDedupFix:
         Centralized check-and-mark for Railway deduplication
         Returns True if notification should be sent, False if already notified
         """
+        # In-memory filter (warmed from notified_tokens, write-behind persistence)
+        dedup = getattr(self.server, 'notification_dedup', None)
+        if dedup is not None:
+            try:
+                allowed = dedup.claim(token_address, token_name, f"{notification_source}:{keyword}")
+                if allowed:
+                    logger.info(f"✅ DEDUP: {token_name} ({token_address[:8]}...) marked as notified - ALLOWING")
+                else:
+                    logger.info(f"🚫 DEDUP: {token_name} ({token_address[:8]}...) already notified - BLOCKED")
+                return allowed
+            except Exception as e:
+                logger.error(f"❌ DEDUP ERROR: {e} - falling back to database check")
+        
         try:
             # First check memory (fastest)
             if hasattr(self.server, 'notified_token_addresses') and token_address in self.server.notified_token_addresses:
@@ -73,7 +86,7 @@ class RailwayDedupFix:
                 logger.warning("⚠️ DEDUP: No database connection - allowing notification")
                 return True
                 
-            conn = psycopg2.connect(database_url)
+            conn = get_pooled_connection(database_url)
             cursor = conn.cursor()
             
             # Check if already notified
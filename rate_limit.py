@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Rate Limit - shared token bucket for outbound API clients
+Used by Discord webhook delivery (corrected from X-RateLimit-* and
+Retry-After headers) and the DexScreener batch client.
+"""
+
+import time
+from typing import Optional
+
+class TokenBucket:
+    """Token bucket that can be corrected by server-reported limits"""
+
+    def __init__(self, capacity: float, per_second: float):
+        self.capacity = float(capacity)
+        self.per_second = per_second
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.per_second)
+            self.updated = now
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """Seconds until one request may go out (0 if now)"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        blocked = max(0.0, self.blocked_until - now)
+        if self.tokens >= 1:
+            return blocked
+        return max(blocked, (1 - self.tokens) / self.per_second)
+
+    def consume(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float, now: Optional[float] = None):
+        """Nothing goes out for seconds (429 Retry-After, exhausted bucket)"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset_after: Optional[float],
+             now: Optional[float] = None):
+        """Adopt the server's view of this bucket (e.g. Discord's X-RateLimit-* headers)"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0 and reset_after:
+                self.block(reset_after, now)
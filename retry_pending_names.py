@@ -22,59 +22,14 @@ class RetryPendingNamesService:
         self.running = False
         
     async def process_pending_tokens(self):
-        """Process all pending tokens in the background"""
+        """Process due pending tokens in the background (one claimed bulk cycle)"""
         try:
             logger.info("🔄 Starting pending token resolution cycle...")
             
-            # Get pending tokens
-            pending_tokens = self.processor.get_pending_tokens(limit=100)
+            # Claims only tokens whose backoff has elapsed, keyword matches first
+            resolved_count = await self.resolver.process_pending_tokens()
             
-            if not pending_tokens:
-                logger.info("✅ No pending tokens to process")
-                return 0
-            
-            logger.info(f"📋 Found {len(pending_tokens)} pending tokens for name resolution")
-            
-            resolved_count = 0
-            
-            # Process each pending token
-            for token_data in pending_tokens:
-                contract_address, placeholder_name, matched_keywords, retry_count, detected_at, blockchain_age = token_data
-                
-                logger.info(f"🔍 Resolving: {placeholder_name} ({contract_address[:10]}...) - attempt #{retry_count + 1}")
-                
-                try:
-                    # Try to resolve the name
-                    result = await self.resolver.resolve_token_name_dexscreener(contract_address)
-                    
-                    if result and result.get('name'):
-                        # Successfully resolved - migrate to detected_tokens
-                        success = self.processor.migrate_pending_to_resolved(
-                            contract_address=contract_address,
-                            token_name=result['name'],
-                            symbol=result.get('symbol'),
-                            social_links={'dexscreener': True}
-                        )
-                        
-                        if success:
-                            resolved_count += 1
-                            logger.info(f"✅ RESOLVED & MIGRATED: {result['name']} (was {placeholder_name})")
-                        else:
-                            logger.error(f"❌ Migration failed for {result['name']}")
-                    else:
-                        # Still not available - update retry count
-                        self.processor.update_retry_count(contract_address)
-                        logger.info(f"⏳ Still pending: {placeholder_name} (will retry later)")
-                    
-                    # Small delay to avoid rate limiting
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error processing {placeholder_name}: {e}")
-                    # Update retry count even on error
-                    self.processor.update_retry_count(contract_address)
-            
-            logger.info(f"📊 RESOLUTION CYCLE COMPLETE: {resolved_count}/{len(pending_tokens)} tokens resolved")
+            logger.info(f"📊 RESOLUTION CYCLE COMPLETE: {resolved_count} tokens resolved")
             return resolved_count
             
         except Exception as e:
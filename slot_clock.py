@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Slot Clock - shared slot → unix time cache
+Learns the slot clock from every (slot, blockTime) pair the monitors already
+see, answers block-time questions locally by interpolating between known
+slots (or extrapolating a short way past the newest) with a reported error
+bound, and batches getBlockTime only for what it can't answer closely enough.
+"""
+
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SlotClock:
+    """Thread-safe slot → time map with interpolation and batched RPC fallback
+
+    rpc_batch(calls) -> results takes a list of (method, params) and returns
+    results in order (e.g. NewTokenOnlyMonitor._rpc_batch).
+    """
+
+    def __init__(self, rpc_batch: Optional[Callable[[List[tuple]], List[Any]]] = None,
+                 max_entries: int = 20000, max_error: float = 2.0,
+                 max_extrapolation_slots: int = 300, default_slot_seconds: float = 0.4):
+        self.rpc_batch = rpc_batch
+        self.max_entries = max_entries
+        self.max_error = max_error
+        self.max_extrapolation_slots = max_extrapolation_slots
+        self.default_slot_seconds = default_slot_seconds
+
+        self._lock = threading.Lock()
+        self._slots: List[int] = []          # Sorted known slots
+        self._times: Dict[int, float] = {}
+        self.stats = {
+            'anchors': 0,
+            'evicted': 0,
+            'exact_hits': 0,
+            'interpolated': 0,
+            'extrapolated': 0,
+            'rpc_batches': 0,
+            'rpc_fetched': 0,
+            'unresolved': 0,
+            'max_error_served': 0.0,
+            'total_error_served': 0.0,
+        }
+
+    def attach_rpc(self, rpc_batch: Callable[[List[tuple]], List[Any]]):
+        """Use rpc_batch for lookups unless one is already attached"""
+        if self.rpc_batch is None:
+            self.rpc_batch = rpc_batch
+
+    # ------------------------------------------------------------------ learning
+
+    def observe(self, slot: Optional[int], block_time: Optional[float]):
+        """Record a known (slot, blockTime) pair"""
+        if slot is None or not block_time:
+            return
+        if block_time > 1e12:
+            block_time = block_time / 1000.0
+        with self._lock:
+            if slot in self._times:
+                return
+            if not self._slots or slot > self._slots[-1]:
+                self._slots.append(slot)
+            else:
+                insort(self._slots, slot)
+            self._times[slot] = float(block_time)
+            self.stats['anchors'] += 1
+            # Evict the oldest slots - hot-path questions are always about recent ones
+            excess = len(self._slots) - self.max_entries
+            if excess > 0:
+                for old_slot in self._slots[:excess]:
+                    del self._times[old_slot]
+                del self._slots[:excess]
+                self.stats['evicted'] += excess
+
+    def observe_entries(self, entries: Iterable[Dict[str, Any]]):
+        """Learn from RPC results carrying 'slot' and 'blockTime' (signatures, transactions)"""
+        for entry in entries or ():
+            if entry:
+                self.observe(entry.get('slot'), entry.get('blockTime'))
+
+    def slot_seconds(self) -> float:
+        """Recent average slot duration (default until enough history exists)"""
+        with self._lock:
+            if len(self._slots) < 2:
+                return self.default_slot_seconds
+            newest = self._slots[-1]
+            reference = self._slots[max(0, bisect_left(self._slots, newest - 10000))]
+            slot_span = newest - reference
+            time_span = self._times[newest] - self._times[reference]
+        if slot_span <= 0 or time_span < 10:
+            return self.default_slot_seconds
+        return time_span / slot_span
+
+    # ------------------------------------------------------------------ answering
+
+    def estimate(self, slot: int) -> Optional[Tuple[float, float]]:
+        """(time, error bound in seconds) from known slots only; None if out of range"""
+        slot_seconds = self.slot_seconds()
+        with self._lock:
+            if slot in self._times:
+                return self._times[slot], 0.0
+            index = bisect_left(self._slots, slot)
+            if 0 < index < len(self._slots):
+                low_slot, high_slot = self._slots[index - 1], self._slots[index]
+                low_time, high_time = self._times[low_slot], self._times[high_slot]
+                estimate = low_time + (high_time - low_time) * (slot - low_slot) / (high_slot - low_slot)
+                # Block times never decrease with slot, so the truth lies in [low_time, high_time]
+                return estimate, max(estimate - low_time, high_time - estimate)
+            if index == len(self._slots) and self._slots:
+                newest = self._slots[-1]
+                distance = slot - newest
+                if distance > self.max_extrapolation_slots:
+                    return None
+                # Slot times drift by a fraction of a slot; blockTime itself is whole seconds
+                return self._times[newest] + distance * slot_seconds, distance * slot_seconds * 0.25 + 1.0
+        return None
+
+    def _record_served(self, error: float, kind: str):
+        with self._lock:
+            self.stats[kind] += 1
+            self.stats['total_error_served'] += error
+            self.stats['max_error_served'] = max(self.stats['max_error_served'], error)
+
+    def resolve_many(self, slots: Iterable[int], max_error: Optional[float] = None) -> Dict[int, Optional[Tuple[float, float]]]:
+        """(time, error bound) per slot - locally where the bound allows, else one batched getBlockTime"""
+        max_error = self.max_error if max_error is None else max_error
+        results: Dict[int, Optional[Tuple[float, float]]] = {}
+        pending = []
+        for slot in dict.fromkeys(slot for slot in slots if slot is not None):
+            estimate = self.estimate(slot)
+            if estimate is not None and estimate[1] <= max_error:
+                kind = 'exact_hits' if estimate[1] == 0 else (
+                    'extrapolated' if slot > self._slots[-1] else 'interpolated')
+                self._record_served(estimate[1], kind)
+                results[slot] = estimate
+            else:
+                pending.append(slot)
+
+        results.update(self._fetch(pending))
+        for slot in pending:
+            if slot not in results:
+                self.stats['unresolved'] += 1
+                results[slot] = None
+        return results
+
+    def _fetch(self, slots: List[int]) -> Dict[int, Tuple[float, float]]:
+        """One batched getBlockTime for slots; fetched times become anchors"""
+        if not slots or self.rpc_batch is None:
+            return {}
+        try:
+            fetched = self.rpc_batch([("getBlockTime", [slot]) for slot in slots])
+            self.stats['rpc_batches'] += 1
+        except Exception as e:
+            logger.debug(f"getBlockTime batch failed for {len(slots)} slots: {e}")
+            return {}
+        results = {}
+        for slot, block_time in zip(slots, fetched):
+            if block_time:
+                self.observe(slot, block_time)
+                self.stats['rpc_fetched'] += 1
+                results[slot] = (float(block_time), 0.0)
+        return results
+
+    def prefetch(self, slots: Iterable[Optional[int]], max_error: Optional[float] = None) -> int:
+        """Batch-fetch every slot the clock can't answer within max_error, so later per-item
+        resolve() calls are answered locally; returns how many slots were fetched"""
+        max_error = self.max_error if max_error is None else max_error
+        pending = []
+        for slot in dict.fromkeys(slot for slot in slots if slot is not None):
+            estimate = self.estimate(slot)
+            if estimate is None or estimate[1] > max_error:
+                pending.append(slot)
+        return len(self._fetch(pending))
+
+    def resolve(self, slot: Optional[int], max_error: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        if slot is None:
+            return None
+        return self.resolve_many([slot], max_error).get(slot)
+
+    def block_time(self, slot: Optional[int], max_error: Optional[float] = None) -> Optional[float]:
+        """Unix time for slot within max_error seconds, or None"""
+        resolved = self.resolve(slot, max_error)
+        return resolved[0] if resolved else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._slots)
+            stats['newest_slot'] = self._slots[-1] if self._slots else None
+        served = stats['exact_hits'] + stats['interpolated'] + stats['extrapolated']
+        stats['local_answers'] = served
+        stats['avg_error_served'] = stats['total_error_served'] / served if served else 0.0
+        stats['slot_seconds'] = self.slot_seconds()
+        return stats
+
+# Global instance shared by the pollers, WebSocket monitor and validators
+_slot_clock = None
+_slot_clock_lock = threading.Lock()
+
+def get_slot_clock() -> SlotClock:
+    """Get the process-wide slot clock"""
+    global _slot_clock
+    if _slot_clock is None:
+        with _slot_clock_lock:
+            if _slot_clock is None:
+                _slot_clock = SlotClock()
+    return _slot_clock
@@ -13,8 +13,13 @@ from concurrent.futures import ThreadPoolExecutor
 import json
 import re
 
+from source_scoring import get_source_scoring
+
 logger = logging.getLogger(__name__)
 
+# Methods that are real name sources, scored per attempt by _scored (Cache and the Ultra-fast aggregate are not)
+SCORED_METHODS = {'DexScreener': 'dexscreener', 'Jupiter': 'jupiter', 'BrowserCat': 'browsercat'}
+
 class SmartOptimizationEngine:
     """AI-powered optimization for faster, smarter token processing"""
     
@@ -54,6 +59,7 @@ class SmartOptimizationEngine:
             'avg_time': 0,
             'method_success_rates': {}
         }
+        self.method_success_rates = self.extraction_stats['method_success_rates']
         
     async def ultra_fast_extraction(self, token_address: str) -> Optional[str]:
         """Ultra-fast extraction using optimized parallel processing"""
@@ -62,8 +68,8 @@ class SmartOptimizationEngine:
         try:
             # Phase 1: Parallel API calls (0.5s timeout)
             fast_tasks = [
-                self._lightning_dexscreener(token_address),
-                self._lightning_jupiter(token_address),
+                self._scored('DexScreener', self._lightning_dexscreener(token_address)),
+                self._scored('Jupiter', self._lightning_jupiter(token_address)),
                 self._smart_cache_lookup(token_address)
             ]
             
@@ -80,7 +86,7 @@ class SmartOptimizationEngine:
             
             # Phase 2: Smart BrowserCat with optimized selectors
             if time.time() - start_time < 1.0:  # Only if we have time budget
-                browsercat_result = await self._smart_browsercat_extraction(token_address)
+                browsercat_result = await self._scored('BrowserCat', self._smart_browsercat_extraction(token_address))
                 if browsercat_result:
                     elapsed = time.time() - start_time
                     logger.info(f"⚡ SMART BROWSERCAT: {token_address[:10]}... → '{browsercat_result}' ({elapsed:.2f}s)")
@@ -94,6 +100,16 @@ class SmartOptimizationEngine:
         self._update_method_stats('Ultra-fast', False, elapsed)
         return None
     
+    async def _scored(self, method: str, extraction) -> Optional[str]:
+        """Await one source's extraction and report its own outcome - failures and timeouts included"""
+        started = time.time()
+        name = None
+        try:
+            name = await extraction
+            return name
+        finally:
+            get_source_scoring().record(SCORED_METHODS[method], bool(name), time.time() - started)
+    
     async def _lightning_dexscreener(self, token_address: str) -> Optional[str]:
         """Lightning-fast DexScreener extraction with smart caching"""
         try:
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Source Scoring Service - shared, persisted performance data for name sources
+Every extractor reports attempts here; ranking and retry timing come from
+windowed success rate, p50/p95 latency and success-by-token-age curves
+(DexScreener rarely knows a token in its first ~30 seconds). Samples are
+persisted to PostgreSQL (or a local JSON file without DATABASE_URL) so the
+curves survive restarts.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Token-age bucket edges in seconds; bucket i covers [edges[i-1], edges[i])
+AGE_BUCKET_EDGES = (10, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+
+class SourceScoringService:
+    """Thread-safe per-source outcome samples with ranking and retry-delay advice
+
+    Samples are (timestamp, success, latency, token_age). Same record()/rank()
+    shape as hedged_resolver.SourceScoreboard so it can back a HedgedResolver.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, window_seconds: float = 3600.0,
+                 max_samples: int = 1000, min_samples: int = 20, flush_interval: float = 60.0,
+                 state_path: Optional[str] = None):
+        self.database_url = database_url
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.flush_interval = flush_interval
+        self.state_path = state_path or os.getenv('SOURCE_SCORES_PATH', 'source_scores.json')
+
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self.wins: Dict[str, int] = {}
+        self.cancellations: Dict[str, int] = {}
+        self._dirty = False
+        self._last_flush = time.time()
+        self._flushing = False
+
+    # ------------------------------------------------------------------ recording
+
+    def record(self, source: str, success: bool, latency: Optional[float] = None,
+               token_age: Optional[float] = None, won: bool = False, cancelled: bool = False, **context):
+        """Report one attempt; cancelled hedges only count towards win rate"""
+        source = source.lower()
+        with self._lock:
+            if cancelled:
+                self.cancellations[source] = self.cancellations.get(source, 0) + 1
+                return
+            samples = self._samples.get(source)
+            if samples is None:
+                samples = self._samples[source] = deque(maxlen=self.max_samples)
+            samples.append((time.time(), 1 if success else 0, latency, token_age))
+            if won:
+                self.wins[source] = self.wins.get(source, 0) + 1
+            self._dirty = True
+            flush_due = not self._flushing and time.time() - self._last_flush >= self.flush_interval
+            if flush_due:
+                self._flushing = True
+
+        if flush_due:
+            # Persist off the caller's thread - extractors sit on hot paths
+            threading.Thread(target=self._background_save, daemon=True).start()
+
+    # ------------------------------------------------------------------ metrics
+
+    def _window(self, source: str) -> List[tuple]:
+        cutoff = time.time() - self.window_seconds
+        return [sample for sample in self._samples.get(source, ()) if sample[0] >= cutoff]
+
+    def success_rate(self, source: str) -> Optional[float]:
+        """Success rate over the recent window, None without data"""
+        with self._lock:
+            window = self._window(source.lower())
+        if not window:
+            return None
+        return sum(sample[1] for sample in window) / len(window)
+
+    def latency_percentile(self, source: str, fraction: float) -> Optional[float]:
+        with self._lock:
+            latencies = sorted(sample[2] for sample in self._window(source.lower()) if sample[2] is not None)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    def age_curve(self, source: str, prior: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Smoothed success rate per token-age bucket over all retained samples
+
+        Buckets with little data are pulled towards the source's overall rate
+        so one lucky attempt doesn't reorder everything.
+        """
+        with self._lock:
+            samples = [sample for sample in self._samples.get(source.lower(), ()) if sample[3] is not None]
+        buckets = [[0, 0] for _ in range(len(AGE_BUCKET_EDGES) + 1)]
+        for _, success, _, token_age in samples:
+            bucket = buckets[bisect_right(AGE_BUCKET_EDGES, token_age)]
+            bucket[0] += 1
+            bucket[1] += success
+        if prior is None:
+            total = sum(bucket[0] for bucket in buckets)
+            prior = sum(bucket[1] for bucket in buckets) / total if total else 0.5
+
+        curve = []
+        lower = 0.0
+        for index, (attempts, successes) in enumerate(buckets):
+            upper = AGE_BUCKET_EDGES[index] if index < len(AGE_BUCKET_EDGES) else float('inf')
+            curve.append({
+                'min_age': lower,
+                'max_age': upper,
+                'attempts': attempts,
+                'success_rate': (successes + 2 * prior) / (attempts + 2),
+            })
+            lower = upper
+        return curve
+
+    def predicted_success(self, source: str, token_age: Optional[float] = None, prior: float = 0.5) -> float:
+        """Success probability for a token of this age (falls back to windowed rate, then prior)"""
+        source = source.lower()
+        with self._lock:
+            aged_samples = sum(1 for sample in self._samples.get(source, ()) if sample[3] is not None)
+        if token_age is not None and aged_samples >= self.min_samples:
+            curve = self.age_curve(source)
+            return curve[bisect_right(AGE_BUCKET_EDGES, token_age)]['success_rate']
+        rate = self.success_rate(source)
+        return prior if rate is None else rate
+
+    # ------------------------------------------------------------------ decisions
+
+    def score(self, source: str, prior: float = 0.5, token_age: Optional[float] = None, **context) -> float:
+        """Expected successes per second for this source at this token age"""
+        p50 = self.latency_percentile(source, 0.5)
+        return self.predicted_success(source, token_age, prior) / max(p50 if p50 is not None else 1.0, 0.05)
+
+    def rank(self, sources: Sequence[str], priors: Optional[Dict[str, float]] = None,
+             token_age: Optional[float] = None, **context) -> List[str]:
+        """Best source first; ties keep the caller's order"""
+        priors = priors or {}
+        order = {source: index for index, source in enumerate(sources)}
+        return sorted(sources, key=lambda source: (
+            -self.score(source, priors.get(source, 0.5), token_age), order[source]))
+
+    def next_retry_delay(self, source: str, token_age: Optional[float] = None, attempt: int = 0,
+                         fallback: Optional[Sequence[float]] = None, target_rate: float = 0.5,
+                         min_delay: float = 0.5, max_delay: float = 30.0) -> float:
+        """How long to wait before retrying source for a token of token_age seconds
+
+        With enough age-tagged data: wait until the token reaches the first age
+        bucket where the source usually succeeds (target scaled down for sources
+        that never reach it). Otherwise use the fallback schedule.
+        """
+        source = source.lower()
+        with self._lock:
+            aged_samples = sum(1 for sample in self._samples.get(source, ()) if sample[3] is not None)
+
+        if token_age is not None and aged_samples >= self.min_samples:
+            curve = self.age_curve(source)
+            best_rate = max(bucket['success_rate'] for bucket in curve)
+            target = min(target_rate, best_rate * 0.8)
+            backoff = min_delay * (2 ** attempt)
+            for bucket in curve:
+                if bucket['max_age'] <= token_age:
+                    continue
+                if bucket['success_rate'] >= target:
+                    return max(min_delay, min(max(bucket['min_age'] - token_age, backoff), max_delay))
+
+        if fallback:
+            return fallback[min(attempt, len(fallback) - 1)]
+        return min(min_delay * (2 ** attempt), max_delay)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Windowed per-source stats for monitoring summaries"""
+        with self._lock:
+            sources = set(self._samples) | set(self.cancellations)
+        stats = {}
+        for source in sorted(sources):
+            with self._lock:
+                window = self._window(source)
+                wins = self.wins.get(source, 0)
+                cancellations = self.cancellations.get(source, 0)
+            attempts = len(window) + cancellations
+            stats[source] = {
+                'attempts': attempts,
+                'wins': wins,
+                'win_rate': wins / attempts if attempts else 0.0,
+                'cancellations': cancellations,
+                'success_rate': self.success_rate(source) or 0.0,
+                'p50_latency': self.latency_percentile(source, 0.5) or 0.0,
+                'p95_latency': self.latency_percentile(source, 0.95) or 0.0,
+            }
+        return stats
+
+    # ------------------------------------------------------------------ persistence
+
+    def _snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._dirty = False
+            return {
+                source: {'samples': list(samples), 'wins': self.wins.get(source, 0)}
+                for source, samples in self._samples.items()
+            }
+
+    def _restore(self, state: Dict[str, Any]):
+        with self._lock:
+            for source, entry in state.items():
+                samples = self._samples.setdefault(source, deque(maxlen=self.max_samples))
+                for sample in entry.get('samples', []):
+                    samples.append(tuple(sample))
+                self.wins[source] = self.wins.get(source, 0) + entry.get('wins', 0)
+
+    def _ensure_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS source_scores (
+                source VARCHAR(64) PRIMARY KEY,
+                state JSONB NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def save(self) -> bool:
+        """Persist every source's samples (database when configured, else local file)"""
+        if not self._dirty:
+            return True
+        snapshot = self._snapshot()
+        try:
+            if self.database_url:
+                from db_pool import get_pooled_connection
+                conn = get_pooled_connection(self.database_url)
+                try:
+                    cursor = conn.cursor()
+                    self._ensure_table(cursor)
+                    for source, entry in snapshot.items():
+                        cursor.execute("""
+                            INSERT INTO source_scores (source, state, updated_at)
+                            VALUES (%s, %s, CURRENT_TIMESTAMP)
+                            ON CONFLICT (source) DO UPDATE SET state = EXCLUDED.state, updated_at = CURRENT_TIMESTAMP
+                        """, (source, json.dumps(entry)))
+                    conn.commit()
+                    cursor.close()
+                finally:
+                    conn.close()
+            else:
+                temp_path = f"{self.state_path}.tmp"
+                with open(temp_path, 'w') as state_file:
+                    json.dump(snapshot, state_file)
+                os.replace(temp_path, self.state_path)
+            logger.debug(f"💾 SOURCE SCORES: Saved {len(snapshot)} sources")
+            return True
+        except Exception as e:
+            self._dirty = True
+            logger.warning(f"⚠️ SOURCE SCORES: Save failed: {e}")
+            return False
+        finally:
+            self._last_flush = time.time()
+
+    def _background_save(self):
+        try:
+            self.save()
+        finally:
+            self._flushing = False
+
+    def load(self) -> int:
+        """Restore persisted samples; returns how many sources were loaded"""
+        try:
+            state = {}
+            if self.database_url:
+                from db_pool import get_pooled_connection
+                conn = get_pooled_connection(self.database_url)
+                try:
+                    cursor = conn.cursor()
+                    self._ensure_table(cursor)
+                    conn.commit()
+                    cursor.execute("SELECT source, state FROM source_scores")
+                    for source, entry in cursor.fetchall():
+                        state[source] = entry if isinstance(entry, dict) else json.loads(entry)
+                    cursor.close()
+                finally:
+                    conn.close()
+            elif os.path.exists(self.state_path):
+                with open(self.state_path) as state_file:
+                    state = json.load(state_file)
+            self._restore(state)
+            if state:
+                logger.info(f"✅ SOURCE SCORES: Restored history for {len(state)} sources")
+            return len(state)
+        except Exception as e:
+            logger.warning(f"⚠️ SOURCE SCORES: Load failed, starting fresh: {e}")
+            return 0
+
+# Global instance for system-wide use
+_source_scoring = None
+_source_scoring_lock = threading.Lock()
+
+def get_source_scoring() -> SourceScoringService:
+    """Get the process-wide scoring service (loaded from storage on first use)"""
+    global _source_scoring
+    if _source_scoring is None:
+        with _source_scoring_lock:
+            if _source_scoring is None:
+                service = SourceScoringService(database_url=os.getenv('DATABASE_URL'))
+                service.load()
+                atexit.register(service.save)
+                _source_scoring = service
+    return _source_scoring
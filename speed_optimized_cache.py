@@ -9,6 +9,8 @@ import logging
 from typing import Dict, Optional, List
 import threading
 
+from source_scoring import get_source_scoring
+
 logger = logging.getLogger(__name__)
 
 class SpeedOptimizedCache:
@@ -43,8 +45,14 @@ class SpeedOptimizedCache:
                     del self.name_cache[token_address]
         return None
     
-    def cache_name(self, token_address: str, name: str, api_source: Optional[str] = None, extraction_time: Optional[float] = None):
-        """Cache successful extraction"""
+    def cache_name(self, token_address: str, name: str, api_source: Optional[str] = None,
+                   extraction_time: Optional[float] = None, from_cache: bool = False):
+        """Cache successful extraction
+
+        from_cache marks a name that came out of another cache layer - it is
+        stored, but never counted as a success for api_source.
+        """
+        record_source = bool(api_source) and extraction_time is not None and not from_cache
         with self.cache_lock:
             self.name_cache[token_address] = (name, time.time())
             
@@ -56,7 +64,7 @@ class SpeedOptimizedCache:
                 self.pattern_cache[pattern].append(name)
                 
             # Update API performance stats
-            if api_source and extraction_time:
+            if record_source:
                 if api_source.lower() in self.api_performance:
                     stats = self.api_performance[api_source.lower()]
                     stats['success_count'] += 1
@@ -65,22 +73,22 @@ class SpeedOptimizedCache:
                     count = stats['success_count']
                     stats['avg_time'] = ((old_avg * (count - 1)) + extraction_time) / count
                     
+        if record_source:
+            get_source_scoring().record(api_source, True, extraction_time)
+                    
         logger.debug(f"✅ CACHED: {token_address[:10]}... → '{name}' via {api_source}")
     
+    def record_failure(self, api_source: str, extraction_time: Optional[float] = None, timed_out: bool = False):
+        """Report a source that answered without a usable name, errored or timed out"""
+        get_source_scoring().record(api_source, False, extraction_time)
+        logger.debug(f"❌ {api_source} {'timed out' if timed_out else 'failed'}"
+                     f"{f' after {extraction_time:.2f}s' if extraction_time is not None else ''}")
+    
     def get_fastest_apis(self) -> List[str]:
         """Return APIs ordered by performance (fastest first)"""
-        apis_by_performance = []
-        
-        for api, stats in self.api_performance.items():
-            if stats['success_count'] > 0:
-                # Score: success rate * speed (lower time = higher score)
-                speed_score = 1.0 / (stats['avg_time'] + 0.1)  # Avoid division by zero
-                total_score = stats['success_count'] * speed_score
-                apis_by_performance.append((api, total_score))
-        
-        # Sort by performance score (descending)
-        apis_by_performance.sort(key=lambda x: x[1], reverse=True)
-        return [api for api, score in apis_by_performance]
+        # Ranking comes from the shared scoring service, which also sees failures
+        seen_apis = [api for api, stats in self.api_performance.items() if stats['success_count'] > 0]
+        return get_source_scoring().rank(seen_apis)
     
     def predict_likely_success(self, token_address: str) -> bool:
         """Predict if this token is likely to be found quickly"""
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+SPL WebSocket Monitor - real-time LetsBonk token detection via logsSubscribe
+Subscribes to program logs for the LetsBonk program over a Solana JSON-RPC
+WebSocket, picks token creations straight out of the log stream and feeds
+them to the same callback the pollers use. Resubscribes on disconnect and
+backfills any signatures missed while the socket was down.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from async_token_pipeline import LatencyHistogram
+from background_event_loop import BackgroundEventLoop, get_background_loop
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+LETSBONK_PROGRAM_ID = "LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj"
+
+# Log lines that mark a mint being created (substring match)
+CREATION_LOG_PATTERNS = (
+    'Instruction: InitializeMint',
+    'Instruction: InitializeMint2',
+    'Initializing token mint',
+    'Instruction: Create',
+)
+# LetsBonk's own launch instruction - exact line so InitializeAccount etc. don't match
+CREATION_LOG_LINES = frozenset({
+    'Program log: Instruction: Initialize',
+})
+
+def is_creation_logs(logs: List[str]) -> bool:
+    """True if a transaction's log messages contain a token creation"""
+    for line in logs or ():
+        if line in CREATION_LOG_LINES:
+            return True
+        if any(pattern in line for pattern in CREATION_LOG_PATTERNS):
+            return True
+    return False
+
+def parse_log_notification(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Extract {signature, slot, logs, is_creation} from a logsNotification, else None
+
+    Failed transactions are dropped - they can't have created a token.
+    """
+    if not isinstance(message, dict) or message.get('method') != 'logsNotification':
+        return None
+    result = (message.get('params') or {}).get('result') or {}
+    value = result.get('value') or {}
+    signature = value.get('signature')
+    if not signature or value.get('err') is not None:
+        return None
+    logs = value.get('logs') or []
+    return {
+        'signature': signature,
+        'slot': (result.get('context') or {}).get('slot'),
+        'logs': logs,
+        'is_creation': is_creation_logs(logs),
+    }
+
+class SPLWebSocketMonitor:
+    """logsSubscribe ingestion source for the LetsBonk program
+
+    resolve_func(signatures) -> token dicts turns creation signatures into the
+    token shape process_tokens expects (e.g. NewTokenOnlyMonitor.resolve_signatures).
+    backfill_func(last_signature) -> signatures returns what was missed while
+    disconnected (e.g. NewTokenOnlyMonitor.get_signatures_since). Both are
+    blocking and run off the event loop, as does callback_func.
+    """
+
+    def __init__(self, callback_func: Optional[Callable] = None, ws_url: Optional[str] = None,
+                 program_id: str = LETSBONK_PROGRAM_ID, resolve_func: Optional[Callable] = None,
+                 backfill_func: Optional[Callable] = None, commitment: str = "confirmed",
+                 idle_timeout: float = 60.0, batch_window: float = 0.05, max_batch: int = 20,
+                 reconnect_delay: float = 1.0, loop_service: Optional[BackgroundEventLoop] = None):
+        if websockets is None:
+            raise ImportError("websockets package not installed")
+        if ws_url is None:
+            ws_url = os.getenv("SOLANA_WS_URL")
+        if ws_url is None and os.getenv("ALCHEMY_API_KEY"):
+            ws_url = f"wss://solana-mainnet.g.alchemy.com/v2/{os.getenv('ALCHEMY_API_KEY')}"
+        if not ws_url:
+            raise ValueError("SOLANA_WS_URL or ALCHEMY_API_KEY environment variable required")
+
+        self.callback_func = callback_func
+        self.ws_url = ws_url
+        self.program_id = program_id
+        self.resolve_func = resolve_func
+        self.backfill_func = backfill_func
+        self.commitment = commitment
+        self.idle_timeout = idle_timeout
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.reconnect_delay = reconnect_delay
+        self.loop_service = loop_service or get_background_loop()
+
+        self.running = False
+        self.connected = False
+        self.subscription_id = None
+        self.last_signature: Optional[str] = None
+        self.last_slot: Optional[int] = None
+        # Bounded recently-seen signatures (stream and backfill overlap on reconnect)
+        self._seen_signatures: OrderedDict = OrderedDict()
+        self._max_seen = 5000
+        self._events: Optional[asyncio.Queue] = None
+        self._future = None
+
+        self.detection_latency = LatencyHistogram()
+        self.stats = {
+            'notifications': 0,
+            'creations': 0,
+            'tokens_emitted': 0,
+            'connects': 0,
+            'reconnects': 0,
+            'backfilled_signatures': 0,
+            'resolve_failures': 0,
+        }
+
+    def _remember(self, signature: str) -> bool:
+        """Mark a signature seen; False if it already was"""
+        if signature in self._seen_signatures:
+            return False
+        self._seen_signatures[signature] = True
+        if len(self._seen_signatures) > self._max_seen:
+            self._seen_signatures.popitem(last=False)
+        return True
+
+    async def _subscribe(self, websocket) -> Any:
+        await websocket.send(json.dumps({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "logsSubscribe",
+            "params": [{"mentions": [self.program_id]}, {"commitment": self.commitment}]
+        }))
+        # Notifications can't arrive before the subscription reply
+        reply = json.loads(await asyncio.wait_for(websocket.recv(), timeout=10))
+        if 'error' in reply:
+            raise ConnectionError(f"logsSubscribe rejected: {reply['error']}")
+        return reply.get('result')
+
+    async def _backfill(self):
+        """Queue signatures that landed while we were disconnected"""
+        if not (self.backfill_func and self.last_signature):
+            return
+        loop = asyncio.get_running_loop()
+        signatures = await loop.run_in_executor(None, self.backfill_func, self.last_signature)
+        queued = 0
+        for signature in signatures or ():
+            if self._remember(signature):
+                # Backfilled signatures skip the log filter - resolution checks the transaction
+                await self._events.put((signature, time.monotonic()))
+                self.last_signature = signature
+                queued += 1
+        if queued:
+            self.stats['backfilled_signatures'] += queued
+            logger.info(f"🔄 WEBSOCKET BACKFILL: {queued} signatures missed during disconnect")
+
+    async def _handle_message(self, raw: str):
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.debug(f"Invalid WebSocket message: {str(raw)[:100]}")
+            return
+        event = parse_log_notification(message)
+        if event is None:
+            return
+
+        self.stats['notifications'] += 1
+        self.last_signature = event['signature']
+        if event['slot'] is not None:
+            self.last_slot = event['slot']
+        if event['is_creation'] and self._remember(event['signature']):
+            self.stats['creations'] += 1
+            await self._events.put((event['signature'], time.monotonic()))
+
+    async def _listen(self):
+        websocket = await websockets.connect(self.ws_url, ping_interval=20, ping_timeout=20, max_size=2 ** 22)
+        try:
+            self.subscription_id = await self._subscribe(websocket)
+            self.connected = True
+            self.stats['connects'] += 1
+            logger.info(f"✅ WEBSOCKET: logsSubscribe active for {self.program_id[:10]}... (subscription {self.subscription_id})")
+
+            await self._backfill()
+
+            while self.running:
+                # A silent socket is treated as dead - LetsBonk logs never stop for this long
+                raw = await asyncio.wait_for(websocket.recv(), timeout=self.idle_timeout)
+                await self._handle_message(raw)
+        finally:
+            self.connected = False
+            await websocket.close()
+
+    async def _consume(self):
+        """Resolve creation signatures in small batches and hand tokens to the callback"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._events.get()]
+            # Short gather window so a burst resolves in one batched RPC
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._events.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            signatures = [signature for signature, _ in batch]
+            try:
+                tokens = await loop.run_in_executor(None, self.resolve_func, signatures) if self.resolve_func else []
+            except Exception as e:
+                self.stats['resolve_failures'] += 1
+                logger.error(f"❌ WEBSOCKET RESOLVE: {len(signatures)} signatures failed: {e}")
+                continue
+
+            if tokens and self.callback_func:
+                self.stats['tokens_emitted'] += len(tokens)
+                for _, received_at in batch:
+                    self.detection_latency.record(time.monotonic() - received_at)
+                try:
+                    await loop.run_in_executor(None, self.callback_func, tokens)
+                except Exception as e:
+                    logger.error(f"Callback error: {e}")
+
+    async def run(self):
+        """Connect, subscribe and consume until stop(); reconnects with backoff"""
+        self.running = True
+        self._events = asyncio.Queue()
+        consumer = asyncio.ensure_future(self._consume())
+        backoff = self.reconnect_delay
+        try:
+            while self.running:
+                notifications_before = self.stats['notifications']
+                try:
+                    await self._listen()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not self.running:
+                        break
+                    # Reset after a connection that actually delivered data
+                    if self.stats['notifications'] > notifications_before:
+                        backoff = self.reconnect_delay
+                    logger.warning(f"⚠️ WEBSOCKET DISCONNECTED: {e} - resubscribing in {backoff:.1f}s")
+                else:
+                    continue
+                self.stats['reconnects'] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+
+    def start_monitoring(self):
+        """Run on the shared background loop; returns the concurrent future"""
+        if self._future is None or self._future.done():
+            self._future = self.loop_service.submit(self.run())
+            logger.info("🚀 SPL WebSocket monitor started - ultra-fast token detection")
+        return self._future
+
+    def stop(self):
+        self.running = False
+        if self._future is not None:
+            self._future.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats.update({
+            'connected': self.connected,
+            'last_slot': self.last_slot,
+            'detection_latency': self.detection_latency.snapshot(),
+        })
+        return stats
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test alert coalescing - every match on one token shares one market-data lookup,
+one embed, one batched insert and as few Discord messages as the limits allow
+"""
+
+import asyncio
+
+from main import IntegratedTokenMonitor, MAX_MENTIONS_PER_MESSAGE
+
+class FakeDelivery:
+    def __init__(self):
+        self.payloads = []
+
+    async def send_async(self, url, payload, priority=0, channel=None, label=""):
+        self.payloads.append(payload)
+        return True
+
+def make_monitor():
+    monitor = IntegratedTokenMonitor.__new__(IntegratedTokenMonitor)
+    monitor.webhook_url = "https://hook/a"
+    monitor.discord_delivery = FakeDelivery()
+    monitor.pending_alerts = {}
+    monitor.alert_coalesce_window = 0.05
+    monitor.market_lookups = 0
+    monitor.recorded = []
+
+    async def get_market_data(token_address, retry_delay=0):
+        monitor.market_lookups += 1
+        return {'market_cap': 12000, 'price': 0.000012, 'source': 'PumpPortal'}
+
+    async def record_notifications(matches):
+        monitor.recorded.append(list(matches))
+
+    monitor.get_market_data = get_market_data
+    monitor.record_notifications = record_notifications
+    return monitor
+
+def match(user_id, keyword, address="Mint111pump"):
+    return {'user_id': user_id, 'keyword': keyword, 'token_name': 'Moon Cat', 'token_address': address,
+            'match_type': 'substring', 'platform': 'Pump.fun'}
+
+def test_matches_coalesce_per_token():
+    """Many users matching one token → one lookup, one message, one insert"""
+    print("🧪 TESTING ALERT COALESCING")
+    print("=" * 50)
+
+    monitor = make_monitor()
+
+    async def scenario():
+        for index in range(5):
+            monitor.queue_alert(match(f"{1000 + index}", "moon" if index % 2 else "cat"))
+        monitor.queue_alert(match("2000", "dog", address="Mint222pump"))
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+
+    assert monitor.market_lookups == 2
+    assert len(monitor.discord_delivery.payloads) == 2
+    first = monitor.discord_delivery.payloads[0]
+    assert first['content'].split() == [f"<@{1000 + index}>" for index in range(5)]
+    assert '`cat, moon`' in first['embeds'][0]['description']
+    print("✅ 5 matches on one token → 1 market lookup, 1 message mentioning all users")
+
+    assert [len(batch) for batch in monitor.recorded] == [5, 1]
+    print("✅ notified_tokens rows recorded in one batch per token")
+    assert monitor.pending_alerts == {}
+
+def test_mentions_chunked_to_limits():
+    """Past Discord's mention limit the same embed goes out in several messages"""
+    monitor = make_monitor()
+    users = [f"{10**17 + index}" for index in range(MAX_MENTIONS_PER_MESSAGE + 30)]
+
+    chunks = monitor.chunk_mentions(users + users[:3])
+    assert sum(len(chunk) for chunk in chunks) == len(users)
+    for chunk in chunks:
+        assert len(chunk) <= MAX_MENTIONS_PER_MESSAGE
+        assert len(' '.join(f'<@{user_id}>' for user_id in chunk)) <= 2000
+    print(f"✅ {len(users)} users split into {len(chunks)} messages within mention/content limits")
+
+    asyncio.run(monitor.send_coalesced_notification([match(user_id, "cat") for user_id in users]))
+    payloads = monitor.discord_delivery.payloads
+    assert len(payloads) == len(chunks) and monitor.market_lookups == 1
+    assert all(payload['embeds'] == payloads[0]['embeds'] for payload in payloads)
+    print("✅ Embed rendered once and reused for every chunk")
+
+if __name__ == "__main__":
+    test_matches_coalesce_per_token()
+    test_mentions_chunked_to_limits()
+    print("\n✅ ALL ALERT COALESCING TESTS PASSED")
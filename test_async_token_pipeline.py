@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the staged async token pipeline (ordering, drops, back-pressure, metrics)
+"""
+
+import time
+import asyncio
+import threading
+
+from background_event_loop import BackgroundEventLoop
+from async_token_pipeline import AsyncTokenPipeline, PipelineStage, LatencyHistogram
+
+def test_async_token_pipeline():
+    """Tokens flow through every stage; handlers can drop, block or await"""
+    print("🧪 TESTING ASYNC TOKEN PIPELINE")
+    print("=" * 50)
+
+    loop_service = BackgroundEventLoop(name="test-pipeline-loop")
+    persisted = []
+    lock = threading.Lock()
+
+    def detect(token):
+        return token if token.get('address') else None
+
+    async def enrich(token):
+        await asyncio.sleep(0.001)
+        return dict(token, accurate_name=token['name'].upper())
+
+    def keyword(token):
+        return token if 'moon' in token['name'] else None
+
+    def persist(token):
+        time.sleep(0.001)  # Blocking I/O stand-in
+        with lock:
+            persisted.append(token['accurate_name'])
+        return token
+
+    def broken(token):
+        if token['name'] == 'moon boom':
+            raise ValueError("boom")
+        return token
+
+    pipeline = AsyncTokenPipeline([
+        PipelineStage('detect', detect, concurrency=1),
+        PipelineStage('keyword', keyword, concurrency=2),
+        PipelineStage('enrich', enrich, concurrency=4),
+        PipelineStage('broken', broken, concurrency=1),
+        PipelineStage('persist', persist, concurrency=2, blocking=True),
+    ], loop_service=loop_service, name='test-pipeline')
+
+    tokens = [{'address': f'addr{i}', 'name': 'moon dog' if i % 2 else 'pepe'} for i in range(20)]
+    tokens += [{'address': '', 'name': 'moon nobody'}, {'address': 'x', 'name': 'moon boom'}]
+    accepted = pipeline.submit_batch(tokens, timeout=5)
+    pipeline.drain(timeout=5)
+
+    assert accepted == len(tokens)
+    assert sorted(persisted) == ['MOON DOG'] * 10
+    print(f"✅ {len(persisted)} of {len(tokens)} tokens reached the last stage")
+
+    metrics = pipeline.get_metrics()
+    assert metrics['stages']['detect']['dropped'] == 1
+    assert metrics['stages']['keyword']['dropped'] == 10
+    assert metrics['stages']['broken']['errors'] == 1
+    assert metrics['completed'] == 10 and metrics['end_to_end']['count'] == 10
+    print("✅ Drops and handler errors counted per stage")
+    pipeline.stop()
+
+    # Back-pressure: a single slow worker with queue_size=1 holds the producer back
+    release = threading.Event()
+    def slow(token):
+        release.wait(5)
+        return token
+
+    pipeline = AsyncTokenPipeline([PipelineStage('slow', slow, concurrency=1, queue_size=1, blocking=True)],
+                                  loop_service=loop_service, name='test-backpressure')
+    assert pipeline.submit({'n': 1}, timeout=1)   # picked up by the worker
+    assert pipeline.submit({'n': 2}, timeout=1)   # fills the queue
+    assert not pipeline.submit({'n': 3}, timeout=0.2)
+    assert pipeline.get_metrics()['rejected'] == 1
+    release.set()
+    pipeline.drain(timeout=5)
+    print("✅ Producer is held back when the first stage is full")
+    pipeline.stop()
+    loop_service.stop()
+
+def test_latency_histogram():
+    """Percentiles come from bucket bounds"""
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.record(0.004)
+    for _ in range(10):
+        histogram.record(0.2)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100
+    assert snapshot['p50_ms'] == 5 and snapshot['p95_ms'] == 250
+    print(f"✅ Histogram p50={snapshot['p50_ms']}ms p95={snapshot['p95_ms']}ms")
+
+if __name__ == "__main__":
+    test_async_token_pipeline()
+    test_latency_histogram()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test the shared background event loop used by the threaded pipeline
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+
+from background_event_loop import BackgroundEventLoop
+
+def test_background_event_loop():
+    """Every caller thread should land on the same long-lived loop"""
+    print("🧪 TESTING BACKGROUND EVENT LOOP")
+    print("=" * 50)
+
+    service = BackgroundEventLoop(name="test-background-loop")
+
+    async def loop_id():
+        await asyncio.sleep(0)
+        return id(asyncio.get_running_loop())
+
+    seen = []
+    def worker():
+        seen.append(service.run(loop_id(), timeout=5))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(seen) == 8 and len(set(seen)) == 1
+    print("✅ 8 threads shared one event loop")
+
+    # Timeouts cancel the coroutine instead of leaving it running
+    cancelled = threading.Event()
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    try:
+        service.run(slow(), timeout=0.05)
+        assert False, "expected timeout"
+    except concurrent.futures.TimeoutError:
+        pass
+    assert cancelled.wait(2)
+    print("✅ Timed-out coroutine was cancelled")
+
+    # Blocking on the loop from inside the loop would deadlock
+    async def nested():
+        try:
+            service.run(loop_id())
+        except RuntimeError:
+            return True
+        return False
+
+    assert service.run(nested(), timeout=5) is True
+    print("✅ run() from the loop thread is rejected")
+
+    stats = service.get_stats()
+    assert stats['timeouts'] == 1 and stats['loop_starts'] == 1
+    print(f"✅ Stats: {stats}")
+
+    service.stop()
+    assert not service.is_running()
+    print("✅ Loop stopped cleanly")
+
+if __name__ == "__main__":
+    test_background_event_loop()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test bulk token resolution - a batch is claimed with FOR UPDATE SKIP LOCKED,
+resolved concurrently and written back in a single transaction
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from bulk_token_resolution import BulkTokenResolver, normalize_resolution
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        self.conn.statements.append((' '.join(query.split()), params))
+
+    def fetchall(self):
+        return self.conn.rows[:self.conn.statements[-1][1][0]]
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.inserted = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def async_connection(self):
+        try:
+            yield self.conn
+            self.conn.commits += 1
+        except Exception:
+            self.conn.rollbacks += 1
+            raise
+
+def make_resolver(conn, resolve, table='pending_tokens'):
+    resolver = BulkTokenResolver(None, table, resolve, batch_size=3, pool=FakePool(conn))
+    resolver._insert_resolved = lambda cursor, rows: conn.inserted.extend(rows)
+    return resolver
+
+ROWS = [
+    ("Mint1listed", "Unnamed Token Mint1", None, ['cat'], 0),
+    ("Mint2new", "Unnamed Token Mint2", None, ['dog'], 2),
+    ("Mint3listed", "Unnamed Token Mint3", "OLD", None, 1),
+    ("Mint4listed", "Unnamed Token Mint4", None, None, 0),
+]
+
+def test_batch_claimed_and_written_in_one_transaction():
+    """Claim with SKIP LOCKED, concurrent lookups, one commit for every write"""
+    print("🧪 TESTING BULK TOKEN RESOLUTION")
+    print("=" * 50)
+
+    in_flight = []
+    peak = []
+    async def resolve(address):
+        in_flight.append(address)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(address)
+        if address.endswith('listed'):
+            return {'name': f"Name {address[:5]}", 'symbol': 'NEW' if address == "Mint1listed" else ''}
+        return None
+
+    conn = FakeConnection(ROWS)
+    summary = asyncio.run(make_resolver(conn, resolve).run_cycle())
+
+    claim_sql, claim_params = conn.statements[0]
+    assert claim_sql.endswith("FOR UPDATE SKIP LOCKED") and claim_params == (3,)
+    assert summary == {'claimed': 3, 'resolved': 2, 'retried': 1}
+    assert max(peak) == 3
+    print("✅ 3 rows claimed with FOR UPDATE SKIP LOCKED and looked up concurrently")
+
+    assert conn.inserted == [
+        ("Mint1listed", "Name Mint1", "NEW", ['cat'], 'LetsBonk', 'detected'),
+        ("Mint3listed", "Name Mint3", "OLD", [], 'LetsBonk', 'detected'),
+    ]
+    delete_sql, delete_params = conn.statements[1]
+    assert delete_sql.startswith("DELETE FROM pending_tokens") and delete_params == (["Mint1listed", "Mint3listed"],)
+    update_sql, update_params = conn.statements[2]
+    assert update_sql.startswith("UPDATE pending_tokens") and update_params == (["Mint2new"],)
+    assert len(conn.statements) == 3 and conn.commits == 1
+    print("✅ One insert, one delete, one retry update - committed together")
+
+def test_failures_release_the_claim():
+    """A failed write rolls back so the claimed rows go back to the pool of work"""
+    async def resolve(address):
+        return "Unnamed Token" if address == "Mint1listed" else address
+
+    assert normalize_resolution("Unnamed Token ABC") is None
+    assert normalize_resolution({'name': ' Moon ', 'symbol': ''}) == {'name': 'Moon', 'symbol': None}
+
+    conn = FakeConnection(ROWS)
+    resolver = make_resolver(conn, resolve, table='fallback_processing_coins')
+    def broken_insert(cursor, rows):
+        raise RuntimeError("connection reset")
+    resolver._insert_resolved = broken_insert
+
+    summary = asyncio.run(resolver.run_cycle())
+    assert summary['claimed'] == 0 and conn.rollbacks == 1 and conn.commits == 0
+    assert "processing_status IN" in conn.statements[0][0]
+    assert resolver.get_stats()['failed_cycles'] == 1
+    print("✅ Failed cycle rolled back, locks released for the next resolver")
+
+    try:
+        BulkTokenResolver(None, 'detected_tokens', resolve, pool=FakePool(conn))
+        assert False, "unsupported table accepted"
+    except ValueError:
+        print("✅ Only pending_tokens and fallback_processing_coins can be claimed")
+
+if __name__ == "__main__":
+    test_batch_claimed_and_written_in_one_transaction()
+    test_failures_release_the_claim()
+    print("\n✅ ALL BULK TOKEN RESOLUTION TESTS PASSED")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test the compact seen set - decoded keys in a fixed-size table, time-bucketed
+expiry, early eviction when full (bursts included), and the Bloom tail's false-positive metric
+"""
+
+import os
+
+from compact_seen_set import CompactSeenSet, decode_key, B58_ALPHABET, SIGNATURE_KEY_SIZE
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def b58encode(raw):
+    number = int.from_bytes(raw, 'big')
+    encoded = ''
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = B58_ALPHABET[remainder] + encoded
+    return '1' * (len(raw) - len(raw.lstrip(b'\0'))) + encoded
+
+def test_decode_key():
+    """Canonical base58 decodes to raw bytes; anything else hashes to the same width"""
+    print("🧪 TESTING COMPACT SEEN SET")
+    print("=" * 50)
+
+    for raw in [os.urandom(32) for _ in range(200)] + [b'\0\0' + os.urandom(30)]:
+        assert decode_key(b58encode(raw)) == raw
+    signature = os.urandom(64)
+    assert decode_key(b58encode(signature), SIGNATURE_KEY_SIZE) == signature
+    print("✅ Mints and signatures decode to their 32/64 raw bytes")
+
+    assert len(decode_key('MintA')) == 32 and decode_key('MintA') != decode_key('MintB')
+    assert decode_key('not-base58!') == decode_key('not-base58!')
+    print("✅ Non-canonical ids fall back to a stable digest")
+
+def test_membership_and_expiry():
+    """Keys stay live for ttl after their last add, then expire without timers"""
+    clock = FakeClock()
+    seen = CompactSeenSet(capacity=100, ttl=60, buckets=6, clock=clock)
+    mint = b58encode(os.urandom(32))
+
+    assert mint not in seen
+    assert seen.add(mint) is True and seen.add(mint) is False
+    assert mint in seen and len(seen) == 1
+
+    clock.now += 50
+    seen.add('Refreshed')
+    clock.now += 20
+    assert mint not in seen and 'Refreshed' in seen
+    assert seen.add(mint) is True
+    seen.discard(mint)
+    assert mint not in seen and len(seen) == 1
+    print("✅ Add/contains/discard with bucketed expiry")
+
+    clock.now += 254 * 10
+    assert 'Refreshed' not in seen and len(seen) == 0
+    print("✅ Stamps purged before they wrap around")
+
+def test_fixed_memory_early_eviction():
+    """A full table drops its oldest bucket instead of growing"""
+    clock = FakeClock()
+    seen = CompactSeenSet(capacity=50, ttl=100, buckets=10, clock=clock)
+    memory = seen.memory_bytes
+
+    for batch in range(5):
+        for index in range(20):
+            seen.add(f'mint-{batch}-{index}')
+        clock.now += 10
+
+    assert seen.memory_bytes == memory
+    assert len(seen) <= 50
+    assert 'mint-4-19' in seen and 'mint-0-0' not in seen
+    stats = seen.get_stats()
+    assert stats['evicted_early'] > 0 and stats['false_positive_rate'] == 0.0
+    print(f"✅ {stats['adds']} adds in {memory} bytes, {stats['evicted_early']} evicted early")
+
+def test_burst_within_one_bucket_keeps_recent_keys():
+    """More than capacity keys in one bucket evicts the oldest part, not everything"""
+    clock = FakeClock()
+    seen = CompactSeenSet(capacity=100, ttl=100, buckets=10, clock=clock)
+
+    seen.update(f'burst-{index}' for index in range(350))
+
+    assert 0 < len(seen) <= 100
+    assert all(f'burst-{index}' in seen for index in range(300, 350))
+    assert 'burst-0' not in seen
+    stats = seen.get_stats()
+    assert stats['early_rolls'] >= 6 and stats['evicted_early'] > 0
+    print(f"✅ Burst of 350 keys: {len(seen)} most recent kept after {stats['early_rolls']} early bucket rolls")
+
+def test_bloom_tail_false_positive_rate():
+    """Keys leaving the table stay members via the Bloom tail, with a reported error rate"""
+    clock = FakeClock()
+    seen = CompactSeenSet(capacity=100, ttl=10, buckets=2, tail_capacity=1000, tail_error_rate=0.01, clock=clock)
+
+    seen.update(f'old-{index}' for index in range(80))
+    clock.now += 30
+    seen.update(f'new-{index}' for index in range(80))
+
+    assert all(f'old-{index}' in seen for index in range(80))
+    stats = seen.get_stats()
+    # Overwritten slots spilled to the Bloom tail; the rest are still in the table, expired
+    assert stats['tail_hits'] == 80 and 0 < stats['tail_items'] <= 80
+    assert 0 < stats['false_positive_rate'] < 0.01
+    false_hits = sum(1 for index in range(2000) if f'never-{index}' in seen)
+    assert false_hits < 40
+    print(f"✅ Tail keeps expired keys; estimated FPR {stats['false_positive_rate']:.5f}, "
+          f"observed {false_hits}/2000")
+
+if __name__ == "__main__":
+    test_decode_key()
+    test_membership_and_expiry()
+    test_fixed_memory_early_eviction()
+    test_burst_within_one_bucket_keeps_recent_keys()
+    test_bloom_tail_false_positive_rate()
+    print("\n✅ ALL COMPACT SEEN SET TESTS PASSED")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test DexScreener batching - concurrent single-mint lookups share comma-separated
+requests of up to 30 mints and each caller gets its own pairs back
+"""
+
+import time
+import asyncio
+import threading
+
+from dexscreener_batch import DexScreenerBatchClient, base_token_name
+
+def pair(address, name):
+    return {'baseToken': {'address': address, 'name': name, 'symbol': name[:4].upper()},
+            'quoteToken': {'address': 'So11111111111111111111111111111111111111112'}}
+
+class FakeDexScreener:
+    """Knows every mint whose address ends in 'listed'"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, addresses):
+        self.batches.append(list(addresses))
+        time.sleep(0.02)
+        if self.fail:
+            raise RuntimeError("HTTP 429")
+        return [pair(address, f"Name {address[:6]}") for address in addresses if address.endswith('listed')]
+
+def test_lookups_are_batched():
+    """45 concurrent lookups → 2 requests (30 + 15), each caller gets its own answer"""
+    print("🧪 TESTING DEXSCREENER BATCH CLIENT")
+    print("=" * 50)
+
+    upstream = FakeDexScreener()
+    client = DexScreenerBatchClient(fetch_batch=upstream, max_wait=0.05)
+    addresses = [f"Mint{index:03d}{'listed' if index % 3 == 0 else 'new'}" for index in range(45)]
+
+    results = {}
+    def lookup(address):
+        results[address] = client.lookup(address)
+
+    threads = [threading.Thread(target=lookup, args=(address,)) for address in addresses]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(len(batch) for batch in upstream.batches) == [15, 30], upstream.batches
+    print(f"✅ 45 lookups sent as {len(upstream.batches)} requests")
+
+    for address in addresses:
+        if address.endswith('listed'):
+            assert base_token_name(address, results[address])['name'] == f"Name {address[:6]}"
+        else:
+            assert results[address] == []
+    print("✅ Each caller got the pairs for its own mint ([] when not indexed)")
+
+def test_async_backlog_and_errors():
+    """A coroutine backlog fills batches; failed requests answer None, not []"""
+    upstream = FakeDexScreener()
+    client = DexScreenerBatchClient(fetch_batch=upstream)
+
+    async def backlog():
+        return await client.lookup_many_async([f"Pending{index}new" for index in range(100)])
+
+    results = asyncio.run(backlog())
+    assert len(results) == 100 and len(upstream.batches) == 4
+    stats = client.get_stats()
+    assert stats['avg_batch_size'] == 25.0
+    print("✅ 100 pending tokens resolved with 4 requests")
+
+    failing = DexScreenerBatchClient(fetch_batch=FakeDexScreener(fail=True))
+    assert failing.lookup("MintXlisted") is None
+    assert failing.get_stats()['request_errors'] == 1
+    print("✅ Request failures are reported as None")
+
+def test_listed_results_reused():
+    """A listed mint asked again right away is answered from the last batch"""
+    upstream = FakeDexScreener()
+    client = DexScreenerBatchClient(fetch_batch=upstream)
+    client.lookup("Mint1listed")
+    client.lookup("Mint1listed")
+    client.lookup("Mint2new")
+    client.lookup("Mint2new")
+    assert len(upstream.batches) == 3
+    print("✅ Listed results reused; unlisted mints are asked again")
+
+if __name__ == "__main__":
+    test_lookups_are_batched()
+    test_async_backlog_and_errors()
+    test_listed_results_reused()
+    print("\n✅ ALL DEXSCREENER BATCH TESTS PASSED")
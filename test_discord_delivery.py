@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test the Discord delivery engine - producers never block, keyword matches jump
+status messages, and Discord's rate-limit headers drive the buckets
+"""
+
+import time
+import asyncio
+
+from background_event_loop import BackgroundEventLoop
+from discord_delivery import Delivery, DiscordDeliveryEngine, PRIORITY_MATCH, PRIORITY_STATUS
+from rate_limit import TokenBucket
+
+class FakeDiscord:
+    """Transport answering from a script of (status, headers) responses"""
+
+    def __init__(self, responses=None, delay=0.0):
+        self.responses = list(responses or [])
+        self.delay = delay
+        self.posts = []
+
+    async def __call__(self, url, payload, timeout):
+        await asyncio.sleep(self.delay)
+        self.posts.append((url, payload.get('content'), time.monotonic()))
+        if self.responses:
+            status, headers = self.responses.pop(0)
+            return status, headers, ''
+        return 204, {}, ''
+
+def test_producers_never_block():
+    """A burst is queued instantly and delivered at the bucket's rate, not 1/s"""
+    print("🧪 TESTING DISCORD DELIVERY ENGINE")
+    print("=" * 50)
+
+    service = BackgroundEventLoop(name="test-discord-delivery")
+    discord = FakeDiscord()
+    engine = DiscordDeliveryEngine(loop_service=service, transport=discord)
+
+    started = time.monotonic()
+    futures = [engine.send("https://hook/a", {'content': f"match {i}"}) for i in range(8)]
+    assert time.monotonic() - started < 0.5
+    print("✅ 8 sends queued without blocking the producer")
+
+    assert all(future.result(timeout=10) for future in futures)
+    elapsed = time.monotonic() - started
+    # 5 burst + 3 at 2.5/s ≈ 1.2s (a flat 1s gap would take 7s)
+    assert elapsed < 3.0, elapsed
+    assert [content for _, content, _ in discord.posts] == [f"match {i}" for i in range(8)]
+    print(f"✅ Delivered in order in {elapsed:.2f}s")
+
+    stats = engine.get_stats()
+    assert stats['sent'] == 8 and stats['bucket_waits'] > 0
+    service.stop()
+
+def test_priority_lanes():
+    """Queued keyword matches go out before queued status messages"""
+    service = BackgroundEventLoop(name="test-discord-priority")
+    discord = FakeDiscord(delay=0.05)
+    engine = DiscordDeliveryEngine(loop_service=service, transport=discord)
+
+    first = engine.send("https://hook/a", {'content': "status 0"}, priority=PRIORITY_STATUS)
+    time.sleep(0.01)
+    later = [engine.send("https://hook/a", {'content': "status 1"}, priority=PRIORITY_STATUS),
+             engine.send("https://hook/a", {'content': "match"}, priority=PRIORITY_MATCH)]
+    for future in [first] + later:
+        assert future.result(timeout=10)
+
+    order = [content for _, content, _ in discord.posts]
+    assert order == ["status 0", "match", "status 1"], order
+    print("✅ Keyword match overtook a queued status message")
+    service.stop()
+
+def test_rate_limit_headers():
+    """Retry-After holds the destination; exhausted buckets wait for Reset-After"""
+    service = BackgroundEventLoop(name="test-discord-ratelimit")
+    discord = FakeDiscord(responses=[
+        (429, {'Retry-After': '0.3'}),
+        (204, {'X-RateLimit-Limit': '5', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '0.4'}),
+        (204, {}),
+    ])
+    engine = DiscordDeliveryEngine(loop_service=service, transport=discord)
+
+    assert engine.send("https://hook/a", {'content': "one"}).result(timeout=10)
+    assert engine.send("https://hook/a", {'content': "two"}).result(timeout=10)
+    times = [posted for _, _, posted in discord.posts]
+    assert times[1] - times[0] >= 0.28
+    print("✅ 429 Retry-After respected before resending")
+    assert times[2] - times[1] >= 0.38
+    print("✅ X-RateLimit-Remaining: 0 held the next message until reset")
+    assert engine.get_stats()['rate_limited'] == 1
+
+    bad = FakeDiscord(responses=[(400, {})])
+    engine.transport = bad
+    assert engine.send("https://hook/b", {'content': "broken"}).result(timeout=10) is False
+    assert len(bad.posts) == 1
+    print("✅ Rejected payloads are not retried")
+    service.stop()
+
+def test_token_bucket():
+    bucket = TokenBucket(2, 1.0)
+    now = time.monotonic()
+    bucket.consume(now)
+    bucket.consume(now)
+    assert abs(bucket.wait_time(now) - 1.0) < 1e-6
+    bucket.block(5.0, now)
+    assert bucket.wait_time(now + 2) >= 3.0 - 1e-6
+    print("✅ Token bucket refills and honours blocks")
+
+def test_channel_bucket():
+    """Every delivery is held to a channel limit; webhooks sharing a channel share it"""
+    engine = DiscordDeliveryEngine(loop_service=BackgroundEventLoop(name="test-discord-channel"),
+                                   transport=FakeDiscord())
+    own_a, own_b = (engine._buckets_for(Delivery(url, {}, PRIORITY_MATCH, None, ""))[2]
+                    for url in ("https://hook/a", "https://hook/b"))
+    assert own_a is not own_b and own_a.capacity == 30
+    shared_a, shared_b = (engine._buckets_for(Delivery(url, {}, PRIORITY_MATCH, "123", ""))[2]
+                          for url in ("https://hook/a", "https://hook/b"))
+    assert shared_a is shared_b and shared_a is not own_a
+    print("✅ Channel bucket applied per webhook, shared when the channel is named")
+
+if __name__ == "__main__":
+    test_producers_never_block()
+    test_priority_lanes()
+    test_rate_limit_headers()
+    test_token_bucket()
+    test_channel_bucket()
+    print("\n✅ ALL DISCORD DELIVERY TESTS PASSED")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test hedged name resolution - staggered starts, first confident answer wins,
+losers cancelled, scoreboard reorders sources
+"""
+
+import asyncio
+
+from hedged_resolver import HedgedResolver, SourceScoreboard
+
+def make_source(delay, name, log, cancelled):
+    async def source(key):
+        log.append(key)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(name or 'none')
+            raise
+        return name
+    return source
+
+def test_first_confident_answer_wins():
+    """A slow first source is hedged; the faster confident answer wins"""
+    print("🧪 TESTING HEDGED RESOLVER")
+    print("=" * 50)
+
+    async def run():
+        log, cancelled = [], []
+        resolver = HedgedResolver(
+            {
+                'slow': make_source(1.0, 'Slow Name', log, cancelled),
+                'fast': make_source(0.01, 'Fast Name', log, cancelled),
+                'never': make_source(1.0, None, log, cancelled),
+            },
+            confidences={'slow': 0.95, 'fast': 0.9, 'never': 0.85},
+            hedge_delays=(0.0, 0.05, 0.5),
+        )
+        result = await resolver.resolve('TokenAddress1')
+        return result, cancelled, resolver
+
+    result, cancelled, resolver = asyncio.run(run())
+    assert result.name == 'Fast Name' and result.source == 'fast'
+    assert result.attempted == ['slow', 'fast']  # third hedge never launched
+    assert cancelled == ['Slow Name']
+    assert result.latency < 0.5
+    print(f"✅ '{result.name}' from {result.source} in {result.latency:.2f}s, slow source cancelled")
+
+    stats = resolver.get_stats()
+    assert stats['fast']['wins'] == 1 and stats['slow']['cancellations'] == 1
+    print("✅ Win and cancellation recorded per source")
+
+def test_failure_launches_next_hedge_early():
+    """If everything in flight fails, the next source starts without waiting for its delay"""
+    async def run():
+        log, cancelled = [], []
+        resolver = HedgedResolver(
+            {
+                'broken': make_source(0.0, None, log, cancelled),
+                'backup': make_source(0.0, 'Backup Name', log, cancelled),
+            },
+            confidences={'broken': 0.95, 'backup': 0.9},
+            hedge_delays=(0.0, 5.0),
+        )
+        return await resolver.resolve('TokenAddress2')
+
+    result = asyncio.run(run())
+    assert result.name == 'Backup Name' and result.latency < 1.0
+    print(f"✅ Backup launched immediately after failure ({result.latency:.3f}s)")
+
+def test_low_confidence_fallback_and_ranking():
+    """Low-confidence answers are used only when nothing better arrives"""
+    async def run():
+        log, cancelled = [], []
+        resolver = HedgedResolver(
+            {'page': make_source(0.0, 'Page Title', log, cancelled), 'api': make_source(0.01, None, log, cancelled)},
+            confidences={'page': 0.6, 'api': 0.95},
+            hedge_delays=(0.0, 0.0),
+        )
+        return await resolver.resolve('TokenAddress3')
+
+    result = asyncio.run(run())
+    assert result.name == 'Page Title' and result.confidence == 0.6
+    print("✅ Low-confidence answer returned as fallback")
+
+    scoreboard = SourceScoreboard()
+    for _ in range(10):
+        scoreboard.record('a', False, 2.0)
+        scoreboard.record('b', True, 0.2)
+    assert scoreboard.rank(['a', 'b', 'c'], priors={'a': 0.9, 'b': 0.9, 'c': 0.5}) == ['b', 'c', 'a']
+    print("✅ Ranking adapts to observed success and latency")
+
+if __name__ == "__main__":
+    test_first_confident_answer_wins()
+    test_failure_launches_next_hedge_early()
+    test_low_confidence_fallback_and_ranking()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test compiled keyword automaton against the original per-keyword substring loop
+"""
+
+from keyword_automaton import KeywordAutomaton
+
+def legacy_first_match(keywords, name, symbol):
+    """Original AlchemyMonitoringServer.check_token_keywords loop"""
+    name_lower = name.lower() if name else ""
+    symbol_lower = symbol.lower() if symbol else ""
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+        if (keyword_lower == name_lower or keyword_lower == symbol_lower or
+            keyword_lower in name_lower or keyword_lower in symbol_lower):
+            return keyword
+    return ""
+
+def test_keyword_automaton():
+    """Automaton must return the same keyword the legacy loop returned"""
+    print("🧪 TESTING KEYWORD AUTOMATON")
+    print("=" * 50)
+
+    keywords = ["Trump", "moon", "Doge", "big leagues", "he", "hers", "she", "PEPE", "cat", "catalyst"]
+    automaton = KeywordAutomaton(keywords)
+
+    cases = [
+        ("Big Leagues", "BL"),
+        ("Ushers Moon", "USH"),
+        ("Catalyst Protocol", "CAT"),
+        ("Nothing to see", "NTS"),
+        ("", "pepe"),
+        ("TRUMPDOGE", ""),
+    ]
+
+    for name, symbol in cases:
+        expected = legacy_first_match(keywords, name, symbol)
+        actual = automaton.first_match(name, symbol)
+        status = "✅" if actual == expected else "❌"
+        print(f"{status} '{name}' / '{symbol}' → '{actual}' (legacy: '{expected}')")
+        assert actual == expected
+
+    all_matches = automaton.match_all("Ushers Moon", "USH")
+    print(f"✅ All matches for 'Ushers Moon': {all_matches}")
+    assert all_matches == ["moon", "he", "hers", "she"]
+
+    empty = KeywordAutomaton([])
+    assert not empty and empty.first_match("anything", "ANY") == ""
+    print("✅ Empty automaton matches nothing")
+
+if __name__ == "__main__":
+    test_keyword_automaton()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test keyword change propagation - writers NOTIFY inside their transaction,
+the listener fans deltas out and matchers patch their index without reloading
+"""
+
+import json
+import time
+import socket
+
+from keyword_events import (KeywordChangeListener, publish_keyword_change, parse_keyword_event,
+                            apply_keyword_event, keyword_event, KEYWORD_CHANNEL, OP_ADD, OP_REMOVE,
+                            OP_CLEAR, OP_RELOAD, SCOPE_ATTRIBUTION)
+
+class RecordingCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+
+    def close(self):
+        pass
+
+class FailingNotifyCursor(RecordingCursor):
+    def execute(self, query, params=None):
+        super().execute(query, params)
+        if "pg_notify" in query:
+            raise RuntimeError("payload string too long")
+
+class Notify:
+    def __init__(self, payload):
+        self.channel = KEYWORD_CHANNEL
+        self.payload = payload
+
+class FakeListenConnection:
+    """Readable through a socketpair like a real psycopg2 connection"""
+
+    def __init__(self):
+        self.reader, self.writer = socket.socketpair()
+        self.notifies = []
+        self.incoming = []
+        self.cursor_obj = RecordingCursor()
+        self.broken = False
+
+    def fileno(self):
+        return self.reader.fileno()
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def push(self, payload):
+        self.incoming.append(Notify(payload))
+        self.writer.send(b"!")
+
+    def break_connection(self):
+        self.broken = True
+        self.writer.send(b"!")
+
+    def poll(self):
+        self.reader.recv(1024)
+        if self.broken:
+            raise OSError("server closed the connection unexpectedly")
+        self.notifies.extend(self.incoming)
+        self.incoming = []
+
+    def close(self):
+        self.reader.close()
+        self.writer.close()
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+def test_publish_and_parse():
+    """Changes go out as pg_notify on the writer's own transaction"""
+    print("🧪 TESTING KEYWORD EVENTS")
+    print("=" * 50)
+
+    cursor = RecordingCursor()
+    assert publish_keyword_change(cursor, OP_ADD, " Moon Cat ", "42")
+    assert [query for query, _ in cursor.statements][::2] == ["SAVEPOINT keyword_event",
+                                                               "RELEASE SAVEPOINT keyword_event"]
+    query, (channel, payload) = cursor.statements[1]
+    assert "pg_notify" in query and channel == KEYWORD_CHANNEL
+    event = parse_keyword_event(payload)
+    assert event['op'] == OP_ADD and event['keyword'] == "Moon Cat" and event['user_id'] == "42"
+    print("✅ add published with pg_notify and parsed back")
+
+    failing = FailingNotifyCursor()
+    assert publish_keyword_change(failing, OP_REMOVE, "moon", "42") is False
+    assert failing.statements[-1][0] == "ROLLBACK TO SAVEPOINT keyword_event"
+    print("✅ Failed notify rolled back to its savepoint - the writer's transaction survives")
+
+    assert parse_keyword_event("not json") is None
+    assert parse_keyword_event(json.dumps({'op': 'add'})) is None
+    assert parse_keyword_event(json.dumps({'op': 'explode', 'keyword': 'x'})) is None
+    print("✅ Malformed payloads ignored")
+
+    keywords = ["Moon", "Dog"]
+    assert apply_keyword_event(keywords, keyword_event(OP_ADD, "Cat")) == ["Moon", "Dog", "Cat"]
+    assert apply_keyword_event(keywords, keyword_event(OP_ADD, "moon")) == ["Dog", "moon"]
+    assert apply_keyword_event(keywords, keyword_event(OP_REMOVE, "MOON")) == ["Dog"]
+    assert apply_keyword_event(keywords, keyword_event(OP_CLEAR)) == []
+    assert apply_keyword_event(keywords, keyword_event(OP_RELOAD)) is None
+    assert keywords == ["Moon", "Dog"]
+    print("✅ Deltas produce new lists and never mutate the current one")
+
+def test_listener_delivers_and_resyncs():
+    """Notifications reach subscribers in milliseconds; every connect triggers one reload"""
+    connections = []
+    def connect(url):
+        connections.append(FakeListenConnection())
+        return connections[-1]
+
+    listener = KeywordChangeListener("postgresql://test", connect=connect, reconnect_delay=0.01)
+    received = []
+    listener.subscribe(received.append)
+    assert wait_for(listener.connected.is_set)
+    assert connections[0].cursor_obj.statements[0][0] == f"LISTEN {KEYWORD_CHANNEL}"
+    assert wait_for(lambda: len(received) == 1)
+    assert received[0]['op'] == OP_RELOAD and received[0]['scope'] is None
+    print("✅ First LISTEN asks subscribers to resync (covers changes before it took effect)")
+
+    started = time.time()
+    connections[0].push(json.dumps(keyword_event(OP_ADD, "pepe", "7")))
+    assert wait_for(lambda: len(received) == 2)
+    assert received[1]['keyword'] == "pepe"
+    print(f"✅ Delta delivered in {(time.time() - started) * 1000:.1f}ms")
+
+    connections[0].break_connection()
+    assert wait_for(lambda: len(connections) == 2 and len(received) == 3)
+    assert received[2]['op'] == OP_RELOAD and received[2]['scope'] is None
+    assert listener.get_stats()['disconnects'] == 1
+    print("✅ Reconnected and asked subscribers to resync once")
+    listener.stop()
+
+def test_matcher_applies_deltas_without_reload():
+    """IntegratedTokenMonitor patches its per-user index from pushed events"""
+    from main import IntegratedTokenMonitor
+    from keyword_snapshot import KeywordSnapshotStore
+
+    monitor = IntegratedTokenMonitor.__new__(IntegratedTokenMonitor)
+    monitor.keyword_snapshots = KeywordSnapshotStore({"1": ["moon"], "2": ["dog"]})
+    monitor.last_keyword_refresh = time.time()
+    monitor.get_db_connection = lambda: (_ for _ in ()).throw(AssertionError("full reload attempted"))
+    before = monitor.user_keywords
+
+    monitor.on_keyword_change(keyword_event(OP_ADD, "Pepe", "2"))
+    assert monitor.keyword_index.match("pepe coin") == [("2", "pepe")]
+    assert dict(before) == {"1": ("moon",), "2": ("dog",)}
+    print("✅ Added keyword matches immediately, previous map untouched")
+
+    monitor.on_keyword_change(keyword_event(OP_REMOVE, "moon"))
+    assert dict(monitor.user_keywords) == {"2": ("dog", "pepe")}
+    monitor.on_keyword_change(keyword_event(OP_ADD, "moon", scope=SCOPE_ATTRIBUTION))
+    assert "1" not in monitor.user_keywords
+    print("✅ Global removal applied; keyword_attribution events ignored by the per-user index")
+
+    monitor.on_keyword_change(keyword_event(OP_RELOAD, scope=None))
+    assert monitor.last_keyword_refresh == 0
+    print("✅ reload schedules a full refresh instead of guessing")
+
+def test_stale_full_reload_does_not_overwrite_delta():
+    """A full reload that read the table before a delta landed is discarded and retried"""
+    from main import IntegratedTokenMonitor
+    from keyword_snapshot import KeywordSnapshotStore
+
+    monitor = IntegratedTokenMonitor.__new__(IntegratedTokenMonitor)
+    monitor.keyword_snapshots = KeywordSnapshotStore({"1": ["moon"]})
+    monitor.last_keyword_refresh = 0
+    monitor.keyword_listener = KeywordChangeListener(None)
+    rows = [[("1", "moon")], [("1", "moon"), ("1", "pepe")]]
+
+    class ReadCursor:
+        def execute(self, query, params=None):
+            # The delta commits and is pushed while the first read is in flight
+            if len(rows) == 2:
+                monitor.on_keyword_change(keyword_event(OP_ADD, "pepe", "1"))
+            self.rows = rows.pop(0)
+
+        def fetchall(self):
+            return self.rows
+
+        def close(self):
+            pass
+
+    class ReadConnection:
+        def cursor(self):
+            return ReadCursor()
+
+        def close(self):
+            pass
+
+    monitor.get_db_connection = ReadConnection
+    monitor.refresh_keywords()
+    assert dict(monitor.user_keywords) == {"1": ("moon", "pepe")}
+    assert monitor.last_keyword_refresh == 0
+    assert monitor.keyword_snapshots.get_stats()['stale_discarded'] == 1
+    print("✅ Stale full reload discarded - the newer delta survives")
+
+    monitor.refresh_keywords()
+    assert dict(monitor.user_keywords) == {"1": ("moon", "pepe")}
+    assert monitor.last_keyword_refresh > 0
+    print("✅ Retried reload published once nothing raced it")
+
+if __name__ == "__main__":
+    test_publish_and_parse()
+    test_listener_delivers_and_resyncs()
+    test_matcher_applies_deltas_without_reload()
+    test_stale_full_reload_does_not_overwrite_delta()
+    print("\n✅ ALL KEYWORD EVENTS TESTS PASSED")
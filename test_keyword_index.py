@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test inverted keyword index against IntegratedTokenMonitor's per-keyword matching rules
+"""
+
+import re
+from keyword_index import KeywordIndex
+
+def legacy_is_keyword_match(token_name: str, keyword: str) -> bool:
+    """Copy of IntegratedTokenMonitor.is_keyword_match (main.py)"""
+    if keyword.lower() == token_name.lower():
+        return True
+    if len(keyword.split()) == 1:
+        pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
+        if re.search(pattern, token_name.lower()):
+            return True
+    else:
+        if keyword.lower() in token_name.lower():
+            return True
+        token_words = set(word.lower() for word in token_name.split() if len(word) > 1)
+        keyword_words = set(word.lower() for word in keyword.split() if len(word) > 1)
+        if len(token_name.strip()) <= 2:
+            return False
+        if keyword_words and keyword_words.issubset(token_words):
+            return True
+        if len(keyword_words) > 2 and len(token_name.split()) >= 2:
+            overlap = len(token_words.intersection(keyword_words))
+            if overlap / len(keyword_words) >= 0.8:
+                return True
+    return False
+
+def test_keyword_index():
+    """Index must produce exactly the matches of the legacy per-user loop"""
+    print("🧪 TESTING KEYWORD INDEX")
+    print("=" * 50)
+
+    user_keywords = {
+        '111': ['love', 'big leagues', 'moon', '$doge'],
+        '222': ['moon', 'make america great again', 'cat'],
+        '333': ['to the moon', 'pepe2.0', 'x ai'],
+    }
+    index = KeywordIndex(user_keywords)
+    print(f"✅ Indexed {len(index)} postings for {index.user_count} users")
+
+    token_names = [
+        "glove", "love coin", "big leagues", "leagues big", "moonshot", "moon",
+        "make america great", "make great america again now", "the moon to",
+        "$doge", "pepe2.0 token", "x ai", "ai x", "catalyst", "cat",
+    ]
+
+    for token_name in token_names:
+        name = token_name.lower().strip()
+        expected = [(user_id, keyword)
+                    for user_id, keywords in user_keywords.items()
+                    for keyword in keywords
+                    if legacy_is_keyword_match(name, keyword)]
+        actual = index.match(name)
+        status = "✅" if actual == expected else "❌"
+        print(f"{status} '{token_name}' → {actual}")
+        assert actual == expected
+
+if __name__ == "__main__":
+    test_keyword_index()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test versioned keyword snapshots - readers always see one consistent keyword
+set while writers publish new versions, and matches record their version
+"""
+
+import threading
+
+from keyword_snapshot import KeywordSnapshotStore
+
+def test_snapshot_contents_and_versions():
+    """Lookup, ownership and index come from the same map; every publish bumps the version"""
+    print("🧪 TESTING KEYWORD SNAPSHOTS")
+    print("=" * 50)
+
+    store = KeywordSnapshotStore({"1": ["Moon", "dog"], "2": ["moon"]})
+    snapshot = store.current
+    assert snapshot.version == 0
+    assert snapshot.keywords == ("Moon", "dog")
+    assert snapshot.lookup["moon"] == "Moon"
+    assert snapshot.owners_of("MOON") == ("1", "2")
+    assert snapshot.index.match("moon dog") == [("1", "Moon"), ("1", "dog"), ("2", "moon")]
+    print("✅ Original case, owners and per-user index built together")
+
+    try:
+        snapshot.user_keywords["3"] = ("cat",)
+        assert False, "snapshot map should be read-only"
+    except TypeError:
+        pass
+
+    published = store.publish({"1": ["cat"]})
+    assert published.version == 1 and store.current is published
+    assert snapshot.keywords == ("Moon", "dog")
+    assert store.update(lambda current: None) is published
+    assert store.update(lambda current: dict(current.user_keywords, **{"2": ["pepe"]})).version == 2
+    assert store.current.owners_of("pepe") == ("2",)
+    print("✅ Publishing swaps in a new version; older snapshots are untouched")
+
+def test_concurrent_readers_see_consistent_snapshots():
+    """Readers racing a writer never see an automaton from one version and a lookup from another"""
+    store = KeywordSnapshotStore({"System": ["kw0"]})
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            snapshot = store.current
+            expected = f"kw{snapshot.version}"
+            if snapshot.automaton.match_all(f"token {expected}") != [expected] or expected not in snapshot.lookup:
+                errors.append(snapshot.version)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for version in range(1, 200):
+        store.publish({"System": [f"kw{version}"]})
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors, errors[:5]
+    assert store.get_stats()['version'] == 199
+    print("✅ 199 publishes raced by 4 readers without a torn snapshot")
+
+def test_matches_record_snapshot_version():
+    """IntegratedTokenMonitor tags every match with the version it was matched against"""
+    from main import IntegratedTokenMonitor
+
+    monitor = IntegratedTokenMonitor.__new__(IntegratedTokenMonitor)
+    monitor.keyword_snapshots = KeywordSnapshotStore()
+    monitor.publish_keywords({"1": ["pepe"]})
+    monitor.publish_keywords({"1": ["pepe"], "2": ["pepe"]})
+
+    matches = monitor.check_keyword_matches("Pepe Coin", "Mint111bonk")
+    assert [match['user_id'] for match in matches] == ["1", "2"]
+    assert {match['keyword_snapshot_version'] for match in matches} == {2}
+    print("✅ Matches carry the keyword snapshot version")
+
+if __name__ == "__main__":
+    test_snapshot_contents_and_versions()
+    test_concurrent_readers_see_consistent_snapshots()
+    test_matches_record_snapshot_version()
+    print("\n✅ ALL KEYWORD SNAPSHOT TESTS PASSED")
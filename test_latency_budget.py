@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test per-token latency budgets - steps run only when they fit, deferred
+steps still report, and declared costs give way to observed latency
+"""
+
+import time
+from concurrent.futures import Future
+
+from latency_budget import BudgetedValidator, LatencyBudget, time_since_ingest, token_budget
+
+def test_steps_fit_or_skip():
+    """A step runs only if its expected cost fits the remaining budget"""
+    print("🧪 TESTING LATENCY BUDGET")
+    print("=" * 50)
+
+    token = {'address': 'Mint1bonk'}
+    budget = token_budget(token, 1.0)
+    assert 'deadline' in token and token_budget(token, 99.0).deadline == budget.deadline
+    assert 0 <= time_since_ingest(token) < 1.0 and time_since_ingest({'address': 'Mint2bonk'}) is None
+    print("✅ Deadline and ingest time set once at ingestion")
+
+    validator = BudgetedValidator()
+    validator.register('cheap', 0.1)
+    validator.register('slow', 3.0)
+    assert validator.run('cheap', budget, lambda: 'ok') == (True, 'ok')
+    assert validator.run('slow', budget, lambda: 'never') == (False, None)
+    stats = validator.get_stats()
+    assert stats['cheap']['runs'] == 1 and stats['slow']['skipped'] == 1
+    print("✅ Cheap step ran, slow step skipped and counted")
+
+    expired = LatencyBudget(time.monotonic() - 1)
+    validator.note_deadline(expired)
+    assert validator.get_stats()['tokens_past_deadline'] == 1
+    print("✅ Tokens past their deadline are counted")
+
+def test_defer_and_learned_cost():
+    """Deferred steps record latency on completion; observed p95 replaces the declared cost"""
+    validator = BudgetedValidator()
+    step = validator.register('consensus', 3.0)
+
+    future = Future()
+    assert validator.defer('consensus', lambda: future) is future
+    future.set_result({'valid_sources': 1})
+    validator.overturned('consensus')
+    stats = validator.get_stats()['consensus']
+    assert stats['deferred'] == 1 and stats['runs'] == 1 and stats['overturned'] == 1
+    print("✅ Deferred run recorded on completion")
+
+    for _ in range(20):
+        step.latency.record(0.04)
+    assert step.expected_cost() == 0.05
+    assert validator.fits('consensus', LatencyBudget(time.monotonic() + 0.5))
+    print("✅ Observed p95 (50ms) replaces the declared 3s cost")
+
+if __name__ == "__main__":
+    test_steps_fit_or_skip()
+    test_defer_and_learned_cost()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the shared market-data service - concurrent lookups collapse onto one
+upstream call, cache lifetimes follow token age, and too_new is cached briefly
+"""
+
+import time
+import asyncio
+import threading
+
+import market_data_service
+from market_data_service import MarketDataService, freshness_ttl, parse_dexscreener_pairs
+
+PAIR = {'baseToken': {'name': 'Moon Cat', 'symbol': 'MCAT'}, 'priceUsd': '0.0001',
+        'marketCap': 42000, 'volume': {'h24': 900}, 'liquidity': {'usd': 5000}, 'priceChange': {'h24': 12}}
+
+class SlowUpstream:
+    def __init__(self, result, delay=0.2):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, address):
+        self.calls += 1
+        time.sleep(self.delay)
+        return dict(self.result)
+
+def test_single_flight():
+    """Threads and coroutines asking for one mint share a single upstream call"""
+    print("🧪 TESTING MARKET DATA SERVICE")
+    print("=" * 50)
+
+    upstream = SlowUpstream(parse_dexscreener_pairs([PAIR]))
+    service = MarketDataService(fetcher=upstream)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.get("Mint111pump"))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+
+    async def from_coroutines():
+        return await asyncio.gather(*[service.get_async("Mint111pump") for _ in range(5)])
+    results.extend(asyncio.run(from_coroutines()))
+    for thread in threads:
+        thread.join()
+
+    assert upstream.calls == 1
+    assert len(results) == 15 and all(result['market_cap'] == 42000.0 for result in results)
+    stats = service.get_stats()
+    assert stats['collapsed'] + stats['hits'] == 14 and stats['hit_rate'] > 0.9
+    print(f"✅ 15 concurrent requests → 1 upstream call (hit rate {stats['hit_rate']:.0%})")
+
+def test_freshness_tiers_and_negative_cache():
+    """Just-launched tokens expire in seconds; too_new is cached but briefly"""
+    assert freshness_ttl(10) < freshness_ttl(300) < freshness_ttl(1800) < freshness_ttl(86400)
+    assert freshness_ttl(None) == market_data_service.UNKNOWN_AGE_TTL
+    print("✅ Cache lifetime grows with token age")
+
+    upstream = SlowUpstream({'status': 'too_new'}, delay=0)
+    service = MarketDataService(fetcher=upstream)
+    assert service.get("Mint222bonk", token_age=3)['status'] == 'too_new'
+    assert service.get("Mint222bonk", token_age=3)['status'] == 'too_new'
+    assert upstream.calls == 1 and service.get_stats()['negative_hits'] == 1
+    print("✅ too_new answers are negatively cached")
+
+    upstream.result = {'status': 'api_error'}
+    service.invalidate("Mint222bonk")
+    service.get("Mint222bonk")
+    service.get("Mint222bonk")
+    assert upstream.calls == 3
+    print("✅ Transient API errors are not cached")
+
+    upstream.result = parse_dexscreener_pairs([PAIR])
+    service.get("Mint333pump", token_age=5)
+    expires = service._cache["Mint333pump"][1] - time.monotonic()
+    assert expires <= freshness_ttl(5)
+    print("✅ Just-launched token cached for seconds, not minutes")
+
+def test_short_timeout_still_fills_cache():
+    """A notification-path caller gives up quickly; the fetch finishes for the next one"""
+    upstream = SlowUpstream(parse_dexscreener_pairs([PAIR]), delay=0.2)
+    service = MarketDataService(fetcher=upstream)
+
+    assert service.get("Mint444pump", timeout=0.01) == {'status': 'timeout'}
+    time.sleep(0.3)
+    assert service.peek("Mint444pump")['market_cap'] == 42000.0
+    assert service.get("Mint444pump", timeout=0.01)['market_cap'] == 42000.0
+    assert upstream.calls == 1
+    print("✅ Timed-out lookup lands in the cache for the next caller")
+
+if __name__ == "__main__":
+    test_single_flight()
+    test_freshness_tiers_and_negative_cache()
+    test_short_timeout_still_fills_cache()
+    print("\n✅ ALL MARKET DATA SERVICE TESTS PASSED")
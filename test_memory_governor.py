@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the memory governor - per-cache byte metrics, incremental oldest-first
+eviction from the cheapest caches only under pressure, and GC tuning
+"""
+
+import gc
+import time
+from collections import OrderedDict
+
+from compact_seen_set import CompactSeenSet
+from market_data_service import MarketDataService
+from memory_governor import MemoryGovernor, estimate_bytes
+
+def test_metrics_per_cache():
+    """Every registered cache reports bytes and entries; fixed-memory sets are not evictable"""
+    print("🧪 TESTING MEMORY GOVERNOR")
+    print("=" * 50)
+
+    governor = MemoryGovernor(budget_bytes=10 * 1024 * 1024)
+    seen = CompactSeenSet(capacity=1000, name='seen_tokens')
+    seen.update(f'mint-{index}' for index in range(10))
+    prices = {f'mint-{index}': ({'price_usd': index}, time.monotonic() + 60) for index in range(100)}
+    governor.register('seen_tokens', seen)
+    governor.register('prices', prices)
+
+    stats = governor.get_stats()
+    assert stats['caches']['seen_tokens']['bytes'] == seen.memory_bytes
+    assert stats['caches']['seen_tokens']['evictable'] is False
+    assert stats['caches']['prices']['entries'] == 100 and stats['caches']['prices']['evictable'] is True
+    assert stats['caches']['prices']['bytes'] == estimate_bytes(prices) > 100 * 100
+    assert stats['tracked_bytes'] == seen.memory_bytes + estimate_bytes(prices)
+    assert 'thresholds' in stats['gc']
+    print(f"✅ {stats['tracked_bytes']} bytes tracked across {len(stats['caches'])} caches")
+
+def test_incremental_eviction_under_pressure():
+    """Over budget, the cheapest-per-byte cache loses its oldest entries a step at a time"""
+    cheap = OrderedDict((f'cheap-{index}', 'x' * 200) for index in range(500))
+    valuable = OrderedDict((f'valuable-{index}', 'x' * 200) for index in range(500))
+    seen = CompactSeenSet(capacity=1000, name='seen_tokens')
+    seen.add('MintStillSeen')
+
+    governor = MemoryGovernor(budget_bytes=10 ** 9)
+    governor.register('cheap', cheap, value=1.0)
+    governor.register('valuable', valuable, value=10.0)
+    governor.register('seen_tokens', seen)
+    assert governor.enforce() == {} and len(cheap) == 500
+    print("✅ Within budget nothing is evicted")
+
+    total = governor.tracked_bytes()
+    governor.budget_bytes = int(total * 0.9)
+    evicted = governor.enforce()
+
+    assert set(evicted) == {'cheap'} and len(valuable) == 500
+    assert 'cheap-0' not in cheap and 'cheap-499' in cheap
+    assert 0 < evicted['cheap'] < 500
+    assert governor.tracked_bytes() <= governor.budget_bytes * governor.target_ratio
+    assert 'MintStillSeen' in seen
+    stats = governor.get_stats()
+    assert stats['caches']['cheap']['evicted'] == evicted['cheap'] and stats['bytes_reclaimed'] > 0
+    print(f"✅ Evicted {evicted['cheap']} oldest cheap entries; valuable cache and seen set untouched")
+
+    before = len(cheap) + len(valuable)
+    governor.budget_bytes = 10 ** 9
+    forced = governor.enforce(force=True)
+    assert 0 < sum(forced.values()) < before
+    print("✅ Host pressure trims one step even within budget")
+
+def test_market_data_evict_hook():
+    """Market data gives up expired entries first, then the soonest-expiring"""
+    service = MarketDataService(fetcher=lambda address: {'price_usd': 1.0})
+    now = time.monotonic()
+    service._cache = {
+        'expired': ({}, now - 1),
+        'soon': ({}, now + 5),
+        'later': ({}, now + 300),
+    }
+    assert service.evict(2) == 2
+    assert list(service._cache) == ['later'] and len(service) == 1
+    assert service.memory_bytes > 0 and service.get_stats()['evicted'] == 2
+    print("✅ Market data evicts by remaining freshness")
+
+def test_tune_gc_freezes_startup_objects():
+    """tune_gc freezes startup objects and raises the thresholds, once"""
+    previous = gc.get_threshold()
+    governor = MemoryGovernor()
+    try:
+        governor.tune_gc(thresholds=(40000, 20, 20))
+        assert gc.get_threshold() == (40000, 20, 20)
+        assert not hasattr(gc, 'get_freeze_count') or gc.get_freeze_count() > 0
+        governor.tune_gc(thresholds=(700, 10, 10))
+        assert gc.get_threshold() == (40000, 20, 20)
+        assert governor.gc_stats()['tuned'] is True
+        print("✅ GC tuned after startup instead of forced collections")
+    finally:
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        gc.set_threshold(*previous)
+
+if __name__ == "__main__":
+    test_metrics_per_cache()
+    test_incremental_eviction_under_pressure()
+    test_market_data_evict_hook()
+    test_tune_gc_freezes_startup_objects()
+    print("\n✅ ALL MEMORY GOVERNOR TESTS PASSED")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the name retry scheduler - keyword-relevant tokens go first under the
+concurrency cap, misses back off exponentially, availability is learned by age
+"""
+
+import time
+import threading
+
+from background_event_loop import BackgroundEventLoop
+from name_retry_scheduler import NameRetryScheduler, NameAvailabilityModel
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_relevant_tokens_resolved_first():
+    """With one slot, tokens that match an active keyword are tried before the rest"""
+    print("🧪 TESTING NAME RETRY SCHEDULER")
+    print("=" * 50)
+
+    scheduler = NameRetryScheduler(loop_service=BackgroundEventLoop("test-retry"), max_concurrency=1)
+    scheduler.update_keywords(["moon", "token"])
+    order, resolved = [], {}
+
+    async def resolve(address):
+        order.append(address)
+        return f"Real {address}"
+
+    def on_resolved(address, name):
+        resolved[address] = name
+
+    now = time.time()
+    scheduler.schedule("MintPlain1", resolve, on_resolved, created_at=now - 600, hints=("Mystery",),
+                       initial_delay=0.05)
+    scheduler.schedule("MintMatched", resolve, on_resolved, created_at=now - 600, matched_keywords=["Moon"],
+                       initial_delay=0.05)
+    scheduler.schedule("MintPlaceholder", resolve, on_resolved, created_at=now - 600,
+                       hints=("Unnamed Token MintPl",), initial_delay=0.05)
+    scheduler.schedule("MintPlain2", resolve, on_resolved, created_at=now - 5, initial_delay=0.05)
+    assert not scheduler.schedule("MintPlain1", resolve, on_resolved)
+
+    assert wait_for(lambda: len(resolved) == 4)
+    assert set(order[:2]) == {"MintMatched", "MintPlaceholder"}
+    assert order[2:] == ["MintPlain1", "MintPlain2"]
+    print(f"✅ Keyword-relevant first, then older tokens: {order}")
+    assert resolved["MintMatched"] == "Real MintMatched"
+    assert scheduler.get_stats()['duplicates'] == 1
+    print("✅ Duplicate scheduling ignored")
+    scheduler.loop_service.stop()
+
+def test_backoff_and_give_up():
+    """Misses are retried with growing delays, then abandoned after max_attempts"""
+    scheduler = NameRetryScheduler(loop_service=BackgroundEventLoop("test-backoff"), base_delay=0.05,
+                                   max_delay=1.0, max_attempts=3)
+    attempts, abandoned = [], []
+
+    async def never(address):
+        attempts.append(time.monotonic())
+        return "Unnamed Token Mint99"
+
+    scheduler.schedule("Mint99", never, on_abandoned=abandoned.append)
+    assert wait_for(lambda: abandoned == ["Mint99"])
+    assert len(attempts) == 3
+    first_gap, second_gap = attempts[1] - attempts[0], attempts[2] - attempts[1]
+    assert first_gap >= 0.05 and second_gap >= 0.1 and second_gap > first_gap
+    assert scheduler.backoff(1) == 0.05 and scheduler.backoff(10) == 1.0
+    stats = scheduler.get_stats()
+    assert stats['abandoned'] == 1 and stats['pending'] == 0
+    print(f"✅ Backoff {first_gap * 1000:.0f}ms → {second_gap * 1000:.0f}ms, abandoned after 3 attempts")
+    scheduler.loop_service.stop()
+
+def test_concurrency_cap_with_blocking_resolver():
+    """Blocking resolvers run in the executor and never exceed the global cap"""
+    scheduler = NameRetryScheduler(loop_service=BackgroundEventLoop("test-cap"), max_concurrency=2)
+    lock = threading.Lock()
+    running, peak, done, callback_threads = [0], [0], [], set()
+
+    def blocking_lookup(address):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.03)
+        with lock:
+            running[0] -= 1
+        return "Name"
+
+    def on_resolved(address, name):
+        callback_threads.add(threading.current_thread().name)
+        done.append(address)
+
+    for index in range(6):
+        scheduler.schedule(f"Mint{index}", blocking_lookup, on_resolved=on_resolved)
+    assert wait_for(lambda: len(done) == 6)
+    assert peak[0] == 2
+    print("✅ 6 blocking lookups, never more than 2 at once")
+    assert "test-cap" not in callback_threads
+    print("✅ Plain callbacks run off the event loop thread")
+    scheduler.loop_service.stop()
+
+def test_availability_learned_by_age():
+    """Outcomes at a given age move that bucket's estimate"""
+    model = NameAvailabilityModel()
+    young, old = model.availability(10), model.availability(900)
+    assert young < old
+    for _ in range(20):
+        model.record(10, True)
+        model.record(900, False)
+    assert model.availability(10) > young and model.availability(900) < old
+    assert model.availability(10) > model.availability(900)
+    print("✅ Availability by age adapts to observed outcomes")
+
+if __name__ == "__main__":
+    test_relevant_tokens_resolved_first()
+    test_backoff_and_give_up()
+    test_concurrency_cap_with_blocking_resolver()
+    test_availability_learned_by_age()
+    print("\n✅ ALL NAME RETRY SCHEDULER TESTS PASSED")
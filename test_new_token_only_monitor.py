@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the signature cursor - a failed page never advances the cursor past
+unfetched signatures, and signatures whose transaction didn't come back are
+retried on the next poll
+"""
+
+import time
+
+from cachetools import TTLCache
+
+from new_token_only_monitor import NewTokenOnlyMonitor
+from slot_clock import SlotClock
+
+class FakeResponse:
+    def __init__(self, status_code, result=None):
+        self.status_code = status_code
+        self._result = result
+
+    def json(self):
+        return {'result': self._result}
+
+class FakeSession:
+    """Answers getSignaturesForAddress from a script of (status, entries) pages"""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    def post(self, url, json=None, timeout=None):
+        self.requests.append(json['params'][1])
+        status, entries = self.pages.pop(0)
+        return FakeResponse(status, entries)
+
+def entries(*signatures):
+    return [{'signature': signature, 'slot': 100, 'err': None} for signature in signatures]
+
+def make_monitor(pages, page_limit=2):
+    monitor = NewTokenOnlyMonitor.__new__(NewTokenOnlyMonitor)
+    monitor.base_url = "https://rpc"
+    monitor.letsbonk_program_id = "LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj"
+    monitor.monitoring_start_time = time.time() - 60
+    monitor.seen_signatures = TTLCache(maxsize=5000, ttl=300)
+    monitor.session = FakeSession(pages)
+    monitor.slot_clock = SlotClock()
+    monitor.signature_page_limit = page_limit
+    monitor.max_signature_pages = 5
+    monitor.max_transaction_retries = 3
+    monitor.unresolved_signatures = {}
+    monitor.poll_stats = {key: 0 for key in ('polls', 'signatures_seen', 'failed_signatures_skipped',
+                                             'rpc_round_trips', 'batch_fallbacks', 'max_burst',
+                                             'truncated_catchups', 'incomplete_fetches',
+                                             'transaction_retries', 'unresolved_dropped')}
+    monitor.last_known_signature = "Cursor"
+    return monitor
+
+def test_rate_limited_page_keeps_cursor():
+    """Page 2 answering 429 leaves the cursor put; the next poll fetches the gap"""
+    print("🧪 TESTING SIGNATURE CURSOR")
+    print("=" * 50)
+
+    monitor = make_monitor([
+        (200, entries("Sig6", "Sig5")),
+        (429, None),
+        # Next poll re-pages from the same cursor
+        (200, entries("Sig6", "Sig5")),
+        (200, entries("Sig4", "Sig3")),
+        (200, entries("Sig2")),
+    ])
+
+    assert monitor.get_new_signatures() == ["Sig5", "Sig6"]
+    assert monitor.last_known_signature == "Cursor"
+    assert monitor.poll_stats['incomplete_fetches'] == 1
+    print("✅ 429 on page 2: fetched signatures processed, cursor kept")
+
+    assert monitor.get_new_signatures() == ["Sig2", "Sig3", "Sig4"]
+    assert monitor.last_known_signature == "Sig6"
+    assert all(request.get('until') == "Cursor" for request in monitor.session.requests)
+    print("✅ Next poll re-paged from the cursor and filled the gap")
+
+def test_missing_transaction_is_retried():
+    """A signature whose transaction came back None is resolved again next poll"""
+    monitor = make_monitor([(200, entries("Sig1"))])
+    answers = [{'Sig1': None}, {'Sig1': None}]
+    monitor.get_transactions_batch = lambda signatures: answers.pop(0) if answers else {}
+    monitor._is_token_creation_transaction = lambda signature, transaction: False
+
+    assert monitor.poll_new_tokens() == []
+    assert "Sig1" not in monitor.seen_signatures and monitor.unresolved_signatures == {"Sig1": 1}
+
+    monitor.session.pages.append((200, []))
+    assert monitor.poll_new_tokens() == []
+    assert monitor.unresolved_signatures == {"Sig1": 2}
+    print("✅ Empty getTransaction results are retried, not marked seen")
+
+    monitor.unresolved_signatures["Sig1"] = monitor.max_transaction_retries
+    monitor.session.pages.append((200, []))
+    monitor.poll_new_tokens()
+    assert monitor.unresolved_signatures == {} and monitor.poll_stats['unresolved_dropped'] == 1
+    print("✅ Retries are bounded")
+
+if __name__ == "__main__":
+    test_rate_limited_page_keeps_cursor()
+    test_missing_transaction_is_retried()
+    print("\n✅ ALL SIGNATURE CURSOR TESTS PASSED")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test in-memory notification dedup (Bloom filter + LRU) without a database
+"""
+
+import notification_dedup
+from notification_dedup import BloomFilter, NotificationDedup
+
+class FakePool:
+    """Answers the warm queries; on_load runs mid-query like a concurrent notification"""
+
+    def __init__(self, rows, on_load=None):
+        self.rows = rows
+        self.on_load = on_load
+
+    def execute(self, query, params=None, fetch=None):
+        if 'CURRENT_TIMESTAMP' in query and 'token_address' not in query:
+            return ('db-now',)
+        if self.on_load:
+            self.on_load()
+        return list(self.rows)
+
+def test_bloom_filter():
+    """Bloom filter must never produce false negatives"""
+    print("🧪 TESTING BLOOM FILTER")
+    print("=" * 50)
+
+    bloom = BloomFilter(capacity=10000, error_rate=0.001)
+    addresses = [f"Token{i:040d}bonk" for i in range(5000)]
+    for address in addresses:
+        bloom.add(address)
+
+    assert all(address in bloom for address in addresses)
+    print(f"✅ No false negatives for {len(addresses)} addresses")
+
+    false_positives = sum(1 for i in range(10000) if f"Other{i:040d}pump" in bloom)
+    print(f"✅ False positives: {false_positives}/10000 (estimated rate {bloom.estimated_false_positive_rate():.5f})")
+    assert false_positives < 50
+
+def test_claim_without_database():
+    """Claims are decided in memory when no database is configured"""
+    print("\n🧪 TESTING DEDUP CLAIMS")
+    print("=" * 50)
+
+    dedup = NotificationDedup(database_url=None, lru_size=3)
+    dedup.database_url = None  # Force memory-only mode even if DATABASE_URL is set
+
+    assert dedup.claim("AddrA", "Token A", "keyword_match") is True
+    assert dedup.claim("AddrA", "Token A", "keyword_match") is False
+    assert "AddrA" in dedup
+    print("✅ Second claim for the same token is blocked")
+
+    for address in ["AddrB", "AddrC", "AddrD"]:
+        dedup.record(address, address, "keyword_match")
+    assert len(dedup) == 3
+    print("✅ LRU bounded to 3 entries")
+
+    stats = dedup.get_stats()
+    print(f"✅ Stats: {stats['claims_won']} won, {stats['claims_lost']} lost, {stats['pending_writes']} pending writes")
+    assert stats['claims_won'] == 1 and stats['claims_lost'] == 1
+    assert stats['pending_writes'] == 0  # memory-only mode queues nothing
+
+def test_rebuild_swaps_without_a_gap():
+    """Rebuild keeps answering from the old filter and merges unflushed and concurrent marks"""
+    dedup = NotificationDedup(database_url='postgres://test', lru_size=100)
+    dedup.start = lambda: None  # No writer thread - rows stay pending
+    original = notification_dedup.get_db_pool
+    try:
+        notification_dedup.get_db_pool = lambda url: FakePool([('AddrOld', None), ('AddrDb', None)])
+        dedup.warm()
+        dedup.record('AddrPending', 'Pending', 'keyword_match')
+
+        def concurrent_notification():
+            assert dedup.is_notified('AddrOld', confirm_with_db=False)
+            dedup.record('AddrDuring', 'During', 'keyword_match')
+
+        notification_dedup.get_db_pool = lambda url: FakePool([('AddrDb', None)], on_load=concurrent_notification)
+        assert dedup.rebuild() == 1
+    finally:
+        notification_dedup.get_db_pool = original
+
+    for address in ('AddrDb', 'AddrPending', 'AddrDuring'):
+        assert dedup.is_notified(address, confirm_with_db=False)
+    assert not dedup.is_notified('AddrOld', confirm_with_db=False)
+    assert dedup.get_stats()['pending_writes'] == 2
+    print("✅ Rebuild swapped in a fresh filter holding DB, unflushed and concurrent rows")
+
+def test_evict_keeps_unflushed_rows():
+    """Memory-governor eviction never drops an address still waiting for the writer"""
+    dedup = NotificationDedup(database_url='postgres://test', lru_size=100)
+    dedup.start = lambda: None  # No writer thread - rows stay pending
+    dedup.record('AddrPending', 'Pending', 'keyword_match')
+    dedup.add('AddrFlushed')
+
+    assert dedup.evict(2) == 1
+    assert len(dedup) == 1 and 'AddrPending' in dedup._lru
+    assert dedup.evict(1) == 0
+    print("✅ Eviction skips rows the database can't confirm yet")
+
+def test_claims_confirmed_in_database():
+    """With a database every claim is settled by one INSERT, so another process can win"""
+    class ClaimPool:
+        def __init__(self):
+            self.claimed = {'AddrPeer'}
+            self.queries = []
+            self.rows = []
+
+        def execute(self, query, params=None, fetch=None):
+            self.queries.append(query)
+            if params is None:
+                return 0  # Column migration
+            self.rows.append(params)
+            if params[0] in self.claimed:
+                return 0
+            self.claimed.add(params[0])
+            return 1
+
+    dedup = NotificationDedup(database_url='postgres://test')
+    pool = ClaimPool()
+    original = notification_dedup.get_db_pool
+    try:
+        notification_dedup.get_db_pool = lambda url: pool
+        assert dedup.claim('AddrNew', 'New', keyword_snapshot_version=7) is True
+        assert dedup.claim('AddrPeer', 'Peer') is False
+    finally:
+        notification_dedup.get_db_pool = original
+    assert 'ADD COLUMN IF NOT EXISTS keyword_snapshot_version' in pool.queries[0]
+    assert all('ON CONFLICT DO NOTHING' in query for query in pool.queries[1:])
+    print("✅ Peer-claimed token lost without waiting for peer sync")
+    assert pool.rows[0][:4] == ('AddrNew', 'New', 'keyword_match', 7)
+    print("✅ Claimed row stores the keyword snapshot version")
+
+def test_pending_queue_is_capped():
+    """Rows piling up behind a failing writer are capped, oldest dropped"""
+    dedup = NotificationDedup(database_url='postgres://test', max_pending=3)
+    dedup.start = lambda: None  # No writer thread - rows stay pending
+    for index in range(5):
+        dedup.record(f'Addr{index}', f'Token {index}', keyword_snapshot_version=index)
+    stats = dedup.get_stats()
+    assert stats['pending_writes'] == 3 and stats['pending_dropped'] == 2
+    assert [row[0] for row in dedup._pending] == ['Addr2', 'Addr3', 'Addr4']
+    assert [row[3] for row in dedup._pending] == [2, 3, 4]  # Versions ride along to the writer
+    assert dedup.is_notified('Addr0', confirm_with_db=False)
+    print("✅ Write-behind queue bounded; dropped rows still remembered in memory")
+
+if __name__ == "__main__":
+    test_bloom_filter()
+    test_claim_without_database()
+    test_rebuild_swaps_without_a_gap()
+    test_evict_keeps_unflushed_rows()
+    test_claims_confirmed_in_database()
+    test_pending_queue_is_capped()
+    print("\n✅ ALL NOTIFICATION DEDUP TESTS PASSED")
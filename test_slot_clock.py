@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the slot clock - interpolation with bounded error, short extrapolation,
+batched getBlockTime fallback and eviction by slot
+"""
+
+from slot_clock import SlotClock
+
+def test_interpolation_and_extrapolation():
+    """Known slots answer exactly; gaps interpolate with a monotonic error bound"""
+    print("🧪 TESTING SLOT CLOCK")
+    print("=" * 50)
+
+    clock = SlotClock()
+    clock.observe_entries([{'slot': 1000, 'blockTime': 1760000000}, {'slot': 1100, 'blockTime': 1760000040}])
+    assert clock.estimate(1000) == (1760000000.0, 0.0)
+    estimate, error = clock.estimate(1050)
+    assert estimate == 1760000020.0 and error == 20.0
+    print(f"✅ Slot 1050 interpolated to {estimate:.0f} ±{error:.0f}s")
+
+    assert abs(clock.slot_seconds() - 0.4) < 1e-9
+    estimate, error = clock.estimate(1105)
+    assert abs(estimate - 1760000042.0) < 1e-6 and error <= 2.0
+    assert clock.estimate(1100 + 301) is None and clock.estimate(900) is None
+    print("✅ Short extrapolation past the newest slot only")
+
+def test_batched_fallback_and_eviction():
+    """Slots outside the error budget are fetched in one batch, then cached"""
+    calls = []
+
+    def rpc_batch(batch):
+        calls.append(batch)
+        return [1760000000 + slot // 10 for _, (slot,) in batch]
+
+    clock = SlotClock(rpc_batch=rpc_batch, max_error=2.0, max_entries=4)
+    clock.observe(1000, 1760000100)
+    clock.observe(1010, 1760000104)
+
+    results = clock.resolve_many([1005, 5000, 6000])
+    assert results[1005] == (1760000102.0, 2.0)
+    assert calls == [[("getBlockTime", [5000]), ("getBlockTime", [6000])]]
+    assert results[5000] == (1760000500.0, 0.0)
+    print("✅ Local answer within budget, the rest in one getBlockTime batch")
+
+    assert clock.block_time(6000) == 1760000600.0 and len(calls) == 1
+    stats = clock.get_stats()
+    assert stats['exact_hits'] == 1 and stats['interpolated'] == 1 and stats['max_error_served'] == 2.0
+    print("✅ Fetched slots answered from cache afterwards")
+
+    clock.observe(7000, 1760000700)
+    stats = clock.get_stats()
+    assert stats['entries'] == 4 and stats['evicted'] == 1 and clock.estimate(1000) is None
+    print("✅ Oldest slot evicted at capacity")
+
+def test_prefetch_batches_a_poll():
+    """A poll's missing block times cost one batch; per-transaction checks then stay local"""
+    calls = []
+
+    def rpc_batch(batch):
+        calls.append(batch)
+        return [1760000000 + slot // 10 for _, (slot,) in batch]
+
+    clock = SlotClock(rpc_batch=rpc_batch, max_error=2.0)
+    clock.observe(1000, 1760000100)
+    clock.observe(1010, 1760000104)
+
+    assert clock.prefetch([1005, None, 5000, 6000, 5000]) == 2
+    assert calls == [[("getBlockTime", [5000]), ("getBlockTime", [6000])]]
+    assert [clock.block_time(slot) for slot in (1005, 5000, 6000)] == [1760000102.0, 1760000500.0, 1760000600.0]
+    assert len(calls) == 1
+    print("✅ One getBlockTime batch per poll, then local answers")
+
+if __name__ == "__main__":
+    test_interpolation_and_extrapolation()
+    test_batched_fallback_and_eviction()
+    test_prefetch_batches_a_poll()
+    print("\n✅ ALL SLOT CLOCK TESTS PASSED")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test shared source scoring - windowed stats, token-age curves, age-aware
+ranking and retry delays, file persistence
+"""
+
+import os
+import tempfile
+
+from source_scoring import SourceScoringService
+
+def make_service(path=None):
+    return SourceScoringService(state_path=path or os.path.join(tempfile.mkdtemp(), 'scores.json'),
+                                flush_interval=3600)
+
+def train_dexscreener(service):
+    """DexScreener misses tokens under 30s and finds them after"""
+    for age in (2, 5, 8, 12, 15, 18, 22, 25, 28, 29):
+        service.record('dexscreener', False, 0.3, token_age=age)
+    for age in (31, 35, 40, 50, 70, 95, 130, 200, 320, 700):
+        service.record('dexscreener', True, 0.3, token_age=age)
+    for age in (3, 6, 9, 14, 40, 70, 100, 150, 250, 400, 5, 11, 17, 23, 29, 33, 47, 61, 80, 99):
+        service.record('alchemy_metadata', True, 0.8, token_age=age)
+
+def test_windowed_stats_and_age_curve():
+    """Success rate, latency percentiles and per-age buckets"""
+    print("🧪 TESTING SOURCE SCORING")
+    print("=" * 50)
+
+    service = make_service()
+    train_dexscreener(service)
+    assert service.success_rate('dexscreener') == 0.5
+    assert service.latency_percentile('dexscreener', 0.5) == 0.3
+    stats = service.get_stats()
+    assert stats['dexscreener']['attempts'] == 20 and stats['alchemy_metadata']['success_rate'] == 1.0
+    print("✅ Windowed success rate and p50 latency per source")
+
+    assert service.predicted_success('dexscreener', token_age=5) < 0.3
+    assert service.predicted_success('dexscreener', token_age=100) > 0.6
+    print("✅ Token-age curve separates new and indexed tokens")
+
+def test_age_aware_ranking_and_retry_delay():
+    """DexScreener drops back for brand-new tokens; retries wait until it usually knows them"""
+    service = make_service()
+    train_dexscreener(service)
+
+    sources = ['dexscreener', 'alchemy_metadata']
+    assert service.rank(sources, token_age=5) == ['alchemy_metadata', 'dexscreener']
+    assert service.rank(sources, token_age=120) == ['dexscreener', 'alchemy_metadata']
+    print("✅ Ranking depends on token age")
+
+    delay = service.next_retry_delay('dexscreener', token_age=12, attempt=0)
+    assert 17 <= delay <= 19, delay
+    assert service.next_retry_delay('dexscreener', token_age=60, attempt=0) == 0.5
+    print(f"✅ 12s-old token waits {delay:.1f}s for the 30s bucket, older tokens retry quickly")
+
+    cold = make_service()
+    assert cold.next_retry_delay('dexscreener', token_age=12, attempt=2, fallback=[1, 3, 5]) == 5
+    print("✅ Cold start falls back to the fixed schedule")
+
+def test_persistence_round_trip():
+    """Samples survive a restart via the state file"""
+    path = os.path.join(tempfile.mkdtemp(), 'scores.json')
+    service = make_service(path)
+    train_dexscreener(service)
+    service.record('dexscreener', True, 0.2, token_age=90, won=True)
+    assert service.save()
+
+    restored = make_service(path)
+    assert restored.load() == 2
+    assert restored.get_stats()['dexscreener']['wins'] == 1
+    assert restored.rank(['dexscreener', 'alchemy_metadata'], token_age=5)[0] == 'alchemy_metadata'
+    print("✅ Scores restored from disk")
+
+def test_speed_cache_reports_failures_not_cache_hits():
+    """Failures and timeouts are scored; names re-cached from another cache layer are not"""
+    import speed_optimized_cache
+    from speed_optimized_cache import SpeedOptimizedCache
+
+    service = make_service()
+    original = speed_optimized_cache.get_source_scoring
+    speed_optimized_cache.get_source_scoring = lambda: service
+    try:
+        cache = SpeedOptimizedCache()
+        cache.cache_name("Mint1111111111", "Moon", api_source='dexscreener', extraction_time=0.4)
+        cache.cache_name("Mint2222222222", "Dog", api_source='dexscreener', extraction_time=0.0, from_cache=True)
+        cache.record_failure('dexscreener', 0.6)
+        cache.record_failure('dexscreener', 8.0, timed_out=True)
+    finally:
+        speed_optimized_cache.get_source_scoring = original
+
+    stats = service.get_stats()['dexscreener']
+    assert stats['attempts'] == 3 and stats['success_rate'] == 1 / 3
+    assert cache.api_performance['dexscreener']['success_count'] == 1
+    assert cache.get_cached_name("Mint2222222222") == "Dog"
+    print("✅ Speed cache scores failures and timeouts, skips cache hits")
+
+if __name__ == "__main__":
+    test_windowed_stats_and_age_curve()
+    test_age_aware_ranking_and_retry_delay()
+    test_persistence_round_trip()
+    test_speed_cache_reports_failures_not_cache_hits()
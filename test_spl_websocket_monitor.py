@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test LetsBonk logsSubscribe ingestion - log parsing plus a local mock
+WebSocket server for resubscription and gap backfill
+"""
+
+import json
+import asyncio
+import threading
+
+import spl_websocket_monitor
+from spl_websocket_monitor import SPLWebSocketMonitor, parse_log_notification, is_creation_logs
+from background_event_loop import BackgroundEventLoop
+
+def notification(signature, logs, err=None, slot=1000):
+    return {
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "result": {"context": {"slot": slot}, "value": {"signature": signature, "err": err, "logs": logs}},
+            "subscription": 42
+        }
+    }
+
+CREATE_LOGS = [
+    "Program LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj invoke [1]",
+    "Program log: Instruction: Initialize",
+    "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA invoke [2]",
+    "Program log: Instruction: InitializeMint2",
+]
+TRADE_LOGS = [
+    "Program LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj invoke [1]",
+    "Program log: Instruction: BuyExactIn",
+    "Program log: Instruction: InitializeAccount3",
+]
+
+def test_log_parsing():
+    """Creations are recognised from logs; failed transactions are ignored"""
+    print("🧪 TESTING LOGS NOTIFICATION PARSING")
+    print("=" * 50)
+
+    assert is_creation_logs(CREATE_LOGS)
+    assert not is_creation_logs(TRADE_LOGS)
+    print("✅ Initialize/InitializeMint detected, InitializeAccount ignored")
+
+    event = parse_log_notification(notification("sigA", CREATE_LOGS, slot=1234))
+    assert event == {'signature': 'sigA', 'slot': 1234, 'logs': CREATE_LOGS, 'is_creation': True}
+    assert parse_log_notification(notification("sigB", CREATE_LOGS, err={"InstructionError": [0, "Custom"]})) is None
+    assert parse_log_notification({"jsonrpc": "2.0", "result": 42, "id": 1}) is None
+    print("✅ Subscription replies and failed transactions skipped")
+
+def test_mock_websocket_server():
+    """Drop the socket mid-stream: the monitor resubscribes and backfills the gap"""
+    print("🧪 TESTING WEBSOCKET RESUBSCRIBE + BACKFILL")
+    print("=" * 50)
+
+    websockets = spl_websocket_monitor.websockets
+    if websockets is None:
+        print("⚠️ websockets not installed - skipping mock server test")
+        return
+
+    loop_service = BackgroundEventLoop(name="test-ws-loop")
+    connections = []
+    done = threading.Event()
+    received = []
+    backfill_calls = []
+
+    async def handler(websocket):
+        request = json.loads(await websocket.recv())
+        assert request["method"] == "logsSubscribe"
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "result": 42, "id": request["id"]}))
+        connections.append(request)
+        if len(connections) == 1:
+            await websocket.send(json.dumps(notification("sigA", CREATE_LOGS)))
+            await websocket.send(json.dumps(notification("sigB", TRADE_LOGS)))
+            return  # Drop the connection
+        await websocket.send(json.dumps(notification("sigC", CREATE_LOGS)))
+        await asyncio.sleep(5)
+
+    def backfill(last_signature):
+        backfill_calls.append(last_signature)
+        return ["sigMissed"]
+
+    def resolve(signatures):
+        return [{'address': f"{signature}bonk", 'name': signature} for signature in signatures]
+
+    def callback(tokens):
+        received.extend(token['name'] for token in tokens)
+        if len(received) >= 3:
+            done.set()
+
+    async def start_server():
+        return await websockets.serve(handler, "127.0.0.1", 0)
+
+    server = loop_service.run(start_server(), timeout=5)
+    port = list(server.sockets)[0].getsockname()[1]
+
+    monitor = SPLWebSocketMonitor(
+        callback_func=callback, ws_url=f"ws://127.0.0.1:{port}",
+        resolve_func=resolve, backfill_func=backfill,
+        reconnect_delay=0.05, loop_service=loop_service
+    )
+    monitor.start_monitoring()
+
+    assert done.wait(10), f"only received {received}"
+    assert received == ["sigA", "sigMissed", "sigC"]
+    assert backfill_calls == ["sigB"]
+    stats = monitor.get_stats()
+    assert stats['reconnects'] == 1 and stats['backfilled_signatures'] == 1
+    print(f"✅ Tokens in order {received}, backfilled from {backfill_calls[0]}")
+
+    monitor.stop()
+    server.close()
+    loop_service.stop()
+
+if __name__ == "__main__":
+    test_log_parsing()
+    test_mock_websocket_server()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test timestamp provenance - detection-time fields, has_provenance, and the
+RPC fallback used only for tokens that arrive without them
+"""
+
+from timestamp_provenance import (
+    PROVENANCE_DETECTION, PROVENANCE_EXTERNAL, PROVENANCE_RPC,
+    TimestampProvenanceResolver, detection_provenance, has_provenance, normalize_timestamp
+)
+
+TRANSACTION = {
+    'blockTime': 1760000000,
+    'slot': 370000123,
+    'transaction': {'signatures': ['creationSig']},
+}
+
+def test_detection_provenance():
+    """Creation transaction fields travel in the token dict"""
+    print("🧪 TESTING TIMESTAMP PROVENANCE")
+    print("=" * 50)
+
+    token = {'address': 'Mint1bonk', **detection_provenance(TRANSACTION)}
+    assert token['created_timestamp'] == 1760000000.0 and token['creation_slot'] == 370000123
+    assert token['creation_signature'] == 'creationSig' and token['timestamp_source'] == PROVENANCE_DETECTION
+    assert has_provenance(token)
+    print("✅ blockTime, slot and signature carried from detection")
+
+    assert normalize_timestamp(1760000000000) == 1760000000.0 and normalize_timestamp(0) is None
+    assert not has_provenance({'created_timestamp': 1760000000, 'timestamp_source': PROVENANCE_EXTERNAL})
+    assert not has_provenance({'created_timestamp': 1760000000})
+    print("✅ External and unlabelled timestamps are not authoritative")
+
+def test_rpc_fallback_only_without_provenance():
+    """Detected tokens cost no RPC; recovered ones get one lookup"""
+    calls = []
+
+    def rpc_call(method, params):
+        calls.append((method, params[0]))
+        return [
+            {'signature': 'newest', 'slot': 30, 'blockTime': 1760000100},
+            {'signature': 'oldest', 'slot': 10, 'blockTime': 1760000000},
+            {'signature': 'noTime', 'slot': 5, 'blockTime': None},
+        ]
+
+    resolver = TimestampProvenanceResolver(rpc_call)
+    detected = {'address': 'Mint1bonk', **detection_provenance(TRANSACTION)}
+    assert resolver.ensure(detected) and calls == []
+    print("✅ Detected token needs no lookup")
+
+    recovered = {'address': 'Mint2bonk', 'created_timestamp': 1760000050, 'timestamp_source': PROVENANCE_EXTERNAL}
+    assert resolver.ensure(recovered)
+    assert calls == [('getSignaturesForAddress', 'Mint2bonk')]
+    assert recovered['created_timestamp'] == 1760000000.0 and recovered['creation_signature'] == 'oldest'
+    assert recovered['timestamp_source'] == PROVENANCE_RPC and has_provenance(recovered)
+    print("✅ Recovered token resolved from its oldest signature")
+
+    failing = TimestampProvenanceResolver(lambda method, params: None)
+    assert not failing.ensure({'address': 'Mint3bonk'})
+    assert failing.get_stats()['rpc_failed'] == 1
+    print("✅ Lookup failure leaves the token for consensus")
+
+def test_rpc_lookup_pages_and_never_moves_newer():
+    """History is paged to its end; truncated history and newer answers don't win"""
+    history = [{'signature': f'sig{index}', 'slot': 100 - index, 'blockTime': 1760000100 - index}
+               for index in range(5)]
+    calls = []
+
+    def rpc_call(method, params):
+        before = params[1].get('before')
+        calls.append(before)
+        start = 0 if before is None else [entry['signature'] for entry in history].index(before) + 1
+        return history[start:start + 2]
+
+    resolver = TimestampProvenanceResolver(rpc_call, signature_limit=2)
+    token = {'address': 'Mint4bonk'}
+    assert resolver.ensure(token)
+    assert calls == [None, 'sig1', 'sig3'] and token['creation_signature'] == 'sig4'
+    print("✅ Signatures paged with `before` until a short page")
+
+    truncated = TimestampProvenanceResolver(rpc_call, signature_limit=2, max_pages=2)
+    assert not truncated.ensure({'address': 'Mint5bonk'})
+    assert truncated.get_stats()['rpc_incomplete'] == 1
+    print("✅ History longer than max_pages gives no RPC provenance")
+
+    older = {'address': 'Mint6bonk', 'created_timestamp': 1750000000, 'timestamp_source': PROVENANCE_EXTERNAL}
+    assert not resolver.ensure(older)
+    assert older['created_timestamp'] == 1750000000 and older['timestamp_source'] == PROVENANCE_EXTERNAL
+    assert resolver.get_stats()['kept_older'] == 1
+    print("✅ An older existing timestamp is never replaced by a newer RPC one")
+
+if __name__ == "__main__":
+    test_detection_provenance()
+    test_rpc_fallback_only_without_provenance()
+    test_rpc_lookup_pages_and_never_moves_newer()
+    print("\n✅ ALL TIMESTAMP PROVENANCE TESTS PASSED")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test the shared token processing engine - sources feed detect → enrichers →
+match → sinks, with one seen-token cache and one set of metrics
+"""
+
+import json
+import time
+import asyncio
+import threading
+
+from background_event_loop import BackgroundEventLoop
+from async_token_pipeline import PipelineStage
+from token_processing_engine import TokenProcessingEngine, TokenSource, PumpPortalSource, PollingSource
+
+class FakeWebSocket:
+    """Replays messages, or stays open forever when messages is None"""
+
+    def __init__(self, messages=None):
+        self.messages = messages
+        self.sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        if self.messages is None:
+            await asyncio.Event().wait()
+        for message in self.messages:
+            yield message
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+def test_pumpportal_source_through_engine():
+    """Messages are parsed, de-duplicated, enriched, matched and sunk; the source reconnects"""
+    print("🧪 TESTING TOKEN PROCESSING ENGINE")
+    print("=" * 50)
+
+    loop_service = BackgroundEventLoop(name="test-engine-loop")
+    sockets = []
+    def connect(url):
+        sockets.append(FakeWebSocket([
+            json.dumps({'mint': 'MintA', 'name': 'Moon Dog', 'symbol': 'MD'}),
+            "not json",
+            json.dumps({'mint': 'MintA', 'name': 'Moon Dog', 'symbol': 'MD'}),
+            json.dumps({'txType': 'buy', 'signature': 'abc'}),
+            json.dumps({'mint': 'MintB', 'name': 'Cat', 'symbol': 'CAT'}),
+        ] if not sockets else None))
+        return sockets[-1]
+
+    sunk = []
+    async def enrich(token):
+        return dict(token, name=token['name'].upper())
+
+    engine = TokenProcessingEngine(
+        'test-engine',
+        matcher=lambda token: ['moon'] if 'MOON' in token['name'] else [],
+        sources=[PumpPortalSource('wss://fake', connect=connect, reconnect_delay=0.01)],
+        enrichers=[PipelineStage('enrich', enrich)],
+        sinks=[PipelineStage('collect', lambda token: sunk.append(token) or token)],
+        loop_service=loop_service,
+    )
+    engine.start()
+
+    assert wait_for(lambda: len(sunk) == 2 and len(sockets) == 2)
+    assert sockets[0].sent == [{"method": "subscribeNewToken"}]
+    by_address = {token['address']: token for token in sunk}
+    assert by_address['MintA']['matches'] == ['moon'] and by_address['MintB']['matches'] == []
+    assert by_address['MintA']['source'] == 'pumpportal'
+    print("✅ Duplicate mint and non-token messages dropped; unmatched tokens still reach sinks")
+
+    metrics = engine.get_metrics()
+    assert metrics['engine']['duplicates'] == 1 and metrics['engine']['matched'] == 1
+    assert metrics['sources']['pumpportal']['connects'] == 2
+    assert metrics['stages']['enrich']['passed'] == 2
+    print("✅ One set of metrics covers sources, engine and stages; source reconnected")
+
+    engine.stop()
+    loop_service.stop()
+
+def test_polling_source_and_submit():
+    """Polled and submitted tokens share one seen cache; admit/ingest hooks and drop_unmatched apply"""
+    loop_service = BackgroundEventLoop(name="test-engine-poll-loop")
+    polls = []
+    def poll():
+        polls.append(time.time())
+        return [{'address': 'MintPolled', 'name': 'pepe'}] if len(polls) == 1 else []
+
+    ingested, sunk = [], []
+    engine = TokenProcessingEngine(
+        'test-poll-engine',
+        matcher=lambda token: ['pepe'] if 'pepe' in token['name'] else [],
+        sources=[PollingSource('alchemy', poll, interval=0.01)],
+        sinks=[PipelineStage('notify', lambda token: sunk.append(token['address']) or token, blocking=True)],
+        drop_unmatched=True,
+        admit=lambda token: token['address'] != 'MintBlocked',
+        ingest=lambda token: ingested.append(token['address']),
+        loop_service=loop_service,
+    )
+    engine.start()
+    assert wait_for(lambda: sunk == ['MintPolled'])
+
+    try:
+        TokenSource()
+        assert False, "TokenSource.run is abstract"
+    except TypeError:
+        pass
+
+    submitter = threading.Thread(target=engine.submit_batch, args=([
+        {'address': 'MintPolled', 'name': 'pepe'},
+        {'address': 'MintBlocked', 'name': 'pepe'},
+        {'address': 'MintOther', 'name': 'dog'},
+        {'address': 'MintSubmitted', 'name': 'pepe two'},
+    ],))
+    submitter.start()
+    submitter.join()
+    engine.pipeline.drain(timeout=5)
+
+    assert sunk == ['MintPolled', 'MintSubmitted']
+    assert ingested[0] == 'MintPolled' and len(ingested) == 5
+    stats = engine.get_metrics()['engine']
+    assert stats['duplicates'] == 1 and stats['rejected'] == 1
+    print("✅ Polling source and thread producers share dedup; unmatched and vetoed tokens dropped")
+
+    engine.stop()
+    loop_service.stop()
+
+def test_pumpportal_monitor_is_engine_configuration():
+    """IntegratedTokenMonitor's alerts and persistence run as engine stages"""
+    from main import IntegratedTokenMonitor
+    from keyword_snapshot import KeywordSnapshotStore
+
+    monitor = IntegratedTokenMonitor.__new__(IntegratedTokenMonitor)
+    monitor.websocket_url = 'wss://fake'
+    monitor.keyword_snapshots = KeywordSnapshotStore({"1": ["moon"]})
+    monitor.keyword_listener = type('Listener', (), {'connected': threading.Event()})()
+    monitor.last_keyword_refresh = time.time()
+    monitor.pending_alerts = {}
+    monitor.alert_coalesce_window = 0.01
+    monitor.get_db_connection = lambda: None
+    alerts = []
+    async def send_coalesced_notification(matches):
+        alerts.append(matches)
+    monitor.send_coalesced_notification = send_coalesced_notification
+
+    engine = monitor.engine = monitor.build_engine()
+    engine.sources[0].connect = lambda url: FakeWebSocket([
+        json.dumps({'mint': 'MintMoon', 'name': 'Moon Cat', 'symbol': 'MC'}),
+        json.dumps({'mint': 'MintDull', 'name': 'Dull', 'symbol': 'D'}),
+    ])
+    engine.sources[0].reconnect_delay = 60
+    engine.start()
+
+    assert wait_for(lambda: len(alerts) == 1 and engine.get_metrics()['stages']['persist']['processed'] == 2)
+    assert [(match['user_id'], match['keyword']) for match in alerts[0]] == [("1", "moon")]
+    print("✅ PumpPortal monitor runs as a thin engine configuration")
+
+    engine.stop()
+
+if __name__ == "__main__":
+    test_pumpportal_source_through_engine()
+    test_polling_source_and_submit()
+    test_pumpportal_monitor_is_engine_configuration()
+    print("\n✅ ALL TOKEN PROCESSING ENGINE TESTS PASSED")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Timestamp Provenance - where a token's creation time came from
+Tokens we detect ourselves carry blockTime/slot/signature from the creation
+transaction in the token dict. Only tokens without that (recovery, external
+feeds) need an RPC lookup, and only tokens still lacking it after that need
+multi-source consensus.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from slot_clock import get_slot_clock
+
+logger = logging.getLogger(__name__)
+
+PROVENANCE_DETECTION = 'detection_tx'     # blockTime of the creation transaction we parsed
+PROVENANCE_RPC = 'rpc_signatures'         # oldest signature for the mint, looked up afterwards
+PROVENANCE_EXTERNAL = 'external'          # API-reported (DexScreener pair creation etc.)
+
+# Chain-derived sources - no consensus needed
+AUTHORITATIVE_SOURCES = frozenset({PROVENANCE_DETECTION, PROVENANCE_RPC})
+
+def normalize_timestamp(timestamp: Optional[float]) -> Optional[float]:
+    """Seconds since epoch from a seconds or milliseconds value; None if unusable"""
+    if not timestamp or timestamp <= 0:
+        return None
+    return timestamp / 1000.0 if timestamp > 1e12 else float(timestamp)
+
+def detection_provenance(transaction: Dict[str, Any], signature: Optional[str] = None,
+                         source: str = PROVENANCE_DETECTION) -> Dict[str, Any]:
+    """Token-dict fields describing creation time from a getTransaction result
+
+    Confirmed transactions sometimes come back without blockTime; the slot
+    clock then supplies it, with its error bound in timestamp_error.
+    """
+    signatures = (transaction.get('transaction') or {}).get('signatures') or [None]
+    slot_clock = get_slot_clock()
+    created_timestamp = normalize_timestamp(transaction.get('blockTime'))
+    timestamp_error = 0.0
+    if created_timestamp is None:
+        resolved = slot_clock.resolve(transaction.get('slot'))
+        if resolved:
+            created_timestamp, timestamp_error = resolved
+    else:
+        slot_clock.observe(transaction.get('slot'), created_timestamp)
+    return {
+        'created_timestamp': created_timestamp,
+        'creation_slot': transaction.get('slot'),
+        'creation_signature': signature or signatures[0],
+        'timestamp_source': source,
+        'timestamp_error': timestamp_error,
+    }
+
+def has_provenance(token: Dict[str, Any]) -> bool:
+    """True if the token's creation time came from the chain"""
+    return (token.get('timestamp_source') in AUTHORITATIVE_SOURCES
+            and normalize_timestamp(token.get('created_timestamp')) is not None)
+
+class TimestampProvenanceResolver:
+    """Fill in chain-derived creation time for tokens that arrive without it
+
+    rpc_call(method, params) -> result, e.g. AlchemyLetsBonkScraper._make_rpc_call.
+    """
+
+    def __init__(self, rpc_call: Callable[[str, list], Any], signature_limit: int = 1000, max_pages: int = 5):
+        self.rpc_call = rpc_call
+        self.signature_limit = signature_limit
+        self.max_pages = max_pages
+        self.stats = {
+            'from_detection': 0,
+            'rpc_lookups': 0,
+            'rpc_resolved': 0,
+            'rpc_incomplete': 0,
+            'rpc_failed': 0,
+            'kept_older': 0,
+        }
+
+    def lookup_creation(self, mint_address: str) -> Optional[Dict[str, Any]]:
+        """Creation time from the mint's oldest signature
+
+        getSignaturesForAddress is paged with `before` until a page comes back
+        short. A mint whose history doesn't end within max_pages gets None:
+        its creation is older than anything fetched, so no RPC answer here
+        would be its creation time.
+        """
+        self.stats['rpc_lookups'] += 1
+        try:
+            signatures = []
+            complete = False
+            for _ in range(self.max_pages):
+                options = {"limit": self.signature_limit, "commitment": "confirmed"}
+                if signatures:
+                    options["before"] = signatures[-1].get('signature')
+                page = self.rpc_call("getSignaturesForAddress", [mint_address, options]) or []
+                signatures.extend(page)
+                if len(page) < self.signature_limit:
+                    complete = True
+                    break
+            if not complete:
+                self.stats['rpc_incomplete'] += 1
+                logger.debug(f"Creation lookup for {mint_address[:10]}...: history longer than "
+                             f"{self.max_pages} pages, leaving it to consensus")
+                return None
+
+            slot_clock = get_slot_clock()
+            slot_clock.observe_entries(signatures)
+            for entry in reversed(signatures):
+                block_time = normalize_timestamp(entry.get('blockTime')) or slot_clock.block_time(entry.get('slot'))
+                if block_time is not None:
+                    self.stats['rpc_resolved'] += 1
+                    return {
+                        'created_timestamp': block_time,
+                        'creation_slot': entry.get('slot'),
+                        'creation_signature': entry.get('signature'),
+                        'timestamp_source': PROVENANCE_RPC,
+                    }
+        except Exception as e:
+            logger.debug(f"Creation lookup failed for {mint_address[:10]}...: {e}")
+        self.stats['rpc_failed'] += 1
+        return None
+
+    def ensure(self, token: Dict[str, Any]) -> bool:
+        """Make sure token carries chain provenance; True if it does afterwards
+
+        An existing timestamp older than the RPC answer is never replaced:
+        the token keeps it and is left for consensus.
+        """
+        if has_provenance(token):
+            self.stats['from_detection'] += 1
+            return True
+        if not token.get('address'):
+            return False
+
+        provenance = self.lookup_creation(token['address'])
+        if provenance is None:
+            return False
+        previous = token.get('created_timestamp')
+        previous_seconds = normalize_timestamp(previous)
+        if previous_seconds is not None and previous_seconds < provenance['created_timestamp']:
+            self.stats['kept_older'] += 1
+            logger.info(f"⚠️ TIMESTAMP PROVENANCE: {token['address'][:10]}... RPC creation is newer than "
+                        f"{previous} - keeping the older timestamp")
+            return False
+        token.update(provenance)
+        logger.info(f"🔍 TIMESTAMP PROVENANCE: {token['address'][:10]}... creation from RPC "
+                    f"(slot {provenance['creation_slot']}, was {previous})")
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
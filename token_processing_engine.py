@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Token Processing Engine - one match → notify core for every deployment
+Pluggable sources (PumpPortal WebSocket, Alchemy signature polling, or any
+producer calling submit()) feed a single AsyncTokenPipeline:
+detect → enrichers → match → sinks. The engine owns the seen-token cache and
+the metrics, so the PumpPortal monitor and the Alchemy server differ only in
+the sources, enrichers, matcher and sinks they plug in.
+"""
+
+import abc
+import json
+import asyncio
+import inspect
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from async_token_pipeline import AsyncTokenPipeline, PipelineStage
+from background_event_loop import BackgroundEventLoop, get_background_loop
+from compact_seen_set import CompactSeenSet
+
+logger = logging.getLogger(__name__)
+
+PUMPPORTAL_WS_URL = "wss://pumpportal.fun/api/data"
+
+Emit = Callable[[Dict[str, Any]], Awaitable[None]]
+Matcher = Callable[[Dict[str, Any]], Optional[List[Any]]]
+
+def parse_pumpportal_message(message: Any) -> Optional[Dict[str, Any]]:
+    """Token dict for a PumpPortal new-token message, None for anything else"""
+    try:
+        data = json.loads(message)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid JSON: {str(message)[:100]}")
+        return None
+    if not isinstance(data, dict) or not (data.get('type') == 'new_token' or 'mint' in data):
+        return None
+    address = data.get('mint') or data.get('address')
+    if not address:
+        return None
+    return {
+        'address': address,
+        'name': data.get('name') or 'Unknown',
+        'symbol': data.get('symbol', ''),
+        'raw': data,
+    }
+
+class TokenSource(abc.ABC):
+    """Base source: run(emit) awaits emit(token) for every detected token until cancelled"""
+
+    name = 'source'
+
+    def __init__(self):
+        self.stats = {
+            'emitted': 0,
+            'errors': 0,
+        }
+
+    @abc.abstractmethod
+    async def run(self, emit: Emit):
+        ...
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+class PumpPortalSource(TokenSource):
+    """PumpPortal new-token WebSocket with reconnect and exponential backoff"""
+
+    name = 'pumpportal'
+
+    def __init__(self, url: str = PUMPPORTAL_WS_URL, connect: Optional[Callable[[str], Any]] = None,
+                 reconnect_delay: float = 5.0, max_reconnect_delay: float = 60.0):
+        super().__init__()
+        self.url = url
+        self.connect = connect or self._connect
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self.stats.update({'connects': 0, 'messages': 0})
+
+    def _connect(self, url: str):
+        import websockets
+        return websockets.connect(url)
+
+    async def run(self, emit: Emit):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                logger.info(f"🔗 Connecting to {self.url}")
+                async with self.connect(self.url) as websocket:
+                    await websocket.send(json.dumps({"method": "subscribeNewToken"}))
+                    self.connected = True
+                    self.stats['connects'] += 1
+                    delay = self.reconnect_delay
+                    logger.info("✅ Connected to PumpPortal - subscribed to new token events")
+
+                    async for message in websocket:
+                        self.stats['messages'] += 1
+                        token = parse_pumpportal_message(message)
+                        if token is not None:
+                            await emit(token)
+                logger.warning("⚠️ PumpPortal closed the connection")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"WebSocket connection error: {e}")
+            finally:
+                self.connected = False
+
+            logger.info(f"🔄 Reconnecting to PumpPortal in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['connected'] = self.connected
+        return stats
+
+class PollingSource(TokenSource):
+    """Calls poll() every interval seconds and emits the tokens it returns
+
+    poll may be a coroutine function or a blocking function (run in the
+    default executor), e.g. NewTokenOnlyMonitor.poll_new_tokens.
+    """
+
+    def __init__(self, name: str, poll: Callable[[], Any], interval: float = 2.0, error_delay: float = 5.0):
+        super().__init__()
+        self.name = name
+        self.poll = poll
+        self.interval = interval
+        self.error_delay = error_delay
+        self.stats['polls'] = 0
+
+    async def run(self, emit: Emit):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if inspect.iscoroutinefunction(self.poll):
+                    tokens = await self.poll()
+                else:
+                    tokens = await loop.run_in_executor(None, self.poll)
+                self.stats['polls'] += 1
+                for token in tokens or []:
+                    await emit(token)
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Monitoring error ({self.name}): {e}")
+                await asyncio.sleep(self.error_delay)
+
+class TokenProcessingEngine:
+    """detect → enrichers → match → sinks on one pipeline, fed by pluggable sources
+
+    Enrichers and sinks are PipelineStages whose handler returns the token to
+    forward or None to drop it. matcher(token) returns the token's matches;
+    tokens reach the sinks with token['matches'] set (only matched tokens when
+    drop_unmatched is True). admit(token) may veto a token in detect, and
+    ingest(token) runs when a token enters the engine, before any queueing.
+    """
+
+    def __init__(self, name: str, matcher: Matcher, sources: Iterable[TokenSource] = (),
+                 enrichers: Iterable[PipelineStage] = (), sinks: Iterable[PipelineStage] = (),
+                 drop_unmatched: bool = False, match_blocking: bool = False,
+                 admit: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 ingest: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 seen=None, seen_ttl: float = 300, seen_maxsize: int = 10000,
+                 loop_service: Optional[BackgroundEventLoop] = None):
+        self.name = name
+        self.matcher = matcher
+        self.sources = list(sources)
+        self.drop_unmatched = drop_unmatched
+        self.admit = admit
+        self.ingest = ingest
+        self.seen = seen if seen is not None else CompactSeenSet(capacity=seen_maxsize, ttl=seen_ttl, name=name)
+        self.loop_service = loop_service or get_background_loop()
+
+        stages = [
+            PipelineStage('detect', self._detect, concurrency=1, queue_size=500),
+            *enrichers,
+            PipelineStage('match', self._match, concurrency=2, queue_size=200, blocking=match_blocking),
+            *sinks,
+        ]
+        self.pipeline = AsyncTokenPipeline(stages, loop_service=self.loop_service, name=name)
+
+        self._lock = threading.Lock()
+        self._sources_future: Optional[concurrent.futures.Future] = None
+        self.stats = {
+            'admitted': 0,
+            'duplicates': 0,
+            'rejected': 0,
+            'matched': 0,
+        }
+
+    # ------------------------------------------------------------------ lifecycle
+
+    def start(self) -> Optional[concurrent.futures.Future]:
+        """Start the pipeline and every source; the future completes when all sources stop"""
+        self.pipeline.start()
+        if not self.sources:
+            return None
+        with self._lock:
+            if self._sources_future is None or self._sources_future.done():
+                self._sources_future = self.loop_service.submit(self._run_sources())
+                logger.info(f"✅ ENGINE '{self.name}': sources {', '.join(source.name for source in self.sources)}")
+            return self._sources_future
+
+    async def _run_sources(self):
+        results = await asyncio.gather(*[source.run(self._emitter(source)) for source in self.sources],
+                                       return_exceptions=True)
+        for source, result in zip(self.sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ ENGINE '{self.name}': source {source.name} stopped: {result}")
+
+    def stop(self, timeout: float = 10.0):
+        with self._lock:
+            future, self._sources_future = self._sources_future, None
+        if future is not None:
+            future.cancel()
+        self.pipeline.stop(timeout=timeout)
+
+    # ------------------------------------------------------------------ ingestion
+
+    def _emitter(self, source: TokenSource) -> Emit:
+        async def emit(token: Dict[str, Any]):
+            token.setdefault('source', source.name)
+            if self.ingest is not None:
+                self.ingest(token)
+            source.stats['emitted'] += 1
+            await self.pipeline.put(token)
+        return emit
+
+    def submit(self, token: Dict[str, Any], timeout: Optional[float] = None) -> bool:
+        """Thread-safe enqueue for callback-style producers"""
+        if self.ingest is not None:
+            self.ingest(token)
+        return self.pipeline.submit(token, timeout=timeout)
+
+    def submit_batch(self, tokens: Iterable[Dict[str, Any]], timeout: Optional[float] = None) -> int:
+        return sum(1 for token in tokens if self.submit(token, timeout=timeout))
+
+    async def run_blocking(self, func: Callable, *args):
+        """Run a blocking callable from an async handler on the engine's thread pool"""
+        return await self.pipeline.run_blocking(func, *args)
+
+    # ------------------------------------------------------------------ core stages
+
+    def _detect(self, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Drop malformed, vetoed and recently seen tokens before any I/O"""
+        address = token.get('address') if token else None
+        if not address:
+            return None
+        if address in self.seen:
+            self.stats['duplicates'] += 1
+            logger.debug(f"🔁 ALREADY PROCESSED: {token.get('name', 'unknown')} - {address[:10]}...")
+            return None
+        if self.admit is not None and not self.admit(token):
+            self.stats['rejected'] += 1
+            return None
+        # Marking here (single detect worker) keeps a token from entering the pipeline twice
+        self.seen.add(address)
+        self.stats['admitted'] += 1
+        return token
+
+    def _match(self, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        matches = list(self.matcher(token) or [])
+        token['matches'] = matches
+        if matches:
+            self.stats['matched'] += 1
+        elif self.drop_unmatched:
+            return None
+        return token
+
+    # ------------------------------------------------------------------ metrics
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self.pipeline.get_metrics()
+        metrics['engine'] = dict(self.stats, seen=len(self.seen))
+        if isinstance(self.seen, CompactSeenSet):
+            metrics['seen'] = self.seen.get_stats()
+        metrics['sources'] = {source.name: source.get_stats() for source in self.sources}
+        return metrics
+
+    def log_metrics(self):
+        logger.info(f"   ⚙️ Engine '{self.name}': {self.stats['admitted']} admitted, {self.stats['duplicates']} duplicates, "
+                    f"{self.stats['matched']} matched")
+        for source in self.sources:
+            stats = source.get_stats()
+            logger.info(f"      ← {source.name}: {stats['emitted']} emitted, {stats['errors']} errors")
+        self.pipeline.log_metrics()
@@ -15,6 +15,7 @@ from typing import List, Dict, Set, Optional
 import requests
 from enhanced_token_detector import EnhancedTokenDetector
 from market_data_api import MarketDataAPI
+from timestamp_provenance import PROVENANCE_EXTERNAL
 
 class TokenRecoverySystem:
     def __init__(self, alchemy_scraper, discord_notifier, config_manager):
@@ -132,6 +133,7 @@ class TokenRecoverySystem:
                                     'name': pair.get('baseToken', {}).get('name', 'Unknown'),
                                     'symbol': pair.get('baseToken', {}).get('symbol', 'TOKEN'),
                                     'created_timestamp': created_at / 1000,
+                                    'timestamp_source': PROVENANCE_EXTERNAL,  # DexScreener pair creation, not the mint
                                     'market_cap': pair.get('fdv', 0),
                                     'recovery_age': time.time() - (created_at / 1000)
                                 }
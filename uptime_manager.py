@@ -6,12 +6,13 @@ Works directly with the existing monitoring system
 import time
 import logging
 import threading
-import gc
 import psutil
 import signal
 import sys
 from datetime import datetime
 
+from memory_governor import get_memory_governor
+
 logger = logging.getLogger(__name__)
 
 class UptimeManager:
@@ -21,6 +22,7 @@ class UptimeManager:
         self.start_time = time.time()
         self.last_cleanup = time.time()
         self.error_count = 0
+        self.memory_governor = get_memory_governor()
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self.graceful_shutdown)
@@ -79,32 +81,24 @@ class UptimeManager:
                 self.error_count += 1
                 time.sleep(120)
                 
-    def perform_memory_cleanup(self):
-        """Aggressive memory cleanup to prevent bloat"""
+    def perform_memory_cleanup(self, force=False):
+        """Evict the oldest entries of over-budget caches through the memory governor
+
+        Never clears whole caches (recent signatures would be reprocessed and
+        re-alerted) and never forces a full gc.collect() on the hot path.
+        """
         try:
             initial_memory = psutil.virtual_memory().percent
             
-            # Clear TTL caches if they exist in the server
-            if hasattr(self.server, 'seen_token_addresses') and self.server.seen_token_addresses:
-                cache_size = len(self.server.seen_token_addresses)
-                self.server.seen_token_addresses.clear()
-                logger.info(f"🧹 Cleared token address cache ({cache_size} entries)")
-                
-            if hasattr(self.server, 'processed_signatures') and self.server.processed_signatures:
-                cache_size = len(self.server.processed_signatures)
-                self.server.processed_signatures.clear()
-                logger.info(f"🧹 Cleared signature cache ({cache_size} entries)")
-                
-            # Force garbage collection
-            collected = gc.collect()
+            evicted = self.memory_governor.enforce(force=force)
+            stats = self.memory_governor.get_stats()
             
             final_memory = psutil.virtual_memory().percent
-            memory_freed = initial_memory - final_memory
-            
             uptime_hours = (time.time() - self.start_time) / 3600
             
-            logger.info(f"🧹 CLEANUP COMPLETE: {collected} objects freed, "
-                       f"Memory: {final_memory:.1f}% (freed {memory_freed:.1f}%), "
+            logger.info(f"🧹 CLEANUP COMPLETE: {sum(evicted.values())} cache entries evicted, "
+                       f"Tracked caches: {stats['tracked_bytes'] / 1024 / 1024:.1f}MB, "
+                       f"Memory: {final_memory:.1f}% (was {initial_memory:.1f}%), "
                        f"Uptime: {uptime_hours:.2f}h")
             
             self.last_cleanup = time.time()
@@ -153,7 +147,7 @@ class UptimeManager:
             # Trigger cleanup if memory is high
             if memory.percent > 80:
                 logger.warning(f"⚠️ High memory usage: {memory.percent:.1f}% - triggering cleanup")
-                self.perform_memory_cleanup()
+                self.perform_memory_cleanup(force=True)
                 
             # Log warning if CPU is consistently high
             if cpu_percent > 85:
@@ -206,6 +200,7 @@ class UptimeManager:
             "memory_percent": memory.percent if memory else 0,
             "cpu_percent": cpu_percent,
             "last_cleanup": datetime.fromtimestamp(self.last_cleanup).isoformat(),
+            "cache_bytes": {name: cache['bytes'] for name, cache in self.memory_governor.get_stats()['caches'].items()},
             "status": "healthy" if self.error_count < 5 else "degraded" if self.error_count < 20 else "critical"
         }
         